@@ -0,0 +1,224 @@
+# This script requires the 'google-play-scraper' library.
+# Install it first using: pip install google-play-scraper
+# (This file used to be named google_play_scraper.py, which shadowed the library it imports.)
+#
+# Usage (from the project root):
+#   python 0_data_collection/play_review_harvester.py                 # print the newest REVIEW_COUNT reviews
+#   python 0_data_collection/play_review_harvester.py --harvest       # page through all reviews into JSONL
+#   python 0_data_collection/play_review_harvester.py --harvest       # (again) fetch only reviews newer than last run
+
+import argparse
+import json
+import os
+import time
+from datetime import datetime
+
+APP_ID = 'com.nurihaus.lounge'
+LANGUAGE = 'en'  # Fetch Korean reviews
+COUNTRY = 'un'   # Set country to Korea
+REVIEW_COUNT = 200 # Number of reviews to fetch
+
+# Harvest mode: reviews are appended page by page, so memory stays at one page regardless of review count.
+script_dir = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_OUTPUT = os.path.join(script_dir, 'reviews', f'{APP_ID}.jsonl')
+PAGE_SIZE = 200
+SORT_NEWEST = 2  # google_play_scraper.Sort.NEWEST
+# Fields of google_play_scraper's (private) _ContinuationToken, saved so an interrupted harvest can resume mid-run.
+# If a library version no longer has that class, an interrupted run is restarted from its first page instead.
+TOKEN_FIELDS = ['token', 'lang', 'country', 'sort', 'count', 'filter_score_with', 'filter_device_with']
+
+
+def fetch_app_reviews():
+    """
+    Fetches reviews for a specific Google Play app.
+    """
+    from google_play_scraper import reviews, Sort
+
+    print(f"Fetching reviews for app: {APP_ID}...")
+
+    try:
+        # Fetch the reviews
+        # We sort by NEWEST. You can also use Sort.RATING or Sort.HELPFULNESS.
+        result, continuation_token = reviews(
+            APP_ID,
+            lang=LANGUAGE,
+            country=COUNTRY,
+            sort=Sort.NEWEST,
+            count=REVIEW_COUNT
+        )
+
+        if not result:
+            print("No reviews found or failed to fetch reviews.")
+            return
+
+        print(f"Successfully fetched {len(result)} reviews.\n")
+
+        # Print each review (or process it as needed)
+        for i, review in enumerate(result):
+            print(f"--- Review {i + 1} ---")
+            print(f"User: {review['userName']}")
+            print(f"Rating: {review['score']} / 5")
+            print(f"Date: {review['at']}")
+            print(f"Review Text: {review['content']}")
+
+            # Check if there is a developer reply
+            if review.get('replyContent'):
+                print(f"Developer Reply: {review['replyContent']}")
+
+            print("-" * 20 + "\n")
+
+    except Exception as e:
+        print(f"An error occurred: {e}")
+
+
+def load_state(path):
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def save_state(path, state):
+    """Writes the state file atomically so a crash never leaves it half-written."""
+    tmp = f"{path}.tmp"
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(state, f, indent=2)
+    os.replace(tmp, path)
+
+
+def continuation_token_class():
+    """google_play_scraper's private _ContinuationToken, or None if this library version does not have it."""
+    try:
+        from google_play_scraper.features.reviews import _ContinuationToken
+    except ImportError:
+        return None
+    return _ContinuationToken
+
+
+def token_to_dict(token):
+    return {name: getattr(token, name) for name in TOKEN_FIELDS}
+
+
+def _json_default(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"Not JSON serializable: {type(value)}")
+
+
+def harvest_reviews(app_id=APP_ID, output_path=DEFAULT_OUTPUT, state_path=None, lang=LANGUAGE, country=COUNTRY,
+                    page_size=PAGE_SIZE, max_pages=None, sleep_seconds=0.0, fetch=None, make_token=None):
+    """
+    Pages through reviews (newest first) with the continuation token and appends each page to a JSONL file.
+
+    The state file (default: <output>.state.json) stores:
+      - last_review_at / last_review_ids: newest review of the last completed run. The next run stops
+        as soon as it reaches it, so only newer reviews are fetched.
+      - continuation_token / output_offset / run_newest_*: progress of an unfinished run. A rerun truncates
+        the JSONL back to output_offset (dropping a page written after the last state save) and resumes.
+        If the token cannot be rebuilt, the JSONL is truncated back to run_start_offset and the run restarts.
+
+    fetch / make_token default to google_play_scraper's reviews and _ContinuationToken; tests can pass fakes.
+    Returns a summary dict.
+    """
+    if fetch is None:
+        from google_play_scraper import reviews as fetch
+    make_token = make_token or continuation_token_class()
+
+    state_path = state_path or f"{output_path}.state.json"
+    os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
+    state = load_state(state_path)
+    last_at = state.get('last_review_at')
+    last_ids = set(state.get('last_review_ids', []))
+
+    resume = state.get('continuation_token')
+    token = None
+    if resume:
+        try:
+            token = make_token(*[resume[name] for name in TOKEN_FIELDS])
+        except TypeError as e:
+            # make_token is None (class removed from the library) or its signature changed
+            print(f"Cannot resume from the saved continuation token ({e}); restarting the interrupted run.")
+            state.pop('continuation_token')
+            state['output_offset'] = state.get('run_start_offset', state['output_offset'])
+            state['run_newest_at'], state['run_newest_ids'] = None, []
+    else:
+        state['output_offset'] = os.path.getsize(output_path) if os.path.exists(output_path) else 0
+        state['run_start_offset'] = state['output_offset']
+        state['run_newest_at'], state['run_newest_ids'] = None, []
+
+    written, pages, reached_previous = 0, 0, False
+    started = time.perf_counter()
+    with open(output_path, 'a+', encoding='utf-8') as out:
+        out.truncate(state['output_offset'])
+        while max_pages is None or pages < max_pages:
+            if token is None:
+                result, next_token = fetch(app_id, lang=lang, country=country, sort=SORT_NEWEST, count=page_size)
+            else:
+                result, next_token = fetch(app_id, continuation_token=token)
+            pages += 1
+
+            lines = []
+            for review in result:
+                at = review['at'].isoformat() if isinstance(review['at'], datetime) else review['at']
+                # Stop at the newest review of the previous run (NEWEST order: everything after it is older)
+                if last_at and (at < last_at or (at == last_at and review['reviewId'] in last_ids)):
+                    reached_previous = True
+                    break
+                if state['run_newest_at'] is None or at > state['run_newest_at']:
+                    state['run_newest_at'], state['run_newest_ids'] = at, []
+                if at == state['run_newest_at']:
+                    state['run_newest_ids'].append(review['reviewId'])
+                lines.append(json.dumps(review, ensure_ascii=False, default=_json_default) + '\n')
+
+            out.writelines(lines)
+            out.flush()
+            written += len(lines)
+            state['output_offset'] = out.tell()
+
+            finished = reached_previous or not result or next_token is None or getattr(next_token, 'token', None) is None
+            if finished:
+                # Run complete: promote this run's newest review to the incremental boundary
+                if state['run_newest_at'] is not None:
+                    state['last_review_at'], state['last_review_ids'] = state['run_newest_at'], state['run_newest_ids']
+                for key in ['continuation_token', 'run_newest_at', 'run_newest_ids', 'run_start_offset']:
+                    state.pop(key, None)
+                state['last_run_at'] = datetime.now().isoformat(timespec='seconds')
+                save_state(state_path, state)
+                break
+
+            token = next_token
+            state['continuation_token'] = token_to_dict(token)
+            save_state(state_path, state)
+            if sleep_seconds:
+                time.sleep(sleep_seconds)
+
+    return {'reviews': written, 'pages': pages, 'complete': 'continuation_token' not in state,
+            'last_review_at': state.get('last_review_at'), 'seconds': time.perf_counter() - started}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Google Play review scraper")
+    parser.add_argument('--harvest', action='store_true', help="page through all (or only new) reviews into JSONL")
+    parser.add_argument('--app-id', default=APP_ID)
+    parser.add_argument('--output', help="JSONL output path (default: 0_data_collection/reviews/<app_id>.jsonl)")
+    parser.add_argument('--state', help="state file path (default: <output>.state.json)")
+    parser.add_argument('--page-size', type=int, default=PAGE_SIZE)
+    parser.add_argument('--max-pages', type=int, help="stop after N pages (the run resumes next time)")
+    parser.add_argument('--sleep', type=float, default=0.5, help="seconds to wait between pages")
+    args = parser.parse_args()
+
+    if not args.harvest:
+        fetch_app_reviews()
+        return
+
+    output = args.output or os.path.join(script_dir, 'reviews', f'{args.app_id}.jsonl')
+    print(f"Harvesting reviews for app: {args.app_id} -> {output}")
+    summary = harvest_reviews(args.app_id, output, args.state, page_size=args.page_size,
+                              max_pages=args.max_pages, sleep_seconds=args.sleep)
+    status = "complete" if summary['complete'] else "paused (rerun to resume)"
+    print(f"Appended {summary['reviews']} reviews from {summary['pages']} pages in {summary['seconds']:.1f}s, {status}.")
+    print(f"Newest review seen: {summary['last_review_at']}")
+
+
+if __name__ == "__main__":
+    main()
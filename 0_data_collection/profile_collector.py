@@ -0,0 +1,325 @@
+"""
+Instagram 프로필 대량 수집기
+
+기존 instaloader.py 는 하드코딩된 프로필 1개를 동기로 가져와 출력만 했고, 파일 이름이 instaloader 패키지를 가려
+`import instaloader` 가 자기 자신을 불러오는 문제도 있었습니다. 이 스크립트는 여러 프로필을 다음 방식으로 수집합니다.
+
+- 워커 풀   : ThreadPoolExecutor(workers) + 동시에 대기하는 요청 수 제한 (사용자 목록 전체를 한 번에 제출하지 않음)
+- 속도 제한 : 토큰 버킷 (초당 rate 개, 최대 burst 개 연속 허용). 429/5xx 는 Retry-After 또는 지수 백오프 후 재시도
+- 응답 캐시 : 원본 JSON 을 사용자별 파일로 저장하고 TTL 안이면 네트워크를 타지 않습니다.
+- 체크포인트: 처리 결과(ok / not_found / error)를 JSONL 로 남겨, 중단 후 재실행하면 ok / not_found 는 건너뜁니다.
+- 출력      : 프로필마다 파일 하나, 첫 줄에 탭 구분 필드 (etl_nurihaus.py 의 users_influencers_SPOD 형식)
+              username, followers, followees, posts, full_name, external_url, is_business, biography, engagement_rate, niches
+              etl_nurihaus.py 는 0(username), 1(followers), 7(biography) 번째 필드만 사용합니다.
+
+인게이지먼트율은 모든 게시물을 순회하지 않고, 프로필 응답에 함께 오는 최근 게시물(최대 12개)의
+평균 (좋아요 + 댓글) / 팔로워 수로 계산합니다.
+
+사용 예시 (프로젝트 루트에서 실행):
+    python 0_data_collection/profile_collector.py --usernames usernames.txt
+    python 0_data_collection/profile_collector.py --usernames usernames.txt --workers 8 --rate 2 --burst 5
+    # 로컬 스텁 서버로 테스트 (python 0_data_collection/stub_instagram_server.py --port 8080)
+    python 0_data_collection/profile_collector.py --usernames usernames.txt --base-url http://127.0.0.1:8080 --output-dir /tmp/profiles
+"""
+import argparse
+import hashlib
+import json
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import datetime
+
+import requests
+from requests.adapters import HTTPAdapter
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(script_dir)
+DEFAULT_OUTPUT_DIR = os.path.join(project_root, '1_data_simulation', 'influencer_and_brand_dataset',
+                                  'users_influencers_SPOD')
+DEFAULT_CACHE_DIR = os.path.join(script_dir, '.cache', 'profiles')
+
+DEFAULT_BASE_URL = 'https://i.instagram.com'
+PROFILE_PATH = '/api/v1/users/web_profile_info/'
+HEADERS = {'x-ig-app-id': '936619743392459', 'User-Agent': 'Mozilla/5.0'}
+TIMEOUT = (3.05, 15)
+MAX_RETRIES = 4
+
+DEFAULT_CACHE_TTL_HOURS = 24 * 7
+PROFILE_COLUMNS = ['username', 'followers', 'followees', 'posts', 'full_name', 'external_url', 'is_business',
+                   'biography', 'engagement_rate', 'niches']
+
+# 바이오 키워드 기반 니치 분류
+NICHE_KEYWORDS = {'skincare': '스킨케어', 'makeup': '메이크업', 'haircare': '헤어케어'}
+
+
+class ProfileNotFound(Exception):
+    """프로필이 없거나 비공개로 전환되어 조회할 수 없을 때 발생합니다 (재시도하지 않음)."""
+
+
+class TokenBucket:
+    """초당 rate 개의 토큰이 채워지고 최대 capacity 개까지 쌓이는 스레드 안전 토큰 버킷."""
+
+    def __init__(self, rate, capacity):
+        self.rate = float(rate)
+        self.capacity = float(capacity)
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait_seconds = (1 - self.tokens) / self.rate
+            time.sleep(wait_seconds)
+
+
+class ResponseCache:
+    """사용자별 원본 응답 JSON 을 파일로 저장합니다. 파일 수정 시각이 ttl_seconds 안이면 적중입니다."""
+
+    def __init__(self, cache_dir, ttl_seconds):
+        self.cache_dir = cache_dir
+        self.ttl_seconds = ttl_seconds
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def path(self, username):
+        digest = hashlib.sha1(username.encode('utf-8')).hexdigest()
+        return os.path.join(self.cache_dir, digest[:2], f"{digest}.json")
+
+    def get(self, username):
+        path = self.path(username)
+        try:
+            if time.time() - os.path.getmtime(path) > self.ttl_seconds:
+                return None
+            with open(path, encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def put(self, username, payload):
+        path = self.path(username)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(payload, f)
+        os.replace(tmp, path)
+
+
+class Checkpoint:
+    """처리 결과를 한 줄씩 JSONL 로 추가 기록합니다. 마지막 상태가 ok / not_found 인 사용자는 재실행 시 건너뜁니다."""
+
+    FINAL_STATUSES = {'ok', 'not_found'}
+
+    def __init__(self, path):
+        self.path = path
+        self.status = {}
+        if os.path.exists(path):
+            with open(path, encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        continue  # 중단 시점에 잘린 마지막 줄
+                    self.status[record['username']] = record['status']
+        self.file = open(path, 'a', encoding='utf-8')
+
+    def done(self, username):
+        return self.status.get(username) in self.FINAL_STATUSES
+
+    def record(self, username, status, error=None):
+        self.status[username] = status
+        entry = {'username': username, 'status': status, 'at': datetime.now().isoformat(timespec='seconds')}
+        if error:
+            entry['error'] = error
+        self.file.write(json.dumps(entry, ensure_ascii=False) + '\n')
+        self.file.flush()
+
+    def close(self):
+        self.file.close()
+
+
+def make_session(workers):
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=workers)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    session.headers.update(HEADERS)
+    return session
+
+
+def fetch_profile(session, base_url, username, bucket):
+    """프로필 응답 JSON 을 가져옵니다. 429 / 5xx / 연결 오류는 백오프 후 최대 MAX_RETRIES 번 재시도합니다."""
+    for attempt in range(MAX_RETRIES + 1):
+        bucket.acquire()
+        try:
+            response = session.get(f"{base_url}{PROFILE_PATH}", params={'username': username}, timeout=TIMEOUT)
+        except requests.RequestException:
+            if attempt == MAX_RETRIES:
+                raise
+            time.sleep(2 ** attempt)
+            continue
+        if response.status_code == 404:
+            raise ProfileNotFound(username)
+        if response.status_code == 429 or response.status_code >= 500:
+            if attempt == MAX_RETRIES:
+                response.raise_for_status()
+            retry_after = response.headers.get('Retry-After')
+            time.sleep(float(retry_after) if retry_after else 2 ** attempt)
+            continue
+        response.raise_for_status()
+        payload = response.json()
+        if not (payload.get('data') or {}).get('user'):
+            raise ProfileNotFound(username)
+        return payload
+
+
+def classify_niches(bio):
+    bio = bio.lower()
+    return [label for keyword, label in NICHE_KEYWORDS.items() if keyword in bio]
+
+
+def parse_profile(payload):
+    """web_profile_info 응답 -> PROFILE_COLUMNS 순서의 값 목록."""
+    user = payload['data']['user']
+    followers = user.get('edge_followed_by', {}).get('count', 0)
+    timeline = user.get('edge_owner_to_timeline_media', {})
+    recent = [edge['node'] for edge in timeline.get('edges', [])]
+    engagement = 0.0
+    if recent and followers:
+        interactions = sum(node.get('edge_liked_by', {}).get('count', 0)
+                           + node.get('edge_media_to_comment', {}).get('count', 0) for node in recent)
+        engagement = interactions / len(recent) / followers
+    bio = user.get('biography') or ''
+    return [
+        user['username'],
+        followers,
+        user.get('edge_follow', {}).get('count', 0),
+        timeline.get('count', 0),
+        user.get('full_name') or '',
+        user.get('external_url') or '',
+        int(bool(user.get('is_business_account'))),
+        bio,
+        round(engagement, 6),
+        ','.join(classify_niches(bio)),
+    ]
+
+
+def to_tsv_line(values):
+    # 탭 / 줄바꿈이 들어가면 etl_nurihaus.py 의 첫 줄 split('\t') 파싱이 깨지므로 공백으로 바꿉니다.
+    return '\t'.join(' '.join(str(v).split()) for v in values) + '\n'
+
+
+def write_profile(output_dir, values):
+    path = os.path.join(output_dir, values[0])
+    tmp = f"{path}.tmp"
+    with open(tmp, 'w', encoding='utf-8') as f:
+        f.write(to_tsv_line(values))
+    os.replace(tmp, path)
+
+
+def collect_one(username, session, base_url, bucket, cache, output_dir):
+    """사용자 한 명 처리: (username, 상태, 캐시 적중 여부, 오류 메시지)"""
+    payload = cache.get(username)
+    cached = payload is not None
+    try:
+        if payload is None:
+            payload = fetch_profile(session, base_url, username, bucket)
+            cache.put(username, payload)
+        write_profile(output_dir, parse_profile(payload))
+        return username, 'ok', cached, None
+    except ProfileNotFound:
+        return username, 'not_found', cached, None
+    except Exception as e:
+        return username, 'error', cached, str(e)
+
+
+def collect_profiles(usernames, output_dir=DEFAULT_OUTPUT_DIR, base_url=DEFAULT_BASE_URL, workers=4, rate=1.0,
+                     burst=5, cache_dir=DEFAULT_CACHE_DIR, cache_ttl_hours=DEFAULT_CACHE_TTL_HOURS,
+                     checkpoint_path=None, progress_every=100):
+    """usernames 를 병렬 수집하여 output_dir 에 기록하고 상태별 건수 / 소요 시간을 반환합니다."""
+    os.makedirs(output_dir, exist_ok=True)
+    checkpoint = Checkpoint(checkpoint_path or f"{output_dir.rstrip(os.sep)}.checkpoint.jsonl")
+    cache = ResponseCache(cache_dir, cache_ttl_hours * 3600)
+    bucket = TokenBucket(rate, burst)
+    session = make_session(workers)
+
+    # 중복 / 빈 이름 제거 후 이미 끝난 사용자(체크포인트) 제외
+    unique = [u for u in dict.fromkeys(u.strip().lstrip('@') for u in usernames) if u]
+    pending = [u for u in unique if not checkpoint.done(u)]
+    counts = {'ok': 0, 'not_found': 0, 'error': 0, 'cache_hits': 0, 'skipped': len(unique) - len(pending),
+              'duplicates': len(usernames) - len(unique)}
+    started = time.perf_counter()
+    max_in_flight = workers * 4
+
+    def finish(future):
+        username, status, cached, error = future.result()
+        checkpoint.record(username, status, error)
+        counts[status] += 1
+        counts['cache_hits'] += cached
+        done = counts['ok'] + counts['not_found'] + counts['error']
+        if progress_every and done % progress_every == 0:
+            print(f"   {done:,}/{len(pending):,} done ({done / (time.perf_counter() - started):.1f}/s)")
+
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            in_flight = set()
+            for username in pending:
+                if len(in_flight) >= max_in_flight:
+                    finished, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                    for future in finished:
+                        finish(future)
+                in_flight.add(pool.submit(collect_one, username, session, base_url, bucket, cache, output_dir))
+            for future in wait(in_flight).done:
+                finish(future)
+    finally:
+        checkpoint.close()
+    counts['seconds'] = time.perf_counter() - started
+    return counts
+
+
+def read_usernames(path):
+    with open(path, encoding='utf-8') as f:
+        return [line.strip() for line in f if line.strip() and not line.startswith('#')]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Instagram 프로필 대량 수집 (etl_nurihaus.py 입력 형식)")
+    parser.add_argument('usernames', nargs='*', help="수집할 사용자 이름")
+    parser.add_argument('--usernames', dest='usernames_file', help="사용자 이름 목록 파일 (한 줄에 하나)")
+    parser.add_argument('--output-dir', default=DEFAULT_OUTPUT_DIR)
+    parser.add_argument('--base-url', default=DEFAULT_BASE_URL, help="API 주소 (로컬 스텁 서버 테스트용)")
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--rate', type=float, default=1.0, help="초당 요청 수")
+    parser.add_argument('--burst', type=int, default=5, help="연속 허용 요청 수")
+    parser.add_argument('--cache-dir', default=DEFAULT_CACHE_DIR)
+    parser.add_argument('--cache-ttl-hours', type=float, default=DEFAULT_CACHE_TTL_HOURS)
+    parser.add_argument('--checkpoint', help="체크포인트 파일 (기본: <output-dir>.checkpoint.jsonl)")
+    args = parser.parse_args()
+
+    usernames = list(args.usernames)
+    if args.usernames_file:
+        usernames += read_usernames(args.usernames_file)
+    if not usernames:
+        parser.error("No usernames given.")
+
+    print(f">>> Collecting {len(usernames):,} profiles from {args.base_url} "
+          f"({args.workers} workers, {args.rate}/s, burst {args.burst})...")
+    counts = collect_profiles(usernames, args.output_dir, args.base_url, args.workers, args.rate, args.burst,
+                              args.cache_dir, args.cache_ttl_hours, args.checkpoint)
+    print(f">>> Done in {counts['seconds']:.1f}s: {counts['ok']:,} ok, {counts['not_found']:,} not found, "
+          f"{counts['error']:,} errors, {counts['cache_hits']:,} cache hits, {counts['skipped']:,} skipped (checkpoint), "
+          f"{counts['duplicates']:,} duplicate/blank inputs")
+    print(f"   Output: {args.output_dir}")
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except Exception as e:
+        print(f"Collector Error: {e}")
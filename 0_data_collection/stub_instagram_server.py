@@ -0,0 +1,108 @@
+"""
+profile_collector.py 테스트용 로컬 스텁 서버 (web_profile_info 응답 흉내)
+
+- 사용자 이름 해시로 결정적인 프로필(팔로워 수, 바이오, 최근 게시물 12개)을 생성합니다.
+- 'missing' 으로 시작하는 사용자는 404 를 돌려줍니다.
+- --latency 로 응답 지연을, --rate-limit 으로 초당 허용 요청 수(초과 시 429 + Retry-After)를 흉내냅니다.
+- 종료(Ctrl+C) 시 상태 코드별 요청 수를 출력합니다.
+
+사용 예시 (프로젝트 루트에서 실행):
+    python 0_data_collection/stub_instagram_server.py --port 8080 --latency 0.05 --rate-limit 20
+"""
+import argparse
+import hashlib
+import json
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+BIOS = ['daily skincare routine & kbeauty reviews', 'makeup artist | tutorials every week',
+        'haircare tips and salon life', 'travel and food vlog', 'fashion / style / ootd']
+
+
+def fake_profile(username):
+    seed = int(hashlib.md5(username.encode('utf-8')).hexdigest(), 16)
+    followers = 1000 + seed % 1_000_000
+    posts = [{'node': {'edge_liked_by': {'count': followers * (1 + (seed >> i) % 5) // 100},
+                       'edge_media_to_comment': {'count': (seed >> i) % 200}}} for i in range(12)]
+    return {'data': {'user': {
+        'username': username,
+        'full_name': username.title(),
+        'biography': BIOS[seed % len(BIOS)] + '\nDM for collab',
+        'external_url': f"https://example.com/{username}",
+        'is_business_account': bool(seed % 2),
+        'edge_followed_by': {'count': followers},
+        'edge_follow': {'count': seed % 3000},
+        'edge_owner_to_timeline_media': {'count': 12 + seed % 2000, 'edges': posts},
+    }}, 'status': 'ok'}
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    latency = 0.0
+    rate_limit = None
+    stats = Counter()
+    lock = threading.Lock()
+    window = [0.0, 0]  # [윈도 시작 시각, 윈도 내 요청 수]
+
+    def _send(self, status, body=None, headers=None):
+        with self.lock:
+            self.stats[status] += 1
+        self.send_response(status)
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        data = json.dumps(body or {}).encode('utf-8')
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _rate_limited(self):
+        if not self.rate_limit:
+            return False
+        with self.lock:
+            now = time.monotonic()
+            if now - self.window[0] >= 1.0:
+                self.window[:] = [now, 0]
+            self.window[1] += 1
+            return self.window[1] > self.rate_limit
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        username = parse_qs(url.query).get('username', [''])[0]
+        if url.path.rstrip('/') != '/api/v1/users/web_profile_info' or not username:
+            return self._send(400, {'message': 'bad request'})
+        if self._rate_limited():
+            return self._send(429, {'message': 'Please wait a few minutes'}, {'Retry-After': '1'})
+        time.sleep(self.latency)
+        if username.startswith('missing'):
+            return self._send(404, {'message': 'not found'})
+        return self._send(200, fake_profile(username))
+
+    def log_message(self, *args):
+        pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Instagram web_profile_info 스텁 서버")
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--latency', type=float, default=0.05, help="응답 지연 (초)")
+    parser.add_argument('--rate-limit', type=int, help="초당 허용 요청 수 (초과 시 429)")
+    args = parser.parse_args()
+
+    StubHandler.latency = args.latency
+    StubHandler.rate_limit = args.rate_limit
+    server = ThreadingHTTPServer(('127.0.0.1', args.port), StubHandler)
+    print(f">>> Stub server on http://127.0.0.1:{args.port} (latency {args.latency}s, rate limit {args.rate_limit})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print(f">>> Requests by status: {dict(StubHandler.stats)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,16 @@
+import argparse
 import pandas as pd
 from sqlalchemy import create_engine, text
 import os
+import sys
 from dotenv import load_dotenv
 from cryptography.fernet import Fernet
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), '2_recommendation_model'))
+import profiling
+from segment_rollups import update_rollups
+
 def get_decrypted_db_url():
     """환경변수에서 암호화된 DB URL을 복호화하여 반환합니다."""
     key = os.getenv("ENCRYPTION_KEY")
@@ -30,6 +37,7 @@ load_dotenv()
 
 def load_full_data():
     print("🔄 [15만 개] 전체 데이터 로딩 및 DB 적재 시작...")
+    profiling.step('read_csv')
     
     # 1. CSV 파일 읽기
     # 파일명이 정확한지 확인해주세요 (폴더 위치 등)
@@ -45,6 +53,7 @@ def load_full_data():
 
     # 2. 가상 예산(Budget) 생성 (도달수 기반)
     print("💰 가상 예산 데이터 생성 중...")
+    profiling.step('add_budget')
     df['budget'] = df['estimated_reach'] * 0.03 
     df['budget'] = df['budget'].astype(int)
 
@@ -72,6 +81,7 @@ def load_full_data():
     df = df[target_columns]
 
     # 4. DB에 밀어넣기
+    profiling.step('write_db')
     try:
         DB_URL = get_decrypted_db_url()
         engine = create_engine(DB_URL)
@@ -79,13 +89,24 @@ def load_full_data():
         print(f"Error: {e}")
         exit(1)
 
-    with engine.connect() as conn:
-        conn.execute(text("DROP TABLE IF EXISTS campaign_performance CASCADE;"))
-        print("🗑️ 기존(테스트) 테이블 삭제 완료")
-        
+    # 테이블을 DROP 후 새로 만들면 001 인덱스 / 003 플랫폼 파티셔닝이 사라지는데, schema_migrations 에는
+    # 적용됨으로 남아 migrate.py 가 다시 만들지 않습니다. 테이블이 있으면 구조는 그대로 두고 행만 교체합니다.
+    # (TRUNCATE + 적재를 한 트랜잭션으로 실행하므로 실패하면 기존 데이터가 그대로 남습니다.)
+    with engine.begin() as conn:
+        if conn.execute(text("SELECT to_regclass('campaign_performance')")).scalar() is not None:
+            conn.execute(text("TRUNCATE TABLE campaign_performance;"))
+            print("🗑️ 기존(테스트) 데이터 삭제 완료 (인덱스 / 파티션 유지)")
+
         # 청크 단위로 나누어 넣으면 더 안정적일 수 있음 (chunksize 옵션)
-        df.to_sql('campaign_performance', conn, if_exists='replace', index=False)
-        print(f"✅ {len(df)}개 데이터 적재 완료! (이제 eda.py를 실행해보세요)")
+        df.to_sql('campaign_performance', conn, if_exists='append', index=False, chunksize=10_000)
+
+        # 5. 세그먼트 사전 집계 교체 (테이블 전체를 바꿨으므로 기존 집계는 버림, 적재와 함께 커밋)
+        update_rollups(conn, df, replace=True)
+    print(f"✅ {len(df)}개 데이터 적재 완료! (이제 eda.py를 실행해보세요)")
 
 if __name__ == "__main__":
-    load_full_data()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="campaign_performance 전체 데이터 + 가상 예산 적재")
+    profiling.add_profile_argument(parser)
+    args = parser.parse_args()
+    with profiling.run('add_budget', args.profile):
+        load_full_data()
\ No newline at end of file
@@ -1,11 +1,16 @@
+import argparse
 import pandas as pd
 from sqlalchemy import create_engine
 import os
+import sys
 import seaborn as sns
 import matplotlib.pyplot as plt
 from dotenv import load_dotenv
 from cryptography.fernet import Fernet
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import profiling
+
 def get_decrypted_db_url():
     """환경변수에서 암호화된 DB URL을 복호화하여 반환합니다."""
     key = os.getenv("ENCRYPTION_KEY")
@@ -39,6 +44,7 @@ except ValueError as e:
 
 def run_eda_basic():
     print("📊 데이터 로딩 중...")
+    profiling.step('load_data')
     query = "SELECT * FROM campaign_performance"
     df = pd.read_sql(query, engine)
     
@@ -55,20 +61,24 @@ def run_eda_basic():
     # --- 🔍 DEBUGGING END ---
 
     # 1. ROI Calculation
+    profiling.step('roi_calculation')
     df['calculated_roi'] = df.apply(
         lambda x: ((x['product_sales'] - x['budget']) / x['budget'] * 100) if x['budget'] > 0 else 0, 
         axis=1
     )
 
     # 2. Data Info
+    profiling.step('data_info')
     print("\n[1. Data Info]")
     print(df.info())
 
     # 3. Basic Statistics
+    profiling.step('basic_statistics')
     print("\n[2. Basic Statistics]")
     print(df[['budget', 'product_sales', 'estimated_reach', 'calculated_roi']].describe().round(2))
 
     # 4. Correlation Heatmap (Visual check)
+    profiling.step('correlation_heatmap')
     plt.figure(figsize=(10, 8))
     # Select only numeric columns for correlation
     numeric_df = df.select_dtypes(include=['float64', 'int64'])
@@ -79,4 +89,8 @@ def run_eda_basic():
     return df
 
 if __name__ == "__main__":
-    run_eda_basic()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="campaign_performance 기초 EDA")
+    profiling.add_profile_argument(parser)
+    args = parser.parse_args()
+    with profiling.run('eda', args.profile):
+        run_eda_basic()
\ No newline at end of file
@@ -1,6 +1,7 @@
 # 0)  pip install pandas sqlalchemy psycopg2 python-dotenv cryptography
 import pandas as pd
 import os
+import sys
 from sqlalchemy import create_engine
 from dotenv import load_dotenv
 from cryptography.fernet import Fernet
@@ -54,6 +55,11 @@ except ValueError as e:
     print(f"Error: {e}")
     exit(1)
 
-# 4) 데이터 적재
-df.to_sql('campaign_performance', engine, if_exists='append', index=False)
+# 4) 데이터 적재 + 5) 세그먼트 사전 집계에 이번 적재분만 더하기 (2_recommendation_model/segment_rollups.py)
+#    한 트랜잭션으로 실행하므로 집계가 실패하면 적재도 롤백됩니다.
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), '2_recommendation_model'))
+from segment_rollups import update_rollups
+with engine.begin() as conn:
+    df.to_sql('campaign_performance', conn, if_exists='append', index=False)
+    update_rollups(conn, df)
 print("데이터 적재 완료")
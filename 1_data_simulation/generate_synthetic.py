@@ -0,0 +1,392 @@
+"""
+벤치마크용 대규모 가상 데이터 생성기 (campaign_performance, creators, campaigns, matches)
+
+- 시드 고정 NumPy 벡터 연산으로 생성하므로 행 단위 random 호출이 없습니다.
+- 청크 단위로 생성 후 바로 Parquet/CSV 파일 또는 PostgreSQL COPY로 기록하므로
+  메모리 사용량은 chunksize에만 비례합니다 (1M ~ 100M 행).
+- 크리에이터 속성(팔로워 수, 니치, 플랫폼)은 creator_id의 해시로 결정되므로,
+  matches 생성 시 creators 테이블을 다시 읽지 않고도 같은 속성을 재현할 수 있습니다.
+
+사용 예시 (프로젝트 루트에서 실행):
+    # 현재 데이터 규모의 100배를 Parquet으로 생성
+    python 1_data_simulation/generate_synthetic.py --scale 100 --format parquet
+
+    # 모든 테이블 1M 행을 DB에 COPY로 적재
+    python 1_data_simulation/generate_synthetic.py --rows 1000000 --format copy --truncate
+"""
+import argparse
+import io
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+from dotenv import load_dotenv
+from cryptography.fernet import Fernet
+
+def get_decrypted_db_url():
+    """환경변수에서 암호화된 DB URL을 복호화하여 반환합니다."""
+    key = os.getenv("ENCRYPTION_KEY")
+    encrypted_url = os.getenv("ENCRYPTED_DATABASE_URL")
+
+    if not key or not encrypted_url:
+        # fallback to the old plain text DATABASE_URL for backward compatibility
+        plain_db_url = os.getenv("DATABASE_URL")
+        if plain_db_url:
+            print("Warning: Using plain text DATABASE_URL. For better security, please use ENCRYPTION_KEY and ENCRYPTED_DATABASE_URL.")
+            return plain_db_url
+        raise ValueError("ENCRYPTION_KEY and ENCRYPTED_DATABASE_URL must be set, or a plain DATABASE_URL must be provided.")
+
+    try:
+        f = Fernet(key.encode('utf-8'))
+        decrypted_url = f.decrypt(encrypted_url.encode('utf-8')).decode('utf-8')
+        return decrypted_url
+    except Exception as e:
+        raise ValueError(f"Failed to decrypt DATABASE_URL. Check your key and encrypted URL. Error: {e}")
+
+# .env 파일에서 환경변수 로드
+load_dotenv()
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_OUTPUT_DIR = os.path.join(script_dir, 'synthetic_data')
+
+# 현재 데이터 규모 (README / etl_nurihaus.py 기준) - --scale 배수의 기준값
+BASE_ROWS = {
+    'campaign_performance': 150_000,
+    'creators': 5_000,
+    'campaigns': 2_000,
+    'matches': 2_000,
+}
+TABLES = list(BASE_ROWS)
+
+# 범주형 분포 (값, 비율)
+PLATFORMS = (['Instagram', 'YouTube', 'TikTok', 'Facebook'], [0.45, 0.25, 0.22, 0.08])
+INFLUENCER_CATEGORIES = (['Beauty', 'Fashion', 'Lifestyle', 'Fitness', 'Food', 'Tech', 'Gaming', 'Travel'],
+                         [0.22, 0.18, 0.15, 0.12, 0.11, 0.09, 0.07, 0.06])
+CAMPAIGN_TYPES = (['Brand Awareness', 'Product Launch', 'Influencer Takeover', 'Giveaway', 'Affiliate'],
+                  [0.30, 0.25, 0.15, 0.15, 0.15])
+NICHES = (['Beauty', 'Fashion', 'Lifestyle', 'Vlog'], [0.55, 0.20, 0.15, 0.10])
+PRODUCT_CATEGORIES = (['Beauty/Skincare', 'Beauty/Makeup', 'Beauty/Haircare', 'Fashion'], [0.45, 0.25, 0.15, 0.15])
+
+# 플랫폼/카테고리별 ROI 배수 효과 (학습 가능한 신호를 심어두기 위함)
+PLATFORM_ROI = {'Instagram': 1.10, 'YouTube': 1.25, 'TikTok': 1.00, 'Facebook': 0.80}
+NICHE_ROI = {'Beauty': 1.20, 'Fashion': 1.00, 'Lifestyle': 0.90, 'Vlog': 0.85}
+
+BIO_WORDS = np.array([
+    'beauty', 'skincare', 'makeup', 'kbeauty', 'daily', 'style', 'cosmetic', 'mask', 'care', 'glow',
+    'routine', 'review', 'haircare', 'vegan', 'clean', 'fashion', 'lifestyle', 'vlog', 'seoul', 'tips',
+    'serum', 'sunscreen', 'lip', 'nail', 'fragrance', 'collab', 'dm', 'for', 'business', 'inquiries',
+])
+REQUIREMENT_WORDS = np.array([
+    'looking', 'for', 'creators', 'skincare', 'makeup', 'review', 'unboxing', 'tutorial', 'honest',
+    'glow', 'routine', 'natural', 'vegan', 'sensitive', 'skin', 'launch', 'campaign', 'reels', 'shorts',
+    'kbeauty', 'serum', 'sunscreen', 'cushion', 'lip', 'tint', 'summer', 'collection', 'before', 'after',
+])
+MATCH_METHODS = (['Synthetic_Random', 'Category_Match', 'AI_Recommended'], [0.5, 0.3, 0.2])
+
+START_DATE = np.datetime64('2023-01-01T00:00:00')
+DATE_RANGE_SECONDS = 2 * 365 * 24 * 3600
+
+
+# ==========================================
+# 1. 벡터 연산 헬퍼
+# ==========================================
+def _hash_uniform(ids, salt):
+    """splitmix64 해시로 id마다 고정된 [0, 1) 난수를 만듭니다 (상태 없는 난수)."""
+    with np.errstate(over='ignore'):
+        x = ids.astype(np.uint64) + np.uint64(salt) * np.uint64(0x9E3779B97F4A7C15)
+        x = (x ^ (x >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+        x = (x ^ (x >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+        x = x ^ (x >> np.uint64(31))
+    return (x >> np.uint64(11)).astype(np.float64) / float(1 << 53)
+
+
+def _categorical(u, spec):
+    """[0, 1) 난수를 (값, 비율) 분포에 따라 범주값 배열로 변환합니다."""
+    values, probs = spec
+    cdf = np.cumsum(probs) / np.sum(probs)
+    return np.asarray(values, dtype=object)[np.minimum(np.searchsorted(cdf, u, side='right'), len(values) - 1)]
+
+
+def _pareto(u, x_min, alpha, cap):
+    """역변환 샘플링으로 꼬리가 두꺼운 파레토 분포 값을 만듭니다."""
+    return np.minimum(x_min * (1.0 - u) ** (-1.0 / alpha), cap)
+
+
+def _join_words(words, idx):
+    """(n, k) 단어 인덱스 행렬을 공백으로 이어 붙인 문자열 배열로 만듭니다."""
+    out = words[idx[:, 0]].astype(object)
+    for j in range(1, idx.shape[1]):
+        out = out + ' ' + words[idx[:, j]].astype(object)
+    return out
+
+
+def creator_attributes(creator_ids):
+    """creator_id로부터 팔로워 수 / 니치 / 플랫폼을 결정적으로 계산합니다."""
+    follower_count = _pareto(_hash_uniform(creator_ids, 1), x_min=2_000, alpha=1.0, cap=50_000_000)
+    return {
+        'follower_count': follower_count.astype(np.int64),
+        'niche': _categorical(_hash_uniform(creator_ids, 2), NICHES),
+        'platform': _categorical(_hash_uniform(creator_ids, 3), (PLATFORMS[0][:3], PLATFORMS[1][:3])),
+    }
+
+
+# ==========================================
+# 2. 테이블별 청크 생성기
+# ==========================================
+def gen_campaign_performance(rng, start, n):
+    ids = np.arange(start, start + n)
+    platform = _categorical(rng.random(n), PLATFORMS)
+    category = _categorical(rng.random(n), INFLUENCER_CATEGORIES)
+    campaign_type = _categorical(rng.random(n), CAMPAIGN_TYPES)
+
+    # 도달수: 로그정규 (꼬리가 두꺼운 분포)
+    reach = np.minimum(rng.lognormal(mean=10.5, sigma=1.4, size=n), 2e8).astype(np.int64) + 100
+    # 예산: 도달수에 비례 (add_budget.py의 reach * 0.03 규칙 + 노이즈)
+    budget = np.maximum(reach * 0.03 * rng.lognormal(0.0, 0.35, n), 50.0).round(2)
+    engagements = (reach * rng.beta(2.0, 40.0, n)).astype(np.int64)
+
+    platform_effect = pd.Series(platform).map(PLATFORM_ROI).fillna(1.0).to_numpy()
+    beauty_bonus = np.where(category == 'Beauty', 1.15, 1.0)
+    sales = budget * rng.lognormal(0.6, 0.6, n) * platform_effect * beauty_bonus
+    sales = sales * (1.0 + 5.0 * engagements / np.maximum(reach, 1))
+
+    start_date = START_DATE + rng.integers(0, DATE_RANGE_SECONDS, n).astype('timedelta64[s]')
+    duration = rng.integers(3, 91, n)
+    end_date = start_date + (duration * 86400).astype('timedelta64[s]')
+
+    return pd.DataFrame({
+        'campaign_id': np.char.add('CMP', np.char.zfill(ids.astype(str), 10)),
+        'platform': platform,
+        'influencer_category': category,
+        'campaign_type': campaign_type,
+        'start_date': start_date,
+        'engagements': engagements,
+        'estimated_reach': reach,
+        'product_sales': sales.round(2),
+        'budget': budget,
+        'campaign_duration_days': duration,
+        'end_date': end_date,
+    })
+
+
+def gen_creators(rng, start, n):
+    creator_ids = np.arange(start + 1, start + n + 1)
+    attrs = creator_attributes(creator_ids)
+    bio_idx = rng.integers(0, len(BIO_WORDS), size=(n, 6))
+    return pd.DataFrame({
+        'creator_id': creator_ids,
+        'username': np.char.add('creator_', creator_ids.astype(str)),
+        'follower_count': attrs['follower_count'],
+        'niche': attrs['niche'],
+        'platform': attrs['platform'],
+        'bio': _join_words(BIO_WORDS, bio_idx),
+        'created_at': START_DATE + (_hash_uniform(creator_ids, 4) * DATE_RANGE_SECONDS).astype('timedelta64[s]'),
+    })
+
+
+def gen_campaigns(rng, start, n):
+    campaign_ids = np.arange(start + 1, start + n + 1)
+    req_idx = rng.integers(0, len(REQUIREMENT_WORDS), size=(n, 8))
+    return pd.DataFrame({
+        'campaign_id': campaign_ids,
+        'brand_name': np.char.add('brand_', campaign_ids.astype(str)),
+        'product_category': _categorical(rng.random(n), PRODUCT_CATEGORIES),
+        'budget': np.minimum(rng.lognormal(8.5, 0.8, n), 1e7).astype(np.int64),
+        'content_requirements': _join_words(REQUIREMENT_WORDS, req_idx),
+        'created_at': START_DATE + rng.integers(0, DATE_RANGE_SECONDS, n).astype('timedelta64[s]'),
+    })
+
+
+def gen_matches(rng, start, n, n_creators, n_total):
+    match_ids = np.arange(start + 1, start + n + 1)
+    creator_ids = rng.integers(1, n_creators + 1, n)
+    attrs = creator_attributes(creator_ids)
+
+    # ROI = 플랫폼/니치 효과 x 팔로워 규모 효과 (마이크로 인플루언서가 효율이 좋음) + 노이즈
+    platform_effect = pd.Series(attrs['platform']).map(PLATFORM_ROI).to_numpy()
+    niche_effect = pd.Series(attrs['niche']).map(NICHE_ROI).to_numpy()
+    size_effect = 1.0 + 0.5 * np.exp(-np.log10(attrs['follower_count']) + 4.0)
+    roi = 5.0 * platform_effect * niche_effect * size_effect + rng.normal(0.0, 1.0, n)
+
+    # created_at은 match_id 순서대로 증가 (증분 학습 / 시간 기반 검증용)
+    created_at = START_DATE + (match_ids / max(n_total, 1) * DATE_RANGE_SECONDS).astype('timedelta64[s]')
+    return pd.DataFrame({
+        'match_id': match_ids,
+        'creator_id': creator_ids,
+        'match_method': _categorical(rng.random(n), MATCH_METHODS),
+        'actual_roi': np.clip(roi, 0.0, None).round(2),
+        'outcome': 'Completed',
+        'created_at': created_at,
+    })
+
+
+TABLE_ID_COLUMNS = {'creators': 'creator_id', 'campaigns': 'campaign_id', 'matches': 'match_id'}
+
+
+# ==========================================
+# 3. 출력 (Parquet / CSV / COPY)
+# ==========================================
+class ParquetSink:
+    def __init__(self, output_dir, table):
+        import pyarrow.parquet as pq
+
+        self._pq = pq
+        os.makedirs(output_dir, exist_ok=True)
+        self.path = os.path.join(output_dir, f"{table}.parquet")
+        self.writer = None
+
+    def write(self, df):
+        import pyarrow as pa
+
+        batch = pa.Table.from_pandas(df, preserve_index=False)
+        if self.writer is None:
+            self.writer = self._pq.ParquetWriter(self.path, batch.schema, compression='snappy')
+        self.writer.write_table(batch)
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+
+
+class CsvSink:
+    def __init__(self, output_dir, table):
+        os.makedirs(output_dir, exist_ok=True)
+        self.path = os.path.join(output_dir, f"{table}.csv")
+        self.first = True
+
+    def write(self, df):
+        df.to_csv(self.path, mode='w' if self.first else 'a', header=self.first, index=False)
+        self.first = False
+
+    def close(self):
+        pass
+
+
+class CopySink:
+    """PostgreSQL COPY FROM STDIN으로 청크를 바로 적재합니다 (to_sql 대비 수십 배 빠름).
+
+    on_write(conn, df, chunk_idx) 는 청크의 COPY 와 같은 트랜잭션에서 커밋 직전에 호출됩니다
+    (예: 세그먼트 사전 집계 갱신. 실패하면 그 청크의 COPY 도 함께 롤백됩니다).
+    """
+
+    def __init__(self, engine, table, truncate=False, on_write=None):
+        self.table = table
+        self.conn = engine.connect()
+        self.on_write = on_write
+        self.chunks = 0
+        if truncate:
+            self.conn.exec_driver_sql(f"TRUNCATE TABLE {table} CASCADE;")
+        self.max_id = None
+
+    def write(self, df):
+        buffer = io.StringIO()
+        df.to_csv(buffer, index=False, header=False)
+        buffer.seek(0)
+        columns = ', '.join(df.columns)
+        with self.conn.connection.cursor() as cur:
+            cur.copy_expert(f"COPY {self.table} ({columns}) FROM STDIN WITH (FORMAT csv)", buffer)
+        if self.on_write is not None:
+            self.on_write(self.conn, df, self.chunks)
+        self.conn.commit()
+        self.chunks += 1
+        id_column = TABLE_ID_COLUMNS.get(self.table)
+        if id_column:
+            self.max_id = int(df[id_column].max())
+
+    def close(self):
+        # id를 직접 넣었으므로 SERIAL 시퀀스를 마지막 id로 맞춰둡니다.
+        id_column = TABLE_ID_COLUMNS.get(self.table)
+        if id_column and self.max_id is not None:
+            self.conn.exec_driver_sql(
+                f"SELECT setval(pg_get_serial_sequence('{self.table}', '{id_column}'), {self.max_id});")
+            self.conn.commit()
+        self.conn.close()
+
+
+def generate(rows, output_format='parquet', output_dir=DEFAULT_OUTPUT_DIR, chunksize=1_000_000,
+             seed=42, tables=None, truncate=False):
+    """테이블별 행 수(rows)만큼 청크 단위로 생성하여 기록하고, 테이블별 소요 시간을 반환합니다."""
+    tables = tables or TABLES
+    engine = None
+    if output_format == 'copy':
+        from sqlalchemy import create_engine
+
+        engine = create_engine(get_decrypted_db_url())
+        # campaign_performance 청크를 적재할 때마다 세그먼트 사전 집계에 더합니다.
+        sys.path.insert(0, os.path.join(os.path.dirname(script_dir), '2_recommendation_model'))
+        from segment_rollups import update_rollups
+
+    n_creators = rows['creators']
+    timings = {}
+    # 외래키 순서대로 적재 (creators -> matches)
+    for table_idx, table in enumerate(TABLES):
+        if table not in tables:
+            continue
+        n_total = rows[table]
+        if output_format == 'parquet':
+            sink = ParquetSink(output_dir, table)
+        elif output_format == 'csv':
+            sink = CsvSink(output_dir, table)
+        else:
+            on_write = None
+            if table == 'campaign_performance':
+                def on_write(conn, df, chunk_idx):
+                    update_rollups(conn, df, replace=truncate and chunk_idx == 0)
+            sink = CopySink(engine, table, truncate=truncate, on_write=on_write)
+
+        print(f">>> [{table_idx + 1}/{len(TABLES)}] Generating {table}: {n_total:,} rows...")
+        started = time.perf_counter()
+        try:
+            for chunk_idx, start in enumerate(range(0, n_total, chunksize)):
+                n = min(chunksize, n_total - start)
+                # (seed, 테이블, 청크) 조합으로 시드를 고정하여 재실행 시 동일한 데이터를 만듭니다.
+                rng = np.random.default_rng([seed, table_idx, chunk_idx])
+                if table == 'campaign_performance':
+                    df = gen_campaign_performance(rng, start, n)
+                elif table == 'creators':
+                    df = gen_creators(rng, start, n)
+                elif table == 'campaigns':
+                    df = gen_campaigns(rng, start, n)
+                else:
+                    df = gen_matches(rng, start, n, n_creators, n_total)
+                sink.write(df)
+        finally:
+            sink.close()
+        elapsed = time.perf_counter() - started
+        timings[table] = elapsed
+        print(f"   Done in {elapsed:.1f}s ({n_total / max(elapsed, 1e-9):,.0f} rows/sec)")
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description="벤치마크용 대규모 가상 데이터 생성기")
+    size = parser.add_mutually_exclusive_group()
+    size.add_argument('--rows', type=int, help="모든 테이블에 동일하게 생성할 행 수 (예: 1000000)")
+    size.add_argument('--scale', type=float, default=1.0, help="현재 데이터 규모 대비 배수 (예: 10, 100, 1000)")
+    parser.add_argument('--tables', help=f"생성할 테이블 (쉼표 구분, 기본값: 전체) {TABLES}")
+    parser.add_argument('--format', choices=['parquet', 'csv', 'copy'], default='parquet')
+    parser.add_argument('--output-dir', default=DEFAULT_OUTPUT_DIR)
+    parser.add_argument('--chunksize', type=int, default=1_000_000)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--truncate', action='store_true', help="COPY 전에 대상 테이블을 비웁니다")
+    args = parser.parse_args()
+
+    if args.rows:
+        rows = {table: args.rows for table in TABLES}
+    else:
+        rows = {table: int(base * args.scale) for table, base in BASE_ROWS.items()}
+    tables = [t.strip() for t in args.tables.split(',')] if args.tables else None
+
+    try:
+        timings = generate(rows, output_format=args.format, output_dir=args.output_dir,
+                           chunksize=args.chunksize, seed=args.seed, tables=tables, truncate=args.truncate)
+        print(f"\n>>> Synthetic data generated ({sum(timings.values()):.1f}s total).")
+    except ValueError as e:
+        print(f"Error: {e}")
+        exit(1)
+
+
+if __name__ == "__main__":
+    main()
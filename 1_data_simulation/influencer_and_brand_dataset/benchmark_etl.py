@@ -0,0 +1,165 @@
+"""
+etl_nurihaus.py 크리에이터 적재 벤치마크: 행별 dict 리스트 -> DataFrame (기존) vs ColumnBuffer + 배치 COPY (현재)
+
+대용량 가상 프로필 디렉토리(파일당 한 줄, 탭 구분)를 만든 뒤, 각 방식을 별도 프로세스에서 실행하여
+프로세스 최대 RSS(peak memory)와 초당 처리 행 수를 비교합니다.
+운영 테이블(creators)을 건드리지 않도록 같은 스키마의 벤치마크 전용 테이블에 적재하고 끝나면 삭제합니다.
+
+사용 예시 (프로젝트 루트에서 실행):
+    python 1_data_simulation/influencer_and_brand_dataset/benchmark_etl.py --profiles 200000
+    python 1_data_simulation/influencer_and_brand_dataset/benchmark_etl.py --profiles 200000 --batch-size 5000 --output etl_bench.json
+"""
+import argparse
+import json
+import os
+import random
+import resource
+import subprocess
+import sys
+import time
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(os.path.dirname(script_dir))
+DEFAULT_PROFILES_DIR = os.path.join(project_root, '1_data_simulation', 'synthetic_data', 'profiles')
+
+VARIANTS = ['dicts', 'columnar']
+BENCH_TABLE = 'etl_benchmark_creators'
+BIO_WORDS = ['daily', 'skincare', 'makeup', 'travel', 'food', 'kbeauty', 'fitness', 'style', 'music', 'mom',
+             'cosmetic', 'photo', 'seoul', 'review', 'collab', 'dm', 'vegan', 'mask', 'gamer', 'books']
+
+
+def peak_rss_mb():
+    # Linux: ru_maxrss 단위는 KB
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def generate_profiles(directory, n, seed=42):
+    """users_influencers_SPOD 형식의 프로필 파일 n 개를 만듭니다 (이미 있으면 건너뜀)."""
+    os.makedirs(directory, exist_ok=True)
+    existing = len(os.listdir(directory))
+    if existing >= n:
+        return existing
+    rng = random.Random(seed)
+    for i in range(existing, n):
+        bio = ' '.join(rng.choices(BIO_WORDS, k=rng.randint(8, 40)))
+        fields = [f"creator_{i}", str(rng.randint(1000, 2_000_000)), str(rng.randint(10, 3000)),
+                  str(rng.randint(1, 3000)), f"https://example.com/{i}", 'Creator', str(rng.randint(0, 1)), bio]
+        with open(os.path.join(directory, f"creator_{i}"), 'w', encoding='utf-8') as f:
+            f.write('\t'.join(fields) + '\n')
+    return n
+
+
+def legacy_load_creators(directory, engine, table):
+    """기존 load_creators 와 같은 방식: 행마다 dict 를 리스트에 쌓고 DataFrame 으로 바꾼 뒤 한 번에 to_sql."""
+    import pandas as pd
+    from etl_nurihaus import BEAUTY_KEYWORDS
+
+    data = []
+    file_list = [os.path.join(directory, f) for f in os.listdir(directory) if os.path.isfile(os.path.join(directory, f))]
+    for file_path in file_list:
+        try:
+            with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
+                line = f.readline().strip().split('\t')
+                if len(line) < 8: continue
+                username = line[0]
+                if not username: continue
+                followers = int(line[1]) if line[1].isdigit() else 0
+                bio = line[7]
+                if any(keyword in bio.lower() for keyword in BEAUTY_KEYWORDS):
+                    data.append({'username': username, 'follower_count': followers, 'niche': 'Beauty',
+                                 'platform': 'Instagram', 'bio': bio[:500]})
+        except Exception:
+            continue
+    df_creators = pd.DataFrame(data)
+    df_creators.drop_duplicates(subset=['username'], keep='first', inplace=True)
+    df_creators.to_sql(table, engine, if_exists='append', index=False, method='multi')
+    return len(df_creators)
+
+
+def reset_table(engine):
+    from sqlalchemy import text
+
+    with engine.begin() as conn:
+        conn.execute(text(f"DROP TABLE IF EXISTS {BENCH_TABLE}"))
+        conn.execute(text(f"""
+            CREATE TABLE {BENCH_TABLE} (
+                creator_id SERIAL PRIMARY KEY,
+                username VARCHAR(255) UNIQUE NOT NULL,
+                follower_count INTEGER,
+                niche VARCHAR(100),
+                platform VARCHAR(50),
+                bio TEXT,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """))
+
+
+def run_variant(variant, directory, batch_size):
+    """자식 프로세스에서 실행: 결과를 JSON 한 줄로 출력합니다."""
+    import etl_nurihaus
+
+    engine = etl_nurihaus.engine
+    reset_table(engine)
+    baseline_mb = peak_rss_mb()
+    started = time.perf_counter()
+    if variant == 'dicts':
+        rows = legacy_load_creators(directory, engine, BENCH_TABLE)
+    else:
+        rows = etl_nurihaus.load_creators(directory, max_files=None, batch_size=batch_size, table=BENCH_TABLE)
+    seconds = time.perf_counter() - started
+    print(json.dumps({'variant': variant, 'rows': rows, 'seconds': seconds, 'rows_per_second': rows / seconds,
+                      'baseline_rss_mb': baseline_mb, 'peak_rss_mb': peak_rss_mb()}))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="etl_nurihaus 크리에이터 적재 peak RSS / 처리량 벤치마크")
+    parser.add_argument('--profiles', type=int, default=200_000, help="가상 프로필 파일 수")
+    parser.add_argument('--profiles-dir', default=DEFAULT_PROFILES_DIR)
+    parser.add_argument('--batch-size', type=int, default=10_000)
+    parser.add_argument('--variants', default=','.join(VARIANTS))
+    parser.add_argument('--output', help="결과 JSON 저장 경로")
+    parser.add_argument('--run-variant', choices=VARIANTS, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run_variant:
+        run_variant(args.run_variant, args.profiles_dir, args.batch_size)
+        return
+
+    print(f">>> [1/2] Preparing {args.profiles:,} profile files in {args.profiles_dir}...")
+    started = time.perf_counter()
+    generate_profiles(args.profiles_dir, args.profiles)
+    print(f"   Ready in {time.perf_counter() - started:.1f}s")
+
+    print(">>> [2/2] Running variants (one process each)...")
+    results = []
+    for variant in args.variants.split(','):
+        cmd = [sys.executable, os.path.abspath(__file__), '--run-variant', variant,
+               '--profiles-dir', args.profiles_dir, '--batch-size', str(args.batch_size)]
+        proc = subprocess.run(cmd, capture_output=True, text=True, cwd=script_dir)
+        lines = [l for l in proc.stdout.splitlines() if l.startswith('{')]
+        if proc.returncode != 0 or not lines:
+            print(f"   {variant}: failed\n{proc.stderr[-2000:]}")
+            continue
+        results.append(json.loads(lines[-1]))
+        r = results[-1]
+        print(f"   {variant:<9} {r['rows']:>9,} rows  {r['seconds']:>7.1f}s  {r['rows_per_second']:>9,.0f} rows/s  "
+              f"peak RSS {r['peak_rss_mb']:,.0f} MB (+{r['peak_rss_mb'] - r['baseline_rss_mb']:,.0f} MB)")
+
+    # 벤치마크 테이블 정리
+    sys.path.insert(0, script_dir)
+    import etl_nurihaus
+    from sqlalchemy import text
+    with etl_nurihaus.engine.begin() as conn:
+        conn.execute(text(f"DROP TABLE IF EXISTS {BENCH_TABLE}"))
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump({'profiles': args.profiles, 'batch_size': args.batch_size, 'results': results}, f, indent=2)
+        print(f">>> Saved: {args.output}")
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except Exception as e:
+        print(f"Benchmark Error: {e}")
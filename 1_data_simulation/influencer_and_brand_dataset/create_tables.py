@@ -78,8 +78,18 @@ def init_db():
             );
         """))
         
+        # 5. 테이블을 새로 만들었으므로 인덱스/학습용 뷰/creators.updated_at 마이그레이션을 다시 적용하도록 이력을 지웁니다.
+        #    (python 5_database/migrate.py 로 재적용)
+        if conn.execute(text("SELECT to_regclass('schema_migrations')")).scalar() is not None:
+            conn.execute(text("""
+                DELETE FROM schema_migrations
+                WHERE name IN ('001_indexes.sql', '002_training_features_view.sql',
+                               '006_creators_updated_at.sql');
+            """))
+
         conn.commit()
         print(">>> Database tables created successfully.")
+        print("    Next: run 'python 5_database/migrate.py' to create indexes and the training view.")
 
 if __name__ == "__main__":
     try:
@@ -1,11 +1,18 @@
 import pandas as pd
+import argparse
+import io
 import os
 import random # 가상 ROI 생성을 위해 추가
+import sys
+from itertools import islice
 import numpy as np
 from sqlalchemy import create_engine, text
 from dotenv import load_dotenv
 from cryptography.fernet import Fernet
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+import profiling
+
 # ==========================================
 # 1. 설정 및 DB 연결
 # ==========================================
@@ -53,12 +60,17 @@ FILE_POST_INFO = os.path.join(script_dir, 'post_info.txt')
 # K-뷰티 필터링 키워드
 BEAUTY_KEYWORDS = ['beauty', 'skin', 'makeup', 'cosmetic', 'kbeauty', 'mask', 'care', 'daily', 'style']
 
+# 이 행 수만큼 버퍼에 모이면 COPY 로 DB에 보내고 버퍼를 비웁니다 (메모리 사용량이 파일 수와 무관하게 고정)
+# 커밋은 테이블 적재가 끝났을 때 한 번만 하므로, 중간에 실패하면 그 테이블의 적재분은 모두 롤백됩니다.
+BATCH_SIZE = 10_000
+
 def get_db_connection():
     return engine.connect()
 
 def clear_tables():
     """Deletes all data from the target tables to ensure a fresh start."""
     print(">>> Clearing existing data from tables...")
+    profiling.step('clear_tables')
     with get_db_connection() as connection:
         with connection.begin(): # 트랜잭션 시작
             connection.execute(text("DELETE FROM matches;"))
@@ -67,109 +79,168 @@ def clear_tables():
     print("   Success: Tables cleared.")
 
 # ==========================================
-# 2. Creators 테이블 적재 (폴더 내 txt 파일 순회)
+# 1-1. 고정 크기 컬럼 버퍼 + 배치 적재
 # ==========================================
-def load_creators():
-    print(f">>> [1/3] Loading Creators from {DIR_INFLUENCERS}...")
-    
-    data = []
-    # 해당 디렉토리의 모든 파일을 가져옵니다.
-    try:
-        file_list = [os.path.join(DIR_INFLUENCERS, f) for f in os.listdir(DIR_INFLUENCERS) if os.path.isfile(os.path.join(DIR_INFLUENCERS, f))]
-    except FileNotFoundError:
-        print(f"   Error: Directory not found at {DIR_INFLUENCERS}")
-        return
+class ColumnBuffer:
+    """
+    행마다 dict 를 만들지 않고, 컬럼별로 미리 할당한 NumPy 배열에 값을 바로 기록하는 레코드 버퍼입니다.
+    정수 컬럼은 int64 배열에 값으로 저장되므로 행당 Python 객체가 문자열 필드 외에는 생기지 않습니다.
+    """
 
-    # 최대 5000개만 처리하여 속도 향상
-    file_list = file_list[:5000]
-    
-    for file_path in file_list:
+    def __init__(self, dtypes, capacity):
+        self.capacity = capacity
+        self.size = 0
+        self.columns = {name: np.empty(capacity, dtype=dtype) for name, dtype in dtypes.items()}
+        self._arrays = tuple(self.columns.values())
+
+    def append(self, *values):
+        for array, value in zip(self._arrays, values):
+            array[self.size] = value
+        self.size += 1
+
+    @property
+    def full(self):
+        return self.size >= self.capacity
+
+    def frame(self):
+        return pd.DataFrame({name: array[:self.size] for name, array in self.columns.items()}, copy=False)
+
+    def clear(self):
+        for array in self._arrays:
+            if array.dtype == object:
+                array[:self.size] = None  # 문자열 참조를 놓아 다음 배치 전에 메모리를 돌려줍니다.
+        self.size = 0
+
+
+class BatchWriter:
+    """
+    ColumnBuffer 가 batch_size 행만큼 차면 COPY FROM STDIN 으로 테이블에 보냅니다.
+    모든 배치는 하나의 트랜잭션이며, with 블록이 정상 종료하면 커밋하고 예외가 나면 롤백합니다.
+    """
+
+    def __init__(self, table, dtypes, batch_size=BATCH_SIZE, constants=None, db_engine=None):
+        self.table = table
+        self.buffer = ColumnBuffer(dtypes, batch_size)
+        self.constants = constants or {}  # 모든 행에 같은 값 (예: niche='Beauty') - 버퍼에 저장하지 않음
+        self.conn = (db_engine or engine).raw_connection()
+        self.rows = 0
+
+    def add(self, *values):
+        self.buffer.append(*values)
+        if self.buffer.full:
+            self.flush()
+
+    def flush(self):
+        if not self.buffer.size:
+            return
+        df = self.buffer.frame()
+        for name, value in self.constants.items():
+            df[name] = value
+        csv = io.StringIO()
+        df.to_csv(csv, index=False, header=False)
+        csv.seek(0)
+        # CSV 에서 따옴표 없는 빈 필드는 NULL 로 읽히므로, 문자열 컬럼은 빈 문자열로 받도록 지정합니다.
+        text_columns = ', '.join(c for c in df.columns if pd.api.types.is_string_dtype(df[c]))
+        options = f"FORMAT csv, FORCE_NOT_NULL ({text_columns})" if text_columns else "FORMAT csv"
+        with self.conn.cursor() as cur:
+            cur.copy_expert(f"COPY {self.table} ({', '.join(df.columns)}) FROM STDIN WITH ({options})", csv)
+        self.rows += self.buffer.size
+        self.buffer.clear()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
         try:
-            with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                # 탭으로 분리된 첫 줄 읽기
-                line = f.readline().strip().split('\t')
-                if len(line) < 8: continue
-
-                username = line[0]
-                if not username: continue # username이 비어있으면 건너뛰기
-
-                followers = int(line[1]) if line[1].isdigit() else 0
-                bio = line[7]
-                
-                # 뷰티 관련 키워드 필터링
-                if any(keyword in bio.lower() for keyword in BEAUTY_KEYWORDS):
-                    data.append({
-                        'username': username,
-                        'follower_count': followers,
-                        'niche': 'Beauty',
-                        'platform': 'Instagram',
-                        'bio': bio[:500]
-                    })
-        except Exception:
-            continue
-
-    if not data:
-        print("   Warning: No creators loaded.")
-        return
+            if exc_type is None:
+                self.flush()
+                self.conn.commit()
+            else:
+                self.conn.rollback()
+                self.rows = 0
+        finally:
+            self.conn.close()
 
-    df_creators = pd.DataFrame(data)
-    # 중복된 username 제거 (첫 번째 항목 유지)
-    df_creators.drop_duplicates(subset=['username'], keep='first', inplace=True)
-    
-    # DB 적재
-    df_creators.to_sql('creators', engine, if_exists='append', index=False, method='multi')
-    print(f"   Success: {len(df_creators)} beauty creators loaded.")
+
+def iter_profile_lines(directory, max_files):
+    """디렉토리의 프로필 파일을 (목록 전체를 만들지 않고) 순회하며 탭으로 분리된 첫 줄을 돌려줍니다."""
+    with os.scandir(directory) as entries:
+        for entry in islice((e for e in entries if e.is_file()), max_files):
+            try:
+                with open(entry.path, 'r', encoding='utf-8', errors='ignore') as f:
+                    line = f.readline().strip().split('\t')
+            except Exception:
+                continue  # 읽을 수 없는 파일은 건너뜁니다
+            if len(line) >= 8 and line[0]:
+                yield line
+
+# ==========================================
+# 2. Creators 테이블 적재 (폴더 내 txt 파일 순회)
+# ==========================================
+def load_creators(directory=DIR_INFLUENCERS, max_files=5000, batch_size=BATCH_SIZE, table='creators'):
+    """
+    프로필 파일(첫 줄: 탭 구분, 0=username / 1=followers / 7=bio)에서 뷰티 크리에이터를 골라 batch_size 행씩 적재합니다.
+    max_files=None 이면 디렉토리 전체를 처리합니다.
+    """
+    print(f">>> [1/3] Loading Creators from {directory}...")
+    profiling.step('load_creators')
+
+    if not os.path.isdir(directory):
+        print(f"   Error: Directory not found at {directory}")
+        return 0
+
+    seen = set()  # 중복된 username 제거 (첫 번째 항목 유지)
+    with BatchWriter(table, {'username': object, 'follower_count': np.int64, 'bio': object}, batch_size,
+                     constants={'niche': 'Beauty', 'platform': 'Instagram'}) as writer:
+        for line in iter_profile_lines(directory, max_files):
+            username, bio = line[0], line[7]
+            # 뷰티 관련 키워드 필터링
+            if username in seen or not any(keyword in bio.lower() for keyword in BEAUTY_KEYWORDS):
+                continue
+            seen.add(username)
+            writer.add(username, int(line[1]) if line[1].isdigit() else 0, bio[:500])
+    rows = writer.rows
+
+    if not rows:
+        print("   Warning: No creators loaded.")
+    else:
+        print(f"   Success: {rows} beauty creators loaded.")
+    return rows
 
 # ==========================================
 # 3. Campaigns 테이블 적재 (폴더 내 txt 파일 순회)
 # ==========================================
-def load_campaigns():
-    print(f">>> [2/3] Loading Campaigns from {DIR_BRANDS}...")
-    
-    data = []
-    # 해당 디렉토리의 모든 파일을 가져옵니다.
-    try:
-        file_list = [os.path.join(DIR_BRANDS, f) for f in os.listdir(DIR_BRANDS) if os.path.isfile(os.path.join(DIR_BRANDS, f))]
-    except FileNotFoundError:
-        print(f"   Error: Directory not found at {DIR_BRANDS}")
-        return
+def load_campaigns(directory=DIR_BRANDS, max_files=2000, batch_size=BATCH_SIZE, table='campaigns'):
+    """브랜드 프로필 파일에서 뷰티 브랜드를 골라 가상 예산과 함께 batch_size 행씩 적재합니다."""
+    print(f">>> [2/3] Loading Campaigns from {directory}...")
+    profiling.step('load_campaigns')
 
-    # 최대 2000개만 처리하여 속도 향상
-    file_list = file_list[:2000]
-    
-    for file_path in file_list:
-        try:
-            with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                line = f.readline().strip().split('\t')
-                if len(line) < 8: continue
-                
-                brand_name = line[0]
-                if not brand_name: continue # brand_name이 비어있으면 건너뛰기
-                
-                bio = line[7]
-                
-                if any(keyword in bio.lower() for keyword in BEAUTY_KEYWORDS):
-                    data.append({
-                        'brand_name': brand_name,
-                        'product_category': 'Beauty/Skincare',
-                        'budget': random.randint(1000, 10000), # 데모용 가상 예산 ($1k~$10k)
-                        'content_requirements': bio[:200]
-                    })
-        except Exception:
-            continue
-                    
-    df_campaigns = pd.DataFrame(data)
-    if not df_campaigns.empty:
-        # 중복된 brand_name 제거 (첫 번째 항목 유지)
-        df_campaigns.drop_duplicates(subset=['brand_name'], keep='first', inplace=True)
-        df_campaigns.to_sql('campaigns', engine, if_exists='append', index=False, method='multi')
-        print(f"   Success: {len(df_campaigns)} beauty brands loaded.")
+    if not os.path.isdir(directory):
+        print(f"   Error: Directory not found at {directory}")
+        return 0
+
+    seen = set()  # 중복된 brand_name 제거 (첫 번째 항목 유지)
+    with BatchWriter(table, {'brand_name': object, 'budget': np.int64, 'content_requirements': object},
+                     batch_size, constants={'product_category': 'Beauty/Skincare'}) as writer:
+        for line in iter_profile_lines(directory, max_files):
+            brand_name, bio = line[0], line[7]
+            if brand_name in seen or not any(keyword in bio.lower() for keyword in BEAUTY_KEYWORDS):
+                continue
+            seen.add(brand_name)
+            # 데모용 가상 예산 ($1k~$10k)
+            writer.add(brand_name, random.randint(1000, 10000), bio[:200])
+    rows = writer.rows
+
+    if rows:
+        print(f"   Success: {rows} beauty brands loaded.")
+    return rows
 
 # ==========================================
 # 4. Matches 테이블 적재 (post_info.txt)
 # ==========================================
 def load_matches():
     print(f">>> [3/3] Loading Matches from {FILE_POST_INFO}...")
+    profiling.step('load_matches')
     
     # post_info.txt 읽기 (헤더 없음)
     try:
@@ -222,11 +293,15 @@ def load_matches():
         print(f"   Success: {len(db_ready_df)} synthetic matches randomly assigned and loaded.")
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Nurihaus 데이터셋 ETL (creators / campaigns / matches 적재)")
+    profiling.add_profile_argument(parser)
+    args = parser.parse_args()
     try:
-        clear_tables()
-        load_creators()
-        load_campaigns()
-        load_matches()
+        with profiling.run('etl_nurihaus', args.profile):
+            clear_tables()
+            load_creators()
+            load_campaigns()
+            load_matches()
         print("\n>>> ETL Process Completed Successfully.")
     except Exception as e:
         print(f"\n>>> ETL Error: {e}")
\ No newline at end of file
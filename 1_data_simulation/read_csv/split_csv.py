@@ -0,0 +1,227 @@
+"""
+원본 CSV를 한 번만 스트리밍으로 읽어 조건 필터링 / 컬럼 선택 / 파티션 저장을 수행하는 도구입니다.
+(기존 category_beauty.py, top100.py 를 대체합니다)
+
+사용 예시 (프로젝트 루트에서 실행):
+    # 카테고리별로 한 번에 분할 (Beauty, Fashion, Food ... 각각 한 파일)
+    python 1_data_simulation/read_csv/split_csv.py --partition-by influencer_category
+
+    # Beauty 카테고리만 Parquet으로 저장 (기존 category_beauty.py)
+    python 1_data_simulation/read_csv/split_csv.py --where influencer_category=Beauty --format parquet
+
+    # 처음 100개 행만 저장 (기존 top100.py)
+    python 1_data_simulation/read_csv/split_csv.py --head 100
+"""
+import argparse
+import os
+import re
+
+import pandas as pd
+
+# 경로 설정: 스크립트 위치 기준 (어디서 실행해도 같은 파일을 찾도록)
+script_dir = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_INPUT = os.path.join(os.path.dirname(script_dir), 'influencer_marketing_roi_dataset.csv')
+DEFAULT_OUTPUT_DIR = os.path.join(script_dir, 'output')
+DEFAULT_CHUNKSIZE = 50_000
+
+PARTITION_COLUMNS = ['influencer_category', 'platform']
+# 파티션 값이 비어 있는(NaN) 행은 버리지 않고 이 이름의 파일에 모읍니다.
+NULL_PARTITION = '__null__'
+
+
+def parse_predicates(expressions):
+    """'col=v1,v2' 형태의 조건 목록을 {col: {v1, v2}} 딕셔너리로 변환합니다."""
+    predicates = {}
+    for expr in expressions or []:
+        if '=' not in expr:
+            raise ValueError(f"조건 형식이 올바르지 않습니다 (col=value 필요): {expr}")
+        column, values = expr.split('=', 1)
+        predicates.setdefault(column.strip(), set()).update(v.strip() for v in values.split(','))
+    return predicates
+
+
+def iter_chunks_pandas(input_path, columns, chunksize):
+    """pandas 청크 리더: chunksize 행씩 DataFrame을 돌려줍니다."""
+    yield from pd.read_csv(input_path, usecols=columns, chunksize=chunksize)
+
+
+def iter_chunks_pyarrow(input_path, columns, chunksize):
+    """pyarrow 스트리밍 리더: 블록 단위로 읽어 DataFrame으로 돌려줍니다."""
+    from pyarrow import csv as pa_csv
+
+    # block_size는 바이트 단위이므로 대략 한 행 200바이트로 환산합니다.
+    read_options = pa_csv.ReadOptions(block_size=max(chunksize * 200, 1 << 20))
+    convert_options = pa_csv.ConvertOptions(include_columns=columns)
+    reader = pa_csv.open_csv(input_path, read_options=read_options, convert_options=convert_options)
+    for batch in reader:
+        yield batch.to_pandas()
+
+
+def apply_predicates(chunk, predicates):
+    mask = pd.Series(True, index=chunk.index)
+    for column, values in predicates.items():
+        mask &= chunk[column].astype(str).isin(values)
+    return chunk[mask]
+
+
+def safe_filename(value):
+    return re.sub(r'[^0-9A-Za-z가-힣_.-]+', '_', str(value)) or 'unknown'
+
+
+class PartitionWriter:
+    """
+    파티션 값마다 출력 파일을 하나씩 열어두고 청크를 이어 씁니다.
+    Parquet 스키마는 첫 청크에서 한 번만 정하고 모든 파티션 파일에 같은 스키마를 씁니다.
+    """
+
+    def __init__(self, output_dir, prefix, fmt):
+        self.output_dir = output_dir
+        self.prefix = prefix
+        self.fmt = fmt
+        self.rows = {}
+        self.schema = None
+        self._names = {}
+        self._parquet_writers = {}
+        os.makedirs(output_dir, exist_ok=True)
+
+    def path_for(self, key):
+        name = self._names.get(key)
+        if name is None:
+            name = self.prefix if key is None else f"{self.prefix}_{safe_filename(key)}"
+            # 서로 다른 값이 같은 파일 이름으로 바뀌면 (예: 'A/B', 'A B') 덮어쓰지 않도록 번호를 붙입니다.
+            base, n = name, 2
+            while name in self._names.values():
+                name, n = f"{base}_{n}", n + 1
+            self._names[key] = name
+        return os.path.join(self.output_dir, f"{name}.{self.fmt}")
+
+    def _arrow_table(self, frame):
+        import pyarrow as pa
+
+        if self.schema is None:
+            # 첫 청크에서 값이 모두 비어 있던 컬럼은 float(NaN) 으로 추론되므로 문자열로 고정합니다.
+            empty = [c for c in frame.columns if frame[c].isna().all()]
+            schema = pa.Table.from_pandas(frame.astype({c: 'string' for c in empty}), preserve_index=False).schema
+            self.schema = schema.remove_metadata()
+        # 뒤 청크의 추론 타입이 첫 청크와 다르면 고정한 스키마에 맞춥니다.
+        # - 정수 컬럼이 결측 때문에 float 로 추론된 경우: nullable 정수 (소수 값이 실제로 있으면 명확한 오류)
+        # - 문자열 컬럼이 청크 안에서 모두 비어 float 로 추론된 경우: 문자열
+        for field in self.schema:
+            column = frame[field.name]
+            if pa.types.is_integer(field.type) and column.dtype.kind == 'f':
+                frame = frame.assign(**{field.name: column.astype('Int64')})
+            elif pa.types.is_string(field.type) and column.dtype.kind in 'fiub':
+                frame = frame.assign(**{field.name: column.astype('string')})
+        return pa.Table.from_pandas(frame, schema=self.schema, preserve_index=False)
+
+    def write(self, key, frame):
+        if frame.empty:
+            return
+        path = self.path_for(key)
+        if self.fmt == 'csv':
+            first = key not in self.rows
+            frame.to_csv(path, mode='w' if first else 'a', header=first, index=False, encoding='utf-8')
+        else:
+            import pyarrow.parquet as pq
+
+            table = self._arrow_table(frame)
+            writer = self._parquet_writers.get(key)
+            if writer is None:
+                writer = pq.ParquetWriter(path, self.schema)
+                self._parquet_writers[key] = writer
+            writer.write_table(table)
+        self.rows[key] = self.rows.get(key, 0) + len(frame)
+
+    def close(self):
+        for writer in self._parquet_writers.values():
+            writer.close()
+        self._parquet_writers.clear()
+
+
+def split_csv(input_path=DEFAULT_INPUT, output_dir=DEFAULT_OUTPUT_DIR, partition_by=None,
+              predicates=None, columns=None, fmt='csv', chunksize=DEFAULT_CHUNKSIZE,
+              engine='pandas', head=None, prefix=None):
+    """
+    CSV를 한 번만 읽으면서 조건 필터링, 컬럼 선택, 파티션 저장을 수행합니다.
+    메모리 사용량은 chunksize에만 비례하며, 파티션별 저장 행 수를 반환합니다.
+    """
+    predicates = predicates or {}
+    if partition_by and partition_by not in PARTITION_COLUMNS:
+        raise ValueError(f"partition_by는 {PARTITION_COLUMNS} 중 하나여야 합니다: {partition_by}")
+
+    # 읽어야 할 컬럼 = 출력 컬럼 + 조건 컬럼 + 파티션 컬럼 (컬럼 선택이 없으면 전체)
+    read_columns = None
+    if columns:
+        read_columns = list(dict.fromkeys(list(columns) + list(predicates) + ([partition_by] if partition_by else [])))
+
+    iter_chunks = iter_chunks_pyarrow if engine == 'pyarrow' else iter_chunks_pandas
+    prefix = prefix or os.path.splitext(os.path.basename(input_path))[0]
+    writer = PartitionWriter(output_dir, prefix, fmt)
+    remaining = head
+
+    try:
+        for chunk in iter_chunks(input_path, read_columns, chunksize):
+            if predicates:
+                chunk = apply_predicates(chunk, predicates)
+            if remaining is not None:
+                chunk = chunk.head(remaining)
+                remaining -= len(chunk)
+
+            out = chunk[columns] if columns else chunk
+            if partition_by:
+                for key, part in out.groupby(chunk[partition_by], sort=False, dropna=False):
+                    writer.write(NULL_PARTITION if pd.isna(key) else key, part)
+            else:
+                writer.write(None, out)
+
+            if remaining is not None and remaining <= 0:
+                break
+    finally:
+        writer.close()
+
+    return {writer.path_for(key): rows for key, rows in writer.rows.items()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="CSV 스트리밍 필터링 / 파티션 분할 도구")
+    parser.add_argument('--input', default=DEFAULT_INPUT, help="원본 CSV 경로")
+    parser.add_argument('--output-dir', default=DEFAULT_OUTPUT_DIR, help="결과 파일 저장 폴더")
+    parser.add_argument('--partition-by', choices=PARTITION_COLUMNS, help="이 컬럼 값마다 파일 하나씩 저장")
+    parser.add_argument('--where', action='append', metavar='COL=V1,V2', help="행 필터 조건 (여러 번 지정 가능)")
+    parser.add_argument('--columns', help="저장할 컬럼 목록 (쉼표 구분)")
+    parser.add_argument('--format', choices=['csv', 'parquet'], default='csv')
+    parser.add_argument('--chunksize', type=int, default=DEFAULT_CHUNKSIZE, help="한 번에 읽을 행 수")
+    parser.add_argument('--engine', choices=['pandas', 'pyarrow'], default='pandas', help="CSV 리더 엔진")
+    parser.add_argument('--head', type=int, help="조건을 만족하는 처음 N개 행만 저장")
+    parser.add_argument('--prefix', help="출력 파일 이름 접두어 (기본값: 원본 파일명)")
+    args = parser.parse_args()
+
+    columns = [c.strip() for c in args.columns.split(',')] if args.columns else None
+
+    try:
+        print(f"'{args.input}' 파일을 스트리밍으로 읽는 중... (chunksize={args.chunksize:,}, engine={args.engine})")
+        written = split_csv(
+            input_path=args.input,
+            output_dir=args.output_dir,
+            partition_by=args.partition_by,
+            predicates=parse_predicates(args.where),
+            columns=columns,
+            fmt=args.format,
+            chunksize=args.chunksize,
+            engine=args.engine,
+            head=args.head,
+            prefix=args.prefix,
+        )
+        if not written:
+            print("조건을 만족하는 행이 없습니다.")
+        for path, rows in sorted(written.items()):
+            print(f"   {path}: {rows:,}개 행 저장")
+        print(f"완료! 총 {sum(written.values()):,}개 행, {len(written)}개 파일")
+    except FileNotFoundError:
+        print(f"오류: '{args.input}' 파일을 찾을 수 없습니다. 파일 이름과 경로를 확인하세요.")
+    except Exception as e:
+        print(f"파일 처리 중 오류가 발생했습니다: {e}")
+
+
+if __name__ == "__main__":
+    main()
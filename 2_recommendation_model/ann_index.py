@@ -0,0 +1,315 @@
+"""
+크리에이터 벡터 근사 최근접 이웃(ANN) 인덱스 - IVF (numpy 전용)
+
+크리에이터가 수백만 명이 되면 모든 크리에이터와 유사도를 계산하는 전수 탐색이 병목이 됩니다.
+IVF(Inverted File) 방식으로 검색 범위를 줄입니다.
+- 빌드: 표본으로 구면 k-means 중심(n_lists개)을 학습한 뒤 모든 벡터를 가장 가까운 중심(리스트)에 배정하고,
+        리스트 순서로 정렬하여 연속된 배열(vectors / ids + 리스트별 offsets)로 저장합니다.
+- 검색: 쿼리마다 가장 가까운 n_probe 개 리스트만 내적 계산합니다. 배치 쿼리는 리스트 단위로 묶어서
+        (같은 리스트를 탐색하는 쿼리들 x 리스트 벡터) 행렬 곱 한 번으로 처리합니다.
+- 저장 / 로드: .npy 파일로 저장하고 np.load(mmap_mode='r') 로 열어 필요한 리스트만 디스크에서 읽습니다.
+- 증분 추가: 새 벡터는 delta 영역에 쌓고(검색 시 전수 탐색), 일정 비율을 넘으면 본 배열로 병합합니다.
+
+벡터는 L2 정규화되어 있다고 가정합니다 (내적 = 코사인 유사도). creator_vectors.py 참고.
+
+사용 예시 (프로젝트 루트에서 실행):
+    python 2_recommendation_model/ann_index.py build
+    python 2_recommendation_model/ann_index.py update
+    python 2_recommendation_model/ann_index.py query --creator-id 1 2 3 --k 10 --n-probe 16
+    python 2_recommendation_model/ann_index.py query --text "vegan skincare routine" --niche Beauty --platform YouTube
+"""
+import argparse
+import json
+import os
+import shutil
+import time
+
+import numpy as np
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+INDEX_DIR = os.path.join(script_dir, 'saved_models', 'ann_index')
+
+DEFAULT_N_PROBE = 16
+KMEANS_SAMPLE = 100_000
+KMEANS_ITER = 10
+MERGE_RATIO = 0.1           # delta 영역이 본 배열의 10%를 넘으면 병합
+ASSIGN_BLOCK = 65_536
+
+
+def assign_lists(vectors, centroids, block=ASSIGN_BLOCK):
+    """각 벡터에 내적이 가장 큰 중심 번호를 배정합니다 (블록 단위 행렬 곱)."""
+    labels = np.empty(len(vectors), dtype=np.int32)
+    for start in range(0, len(vectors), block):
+        labels[start:start + block] = np.argmax(vectors[start:start + block] @ centroids.T, axis=1)
+    return labels
+
+
+def spherical_kmeans(vectors, n_lists, n_iter=KMEANS_ITER, sample_size=KMEANS_SAMPLE, seed=42):
+    """표본에서 구면 k-means (중심도 L2 정규화) 를 학습합니다."""
+    rng = np.random.default_rng(seed)
+    sample = vectors[rng.choice(len(vectors), size=min(sample_size, len(vectors)), replace=False)]
+    centroids = sample[rng.choice(len(sample), size=n_lists, replace=False)].copy()
+    for _ in range(n_iter):
+        labels = assign_lists(sample, centroids)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, labels, sample)
+        counts = np.bincount(labels, minlength=n_lists)
+        empty = counts == 0
+        # 빈 리스트는 임의의 표본 벡터로 다시 초기화합니다.
+        sums[empty] = sample[rng.choice(len(sample), size=int(empty.sum()), replace=False)]
+        centroids = sums / np.maximum(np.linalg.norm(sums, axis=1, keepdims=True), 1e-12)
+    return centroids.astype(np.float32)
+
+
+def top_k_rows(scores, k):
+    """행마다 점수 상위 k 개의 열 위치와 점수 (정렬되지 않음)."""
+    keep = min(k, scores.shape[1])
+    if scores.shape[1] > keep:
+        top = np.argpartition(-scores, keep - 1, axis=1)[:, :keep]
+    else:
+        top = np.broadcast_to(np.arange(keep), (len(scores), keep))
+    return top, np.take_along_axis(scores, top, axis=1)
+
+
+def exact_search(vectors, queries, k=10, block=ASSIGN_BLOCK):
+    """전수 탐색 top-k (벤치마크 정답 / 소규모 데이터용). (positions, scores) 반환, 점수 내림차순."""
+    queries = np.asarray(queries, dtype=np.float32)
+    best_pos = np.empty((len(queries), 0), dtype=np.int64)
+    best_scores = np.empty((len(queries), 0), dtype=np.float32)
+    for start in range(0, len(vectors), block):
+        top, scores = top_k_rows(queries @ vectors[start:start + block].T, k)
+        best_pos = np.concatenate([best_pos, start + top], axis=1)
+        best_scores = np.concatenate([best_scores, scores], axis=1)
+        top, best_scores = top_k_rows(best_scores, k)
+        best_pos = np.take_along_axis(best_pos, top, axis=1)
+    order = np.argsort(-best_scores, axis=1, kind='stable')
+    return np.take_along_axis(best_pos, order, axis=1), np.take_along_axis(best_scores, order, axis=1)
+
+
+class IVFIndex:
+    def __init__(self, centroids, vectors, ids, offsets, delta_vectors=None, delta_ids=None, delta_lists=None):
+        self.centroids = centroids
+        self.vectors = vectors
+        self.ids = ids
+        self.offsets = offsets
+        dim = centroids.shape[1]
+        self.delta_vectors = delta_vectors if delta_vectors is not None else np.empty((0, dim), dtype=np.float32)
+        self.delta_ids = delta_ids if delta_ids is not None else np.empty(0, dtype=np.int64)
+        self.delta_lists = delta_lists if delta_lists is not None else np.empty(0, dtype=np.int32)
+
+    # ------------------------------------------
+    # 빌드 / 증분 추가
+    # ------------------------------------------
+    @classmethod
+    def build(cls, vectors, ids, n_lists=None, seed=42):
+        vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+        ids = np.asarray(ids, dtype=np.int64)
+        n_lists = n_lists or max(int(np.sqrt(len(vectors))), 1)
+        centroids = spherical_kmeans(vectors, n_lists, seed=seed)
+        return cls._from_assignment(centroids, vectors, ids, assign_lists(vectors, centroids))
+
+    @classmethod
+    def _from_assignment(cls, centroids, vectors, ids, labels):
+        order = np.argsort(labels, kind='stable')
+        offsets = np.concatenate([[0], np.cumsum(np.bincount(labels, minlength=len(centroids)))]).astype(np.int64)
+        return cls(centroids, vectors[order], ids[order], offsets)
+
+    @property
+    def n_lists(self):
+        return len(self.centroids)
+
+    def __len__(self):
+        return len(self.ids) + len(self.delta_ids)
+
+    @property
+    def max_id(self):
+        return int(max(self.ids.max(initial=0), self.delta_ids.max(initial=0)))
+
+    def add(self, vectors, ids):
+        """새 벡터를 delta 영역에 추가합니다 (중심은 그대로 사용)."""
+        vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+        self.delta_vectors = np.concatenate([self.delta_vectors, vectors])
+        self.delta_ids = np.concatenate([self.delta_ids, np.asarray(ids, dtype=np.int64)])
+        self.delta_lists = np.concatenate([self.delta_lists, assign_lists(vectors, self.centroids)])
+        if len(self.delta_ids) > MERGE_RATIO * max(len(self.ids), 1):
+            self.merge()
+        return len(vectors)
+
+    def merge(self):
+        """delta 영역을 본 배열에 병합합니다 (리스트 순서로 다시 정렬)."""
+        if not len(self.delta_ids):
+            return
+        labels = np.repeat(np.arange(self.n_lists, dtype=np.int32), np.diff(self.offsets))
+        merged = self._from_assignment(
+            self.centroids,
+            np.concatenate([np.asarray(self.vectors), self.delta_vectors]),
+            np.concatenate([np.asarray(self.ids), self.delta_ids]),
+            np.concatenate([labels, self.delta_lists]),
+        )
+        self.vectors, self.ids, self.offsets = merged.vectors, merged.ids, merged.offsets
+        self.delta_vectors = self.delta_vectors[:0]
+        self.delta_ids = self.delta_ids[:0]
+        self.delta_lists = self.delta_lists[:0]
+
+    # ------------------------------------------
+    # 검색
+    # ------------------------------------------
+    def search(self, queries, k=10, n_probe=DEFAULT_N_PROBE):
+        """
+        (m, dim) 쿼리 배치 -> (ids, scores) 각 (m, k), 점수 내림차순.
+        후보가 k개보다 적으면 남는 자리는 id -1, 점수 -inf 입니다.
+        """
+        Q = np.ascontiguousarray(np.atleast_2d(queries), dtype=np.float32)
+        m = len(Q)
+        n_probe = min(n_probe, self.n_lists)
+        probes = np.argpartition(-(Q @ self.centroids.T), n_probe - 1, axis=1)[:, :n_probe]
+
+        slots = n_probe + (1 if len(self.delta_ids) else 0)
+        cand_scores = np.full((m, slots, k), -np.inf, dtype=np.float32)
+        cand_pos = np.full((m, slots, k), -1, dtype=np.int64)
+
+        # 같은 리스트를 탐색하는 쿼리들을 묶어서 행렬 곱 한 번으로 계산합니다.
+        flat = probes.ravel()
+        order = np.argsort(flat, kind='stable')
+        for group in np.split(order, np.flatnonzero(np.diff(flat[order])) + 1):
+            lst = flat[group[0]]
+            start, end = self.offsets[lst], self.offsets[lst + 1]
+            if start == end:
+                continue
+            q_idx, slot = np.divmod(group, n_probe)
+            top, scores = top_k_rows(Q[q_idx] @ self.vectors[start:end].T, k)
+            cand_scores[q_idx[:, None], slot[:, None], np.arange(top.shape[1])] = scores
+            cand_pos[q_idx[:, None], slot[:, None], np.arange(top.shape[1])] = start + top
+
+        if len(self.delta_ids):
+            top, scores = top_k_rows(Q @ self.delta_vectors.T, k)
+            cand_scores[:, -1, :top.shape[1]] = scores
+            cand_pos[:, -1, :top.shape[1]] = len(self.ids) + top
+
+        top, scores = top_k_rows(cand_scores.reshape(m, -1), k)
+        pos = np.take_along_axis(cand_pos.reshape(m, -1), top, axis=1)
+        order = np.argsort(-scores, axis=1, kind='stable')
+        scores, pos = np.take_along_axis(scores, order, axis=1), np.take_along_axis(pos, order, axis=1)
+
+        ids = np.full(pos.shape, -1, dtype=np.int64)
+        main = (pos >= 0) & (pos < len(self.ids))
+        ids[main] = self.ids[pos[main]]
+        delta = pos >= len(self.ids)
+        ids[delta] = self.delta_ids[pos[delta] - len(self.ids)]
+        return ids, scores
+
+    # ------------------------------------------
+    # 저장 / 로드
+    # ------------------------------------------
+    ARRAYS = ['centroids', 'vectors', 'ids', 'offsets', 'delta_vectors', 'delta_ids', 'delta_lists']
+
+    def save(self, path=INDEX_DIR, extra_meta=None):
+        # 임시 폴더에 모두 쓴 뒤 교체하여, 저장 중인 인덱스를 다른 프로세스가 읽지 않도록 합니다.
+        tmp_dir = path + '.tmp'
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        os.makedirs(tmp_dir)
+        for name in self.ARRAYS:
+            np.save(os.path.join(tmp_dir, f'{name}.npy'), np.asarray(getattr(self, name)))
+        meta = {'n_lists': self.n_lists, 'dim': int(self.centroids.shape[1]), 'size': len(self),
+                'delta_size': len(self.delta_ids), **(extra_meta or {})}
+        with open(os.path.join(tmp_dir, 'meta.json'), 'w', encoding='utf-8') as f:
+            json.dump(meta, f, indent=2)
+
+        old_dir = path + '.old'
+        if os.path.exists(path):
+            os.replace(path, old_dir)
+        os.replace(tmp_dir, path)
+        shutil.rmtree(old_dir, ignore_errors=True)
+
+    @classmethod
+    def load(cls, path=INDEX_DIR, mmap=True):
+        """(index, meta) 반환. mmap=True 이면 vectors / ids 는 디스크에서 필요한 부분만 읽습니다."""
+        meta_path = os.path.join(path, 'meta.json')
+        if not os.path.exists(meta_path):
+            raise FileNotFoundError(f"ANN index not found at {path}. Run ann_index.py build first.")
+        with open(meta_path, encoding='utf-8') as f:
+            meta = json.load(f)
+        arrays = {}
+        for name in cls.ARRAYS:
+            mmap_mode = 'r' if mmap and name in ('vectors', 'ids') else None
+            arrays[name] = np.load(os.path.join(path, f'{name}.npy'), mmap_mode=mmap_mode)
+        return cls(**arrays), meta
+
+
+# ==========================================
+# CLI (DB 연동)
+# ==========================================
+def main():
+    import pandas as pd
+    from creator_vectors import CreatorEncoder, load_creators
+    from db import get_engine
+
+    parser = argparse.ArgumentParser(description="크리에이터 벡터 IVF 근사 최근접 이웃 인덱스")
+    sub = parser.add_subparsers(dest='command', required=True)
+    build = sub.add_parser('build', help="creators 테이블 전체로 인덱스를 새로 만듭니다")
+    build.add_argument('--n-lists', type=int, help="IVF 리스트 수 (기본: sqrt(N))")
+    sub.add_parser('update', help="새 크리에이터만 인덱스에 추가합니다")
+    query = sub.add_parser('query', help="비슷한 크리에이터 top-k")
+    query.add_argument('--creator-id', type=int, nargs='+', help="이 크리에이터들과 비슷한 크리에이터 검색")
+    query.add_argument('--text', help="bio 와 비교할 텍스트 (캠페인 요구사항 등)")
+    query.add_argument('--niche')
+    query.add_argument('--platform')
+    query.add_argument('--followers', type=int)
+    query.add_argument('--k', type=int, default=10)
+    query.add_argument('--n-probe', type=int, default=DEFAULT_N_PROBE)
+    for p in sub.choices.values():
+        p.add_argument('--index-dir', default=INDEX_DIR)
+    args = parser.parse_args()
+
+    if args.command == 'build':
+        print(">>> [1/3] Loading creators from Database...")
+        df = load_creators(get_engine())
+        print(f"   {len(df):,} creators")
+        print(">>> [2/3] Encoding vectors and training IVF centroids...")
+        started = time.perf_counter()
+        encoder = CreatorEncoder.fit(df)
+        vectors = encoder.transform(df)
+        index = IVFIndex.build(vectors, df['creator_id'].to_numpy(), n_lists=args.n_lists)
+        print(f"   {len(index):,} vectors x {encoder.dim} dims, {index.n_lists} lists "
+              f"in {time.perf_counter() - started:.1f}s")
+        print(">>> [3/3] Saving index...")
+        index.save(args.index_dir, extra_meta={'encoder': encoder.to_config()})
+        print(f"   Saved: {args.index_dir}")
+        return
+
+    index, meta = IVFIndex.load(args.index_dir, mmap=args.command == 'query')
+    encoder = CreatorEncoder.from_config(meta['encoder'])
+
+    if args.command == 'update':
+        df = load_creators(get_engine(), after_id=index.max_id)
+        print(f">>> Adding {len(df):,} creators after creator_id={index.max_id}...")
+        if len(df):
+            index.add(encoder.transform(df), df['creator_id'].to_numpy())
+            index.save(args.index_dir, extra_meta={'encoder': meta['encoder']})
+        print(f"   Index size: {len(index):,} ({len(index.delta_ids):,} in delta)")
+        return
+
+    if args.creator_id:
+        from sqlalchemy import text
+        queries = pd.read_sql(text("SELECT creator_id, bio, follower_count, niche, platform FROM creators "
+                                   "WHERE creator_id = ANY(:ids)"), get_engine(), params={'ids': args.creator_id})
+    else:
+        queries = pd.DataFrame([{'creator_id': 'query', 'bio': args.text or '', 'follower_count': args.followers,
+                                 'niche': args.niche, 'platform': args.platform}])
+    Q = encoder.transform(queries.astype({'follower_count': 'float64'}))
+    started = time.perf_counter()
+    ids, scores = index.search(Q, k=args.k, n_probe=args.n_probe)
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    for key, row_ids, row_scores in zip(queries['creator_id'], ids, scores):
+        print(f"\n[{key}]")
+        for creator_id, score in zip(row_ids, row_scores):
+            if creator_id >= 0:
+                print(f"   creator_id={creator_id:<10} score={score:.3f}")
+    print(f"\n>>> {len(Q)} queries x {len(index):,} creators in {elapsed_ms:.1f} ms (n_probe={args.n_probe})")
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except Exception as e:
+        print(f"ANN Index Error: {e}")
@@ -0,0 +1,90 @@
+"""
+ANN(IVF) 인덱스 recall / 지연시간 벤치마크 (전수 탐색 대비)
+
+creators 테이블 전체를 벡터로 만든 뒤 IVF 인덱스를 빌드하고,
+무작위 크리에이터를 쿼리로 사용하여 n_probe 별 recall@k 와 쿼리당 지연시간을 전수 탐색과 비교합니다.
+
+사용 예시 (프로젝트 루트에서 실행):
+    python 2_recommendation_model/benchmark_ann.py
+    python 2_recommendation_model/benchmark_ann.py --queries 500 --n-probe 1,4,16,64 --output ann_bench.json
+"""
+import argparse
+import json
+import time
+
+import numpy as np
+
+from ann_index import IVFIndex, exact_search
+from creator_vectors import CreatorEncoder, load_creators
+from db import get_engine
+
+
+def recall_at_k(found, truth):
+    return float(np.mean([len(np.intersect1d(f, t)) / len(t) for f, t in zip(found, truth)]))
+
+
+def timed(fn, repeat=3):
+    """fn() 을 repeat 번 실행한 시간의 중앙값(s)과 마지막 결과."""
+    times = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn()
+        times.append(time.perf_counter() - started)
+    return float(np.median(times)), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="IVF ANN 인덱스 vs 전수 탐색 recall / 지연시간")
+    parser.add_argument('--queries', type=int, default=200)
+    parser.add_argument('--k', type=int, default=10)
+    parser.add_argument('--n-probe', default='1,2,4,8,16,32')
+    parser.add_argument('--n-lists', type=int)
+    parser.add_argument('--single', type=int, default=20, help="단건 쿼리 지연시간 측정 횟수")
+    parser.add_argument('--output', help="결과 JSON 저장 경로")
+    args = parser.parse_args()
+
+    print(">>> [1/4] Loading creators and encoding vectors...")
+    df = load_creators(get_engine())
+    encoder = CreatorEncoder.fit(df)
+    started = time.perf_counter()
+    vectors = encoder.transform(df)
+    ids = df['creator_id'].to_numpy()
+    print(f"   {len(vectors):,} x {vectors.shape[1]} dims in {time.perf_counter() - started:.1f}s")
+
+    print(">>> [2/4] Building IVF index...")
+    started = time.perf_counter()
+    index = IVFIndex.build(vectors, ids, n_lists=args.n_lists)
+    build_seconds = time.perf_counter() - started
+    print(f"   {index.n_lists} lists in {build_seconds:.1f}s")
+
+    rng = np.random.default_rng(0)
+    Q = vectors[rng.choice(len(vectors), size=args.queries, replace=False)]
+
+    print(">>> [3/4] Brute force baseline...")
+    exact_batch_s, (pos, _) = timed(lambda: exact_search(vectors, Q, args.k), repeat=1)
+    truth = ids[pos]
+    exact_single_s, _ = timed(lambda: exact_search(vectors, Q[:1], args.k), repeat=args.single)
+    results = [{'method': 'brute_force', 'n_probe': None, 'recall': 1.0,
+                'batch_ms_per_query': exact_batch_s * 1000 / len(Q), 'single_ms': exact_single_s * 1000}]
+
+    print(">>> [4/4] IVF search...")
+    for n_probe in [int(p) for p in args.n_probe.split(',')]:
+        batch_s, (found, _) = timed(lambda: index.search(Q, args.k, n_probe))
+        single_s, _ = timed(lambda: index.search(Q[:1], args.k, n_probe), repeat=args.single)
+        results.append({'method': 'ivf', 'n_probe': n_probe, 'recall': recall_at_k(found, truth),
+                        'batch_ms_per_query': batch_s * 1000 / len(Q), 'single_ms': single_s * 1000})
+
+    print(f"\n{'method':<12} {'n_probe':>7} {f'recall@{args.k}':>10} {'batch ms/q':>11} {'single ms':>10} {'speedup':>8}")
+    for r in results:
+        print(f"{r['method']:<12} {str(r['n_probe'] or '-'):>7} {r['recall']:>10.3f} {r['batch_ms_per_query']:>11.3f} "
+              f"{r['single_ms']:>10.2f} {results[0]['single_ms'] / r['single_ms']:>7.1f}x")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump({'n_vectors': len(vectors), 'dim': int(vectors.shape[1]), 'n_lists': index.n_lists,
+                       'build_seconds': build_seconds, 'k': args.k, 'results': results}, f, indent=2)
+        print(f">>> Saved: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""
+메모리 / 정확도 트레이드오프 벤치마크: 인메모리 RandomForest(train_budget.py) vs 스트리밍 학습(train_streaming.py)
+
+각 방식을 별도 프로세스에서 실행하여 프로세스 최대 RSS(peak memory), 학습 시간, 검증 R2 를 비교합니다.
+검증 행은 두 방식 모두 같은 규칙(5행 중 1행)으로 분리합니다.
+
+사용 예시 (프로젝트 루트에서 실행):
+    python 1_data_simulation/generate_synthetic.py --rows 1000000 --tables campaign_performance
+    python 2_recommendation_model/benchmark_streaming.py --parquet 1_data_simulation/synthetic_data/campaign_performance.parquet
+"""
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import time
+
+VARIANTS = ['inmemory_rf', 'stream_sgd', 'stream_mlp']
+
+
+def peak_rss_mb():
+    # Linux: ru_maxrss 단위는 KB
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def run_variant(variant, parquet, chunksize, epochs, rf_trees):
+    """자식 프로세스에서 실행: 결과를 JSON 한 줄로 출력합니다."""
+    import numpy as np
+    from sklearn.metrics import mean_squared_error, r2_score
+
+    from train_streaming import (FAMILY, SPEC, VALIDATION_EVERY, parquet_chunk_source, parquet_vocabulary,
+                                 train_streaming)
+    from model_families import build_preprocessor, feature_columns
+
+    baseline_mb = peak_rss_mb()
+    started = time.perf_counter()
+
+    if variant == 'inmemory_rf':
+        import pandas as pd
+        from sklearn.ensemble import RandomForestRegressor
+        from sklearn.pipeline import Pipeline
+
+        # train_budget.py 와 같은 방식: 테이블 전체를 DataFrame 하나로 읽은 뒤 학습
+        df = pd.read_parquet(parquet, columns=feature_columns(FAMILY) + [SPEC['target']]).dropna()
+        is_valid = (np.arange(len(df)) % VALIDATION_EVERY) == 0
+        train, valid = df[~is_valid], df[is_valid]
+        model = Pipeline([
+            ('preprocessor', build_preprocessor(FAMILY)),
+            ('regressor', RandomForestRegressor(n_estimators=rf_trees, random_state=42, n_jobs=-1))
+        ])
+        model.fit(train[feature_columns(FAMILY)], train[SPEC['target']])
+        y_pred = model.predict(valid[feature_columns(FAMILY)])
+        result = {'r2': r2_score(valid[SPEC['target']], y_pred),
+                  'mse': mean_squared_error(valid[SPEC['target']], y_pred), 'train_rows': len(train)}
+    else:
+        learner = variant.split('_', 1)[1]
+        _, result, _ = train_streaming(parquet_chunk_source(parquet, chunksize), parquet_vocabulary(parquet),
+                                       learner=learner, epochs=epochs, verbose=False)
+
+    result.update({
+        'variant': variant,
+        'seconds': time.perf_counter() - started,
+        'peak_rss_mb': peak_rss_mb(),
+        'peak_rss_delta_mb': peak_rss_mb() - baseline_mb,
+    })
+    print(json.dumps(result, default=float))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="인메모리 RF vs 스트리밍 학습 메모리/정확도 벤치마크")
+    parser.add_argument('--parquet', required=True, help="campaign_performance Parquet 파일")
+    parser.add_argument('--variants', default=','.join(VARIANTS))
+    parser.add_argument('--chunksize', type=int, default=100_000)
+    parser.add_argument('--epochs', type=int, default=3)
+    parser.add_argument('--rf-trees', type=int, default=100)
+    parser.add_argument('--output', help="결과 JSON 저장 경로")
+    parser.add_argument('--run-variant', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run_variant:
+        run_variant(args.run_variant, args.parquet, args.chunksize, args.epochs, args.rf_trees)
+        return
+
+    results = []
+    for variant in args.variants.split(','):
+        print(f">>> Running {variant}...")
+        proc = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), '--parquet', args.parquet, '--run-variant', variant,
+             '--chunksize', str(args.chunksize), '--epochs', str(args.epochs), '--rf-trees', str(args.rf_trees)],
+            capture_output=True, text=True,
+        )
+        if proc.returncode != 0:
+            print(f"   Failed: {proc.stderr.strip().splitlines()[-1] if proc.stderr else proc.returncode}")
+            continue
+        results.append(json.loads(proc.stdout.strip().splitlines()[-1]))
+
+    print(f"\n{'variant':<14} {'rows':>10} {'seconds':>9} {'peak RSS':>10} {'R2':>7} {'MSE':>14}")
+    for r in results:
+        print(f"{r['variant']:<14} {r['train_rows']:>10,} {r['seconds']:>8.1f}s {r['peak_rss_mb']:>7.0f} MB "
+              f"{r['r2']:>7.3f} {r['mse']:>14,.0f}")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+        print(f">>> Saved: {args.output}")
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except Exception as e:
+        print(f"Benchmark Error: {e}")
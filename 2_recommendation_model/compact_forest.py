@@ -0,0 +1,216 @@
+"""
+numpy 전용 압축 RandomForest (추론 전용)
+
+sklearn 트리는 노드마다 float64 threshold / value 와 학습용 통계(impurity, 샘플 수 등)를 함께 저장하므로
+100개 full-depth 트리 모델이 수백 MB가 됩니다. 추론에 필요한 배열만 남기고 float32 / int32로 줄여서
+모든 트리를 하나의 배열로 이어 붙인 뒤, 트리 깊이만큼 반복하는 벡터화 탐색으로 예측합니다.
+
+- 리프 노드는 자기 자신을 가리키도록(left = right = 자기 인덱스) 바꿔서, 분기 없이 max_depth 번 반복하면 됩니다.
+- 이 모듈은 numpy 만 사용합니다 (서빙 프로세스에서 sklearn 없이 로드 가능).
+- 결측값(NaN) 분기는 지원하지 않습니다 (현재 입력 피처에는 결측값이 없습니다).
+
+슬림 아티팩트: 전처리기(One-Hot + passthrough ColumnTransformer)까지 CompactPreprocessor 로 바꾸면
+CompactPipeline.save / load 로 npz + JSON 만 읽고 쓰므로, 서빙 프로세스가 sklearn / joblib / pandas 없이 모델을 올릴 수 있습니다.
+"""
+import json
+import os
+
+import numpy as np
+
+DEFAULT_BLOCK_ROWS = 1024
+
+
+def _round_down(threshold, dtype):
+    """
+    float64 threshold 를 그 값 이하의 가장 큰 dtype 값으로 바꿉니다.
+    sklearn 은 float32 입력 x 와 float64 threshold 를 비교(x <= thr)하므로, 캐스팅에서 올림이 되면
+    x 가 정확히 올림된 값일 때 분기가 뒤집힙니다. 내림하면 모든 float32 x 에 대해 같은 쪽으로 갑니다.
+    """
+    cast = threshold.astype(dtype)
+    rounded_up = cast.astype(np.float64) > threshold
+    cast[rounded_up] = np.nextafter(cast[rounded_up], np.array(-np.inf, dtype=cast.dtype))
+    return cast
+
+
+class CompactForest:
+    """RandomForestRegressor 를 float32 배열로 압축한 추론 전용 모델."""
+
+    def __init__(self, feature, threshold, left, right, value, roots, max_depth, n_features):
+        self.feature = feature
+        self.threshold = threshold
+        self.left = left
+        self.right = right
+        self.value = value
+        self.roots = roots
+        self.max_depth = int(max_depth)
+        self.n_features_in_ = int(n_features)
+        # [left | right] 를 하나로 이어 붙여 두면 다음 노드를 take 한 번으로 찾을 수 있습니다.
+        self._children = np.concatenate([left, right])
+
+    def __getstate__(self):
+        # _children 은 left / right 에서 다시 만들 수 있으므로 저장 파일에 넣지 않습니다.
+        state = self.__dict__.copy()
+        state.pop('_children', None)
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._children = np.concatenate([self.left, self.right])
+
+    @classmethod
+    def from_sklearn(cls, regressor, dtype=np.float32):
+        """학습된 RandomForestRegressor (단일 출력)에서 추론에 필요한 배열만 추출합니다."""
+        features, thresholds, lefts, rights, values, roots = [], [], [], [], [], []
+        offset = 0
+        max_depth = 0
+        for estimator in regressor.estimators_:
+            tree = estimator.tree_
+            n = tree.node_count
+            index = np.arange(offset, offset + n, dtype=np.int32)
+            is_leaf = tree.children_left == -1
+            left = np.where(is_leaf, index, tree.children_left + offset).astype(np.int32)
+            right = np.where(is_leaf, index, tree.children_right + offset).astype(np.int32)
+            features.append(np.where(is_leaf, 0, tree.feature).astype(np.int32))
+            thresholds.append(_round_down(np.where(is_leaf, np.inf, tree.threshold), dtype))
+            lefts.append(left)
+            rights.append(right)
+            values.append(tree.value[:, 0, 0].astype(dtype))
+            roots.append(offset)
+            offset += n
+            max_depth = max(max_depth, tree.max_depth)
+        return cls(np.concatenate(features), np.concatenate(thresholds), np.concatenate(lefts),
+                   np.concatenate(rights), np.concatenate(values), np.asarray(roots, dtype=np.int32),
+                   max_depth, regressor.n_features_in_)
+
+    @property
+    def n_estimators(self):
+        return len(self.roots)
+
+    @property
+    def node_count(self):
+        return len(self.feature)
+
+    def leaf_indices(self, X, block_rows=DEFAULT_BLOCK_ROWS):
+        """(n_samples, n_estimators) 크기의 도달 리프 노드 인덱스 (전역 인덱스)."""
+        if hasattr(X, 'toarray'):
+            X = X.toarray()
+        X = np.asarray(X, dtype=np.float32)
+        n_nodes = len(self.feature)
+        out = np.empty((len(X), self.n_estimators), dtype=np.int32)
+        for start in range(0, len(X), block_rows):
+            block = np.ascontiguousarray(X[start:start + block_rows])
+            flat = block.ravel()
+            row_base = (np.arange(len(block), dtype=np.int32) * block.shape[1])[:, None]
+            node = np.broadcast_to(self.roots, (len(block), self.n_estimators)).copy()
+            for _ in range(self.max_depth):
+                # 2차원 fancy indexing 대신 1차원 take 로 모아오는 편이 훨씬 빠릅니다.
+                go_right = np.take(flat, row_base + np.take(self.feature, node)) > np.take(self.threshold, node)
+                node = np.take(self._children, go_right * n_nodes + node)
+            out[start:start + len(block)] = node
+        return out
+
+    def predict(self, X):
+        return self.value[self.leaf_indices(X)].mean(axis=1, dtype=np.float64)
+
+    def save(self, path, compressed=False):
+        save = np.savez_compressed if compressed else np.savez
+        save(path, feature=self.feature, threshold=self.threshold, left=self.left, right=self.right,
+             value=self.value, roots=self.roots, meta=np.array([self.max_depth, self.n_features_in_]))
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            max_depth, n_features = data['meta']
+            return cls(data['feature'], data['threshold'], data['left'], data['right'], data['value'],
+                       data['roots'], max_depth, n_features)
+
+
+class CompactPreprocessor:
+    """
+    학습된 ColumnTransformer(범주형 One-Hot(handle_unknown='ignore') + 수치형 passthrough)를 numpy 로 재현합니다.
+    blocks: 출력 순서대로 [{'column': 'niche', 'categories': [...]}, {'column': 'follower_count'}, ...]
+    입력 X 는 컬럼 이름으로 값 목록을 꺼낼 수 있으면 되므로 DataFrame 이나 {컬럼: 리스트} dict 모두 받습니다.
+    """
+
+    def __init__(self, blocks):
+        self.blocks = blocks
+        self._lookups = [{v: i for i, v in enumerate(b['categories'])} if 'categories' in b else None for b in blocks]
+        self.n_features = sum(len(b.get('categories', [None])) for b in blocks)
+
+    @classmethod
+    def from_column_transformer(cls, transformer):
+        blocks = []
+        for name, step, columns in transformer.transformers_:
+            if name == 'remainder' and step == 'drop':
+                continue
+            # 학습 후 'passthrough' 는 func=None 인 FunctionTransformer(항등 변환)로 바뀌어 있습니다.
+            if step == 'passthrough' or (type(step).__name__ == 'FunctionTransformer' and step.func is None):
+                blocks += [{'column': c} for c in columns]
+            elif (type(step).__name__ == 'OneHotEncoder' and step.handle_unknown == 'ignore'
+                  and step.drop is None):
+                blocks += [{'column': c, 'categories': cats.tolist()} for c, cats in zip(columns, step.categories_)]
+            else:
+                raise ValueError(f"Unsupported preprocessing step for slim export: {name} ({type(step).__name__})")
+        return cls(blocks)
+
+    def transform(self, X):
+        n = len(X[self.blocks[0]['column']])
+        out = np.zeros((n, self.n_features), dtype=np.float32)
+        offset = 0
+        for block, lookup in zip(self.blocks, self._lookups):
+            values = X[block['column']]
+            if lookup is None:
+                out[:, offset] = np.asarray(values, dtype=np.float32)
+                offset += 1
+                continue
+            # 학습 때 없던 범주는 (handle_unknown='ignore' 와 같이) 모두 0 으로 둡니다.
+            codes = np.fromiter((lookup.get(v, -1) for v in values), dtype=np.int64, count=n)
+            known = np.flatnonzero(codes >= 0)
+            out[known, offset + codes[known]] = 1.0
+            offset += len(lookup)
+        return out
+
+
+class CompactPipeline:
+    """
+    (전처리기 + CompactForest) 조합. sklearn Pipeline 과 같은 predict / named_steps 인터페이스를 제공하지만
+    sklearn Pipeline 의 학습 여부 검사를 거치지 않으므로 CompactForest 를 마지막 단계로 쓸 수 있습니다.
+    """
+
+    def __init__(self, preprocessor, regressor):
+        self.named_steps = {'preprocessor': preprocessor, 'regressor': regressor}
+
+    @classmethod
+    def from_pipeline(cls, pipeline, dtype=np.float32):
+        return cls(pipeline.named_steps['preprocessor'],
+                   CompactForest.from_sklearn(pipeline.named_steps['regressor'], dtype=dtype))
+
+    @classmethod
+    def slim(cls, model, dtype=np.float32):
+        """sklearn Pipeline(RF) 또는 CompactPipeline 을 sklearn 없이 저장 / 로드 가능한 형태로 바꿉니다."""
+        regressor = model.named_steps['regressor']
+        if not isinstance(regressor, CompactForest):
+            regressor = CompactForest.from_sklearn(regressor, dtype=dtype)
+        preprocessor = model.named_steps['preprocessor']
+        if not isinstance(preprocessor, CompactPreprocessor):
+            preprocessor = CompactPreprocessor.from_column_transformer(preprocessor)
+        return cls(preprocessor, regressor)
+
+    def predict(self, X):
+        return self.named_steps['regressor'].predict(self.named_steps['preprocessor'].transform(X))
+
+    def save(self, directory):
+        """forest.npz + preprocessor.json 으로 저장합니다 (slim() 결과만 가능)."""
+        preprocessor = self.named_steps['preprocessor']
+        if not isinstance(preprocessor, CompactPreprocessor):
+            raise TypeError("Only slim pipelines can be saved; use CompactPipeline.slim(model) first.")
+        os.makedirs(directory, exist_ok=True)
+        self.named_steps['regressor'].save(os.path.join(directory, 'forest.npz'))
+        with open(os.path.join(directory, 'preprocessor.json'), 'w', encoding='utf-8') as f:
+            json.dump({'blocks': preprocessor.blocks}, f, ensure_ascii=False)
+
+    @classmethod
+    def load(cls, directory):
+        with open(os.path.join(directory, 'preprocessor.json'), encoding='utf-8') as f:
+            preprocessor = CompactPreprocessor(json.load(f)['blocks'])
+        return cls(preprocessor, CompactForest.load(os.path.join(directory, 'forest.npz')))
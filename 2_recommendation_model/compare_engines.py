@@ -0,0 +1,103 @@
+"""
+모델 엔진 비교 (RandomForest vs HistGradientBoosting)
+
+같은 학습/검증 분할에서 엔진별로 아래 항목을 나란히 측정합니다.
+- 학습 시간, 저장 파일(joblib) 크기, 로드 시간
+- 단건 / 배치(1,000건) 추론 지연시간 (전처리 포함 파이프라인 기준)
+- R2 / MSE
+
+사용 예시 (프로젝트 루트에서 실행):
+    python 2_recommendation_model/compare_engines.py --family roi
+    python 2_recommendation_model/compare_engines.py --family sales --sample 200000 --output engines.json
+"""
+import argparse
+import json
+import os
+import tempfile
+import time
+
+import joblib
+from sklearn.metrics import mean_squared_error, r2_score
+from sklearn.model_selection import train_test_split
+
+from model_families import ENGINES, FAMILIES, build_model, feature_columns, load_training_frame, prepare_for_serving
+from tune import measure_latency
+
+
+def artifact_stats(model):
+    """임시 파일로 저장해 크기(bytes)와 로드 시간(s)을 측정합니다."""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'model.joblib')
+        joblib.dump(model, path)
+        size = os.path.getsize(path)
+        started = time.perf_counter()
+        joblib.load(path)
+        return size, time.perf_counter() - started
+
+
+def compare_engines(family, engines=ENGINES, sample=None, random_state=42):
+    spec = FAMILIES[family]
+    print(f">>> [1/2] Fetching '{family}' training data from Database...")
+    df = load_training_frame(family)
+    if df.empty:
+        print("❌ 데이터가 없습니다.")
+        return []
+    if sample and len(df) > sample:
+        df = df.sample(n=sample, random_state=random_state)
+    X = df[feature_columns(family)]
+    y = df[spec['target']]
+    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=random_state)
+    print(f"   Data loaded: {len(df)} records")
+
+    print(f">>> [2/2] Training and measuring engines: {', '.join(engines)}")
+    results = []
+    for engine in engines:
+        model = build_model(family, engine, random_state=random_state)
+        started = time.perf_counter()
+        model.fit(X_train, y_train)
+        fit_seconds = time.perf_counter() - started
+        prepare_for_serving(model)
+
+        y_pred = model.predict(X_test)
+        single_ms, batch_ms = measure_latency(model, X_test)
+        size, load_seconds = artifact_stats(model)
+        result = {
+            'engine': engine,
+            'fit_seconds': fit_seconds,
+            'artifact_mb': size / 1e6,
+            'load_seconds': load_seconds,
+            'single_latency_ms': single_ms,
+            'batch_latency_ms': batch_ms,
+            'r2': r2_score(y_test, y_pred),
+            'mse': mean_squared_error(y_test, y_pred),
+        }
+        results.append(result)
+        print(f"   {engine}: done in {fit_seconds:.1f}s")
+
+    print(f"\n{'engine':<6} {'fit':>8} {'size':>10} {'load':>8} {'single':>9} {'batch':>9} {'R2':>7} {'MSE':>14}")
+    for r in results:
+        print(f"{r['engine']:<6} {r['fit_seconds']:>7.1f}s {r['artifact_mb']:>7.1f} MB {r['load_seconds']:>7.2f}s "
+              f"{r['single_latency_ms']:>6.2f} ms {r['batch_latency_ms']:>6.1f} ms {r['r2']:>7.3f} {r['mse']:>14,.2f}")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="RandomForest vs HistGradientBoosting 엔진 비교")
+    parser.add_argument('--family', choices=list(FAMILIES), default='roi')
+    parser.add_argument('--engines', default=','.join(ENGINES), help="비교할 엔진 목록 (쉼표 구분)")
+    parser.add_argument('--sample', type=int, help="학습 데이터가 클 때 무작위로 N행만 사용")
+    parser.add_argument('--output', help="결과 JSON 저장 경로")
+    args = parser.parse_args()
+
+    results = compare_engines(args.family, args.engines.split(','), sample=args.sample)
+    if args.output and results:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump({'family': args.family, 'sample': args.sample, 'results': results}, f, indent=2)
+        print(f">>> Saved: {args.output}")
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except Exception as e:
+        print(f"Comparison Error: {e}")
@@ -0,0 +1,79 @@
+"""
+예측 신뢰구간 (RandomForest 트리 간 분산 기반)
+
+트리마다 estimator.predict 를 다시 호출하지 않고, 한 번의 트리 탐색으로 얻은 리프 인덱스에서
+모든 트리의 예측값을 한 번에 꺼냅니다.
+- sklearn RandomForest : regressor.apply(X) -> (n_samples, n_trees) 리프 인덱스
+                         + 모든 트리의 노드 값을 이어 붙인 배열과 트리별 시작 오프셋
+- CompactForest       : leaf_indices(X) 가 이미 전역 인덱스를 반환
+
+이렇게 얻은 (n_samples, n_trees) 예측 행렬에서 평균(= 모델 예측값), 표준편차, 분위수 구간을 벡터 연산으로 계산합니다.
+서빙 프로세스에서도 쓰이므로 numpy 만 사용합니다.
+"""
+import numpy as np
+
+DEFAULT_INTERVAL = 0.9
+
+# 구간 폭 / |예측값| 기준 신뢰도 라벨
+CONFIDENCE_LEVELS = [(0.5, 'High'), (1.0, 'Medium')]
+
+
+class ForestConfidence:
+    """학습된 (전처리기 + 트리 앙상블) 파이프라인에 대한 평균 / 분산 / 구간 예측기."""
+
+    def __init__(self, model):
+        self.model = model
+        self.preprocessor = model.named_steps['preprocessor']
+        self.regressor = model.named_steps['regressor']
+        self.leaf_values = None
+        self.offsets = None
+
+        if hasattr(self.regressor, 'leaf_indices'):  # CompactForest
+            self.leaf_values = self.regressor.value
+        elif hasattr(self.regressor, 'estimators_') and hasattr(self.regressor, 'apply'):  # RandomForest
+            trees = [estimator.tree_ for estimator in self.regressor.estimators_]
+            self.leaf_values = np.concatenate([tree.value[:, 0, 0] for tree in trees])
+            counts = np.array([tree.node_count for tree in trees])
+            self.offsets = np.concatenate([[0], np.cumsum(counts)[:-1]])
+
+    @property
+    def supported(self):
+        """트리별 예측값을 꺼낼 수 있는 모델인지 (예: HistGradientBoosting 은 분산을 제공하지 않음)."""
+        return self.leaf_values is not None
+
+    def tree_predictions(self, X):
+        """(n_samples, n_trees) 크기의 트리별 예측값."""
+        Xt = self.preprocessor.transform(X)
+        if self.offsets is None:
+            return self.leaf_values[self.regressor.leaf_indices(Xt)]
+        return self.leaf_values[self.regressor.apply(Xt) + self.offsets]
+
+    def predict(self, X, interval=DEFAULT_INTERVAL):
+        """
+        평균 예측값과 함께 표준편차 / 분위수 구간(interval=0.9 이면 5%~95%)을 배열로 반환합니다.
+        분산을 지원하지 않는 모델은 model.predict 결과와 None 을 돌려줍니다.
+        """
+        if not self.supported:
+            return {'mean': np.asarray(self.model.predict(X), dtype=np.float64),
+                    'std': None, 'lower': None, 'upper': None}
+        preds = self.tree_predictions(X)
+        lower, upper = np.quantile(preds, [(1 - interval) / 2, (1 + interval) / 2], axis=1)
+        return {
+            'mean': preds.mean(axis=1, dtype=np.float64),
+            'std': preds.std(axis=1, dtype=np.float64),
+            'lower': lower,
+            'upper': upper,
+        }
+
+
+def confidence_labels(mean, lower, upper):
+    """구간 폭이 예측값에 비해 좁을수록 높은 신뢰도 라벨을 붙입니다."""
+    if lower is None:
+        return np.full(len(mean), 'Unavailable', dtype=object)
+    relative_width = (upper - lower) / np.maximum(np.abs(mean), 1e-9)
+    labels = np.full(len(mean), 'Low', dtype=object)
+    for threshold, label in reversed(CONFIDENCE_LEVELS):
+        labels[relative_width < threshold] = label
+    # 구간이 없는 행 (예: 분산을 제공하지 않는 모델로 사전 계산된 점수)
+    labels[np.isnan(relative_width)] = 'Unavailable'
+    return labels
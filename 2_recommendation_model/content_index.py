@@ -0,0 +1,332 @@
+"""
+콘텐츠 매칭 인덱스 (크리에이터 bio <-> 캠페인 content_requirements)
+
+etl_nurihaus.py 가 적재한 creators.bio / campaigns.content_requirements 텍스트로
+캠페인 요구사항과 내용이 가장 비슷한 크리에이터 top-k 를 찾습니다.
+
+- 해시 n-gram(단어 1~2gram) TF-IDF: 어휘 사전이 없으므로 새 크리에이터를 추가해도 차원이 변하지 않습니다.
+- 인덱스는 (단어 해시 x 크리에이터) CSR 행렬(역색인)로 저장하여, 쿼리 한 건의 비용은
+  쿼리에 등장한 단어의 posting 길이 합에 비례합니다 (희소 행렬 곱 한 번).
+- top-k 는 0이 아닌 점수만 대상으로 argpartition 으로 선택합니다 (전체 정렬 없음).
+- 증분 갱신: 새 크리에이터와 bio 가 수정된 크리에이터(creators.updated_at, 마이그레이션 006)는 작은 세그먼트로
+  덧붙이고(기존 id 는 이전 세그먼트에서 무효화), 삭제된 크리에이터는 무효화합니다.
+  세그먼트가 많아지면 하나로 병합합니다. IDF 는 빌드 시점 값을 유지하므로 추가분이 많아지면 재빌드합니다.
+  (006 미적용 DB 에서는 새 크리에이터 추가 / 삭제만 반영되며, bio 수정은 build 로 반영해야 합니다.)
+
+사용 예시 (프로젝트 루트에서 실행):
+    python 2_recommendation_model/content_index.py build
+    python 2_recommendation_model/content_index.py update
+    python 2_recommendation_model/content_index.py query --campaign-id 1 2 3 --k 10
+    python 2_recommendation_model/content_index.py query --text "vegan skincare routine review"
+"""
+import argparse
+import json
+import os
+import shutil
+import time
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from sqlalchemy import text
+from sklearn.feature_extraction.text import HashingVectorizer
+from sklearn.preprocessing import normalize
+
+from db import get_engine
+from model_families import SAVED_MODELS_DIR
+
+INDEX_DIR = os.path.join(SAVED_MODELS_DIR, 'content_index')
+
+N_FEATURES = 2 ** 20
+NGRAM_RANGE = (1, 2)
+MAX_SEGMENTS = 8            # 세그먼트가 이보다 많아지면 병합
+REBUILD_RATIO = 0.5         # 빌드 이후 추가된 문서가 빌드 당시의 50%를 넘으면 재빌드 권장
+READ_CHUNKSIZE = 200_000
+
+CREATORS_QUERY = """
+    SELECT creator_id, bio FROM creators
+    WHERE creator_id > :after_id
+    ORDER BY creator_id
+"""
+# 새 크리에이터 + 마지막 색인 이후 수정된 크리에이터
+CHANGED_CREATORS_QUERY = """
+    SELECT creator_id, bio FROM creators
+    WHERE creator_id > :after_id OR updated_at > :since
+    ORDER BY creator_id
+"""
+CAMPAIGNS_QUERY = "SELECT campaign_id, content_requirements FROM campaigns WHERE campaign_id = ANY(:ids)"
+
+
+def build_vectorizer():
+    return HashingVectorizer(n_features=N_FEATURES, ngram_range=NGRAM_RANGE, alternate_sign=False,
+                             norm=None, dtype=np.float32)
+
+
+class ContentIndex:
+    """해시 TF-IDF 역색인. segments 는 (term_doc CSR[N_FEATURES x n], creator_ids, live 마스크) 목록입니다."""
+
+    def __init__(self, idf, segments=None, built_docs=0, added_docs=0, updated_at=None):
+        self.vectorizer = build_vectorizer()
+        self.idf = idf
+        self.segments = segments or []
+        self.built_docs = built_docs
+        self.added_docs = added_docs
+        self.updated_at = updated_at  # 마지막으로 반영한 creators.updated_at (ISO 문자열, 없으면 None)
+
+    # ------------------------------------------
+    # 빌드 / 증분 추가
+    # ------------------------------------------
+    @classmethod
+    def build(cls, chunks):
+        """(creator_ids, texts) 청크 이터레이터에서 IDF 를 계산하고 인덱스를 만듭니다."""
+        vectorizer = build_vectorizer()
+        ids, counts = [], []
+        doc_freq = np.zeros(N_FEATURES, dtype=np.int64)
+        for chunk_ids, texts in chunks:
+            tf = vectorizer.transform(texts)
+            doc_freq += np.bincount(tf.indices, minlength=N_FEATURES)
+            ids.append(np.asarray(chunk_ids, dtype=np.int64))
+            counts.append(tf)
+        n_docs = sum(len(i) for i in ids)
+        # sklearn TfidfTransformer(smooth_idf=True) 와 같은 식
+        idf = (np.log((1 + n_docs) / (1 + doc_freq)) + 1).astype(np.float32)
+
+        index = cls(idf, built_docs=n_docs)
+        if n_docs:
+            index.segments.append(index._make_segment(np.concatenate(ids), sparse.vstack(counts)))
+        return index
+
+    def _weight(self, tf):
+        """tf -> (1 + log tf) * idf -> L2 정규화 (행 = 문서)."""
+        tf = tf.tocsr(copy=True)
+        tf.data = (1 + np.log(tf.data)) * self.idf[tf.indices]
+        return normalize(tf, norm='l2', copy=False)
+
+    def _make_segment(self, creator_ids, tf):
+        term_doc = self._weight(tf).T.tocsr()
+        return {'term_doc': term_doc, 'ids': creator_ids, 'live': np.ones(len(creator_ids), dtype=bool)}
+
+    def add(self, creator_ids, texts):
+        """새 / 수정된 크리에이터를 추가합니다. 같은 id 가 이전 세그먼트에 있으면 무효화합니다."""
+        creator_ids = np.asarray(creator_ids, dtype=np.int64)
+        if not len(creator_ids):
+            return 0
+        for segment in self.segments:
+            segment['live'] &= ~np.isin(segment['ids'], creator_ids)
+        self.segments.append(self._make_segment(creator_ids, self.vectorizer.transform(texts)))
+        self.added_docs += len(creator_ids)
+        if len(self.segments) > MAX_SEGMENTS:
+            self.compact()
+        return len(creator_ids)
+
+    def remove(self, creator_ids):
+        """삭제된 크리에이터를 검색 대상에서 제외합니다 (열은 다음 compact 에서 제거)."""
+        creator_ids = np.asarray(creator_ids, dtype=np.int64)
+        removed = 0
+        for segment in self.segments:
+            hit = segment['live'] & np.isin(segment['ids'], creator_ids)
+            segment['live'] &= ~hit
+            removed += int(hit.sum())
+        return removed
+
+    def compact(self):
+        """모든 세그먼트를 하나로 병합하고 무효화된 열을 제거합니다."""
+        if len(self.segments) <= 1 and all(s['live'].all() for s in self.segments):
+            return
+        term_doc = sparse.hstack([s['term_doc'][:, s['live']] for s in self.segments]).tocsr()
+        ids = np.concatenate([s['ids'][s['live']] for s in self.segments])
+        self.segments = [{'term_doc': term_doc, 'ids': ids, 'live': np.ones(len(ids), dtype=bool)}]
+
+    @property
+    def n_docs(self):
+        return int(sum(s['live'].sum() for s in self.segments))
+
+    @property
+    def live_ids(self):
+        return np.concatenate([s['ids'][s['live']] for s in self.segments]) if self.segments else np.empty(0, np.int64)
+
+    @property
+    def max_creator_id(self):
+        return int(max((s['ids'].max() for s in self.segments if len(s['ids'])), default=0))
+
+    @property
+    def needs_rebuild(self):
+        return self.added_docs > REBUILD_RATIO * max(self.built_docs, 1)
+
+    # ------------------------------------------
+    # 검색
+    # ------------------------------------------
+    def query(self, texts, k=10):
+        """쿼리 텍스트마다 (creator_ids, scores) 를 점수 내림차순으로 반환합니다 (코사인 유사도)."""
+        Q = self._weight(self.vectorizer.transform(texts))
+        per_segment = [(Q @ s['term_doc']).tocsr() for s in self.segments]
+
+        results = []
+        for row in range(Q.shape[0]):
+            ids, scores = [], []
+            for segment, S in zip(self.segments, per_segment):
+                start, end = S.indptr[row], S.indptr[row + 1]
+                cols = S.indices[start:end]
+                alive = segment['live'][cols]
+                ids.append(segment['ids'][cols[alive]])
+                scores.append(S.data[start:end][alive])
+            ids = np.concatenate(ids) if ids else np.empty(0, dtype=np.int64)
+            scores = np.concatenate(scores) if scores else np.empty(0, dtype=np.float32)
+            if len(scores) > k:
+                top = np.argpartition(-scores, k - 1)[:k]
+                ids, scores = ids[top], scores[top]
+            order = np.argsort(-scores, kind='stable')
+            results.append((ids[order], scores[order]))
+        return results
+
+    # ------------------------------------------
+    # 저장 / 로드
+    # ------------------------------------------
+    def save(self, path=INDEX_DIR):
+        # 임시 폴더에 모두 쓴 뒤 교체하여, 저장 중인 인덱스를 다른 프로세스가 읽지 않도록 합니다.
+        tmp_dir = path + '.tmp'
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        os.makedirs(tmp_dir)
+        np.save(os.path.join(tmp_dir, 'idf.npy'), self.idf)
+        for i, segment in enumerate(self.segments):
+            sparse.save_npz(os.path.join(tmp_dir, f'segment_{i}.npz'), segment['term_doc'], compressed=False)
+            np.save(os.path.join(tmp_dir, f'segment_{i}_ids.npy'), segment['ids'])
+            np.save(os.path.join(tmp_dir, f'segment_{i}_live.npy'), segment['live'])
+        meta = {'n_features': N_FEATURES, 'ngram_range': NGRAM_RANGE, 'segments': len(self.segments),
+                'built_docs': self.built_docs, 'added_docs': self.added_docs, 'n_docs': self.n_docs,
+                'max_creator_id': self.max_creator_id, 'updated_at': self.updated_at}
+        with open(os.path.join(tmp_dir, 'meta.json'), 'w', encoding='utf-8') as f:
+            json.dump(meta, f, indent=2)
+
+        old_dir = path + '.old'
+        if os.path.exists(path):
+            os.replace(path, old_dir)
+        os.replace(tmp_dir, path)
+        shutil.rmtree(old_dir, ignore_errors=True)
+
+    @classmethod
+    def load(cls, path=INDEX_DIR):
+        meta_path = os.path.join(path, 'meta.json')
+        if not os.path.exists(meta_path):
+            raise FileNotFoundError(f"Content index not found at {path}. Run content_index.py build first.")
+        with open(meta_path, encoding='utf-8') as f:
+            meta = json.load(f)
+        if meta['n_features'] != N_FEATURES or tuple(meta['ngram_range']) != NGRAM_RANGE:
+            raise ValueError("Content index was built with different hashing settings; rebuild it.")
+        segments = [{
+            'term_doc': sparse.load_npz(os.path.join(path, f'segment_{i}.npz')).tocsr(),
+            'ids': np.load(os.path.join(path, f'segment_{i}_ids.npy')),
+            'live': np.load(os.path.join(path, f'segment_{i}_live.npy')),
+        } for i in range(meta['segments'])]
+        return cls(np.load(os.path.join(path, 'idf.npy')), segments, meta['built_docs'], meta['added_docs'],
+                   meta.get('updated_at'))
+
+
+# ==========================================
+# DB 연동
+# ==========================================
+def creator_chunks(engine, after_id=0, since=None, chunksize=READ_CHUNKSIZE):
+    """creator_id > after_id 인 (since 가 있으면 since 이후 수정된 행 포함) (creator_ids, bios) 청크."""
+    query, params = CREATORS_QUERY, {'after_id': after_id}
+    if since is not None:
+        query, params = CHANGED_CREATORS_QUERY, {'after_id': after_id, 'since': since}
+    for chunk in pd.read_sql(text(query), engine, params=params, chunksize=chunksize):
+        yield chunk['creator_id'].to_numpy(), chunk['bio'].fillna('').to_numpy()
+
+
+def creators_watermark(engine):
+    """creators.updated_at 의 최댓값 (ISO 문자열). 컬럼이 없으면(마이그레이션 006 미적용) None."""
+    with engine.connect() as conn:
+        has_column = conn.execute(text("""
+            SELECT 1 FROM information_schema.columns WHERE table_name = 'creators' AND column_name = 'updated_at'
+        """)).scalar()
+        if not has_column:
+            return None
+        latest = conn.execute(text("SELECT max(updated_at) FROM creators")).scalar()
+    return latest.isoformat() if latest else datetime.min.isoformat()
+
+
+def campaign_texts(engine, campaign_ids):
+    df = pd.read_sql(text(CAMPAIGNS_QUERY), engine, params={'ids': [int(i) for i in campaign_ids]})
+    return df.set_index('campaign_id')['content_requirements'].fillna('').reindex(campaign_ids).dropna()
+
+
+def build_from_db(engine, path=INDEX_DIR):
+    print(">>> [1/2] Building content index from creators.bio...")
+    started = time.perf_counter()
+    # 읽기 전에 워터마크를 잡아 두므로, 빌드 중에 수정된 행은 다음 update 에서 다시 반영됩니다.
+    watermark = creators_watermark(engine)
+    index = ContentIndex.build(creator_chunks(engine))
+    index.updated_at = watermark
+    print(f"   Indexed {index.n_docs:,} creators in {time.perf_counter() - started:.1f}s")
+    print(">>> [2/2] Saving index...")
+    index.save(path)
+    print(f"   Saved: {path}")
+    return index
+
+
+def update_from_db(engine, path=INDEX_DIR):
+    index = ContentIndex.load(path)
+    if index.needs_rebuild:
+        print("   Added creators exceed the rebuild ratio -> full rebuild (refresh IDF)")
+        return build_from_db(engine, path)
+    watermark = creators_watermark(engine)
+    since = index.updated_at if watermark else None
+    if watermark and since is None:
+        print("   Index has no updated_at watermark -> full rebuild")
+        return build_from_db(engine, path)
+    print(f">>> [1/2] Adding creators after creator_id={index.max_creator_id}"
+          + (f" or updated after {since}..." if since else " (no creators.updated_at: bio edits need build)..."))
+    db_ids = pd.read_sql(text("SELECT creator_id FROM creators"), engine)['creator_id'].to_numpy()
+    removed = index.remove(np.setdiff1d(index.live_ids, db_ids))
+    added = sum(index.add(ids, texts) for ids, texts in creator_chunks(engine, index.max_creator_id, since))
+    index.updated_at = watermark
+    print(f"   Added/updated {added:,}, removed {removed:,} creators ({len(index.segments)} segments)")
+    print(">>> [2/2] Saving index...")
+    index.save(path)
+    return index
+
+
+def main():
+    parser = argparse.ArgumentParser(description="크리에이터 bio / 캠페인 요구사항 콘텐츠 매칭 인덱스")
+    sub = parser.add_subparsers(dest='command', required=True)
+    sub.add_parser('build', help="creators 테이블 전체로 인덱스를 새로 만듭니다")
+    sub.add_parser('update', help="새 / 수정된 크리에이터를 반영하고 삭제된 크리에이터를 제외합니다")
+    query = sub.add_parser('query', help="캠페인과 내용이 비슷한 크리에이터 top-k")
+    query.add_argument('--campaign-id', type=int, nargs='+', help="campaigns.campaign_id 목록")
+    query.add_argument('--text', help="직접 입력한 캠페인 요구사항")
+    query.add_argument('--k', type=int, default=10)
+    for p in sub.choices.values():
+        p.add_argument('--index-dir', default=INDEX_DIR)
+    args = parser.parse_args()
+
+    if args.command == 'query':
+        index = ContentIndex.load(args.index_dir)
+        if args.text:
+            queries = pd.Series([args.text], index=['text'])
+        else:
+            queries = campaign_texts(get_engine(), args.campaign_id or [])
+        started = time.perf_counter()
+        results = index.query(queries.tolist(), k=args.k)
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        for key, requirements, (ids, scores) in zip(queries.index, queries, results):
+            print(f"\n[{key}] {requirements}")
+            for creator_id, score in zip(ids, scores):
+                print(f"   creator_id={creator_id:<10} score={score:.3f}")
+        print(f"\n>>> {len(queries)} queries x {index.n_docs:,} creators in {elapsed_ms:.1f} ms "
+              f"({elapsed_ms / max(len(queries), 1):.1f} ms/query)")
+        return
+
+    engine = get_engine()
+    if args.command == 'build':
+        build_from_db(engine, args.index_dir)
+    else:
+        update_from_db(engine, args.index_dir)
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except Exception as e:
+        print(f"Content Index Error: {e}")
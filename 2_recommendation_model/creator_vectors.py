@@ -0,0 +1,89 @@
+"""
+크리에이터 밀집 벡터 (ANN 인덱스 입력)
+
+bio 텍스트와 수치/범주 피처를 하나의 L2 정규화 float32 벡터로 만듭니다.
+- bio      : 해시 단어 1~2gram (2^12 차원) -> 고정 시드 가우시안 랜덤 프로젝션 (TEXT_DIM 차원)
+- 팔로워 수 : log1p 후 표준화 (1차원)
+- niche / platform : One-Hot
+각 블록에 가중치를 곱한 뒤 이어 붙이므로 내적 = 코사인 유사도입니다.
+
+인코더 설정(어휘 목록, 팔로워 통계, 시드)은 JSON 으로 저장하여 인덱스와 함께 보관합니다.
+"""
+import numpy as np
+import pandas as pd
+from sqlalchemy import text
+from sklearn.feature_extraction.text import HashingVectorizer
+
+HASH_FEATURES = 2 ** 12
+TEXT_DIM = 64
+BLOCK_WEIGHTS = {'text': 1.0, 'followers': 0.5, 'niche': 0.5, 'platform': 0.5}
+
+CREATORS_QUERY = """
+    SELECT creator_id, bio, follower_count, niche, platform FROM creators
+    WHERE creator_id > :after_id
+    ORDER BY creator_id
+"""
+
+
+class CreatorEncoder:
+    def __init__(self, niches, platforms, follower_mean, follower_std, seed=42):
+        self.niches = list(niches)
+        self.platforms = list(platforms)
+        self.follower_mean = float(follower_mean)
+        self.follower_std = float(follower_std) or 1.0
+        self.seed = int(seed)
+        self.vectorizer = HashingVectorizer(n_features=HASH_FEATURES, ngram_range=(1, 2), alternate_sign=False,
+                                            norm='l2', dtype=np.float32)
+        rng = np.random.default_rng(self.seed)
+        self.projection = (rng.standard_normal((HASH_FEATURES, TEXT_DIM)) / np.sqrt(TEXT_DIM)).astype(np.float32)
+
+    @classmethod
+    def fit(cls, df, seed=42):
+        followers = np.log1p(df['follower_count'].fillna(0).to_numpy(dtype=np.float64))
+        return cls(sorted(df['niche'].dropna().unique()), sorted(df['platform'].dropna().unique()),
+                   followers.mean(), followers.std(), seed)
+
+    @property
+    def dim(self):
+        return TEXT_DIM + 1 + len(self.niches) + len(self.platforms)
+
+    def _one_hot(self, values, vocab):
+        codes = pd.Categorical(values, categories=vocab).codes
+        out = np.zeros((len(values), len(vocab)), dtype=np.float32)
+        known = codes >= 0
+        out[np.flatnonzero(known), codes[known]] = 1.0
+        return out
+
+    def transform(self, df):
+        """bio / follower_count / niche / platform 컬럼의 DataFrame -> (n, dim) float32. 결측값은 0 벡터 블록."""
+        text_vec = np.asarray(self.vectorizer.transform(df['bio'].fillna('')) @ self.projection, dtype=np.float32)
+        norms = np.linalg.norm(text_vec, axis=1, keepdims=True)
+        text_vec /= np.maximum(norms, 1e-12)
+
+        followers = np.log1p(df['follower_count'].to_numpy(dtype=np.float64))
+        followers = np.nan_to_num((followers - self.follower_mean) / self.follower_std).astype(np.float32)
+
+        vectors = np.hstack([
+            BLOCK_WEIGHTS['text'] * text_vec,
+            BLOCK_WEIGHTS['followers'] * followers[:, None],
+            BLOCK_WEIGHTS['niche'] * self._one_hot(df['niche'], self.niches),
+            BLOCK_WEIGHTS['platform'] * self._one_hot(df['platform'], self.platforms),
+        ])
+        vectors /= np.maximum(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12)
+        return vectors
+
+    def to_config(self):
+        return {'niches': self.niches, 'platforms': self.platforms, 'follower_mean': self.follower_mean,
+                'follower_std': self.follower_std, 'seed': self.seed, 'hash_features': HASH_FEATURES,
+                'text_dim': TEXT_DIM, 'block_weights': BLOCK_WEIGHTS}
+
+    @classmethod
+    def from_config(cls, config):
+        if config['hash_features'] != HASH_FEATURES or config['text_dim'] != TEXT_DIM:
+            raise ValueError("Creator encoder settings changed; rebuild the ANN index.")
+        return cls(config['niches'], config['platforms'], config['follower_mean'], config['follower_std'],
+                   config['seed'])
+
+
+def load_creators(engine, after_id=0):
+    return pd.read_sql(text(CREATORS_QUERY), engine, params={'after_id': after_id})
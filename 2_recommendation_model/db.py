@@ -0,0 +1,56 @@
+"""
+DB 연결 (복호화된 DATABASE_URL + 프로세스당 SQLAlchemy 엔진 하나)
+
+main.py 처럼 DB 만 필요한 곳이 model_families 를 import 하면 sklearn / scipy / joblib 까지 함께 로드되므로,
+연결 관련 코드는 sqlalchemy 만 쓰는 이 모듈에 둡니다. model_families 도 같은 함수를 다시 내보냅니다.
+
+get_engine() 은 처음 호출할 때 엔진을 만들고 이후에는 같은 엔진(커넥션 풀)을 돌려줍니다.
+fork 된 워커 프로세스(score_creators.py 등)는 부모의 커넥션을 공유하면 안 되므로 프로세스마다 새로 만듭니다.
+"""
+import os
+import threading
+
+from sqlalchemy import create_engine
+from dotenv import load_dotenv
+from cryptography.fernet import Fernet
+
+def get_decrypted_db_url():
+    """환경변수에서 암호화된 DB URL을 복호화하여 반환합니다."""
+    key = os.getenv("ENCRYPTION_KEY")
+    encrypted_url = os.getenv("ENCRYPTED_DATABASE_URL")
+
+    if not key or not encrypted_url:
+        # fallback to the old plain text DATABASE_URL for backward compatibility
+        plain_db_url = os.getenv("DATABASE_URL")
+        if plain_db_url:
+            print("Warning: Using plain text DATABASE_URL. For better security, please use ENCRYPTION_KEY and ENCRYPTED_DATABASE_URL.")
+            return plain_db_url
+        raise ValueError("ENCRYPTION_KEY and ENCRYPTED_DATABASE_URL must be set, or a plain DATABASE_URL must be provided.")
+
+    try:
+        f = Fernet(key.encode('utf-8'))
+        decrypted_url = f.decrypt(encrypted_url.encode('utf-8')).decode('utf-8')
+        return decrypted_url
+    except Exception as e:
+        raise ValueError(f"Failed to decrypt DATABASE_URL. Check your key and encrypted URL. Error: {e}")
+
+# .env 파일에서 환경변수 로드
+load_dotenv()
+
+# 모듈 전역 엔진 (get_engine 에서 한 번만 생성, _engine_pid: 엔진을 만든 프로세스)
+_engine = None
+_engine_pid = None
+_engine_lock = threading.Lock()
+
+
+def get_engine():
+    global _engine, _engine_pid
+    if _engine is None or _engine_pid != os.getpid():
+        with _engine_lock:
+            if _engine is None or _engine_pid != os.getpid():
+                if _engine is not None:
+                    # fork 로 물려받은 부모의 커넥션은 닫지 않고 버립니다 (부모가 계속 사용).
+                    _engine.dispose(close=False)
+                _engine = create_engine(get_decrypted_db_url())
+                _engine_pid = os.getpid()
+    return _engine
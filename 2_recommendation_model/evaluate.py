@@ -0,0 +1,234 @@
+"""
+교차 검증 평가 리포트 (train.py 의 80/20 분할 1회 평가 대체용)
+
+- K-fold 와 시간 기준 분할(TimeSeriesSplit: roi 는 created_at, sales 는 start_date 순서) 두 가지 방식으로 평가
+- fold 별 전처리 결과는 tune.py 와 같은 joblib.Memory 캐시에 저장하여 재실행 / 다른 모델 후보 평가 시 재사용
+- fold 학습은 joblib 으로 모든 코어에 병렬 실행 (개별 모델은 n_jobs=1) -> 전체 시간이 대략 모델 1회 학습 시간
+- fold 별 / 전체(평균, 표준편차) R2 / RMSE / MAE 와 학습 / 예측 시간을 레지스트리 버전 폴더의 evaluation.json 에 저장
+
+평가 대상 모델 설정은 레지스트리 버전의 파이프라인을 그대로 복제(clone)하여 사용하고,
+sklearn 파이프라인이 아닌 경우(CompactPipeline 등)에는 --engine 기본 설정으로 다시 만듭니다.
+
+사용 예시 (프로젝트 루트에서 실행):
+    python 2_recommendation_model/evaluate.py --family roi                      # roi LATEST, 5-fold + 시간 분할
+    python 2_recommendation_model/evaluate.py --family sales --folds 3 --scheme time
+    python 2_recommendation_model/evaluate.py --family roi --version v20261019-160219 --sample 200000
+"""
+import argparse
+import json
+import os
+import time
+from datetime import datetime
+
+import numpy as np
+from joblib import Memory, Parallel, delayed
+from sklearn.base import clone
+from sklearn.metrics import mean_absolute_error, mean_squared_error, r2_score
+from sklearn.model_selection import KFold, TimeSeriesSplit
+from sklearn.pipeline import Pipeline
+
+from feature_store import CreatorFeatureStore, store_input_columns
+from model_families import ENGINES, FAMILIES, build_model, feature_columns, load_training_frame
+from model_registry import latest_version, load_model, read_metadata, version_dir
+from tune import CACHE_DIR
+
+SCHEMES = ['kfold', 'time']
+METRICS = ['r2', 'rmse', 'mae']
+REPORT_NAME = 'evaluation.json'
+
+
+# ==========================================
+# 1. 분할 / 전처리 캐싱
+# ==========================================
+def fold_splits(df, scheme, folds, time_column=None, random_state=42):
+    """(학습 행 인덱스, 검증 행 인덱스) 목록. 시간 분할은 시간순으로 정렬한 뒤 과거 -> 미래로 검증합니다."""
+    if scheme == 'kfold':
+        splitter = KFold(n_splits=folds, shuffle=True, random_state=random_state)
+        return [(train, valid) for train, valid in splitter.split(df)]
+    order = np.argsort(df[time_column].to_numpy(), kind='stable')
+    return [(order[train], order[valid]) for train, valid in TimeSeriesSplit(n_splits=folds).split(order)]
+
+
+def _transform_folds(preprocessor, X, splits):
+    """fold 마다 전처리기를 학습 행으로 fit 하고 학습 / 검증 행렬로 변환합니다 (joblib.Memory 캐싱 대상)."""
+    out = []
+    for train, valid in splits:
+        fitted = clone(preprocessor)
+        Xt_train = fitted.fit_transform(X.iloc[train])
+        Xt_valid = fitted.transform(X.iloc[valid])
+        # 트리 모델은 밀집 float32 행렬에서 가장 빠르게 동작합니다.
+        if hasattr(Xt_train, 'toarray'):
+            Xt_train, Xt_valid = Xt_train.toarray(), Xt_valid.toarray()
+        out.append((Xt_train.astype(np.float32), Xt_valid.astype(np.float32)))
+    return out
+
+
+def cached_transform_folds(preprocessor, X, splits, cache_dir=CACHE_DIR):
+    """같은 전처리 설정 / 입력 / 분할이면 캐시된 fold 행렬을 그대로 돌려줍니다."""
+    return Memory(cache_dir, verbose=0).cache(_transform_folds)(preprocessor, X, splits)
+
+
+# ==========================================
+# 2. fold 학습 / 평가
+# ==========================================
+def _fit_fold(regressor, Xt_train, y_train, Xt_valid, y_valid):
+    # fold 단위로 병렬화하므로 개별 모델은 단일 코어로 학습합니다.
+    model = clone(regressor)
+    if 'n_jobs' in model.get_params():
+        model.set_params(n_jobs=1)
+    started = time.perf_counter()
+    model.fit(Xt_train, y_train)
+    fit_seconds = time.perf_counter() - started
+    started = time.perf_counter()
+    y_pred = model.predict(Xt_valid)
+    predict_seconds = time.perf_counter() - started
+    return {
+        'train_rows': len(y_train),
+        'valid_rows': len(y_valid),
+        'r2': r2_score(y_valid, y_pred),
+        'rmse': float(np.sqrt(mean_squared_error(y_valid, y_pred))),
+        'mae': mean_absolute_error(y_valid, y_pred),
+        'fit_seconds': fit_seconds,
+        'predict_seconds': predict_seconds,
+        'predict_us_per_row': predict_seconds / len(y_valid) * 1e6,
+    }
+
+
+def aggregate(fold_results):
+    summary = {}
+    for key in METRICS + ['fit_seconds', 'predict_seconds', 'predict_us_per_row']:
+        values = np.array([r[key] for r in fold_results], dtype=float)
+        summary[key] = {'mean': float(values.mean()), 'std': float(values.std(ddof=1)) if len(values) > 1 else 0.0,
+                        'min': float(values.min()), 'max': float(values.max())}
+    return summary
+
+
+def cross_validate(pipeline, df, family, scheme='kfold', folds=5, n_jobs=-1, random_state=42, columns=None):
+    """파이프라인 설정(미학습)으로 한 가지 분할 방식의 교차 검증을 실행하고 결과 dict 를 반환합니다."""
+    spec = FAMILIES[family]
+    X = df[columns or feature_columns(family)]
+    y = df[spec['target']].to_numpy()
+    time_column = spec.get('time_column')
+    splits = fold_splits(df, scheme, folds, time_column, random_state)
+
+    started = time.perf_counter()
+    transformed = cached_transform_folds(pipeline.named_steps['preprocessor'], X, splits)
+    preprocess_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    results = Parallel(n_jobs=n_jobs)(
+        delayed(_fit_fold)(pipeline.named_steps['regressor'], Xt_train, y[train], Xt_valid, y[valid])
+        for (train, valid), (Xt_train, Xt_valid) in zip(splits, transformed)
+    )
+    fit_wall_seconds = time.perf_counter() - started
+
+    for i, ((_, valid), result) in enumerate(zip(splits, results)):
+        result['fold'] = i + 1
+        if scheme == 'time':
+            times = df[time_column].iloc[valid]
+            result['valid_from'], result['valid_to'] = str(times.min()), str(times.max())
+    return {
+        'scheme': scheme,
+        'folds': results,
+        'aggregate': aggregate(results),
+        'preprocess_seconds': preprocess_seconds,
+        'fit_wall_seconds': fit_wall_seconds,
+        # 병렬 실행 덕분에 fold 학습 + 예측 시간의 합보다 얼마나 빨리 끝났는지
+        'parallel_speedup': sum(r['fit_seconds'] + r['predict_seconds'] for r in results) / fit_wall_seconds,
+    }
+
+
+# ==========================================
+# 3. 평가 대상 / 리포트
+# ==========================================
+def candidate_pipeline(family, version, engine=None, extra_numeric=()):
+    """레지스트리 버전의 sklearn 파이프라인 설정을 복제합니다 (불가능하면 engine 기본 설정으로 생성)."""
+    metadata = read_metadata(family, version)
+    if engine is None:
+        model, _ = load_model(family, metadata['version'], artifact='full')
+        if isinstance(model, Pipeline):
+            return clone(model), 'registered'
+        engine = metadata['extra'].get('engine', 'rf')
+        print(f"   {type(model).__name__} cannot be cloned, rebuilding engine '{engine}'")
+    return build_model(family, engine, extra_numeric=extra_numeric), f"engine:{engine}"
+
+
+def evaluate_candidate(family, pipeline, df, version, schemes=SCHEMES, folds=5, n_jobs=-1, source='registered',
+                       random_state=42, columns=None):
+    """
+    교차 검증을 실행하고 리포트를 버전 폴더의 evaluation.json 에 저장한 뒤 리포트를 반환합니다.
+    columns: 입력 컬럼 (기본: 패밀리 피처, train.py --features 처럼 피처 스토어 컬럼이 추가된 경우 지정)
+    """
+    time_column = FAMILIES[family].get('time_column')
+    report = {
+        'family': family,
+        'version': version,
+        'evaluated_at': datetime.now().isoformat(timespec='seconds'),
+        'candidate': {'source': source, 'preprocessor': type(pipeline.named_steps['preprocessor']).__name__,
+                      'regressor': type(pipeline.named_steps['regressor']).__name__,
+                      'params': pipeline.named_steps['regressor'].get_params()},
+        'rows': len(df),
+        'columns': list(columns or feature_columns(family)),
+        'n_jobs': n_jobs,
+        'schemes': {},
+    }
+    started = time.perf_counter()
+    for scheme in schemes:
+        if scheme == 'time' and (time_column not in df.columns or df[time_column].isna().all()):
+            print(f"   time: skipped ('{time_column}' not available)")
+            continue
+        result = cross_validate(pipeline, df, family, scheme, folds, n_jobs, random_state, columns)
+        report['schemes'][scheme] = result
+        agg = result['aggregate']
+        print(f"   {scheme:<5} {folds} folds: R2 {agg['r2']['mean']:.3f} ± {agg['r2']['std']:.3f}, "
+              f"RMSE {agg['rmse']['mean']:.3f} ± {agg['rmse']['std']:.3f}, "
+              f"fit {agg['fit_seconds']['mean']:.1f}s/fold, predict {agg['predict_us_per_row']['mean']:.2f} us/row "
+              f"(preprocess {result['preprocess_seconds']:.1f}s, folds {result['fit_wall_seconds']:.1f}s wall, "
+              f"x{result['parallel_speedup']:.1f})")
+    report['wall_seconds'] = time.perf_counter() - started
+
+    path = os.path.join(version_dir(family, version), REPORT_NAME)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2, default=str)
+    print(f"   Evaluation report: {path}")
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="K-fold / 시간 분할 교차 검증 평가 리포트")
+    parser.add_argument('--family', choices=list(FAMILIES), default='roi')
+    parser.add_argument('--version', help="평가할 레지스트리 버전 (기본: LATEST), 리포트도 이 버전 폴더에 저장")
+    parser.add_argument('--engine', choices=ENGINES, help="등록된 파이프라인 대신 이 엔진의 기본 설정으로 평가")
+    parser.add_argument('--folds', type=int, default=5)
+    parser.add_argument('--scheme', choices=SCHEMES + ['both'], default='both')
+    parser.add_argument('--n-jobs', type=int, default=-1, help="병렬 작업 수 (-1: 모든 코어)")
+    parser.add_argument('--sample', type=int, help="학습 데이터가 클 때 무작위로 N행만 사용")
+    args = parser.parse_args()
+
+    version = args.version or latest_version(args.family)
+    print(f">>> [1/3] Preparing candidate: {args.family}/{version}...")
+    # train.py --features 로 학습한 버전이면 피처 스토어 컬럼도 입력에 포함합니다.
+    columns = store_input_columns(feature_columns(args.family), read_metadata(args.family, version))
+    extra_numeric = columns[len(feature_columns(args.family)):]
+    pipeline, source = candidate_pipeline(args.family, version, args.engine, extra_numeric)
+    print(f"   {type(pipeline.named_steps['regressor']).__name__} ({source})")
+
+    print(f">>> [2/3] Fetching '{args.family}' training data from Database...")
+    df = load_training_frame(args.family)
+    if args.sample and len(df) > args.sample:
+        df = df.sample(n=args.sample, random_state=42)
+    if extra_numeric:
+        df = CreatorFeatureStore.load().attach(df)
+        print(f"   Feature store columns: {', '.join(extra_numeric)}")
+    print(f"   Data loaded: {len(df)} records")
+
+    print(f">>> [3/3] Cross-validating ({args.folds} folds, n_jobs={args.n_jobs})...")
+    schemes = SCHEMES if args.scheme == 'both' else [args.scheme]
+    evaluate_candidate(args.family, pipeline, df, version, schemes, args.folds, args.n_jobs, source, columns=columns)
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except Exception as e:
+        print(f"Evaluation Error: {e}")
@@ -0,0 +1,87 @@
+"""
+슬림 서빙 아티팩트 내보내기
+
+레지스트리의 RandomForest / CompactForest 모델을 sklearn 없이 로드할 수 있는 형태(npz + JSON)로 바꿔
+같은 버전 폴더의 slim/ 에 저장합니다. 서빙(main.py)은 slim/ 이 있으면 이것을 먼저 사용하므로
+joblib / sklearn / pandas 를 import 하지 않고 모델을 올릴 수 있습니다.
+
+저장 전에 원본 모델과 슬림 모델의 예측값을 같은 입력에서 비교합니다.
+- 입력 그리드: 학습된 모든 범주 x 팔로워 구간 (알 수 없는 범주 포함)
+- 실제 학습 데이터 샘플: threshold 경계에 걸리는 실제 값(분기 반올림 오류)을 잡기 위함
+
+사용 예시 (프로젝트 루트에서 실행):
+    python 2_recommendation_model/export_slim.py                 # roi LATEST
+    python 2_recommendation_model/export_slim.py --family roi --version v20261019-164129
+    python 2_recommendation_model/export_slim.py --check-rows 0   # DB 없이 그리드만 비교
+"""
+import argparse
+import itertools
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+from compact_forest import CompactPipeline
+from model_families import feature_columns, load_training_frame
+from model_registry import load_model, save_slim
+
+NUMERIC_GRID = np.geomspace(100, 10_000_000, 25)
+
+
+def check_grid(preprocessor, columns):
+    """학습된 모든 범주 조합 x 수치형 구간 입력 DataFrame (알 수 없는 범주 1행 포함)."""
+    choices = [b['categories'] + ['__unknown__'] if 'categories' in b else NUMERIC_GRID for b in preprocessor.blocks]
+    names = [b['column'] for b in preprocessor.blocks]
+    return pd.DataFrame(list(itertools.product(*choices)), columns=names)[columns]
+
+
+def training_sample(family, rows, random_state=42):
+    """DB 학습 데이터에서 rows 행을 무작위로 뽑습니다."""
+    df = load_training_frame(family)
+    if len(df) > rows:
+        df = df.sample(rows, random_state=random_state)
+    return df[feature_columns(family)]
+
+
+def directory_bytes(path):
+    return sum(os.path.getsize(os.path.join(path, f)) for f in os.listdir(path))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="sklearn 없이 로드 가능한 슬림 서빙 아티팩트 내보내기")
+    parser.add_argument('--family', default='roi')
+    parser.add_argument('--version', help="모델 버전 (기본: LATEST)")
+    parser.add_argument('--tolerance', type=float, default=1e-4, help="원본 대비 허용 최대 예측 오차")
+    parser.add_argument('--check-rows', type=int, default=100_000, help="비교에 쓸 실제 학습 데이터 행 수 (0: 생략)")
+    args = parser.parse_args()
+
+    print(">>> [1/3] Loading full model...")
+    model, metadata = load_model(args.family, args.version, artifact='full')
+    slim = CompactPipeline.slim(model)
+    print(f"   {args.family}/{metadata['version']}: {type(model).__name__} -> slim "
+          f"({slim.named_steps['regressor'].n_estimators} trees, {slim.named_steps['preprocessor'].n_features} features)")
+
+    print(">>> [2/3] Checking predictions...")
+    inputs = {'grid': check_grid(slim.named_steps['preprocessor'], feature_columns(args.family))}
+    if args.check_rows:
+        inputs['training rows'] = training_sample(args.family, args.check_rows)
+    for name, X in inputs.items():
+        max_diff = float(np.max(np.abs(model.predict(X) - slim.predict(X))))
+        print(f"   {name}: {len(X):,} inputs, max |diff| = {max_diff:.2e}")
+        if max_diff > args.tolerance:
+            raise ValueError(f"Slim model predictions differ on {name} by {max_diff:.2e} (> {args.tolerance})")
+
+    print(">>> [3/3] Saving slim artifact...")
+    path = save_slim(args.family, metadata['version'], slim)
+    started = time.perf_counter()
+    load_model(args.family, metadata['version'], artifact='slim')
+    print(f"   Saved: {path} ({directory_bytes(path) / 1024 ** 2:.1f} MB, "
+          f"full artifact {metadata['artifact_bytes'] / 1024 ** 2:.1f} MB), loads in {time.perf_counter() - started:.2f}s")
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except Exception as e:
+        print(f"Export Error: {e}")
@@ -0,0 +1,344 @@
+"""
+크리에이터 인게이지먼트 피처 스토어 (creator_id 기준 사전 계산 피처)
+
+README 는 인게이지먼트 / 콘텐츠 성향이 핵심 피처라고 하지만, 크리에이터별로 게시물을 모두 훑어야 하므로
+train.py 는 follower_count / niche / platform 만 사용해 왔습니다. 이 배치는 원본 데이터를 한 번만 읽어
+크리에이터별 집계를 벡터 연산(groupby)으로 계산하고, creator_id 로 정렬된 Parquet 파일 하나로 저장합니다.
+
+- post_info.txt (탭 구분, 헤더 없음: post_id, username, is_sponsored) -> 청크 단위 groupby 로
+  dataset_post_count (게시물 수), sponsored_post_count (광고 게시물 수), sponsored_ratio
+- 프로필 파일 (users_influencers_SPOD, profile_collector.py 형식의 첫 줄) -> post_count (계정 전체 게시물 수),
+  engagement_rate (최근 게시물 평균 (좋아요 + 댓글) / 팔로워, 수집기가 계산한 값이 있을 때만)
+- creators 테이블 (username -> creator_id) 로 조인합니다. matches 의 ROI 는 사용하지 않습니다 (타깃 누수 방지).
+
+값이 없는 크리에이터는 결측값 대신 기본값(알려진 값의 중앙값 / 전체 광고 비율 / 0)으로 채웁니다.
+compact_forest 슬림 모델은 NaN 분기를 지원하지 않기 때문입니다. 기본값은 Parquet 메타데이터에 함께 저장되어
+스토어에 없는 creator_id (또는 creator_id 없는 /predict 요청)에도 같은 값이 쓰입니다.
+
+조회(CreatorFeatureStore): creator_id 정렬 배열 + searchsorted 로 단건 / 배치 조회 (score_creators.CreatorScores 와 같은 방식).
+- train.py --features          : 학습 데이터에 피처를 붙여 'roi' 모델을 학습 (입력 컬럼 = ROI 피처 + FEATURE_COLUMNS)
+- main.py /predict             : 모델이 스토어 피처로 학습되었으면 creator_id 로 조회해 입력에 붙이고, 응답에도 피처를 포함
+- score_creators.py / portfolio.py : 같은 방식으로 입력에 붙여 예측
+
+사용 예시 (프로젝트 루트에서 실행):
+    python 2_recommendation_model/feature_store.py build                          # 기본 데이터 경로로 전체 빌드
+    python 2_recommendation_model/feature_store.py build --posts /data/post_info.txt --profiles /data/users_influencers_SPOD
+    python 2_recommendation_model/feature_store.py lookup 1 2 3
+    python 2_recommendation_model/feature_store.py benchmark --batch 1000
+"""
+import argparse
+import json
+import os
+import time
+from datetime import datetime
+
+import numpy as np
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(script_dir)
+DATASET_DIR = os.path.join(project_root, '1_data_simulation', 'influencer_and_brand_dataset')
+DEFAULT_POSTS_PATH = os.path.join(DATASET_DIR, 'post_info.txt')
+DEFAULT_PROFILES_DIR = os.path.join(DATASET_DIR, 'users_influencers_SPOD')
+STORE_PATH = os.path.join(script_dir, 'saved_models', 'feature_store', 'creator_features.parquet')
+
+FEATURE_COLUMNS = ['engagement_rate', 'post_count', 'dataset_post_count', 'sponsored_post_count', 'sponsored_ratio']
+METADATA_KEY = b'nurihaus.feature_store'
+
+POSTS_CHUNK_ROWS = 1_000_000
+
+# 프로필 첫 줄의 필드 위치 (profile_collector.PROFILE_COLUMNS, 원본 SPOD 파일에는 engagement_rate 가 없을 수 있음)
+PROFILE_USERNAME, PROFILE_POSTS, PROFILE_ENGAGEMENT = 0, 3, 8
+
+
+# ==========================================
+# 1. 원본 데이터 집계 (벡터 연산)
+# ==========================================
+def post_aggregates(path=DEFAULT_POSTS_PATH, chunk_rows=POSTS_CHUNK_ROWS):
+    """post_info.txt -> username 별 dataset_post_count / sponsored_post_count DataFrame (청크별 groupby 후 합산)."""
+    import pandas as pd
+
+    parts = []
+    reader = pd.read_csv(path, sep='\t', header=None, usecols=[1, 2], names=['username', 'is_sponsored'],
+                         dtype={'username': str}, chunksize=chunk_rows)
+    for chunk in reader:
+        sponsored = (pd.to_numeric(chunk['is_sponsored'], errors='coerce') == 1).astype(np.int64)
+        parts.append(sponsored.groupby(chunk['username'], sort=False).agg(['size', 'sum']))
+    if not parts:
+        return pd.DataFrame(columns=['username', 'dataset_post_count', 'sponsored_post_count'])
+    # 같은 username 이 여러 청크에 걸칠 수 있으므로 청크별 집계를 한 번 더 합산합니다.
+    totals = pd.concat(parts).groupby(level=0, sort=False).sum()
+    totals.index.name = 'username'
+    return totals.rename(columns={'size': 'dataset_post_count', 'sum': 'sponsored_post_count'}).reset_index()
+
+
+def iter_profile_fields(directory, max_files=None):
+    """프로필 파일 첫 줄에서 (username, 게시물 수, 인게이지먼트율) 문자열을 꺼냅니다 (파일 목록 전체를 만들지 않음)."""
+    with os.scandir(directory) as entries:
+        for i, entry in enumerate(e for e in entries if e.is_file()):
+            if max_files is not None and i >= max_files:
+                break
+            try:
+                with open(entry.path, 'r', encoding='utf-8', errors='ignore') as f:
+                    line = f.readline().rstrip('\n').split('\t')
+            except OSError:
+                continue
+            if len(line) >= 8 and line[0]:
+                yield (line[PROFILE_USERNAME], line[PROFILE_POSTS],
+                       line[PROFILE_ENGAGEMENT] if len(line) > PROFILE_ENGAGEMENT else '')
+
+
+def profile_aggregates(directory=DEFAULT_PROFILES_DIR, max_files=None):
+    """프로필 파일 -> username 별 post_count / engagement_rate DataFrame (숫자 변환은 한 번에 벡터로)."""
+    import pandas as pd
+
+    frame = pd.DataFrame(list(iter_profile_fields(directory, max_files)),
+                         columns=['username', 'post_count', 'engagement_rate'])
+    frame['post_count'] = pd.to_numeric(frame['post_count'], errors='coerce')
+    frame['engagement_rate'] = pd.to_numeric(frame['engagement_rate'], errors='coerce')
+    return frame.drop_duplicates('username')
+
+
+def build_features(creators, posts=None, profiles=None):
+    """
+    creators(creator_id, username) 에 집계를 붙여 creator_id 정렬 피처 DataFrame 과 기본값 dict 를 반환합니다.
+    posts / profiles 가 None 이면 해당 피처는 모두 기본값이 됩니다.
+    """
+    import pandas as pd
+
+    frame = creators[['creator_id', 'username']].drop_duplicates('creator_id')
+    if posts is not None:
+        frame = frame.merge(posts, on='username', how='left')
+    if profiles is not None:
+        frame = frame.merge(profiles, on='username', how='left')
+    for column in FEATURE_COLUMNS[:4]:
+        if column not in frame.columns:
+            frame[column] = np.nan
+
+    total_posts = np.nansum(frame['dataset_post_count'].to_numpy(dtype=np.float64))
+    total_sponsored = np.nansum(frame['sponsored_post_count'].to_numpy(dtype=np.float64))
+    defaults = {
+        'engagement_rate': _median_or(frame['engagement_rate'], 0.0),
+        'post_count': _median_or(frame['post_count'], 0.0),
+        'dataset_post_count': 0.0,
+        'sponsored_post_count': 0.0,
+        'sponsored_ratio': float(total_sponsored / total_posts) if total_posts else 0.0,
+    }
+    posted = frame['dataset_post_count'].fillna(0).to_numpy(dtype=np.float64)
+    sponsored = frame['sponsored_post_count'].fillna(0).to_numpy(dtype=np.float64)
+    frame['sponsored_ratio'] = np.divide(sponsored, posted, out=np.full(len(frame), np.nan), where=posted > 0)
+
+    coverage = {'posts': int((posted > 0).sum()), 'profiles': int(frame['post_count'].notna().sum()),
+                'engagement': int(frame['engagement_rate'].notna().sum())}
+    out = pd.DataFrame({'creator_id': frame['creator_id'].to_numpy(dtype=np.int64)})
+    for column in FEATURE_COLUMNS:
+        out[column] = frame[column].fillna(defaults[column]).to_numpy(dtype=np.float32)
+    return out.sort_values('creator_id', kind='stable', ignore_index=True), defaults, coverage
+
+
+def _median_or(series, fallback):
+    values = series.dropna()
+    return float(values.median()) if len(values) else fallback
+
+
+# ==========================================
+# 2. 저장 (Parquet) / 조회
+# ==========================================
+def write_store(features, defaults, path=STORE_PATH, sources=None, coverage=None):
+    """피처 DataFrame 을 Parquet 으로 저장합니다 (임시 파일에 쓴 뒤 교체, 기본값 / 출처는 스키마 메타데이터)."""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    metadata = {'built_at': datetime.now().isoformat(timespec='seconds'), 'rows': len(features),
+                'columns': FEATURE_COLUMNS, 'defaults': defaults, 'sources': sources or {}, 'coverage': coverage or {}}
+    table = pa.Table.from_pandas(features, preserve_index=False)
+    table = table.replace_schema_metadata({**(table.schema.metadata or {}), METADATA_KEY: json.dumps(metadata)})
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.tmp"
+    pq.write_table(table, tmp, compression='snappy')
+    os.replace(tmp, path)
+    return metadata
+
+
+class CreatorFeatureStore:
+    """
+    Parquet 피처 스토어의 메모리 사본입니다. 100만 명 x 5개 float32 피처 기준 약 28MB.
+    조회는 creator_id 정렬 배열 + searchsorted 이므로 요청 수에 비례하며, 없는 id 는 기본값을 돌려줍니다.
+    """
+
+    def __init__(self, creator_ids, features, defaults, metadata=None):
+        self.creator_ids = creator_ids
+        self.features = features  # {'engagement_rate': ndarray, ...}
+        self.defaults = defaults
+        self.metadata = metadata or {}
+
+    @classmethod
+    def empty(cls):
+        return cls(np.empty(0, dtype=np.int64), {c: np.empty(0, dtype=np.float32) for c in FEATURE_COLUMNS},
+                   {c: 0.0 for c in FEATURE_COLUMNS})
+
+    @classmethod
+    def load(cls, path=STORE_PATH):
+        import pyarrow.parquet as pq
+
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"Feature store not found at {path}. Run: python 2_recommendation_model/feature_store.py build")
+        table = pq.read_table(path, columns=['creator_id'] + FEATURE_COLUMNS, memory_map=True)
+        metadata = json.loads(table.schema.metadata[METADATA_KEY])
+        return cls(table.column('creator_id').to_numpy(),
+                   {c: table.column(c).to_numpy() for c in FEATURE_COLUMNS}, metadata['defaults'], metadata)
+
+    def __len__(self):
+        return len(self.creator_ids)
+
+    def lookup(self, creator_ids):
+        """creator_id 배열 -> (찾은 여부 bool 배열, 피처 배열 내 위치). 없는 id 의 위치 값은 의미 없습니다."""
+        ids = np.asarray(creator_ids, dtype=np.int64)
+        if not len(self.creator_ids):
+            return np.zeros(len(ids), dtype=bool), np.zeros(len(ids), dtype=np.int64)
+        pos = np.minimum(np.searchsorted(self.creator_ids, ids), len(self.creator_ids) - 1)
+        return self.creator_ids[pos] == ids, pos
+
+    def get(self, creator_ids):
+        """creator_id 배열 -> ({피처: float64 배열}, 찾은 여부). 없는 id (None 포함) 는 기본값으로 채웁니다."""
+        ids = np.asarray(creator_ids)
+        if ids.dtype == object:
+            ids = np.array([-1 if i is None else i for i in ids], dtype=np.int64)
+        found, pos = self.lookup(ids)
+        values = {}
+        for column in FEATURE_COLUMNS:
+            out = np.full(len(ids), self.defaults[column], dtype=np.float64)
+            out[found] = self.features[column][pos[found]]
+            values[column] = out
+        return values, found
+
+    def row(self, creator_id):
+        """단건 조회: 스토어에 있으면 {피처: 값}, 없으면 None."""
+        values, found = self.get([creator_id])
+        return {column: float(values[column][0]) for column in FEATURE_COLUMNS} if found[0] else None
+
+    def attach(self, frame, id_column='creator_id'):
+        """frame 의 id_column 으로 조회한 피처 컬럼을 붙인 복사본을 반환합니다 (학습 / 배치 예측용)."""
+        values, _ = self.get(frame[id_column].to_numpy())
+        return frame.assign(**values)
+
+
+def store_input_columns(base_columns, metadata):
+    """
+    레지스트리 메타데이터의 입력 스키마가 base_columns + FEATURE_COLUMNS 이면 그 목록을, 아니면 base_columns 를 반환합니다.
+    (train.py --features 로 학습한 모델인지 판별, 최종 검증은 model_registry.check_schema 가 합니다.)
+    """
+    trained = [c['name'] for c in metadata['input_schema']]
+    extended = list(base_columns) + FEATURE_COLUMNS
+    return extended if trained == extended else list(base_columns)
+
+
+def load_store_or_empty(path=STORE_PATH):
+    """스토어가 없거나 읽을 수 없으면 경고를 출력하고 빈 스토어(모두 기본값)를 반환합니다."""
+    try:
+        return CreatorFeatureStore.load(path)
+    except Exception as e:
+        print(f">>> Warning: feature store unavailable, using default feature values. Error: {e}")
+        return CreatorFeatureStore.empty()
+
+
+# ==========================================
+# 3. 배치 빌드
+# ==========================================
+def build_store(engine, posts_path=DEFAULT_POSTS_PATH, profiles_dir=DEFAULT_PROFILES_DIR, max_files=None,
+                path=STORE_PATH):
+    """creators 테이블 + 원본 파일로 피처 스토어를 다시 만들고 메타데이터 dict 를 반환합니다."""
+    import pandas as pd
+    from sqlalchemy import text
+
+    timings = {}
+    started = time.perf_counter()
+    creators = pd.read_sql(text("SELECT creator_id, username FROM creators"), engine)
+    timings['creators'] = time.perf_counter() - started
+    print(f"   creators: {len(creators):,} rows ({timings['creators']:.1f}s)")
+
+    posts = profiles = None
+    if os.path.exists(posts_path):
+        started = time.perf_counter()
+        posts = post_aggregates(posts_path)
+        timings['posts'] = time.perf_counter() - started
+        print(f"   post_info: {len(posts):,} usernames ({timings['posts']:.1f}s)")
+    else:
+        print(f"   Warning: {posts_path} not found, post features use defaults")
+    if os.path.isdir(profiles_dir):
+        started = time.perf_counter()
+        profiles = profile_aggregates(profiles_dir, max_files)
+        timings['profiles'] = time.perf_counter() - started
+        print(f"   profiles: {len(profiles):,} files ({timings['profiles']:.1f}s)")
+    else:
+        print(f"   Warning: {profiles_dir} not found, profile features use defaults")
+
+    started = time.perf_counter()
+    features, defaults, coverage = build_features(creators, posts, profiles)
+    timings['join'] = time.perf_counter() - started
+    sources = {'posts': posts_path if posts is not None else None,
+               'profiles': profiles_dir if profiles is not None else None}
+    metadata = write_store(features, defaults, path, sources, coverage)
+    metadata['timings'] = timings
+    return metadata
+
+
+def benchmark(store, batch=1000, repeat=1000, seed=42):
+    """단건 / 배치 조회 지연 시간 (무작위 creator_id, 10% 는 없는 id)."""
+    rng = np.random.default_rng(seed)
+    upper = int(store.creator_ids[-1]) if len(store) else 1
+    ids = rng.integers(1, int(upper * 1.1) + 1, size=(repeat, batch))
+    started = time.perf_counter()
+    for i in range(repeat):
+        store.row(int(ids[i, 0]))
+    point_us = (time.perf_counter() - started) / repeat * 1e6
+    started = time.perf_counter()
+    for i in range(repeat):
+        store.get(ids[i])
+    batch_us = (time.perf_counter() - started) / repeat * 1e6
+    return {'point_us': point_us, 'batch_us': batch_us, 'batch': batch, 'batch_us_per_row': batch_us / batch}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="크리에이터 인게이지먼트 피처 스토어 (빌드 / 조회)")
+    parser.add_argument('--store', default=STORE_PATH, help="Parquet 파일 경로")
+    sub = parser.add_subparsers(dest='command', required=True)
+    p = sub.add_parser('build', help="creators + post_info.txt + 프로필 파일로 전체 재계산")
+    p.add_argument('--posts', default=DEFAULT_POSTS_PATH)
+    p.add_argument('--profiles', default=DEFAULT_PROFILES_DIR)
+    p.add_argument('--max-files', type=int, help="읽을 프로필 파일 수 상한 (기본: 전체)")
+    p = sub.add_parser('lookup', help="creator_id 피처 조회")
+    p.add_argument('creator_ids', type=int, nargs='+')
+    p = sub.add_parser('benchmark', help="단건 / 배치 조회 지연 시간 측정")
+    p.add_argument('--batch', type=int, default=1000)
+    p.add_argument('--repeat', type=int, default=1000)
+    args = parser.parse_args()
+
+    if args.command == 'build':
+        from db import get_engine
+
+        print(">>> [1/2] Aggregating creator features...")
+        metadata = build_store(get_engine(), args.posts, args.profiles, args.max_files, args.store)
+        print(">>> [2/2] Done.")
+        print(f"   {metadata['rows']:,} creators -> {args.store} ({os.path.getsize(args.store) / 1e6:.1f} MB)")
+        print(f"   coverage: {metadata['coverage']}")
+        print(f"   defaults: {json.dumps(metadata['defaults'])}")
+        return
+
+    started = time.perf_counter()
+    store = CreatorFeatureStore.load(args.store)
+    print(f">>> Loaded {len(store):,} creators ({time.perf_counter() - started:.3f}s, built {store.metadata['built_at']})")
+    if args.command == 'lookup':
+        for creator_id in args.creator_ids:
+            row = store.row(creator_id)
+            print(f"   {creator_id}: {row if row is not None else 'not found (defaults: ' + json.dumps(store.defaults) + ')'}")
+    else:
+        result = benchmark(store, args.batch, args.repeat)
+        print(f"   point lookup: {result['point_us']:.1f} us, batch of {result['batch']}: {result['batch_us']:.0f} us "
+              f"({result['batch_us_per_row']:.2f} us/row)")
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except Exception as e:
+        print(f"Feature Store Error: {e}")
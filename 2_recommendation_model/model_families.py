@@ -0,0 +1,161 @@
+"""
+모델 패밀리 정의 (학습 데이터 쿼리 / 입력 컬럼 / 타깃 / 전처리)
+
+- roi   : train.py        (follower_count, niche, platform -> actual_roi)          -> main.py /predict
+- sales : train_budget.py (platform, influencer_category, budget -> product_sales) -> predict.py
+
+모델 엔진:
+- rf  : RandomForestRegressor (기존 기본값, One-Hot 입력)
+- hgb : HistGradientBoostingRegressor (범주형 네이티브 지원, Ordinal 입력) - 모델 크기와 추론 지연시간이 작음
+
+튜닝 / 평가 / 증분 학습 스크립트가 같은 정의를 공유하도록 한 곳에 모아둡니다.
+"""
+import os
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import text
+from sklearn.ensemble import HistGradientBoostingRegressor, RandomForestRegressor
+from sklearn.preprocessing import OneHotEncoder, OrdinalEncoder
+from sklearn.compose import ColumnTransformer
+from sklearn.pipeline import Pipeline
+
+from db import get_decrypted_db_url, get_engine  # noqa: F401 (기존 import 경로 호환)
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+SAVED_MODELS_DIR = os.path.join(script_dir, 'saved_models')
+
+FAMILIES = {
+    'roi': {
+        'description': "Creator ROI predictor (main.py /predict)",
+        'query': """
+            SELECT m.match_id, m.created_at, c.creator_id, c.follower_count, c.niche, c.platform, m.actual_roi
+            FROM matches m
+            JOIN creators c ON m.creator_id = c.creator_id
+        """,
+        # 5_database/migrations/002 의 Materialized View (있으면 조인 대신 사용)
+        'view': 'training_features_roi',
+        'view_query': """
+            SELECT match_id, created_at, creator_id, follower_count, niche, platform, actual_roi
+            FROM training_features_roi
+        """,
+        # 뷰 갱신 때 기록한 값과 비교할 원본 상태 (view_is_fresh): 뷰는 creators 와 내부 조인이므로 creator_id 가 있는 매칭만 셉니다.
+        'view_source_stats': "SELECT count(*), max(match_id) FROM matches WHERE creator_id IS NOT NULL",
+        'categorical': ['niche', 'platform'],
+        'numeric': ['follower_count'],
+        'target': 'actual_roi',
+        'time_column': 'created_at',
+    },
+    'sales': {
+        'description': "Campaign sales predictor by budget (predict.py)",
+        'query': """
+            SELECT start_date, platform, influencer_category, budget, product_sales
+            FROM campaign_performance
+        """,
+        'categorical': ['platform', 'influencer_category'],
+        'numeric': ['budget'],
+        'target': 'product_sales',
+        'time_column': 'start_date',
+    },
+}
+
+
+def feature_columns(family):
+    """모델 입력 컬럼 순서 (학습 스크립트의 X 컬럼 순서와 동일)."""
+    spec = FAMILIES[family]
+    if family == 'roi':
+        return spec['numeric'] + spec['categorical']
+    return spec['categorical'] + spec['numeric']
+
+
+def view_is_fresh(conn, family):
+    """
+    Materialized View 를 갱신할 때 기록한 원본 상태(materialized_view_refreshes, 5_database/migrate.py)가
+    지금 원본 matches 의 (행 수, 최대 match_id) 와 같은지 확인합니다. 뷰 자체는 다시 세지 않습니다.
+    REFRESH 없이 새 매칭이 적재되거나 삭제된 경우를 잡아냅니다. creators 피처 값만 수정한 경우는 감지하지 못하므로
+    그때는 python 5_database/migrate.py --refresh 로 뷰를 갱신하세요. 기록이 없으면(008 적용 전) 최신이 아닌 것으로 봅니다.
+    """
+    spec = FAMILIES[family]
+    if conn.execute(text("SELECT to_regclass('materialized_view_refreshes')")).scalar() is None:
+        return False
+    recorded = conn.execute(text("""
+        SELECT source_rows, source_max_id FROM materialized_view_refreshes WHERE view_name = :v
+    """), {'v': spec['view']}).one_or_none()
+    if recorded is None:
+        return False
+    source_stats = conn.execute(text(spec['view_source_stats'])).one()
+    return tuple(recorded) == tuple(source_stats)
+
+
+def training_query(family, engine):
+    """Materialized View가 있고 원본과 같은 상태이면 뷰 쿼리를, 아니면 원본(조인) 쿼리를 반환합니다."""
+    spec = FAMILIES[family]
+    view = spec.get('view')
+    if view:
+        with engine.connect() as conn:
+            if conn.execute(text("SELECT to_regclass(:v)"), {'v': view}).scalar() is not None:
+                if view_is_fresh(conn, family):
+                    return spec['view_query']
+                print(f"   Warning: {view} is stale (run: python 5_database/migrate.py --refresh), "
+                      f"reading the source tables instead")
+    return spec['query']
+
+
+def load_training_frame(family, engine=None):
+    """패밀리의 학습 데이터를 DataFrame으로 읽어옵니다 (타깃 결측 행 제외)."""
+    engine = engine or get_engine()
+    df = pd.read_sql(training_query(family, engine), engine)
+    return df.dropna(subset=[FAMILIES[family]['target']])
+
+
+def build_preprocessor(family, extra_numeric=()):
+    """학습 스크립트와 같은 전처리: 범주형은 One-Hot, 수치형은 그대로. extra_numeric: 피처 스토어 컬럼 등 추가 수치형."""
+    spec = FAMILIES[family]
+    return ColumnTransformer(
+        transformers=[
+            ('cat', OneHotEncoder(handle_unknown='ignore'), spec['categorical']),
+            ('num', 'passthrough', spec['numeric'] + list(extra_numeric))
+        ]
+    )
+
+
+ENGINES = ['rf', 'hgb']
+
+
+def build_hgb_preprocessor(family, extra_numeric=()):
+    """HGB용 전처리: 범주형은 정수 코드(모르는 값은 결측 처리), 수치형은 그대로. 범주형 컬럼이 앞쪽에 위치합니다."""
+    spec = FAMILIES[family]
+    return ColumnTransformer(
+        transformers=[
+            ('cat', OrdinalEncoder(handle_unknown='use_encoded_value', unknown_value=np.nan), spec['categorical']),
+            ('num', 'passthrough', spec['numeric'] + list(extra_numeric))
+        ]
+    )
+
+
+def build_model(family, engine='rf', random_state=42, extra_numeric=(), **params):
+    """패밀리 / 엔진에 맞는 (전처리 + 회귀 모델) 파이프라인을 만듭니다 (extra_numeric: 추가 수치형 입력 컬럼)."""
+    if engine == 'rf':
+        params.setdefault('n_estimators', 100)
+        params.setdefault('n_jobs', -1)
+        return Pipeline([
+            ('preprocessor', build_preprocessor(family, extra_numeric)),
+            ('regressor', RandomForestRegressor(random_state=random_state, **params))
+        ])
+    if engine == 'hgb':
+        n_categorical = len(FAMILIES[family]['categorical'])
+        params.setdefault('max_iter', 200)
+        params.setdefault('early_stopping', True)
+        return Pipeline([
+            ('preprocessor', build_hgb_preprocessor(family, extra_numeric)),
+            ('regressor', HistGradientBoostingRegressor(categorical_features=list(range(n_categorical)),
+                                                        random_state=random_state, **params))
+        ])
+    raise ValueError(f"Unknown engine '{engine}'. Choose one of {ENGINES}")
+
+
+def prepare_for_serving(model):
+    """학습은 모든 코어로, 서빙(단건 예측)은 스레드 풀 없이 동작하도록 되돌립니다 (RF만 해당)."""
+    if isinstance(model.named_steps['regressor'], RandomForestRegressor):
+        model.set_params(regressor__n_jobs=None)
+    return model
@@ -0,0 +1,217 @@
+"""
+모델 레지스트리
+
+train.py(roi)와 train_budget.py(sales)가 같은 roi_predictor.joblib 파일을 덮어쓰던 문제를 막기 위해
+모델 패밀리별 / 버전별로 저장하고, 메타데이터(입력 스키마, 학습 행 수, 학습 시간, 파일 크기)를 함께 기록합니다.
+
+저장 구조:
+    saved_models/registry/<family>/<version>/model.joblib
+    saved_models/registry/<family>/<version>/metadata.json
+    saved_models/registry/<family>/<version>/slim/     (선택: export_slim.py, sklearn 없이 로드 가능한 npz + JSON)
+    saved_models/registry/<family>/LATEST              (최신 버전 이름)
+
+서빙 코드는 LazyModel로 필요한 패밀리만 불러오며, 입력 스키마가 다르면 로드 시점에 바로 실패합니다.
+이 모듈은 서빙 프로세스에서도 쓰이므로 DB / sklearn 관련 모듈을 import 하지 않고,
+joblib 도 전체 아티팩트를 읽거나 쓸 때만 불러옵니다 (슬림 아티팩트는 numpy 만 필요).
+"""
+import json
+import os
+import shutil
+import threading
+import time
+from datetime import datetime
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+SAVED_MODELS_DIR = os.path.join(script_dir, 'saved_models')
+REGISTRY_DIR = os.path.join(SAVED_MODELS_DIR, 'registry')
+
+DEFAULT_KEEP_VERSIONS = 10
+SLIM_DIR_NAME = 'slim'
+ARTIFACTS = ['auto', 'slim', 'full']
+
+
+class ModelNotFoundError(FileNotFoundError):
+    """레지스트리에 해당 패밀리/버전의 모델이 없을 때 발생합니다."""
+
+
+class SchemaMismatchError(ValueError):
+    """저장된 모델의 입력 스키마가 서빙 코드가 기대하는 컬럼과 다를 때 발생합니다."""
+
+
+def family_dir(family):
+    return os.path.join(REGISTRY_DIR, family)
+
+
+def version_dir(family, version):
+    return os.path.join(family_dir(family), version)
+
+
+def slim_dir(family, version):
+    return os.path.join(version_dir(family, version), SLIM_DIR_NAME)
+
+
+def input_schema_of(X):
+    """학습 입력 DataFrame에서 컬럼 이름 / dtype 목록을 만듭니다."""
+    return [{'name': str(column), 'dtype': str(dtype)} for column, dtype in X.dtypes.items()]
+
+
+def list_versions(family):
+    path = family_dir(family)
+    if not os.path.isdir(path):
+        return []
+    return sorted(v for v in os.listdir(path) if os.path.isfile(os.path.join(path, v, 'metadata.json')))
+
+
+def latest_version(family):
+    pointer = os.path.join(family_dir(family), 'LATEST')
+    if os.path.exists(pointer):
+        with open(pointer, encoding='utf-8') as f:
+            version = f.read().strip()
+        if version:
+            return version
+    versions = list_versions(family)
+    return versions[-1] if versions else None
+
+
+def read_metadata(family, version=None):
+    version = version or latest_version(family)
+    if version is None:
+        raise ModelNotFoundError(f"No registered model for family '{family}' in {REGISTRY_DIR}")
+    path = os.path.join(version_dir(family, version), 'metadata.json')
+    if not os.path.exists(path):
+        raise ModelNotFoundError(f"Model '{family}' version '{version}' not found at {path}")
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def register_model(family, model, X_train, fit_seconds, metrics=None, extra=None, keep=DEFAULT_KEEP_VERSIONS,
+                   training_rows=None):
+    """
+    모델을 새 버전으로 저장하고 LATEST를 갱신한 뒤 메타데이터를 반환합니다.
+    training_rows는 X_train 외의 데이터로도 학습된 모델(증분 학습)일 때 전체 행 수를 넘겨줍니다.
+    """
+    version = datetime.now().strftime('v%Y%m%d-%H%M%S')
+    while os.path.exists(version_dir(family, version)):
+        version += '_1'
+
+    # 임시 폴더에 쓴 뒤 이름을 바꿔서, 저장 중인 버전을 다른 프로세스가 읽지 않도록 합니다.
+    final_dir = version_dir(family, version)
+    tmp_dir = final_dir + '.tmp'
+    os.makedirs(tmp_dir, exist_ok=True)
+    import joblib
+
+    artifact_path = os.path.join(tmp_dir, 'model.joblib')
+    joblib.dump(model, artifact_path)
+
+    metadata = {
+        'family': family,
+        'version': version,
+        'created_at': datetime.now().isoformat(timespec='seconds'),
+        'model_class': type(model).__name__,
+        'input_schema': input_schema_of(X_train),
+        'training_rows': int(training_rows if training_rows is not None else len(X_train)),
+        'fit_seconds': round(float(fit_seconds), 3),
+        'artifact_bytes': os.path.getsize(artifact_path),
+        'metrics': metrics or {},
+        'extra': extra or {},
+    }
+    with open(os.path.join(tmp_dir, 'metadata.json'), 'w', encoding='utf-8') as f:
+        json.dump(metadata, f, indent=2, default=str)
+    os.replace(tmp_dir, final_dir)
+
+    pointer_tmp = os.path.join(family_dir(family), 'LATEST.tmp')
+    with open(pointer_tmp, 'w', encoding='utf-8') as f:
+        f.write(version)
+    os.replace(pointer_tmp, os.path.join(family_dir(family), 'LATEST'))
+
+    if keep:
+        prune_versions(family, keep=keep)
+    return metadata
+
+
+def prune_versions(family, keep=DEFAULT_KEEP_VERSIONS):
+    """최신 keep개 버전만 남기고 오래된 버전을 삭제합니다 (LATEST 버전은 항상 유지)."""
+    latest = latest_version(family)
+    others = [v for v in list_versions(family) if v != latest]
+    old = others[:max(len(others) - (keep - 1), 0)]
+    for version in old:
+        shutil.rmtree(version_dir(family, version), ignore_errors=True)
+    return old
+
+
+def check_schema(metadata, expected_columns):
+    """서빙 코드가 넘길 컬럼과 학습 당시 입력 컬럼(순서 포함)이 같은지 확인합니다."""
+    trained = [c['name'] for c in metadata['input_schema']]
+    if list(expected_columns) != trained:
+        raise SchemaMismatchError(
+            f"Model '{metadata['family']}' {metadata['version']} expects columns {trained}, "
+            f"but the caller provides {list(expected_columns)}"
+        )
+
+
+def save_slim(family, version, slim_model):
+    """CompactPipeline.slim() 결과를 버전 폴더의 slim/ 에 저장합니다 (임시 폴더에 쓴 뒤 교체)."""
+    final_dir = slim_dir(family, version)
+    tmp_dir = final_dir + '.tmp'
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    slim_model.save(tmp_dir)
+    shutil.rmtree(final_dir, ignore_errors=True)
+    os.replace(tmp_dir, final_dir)
+    return final_dir
+
+
+def load_model(family, version=None, expected_columns=None, artifact='auto'):
+    """
+    (모델, 메타데이터)를 반환합니다. expected_columns가 있으면 스키마를 먼저 검증합니다.
+    artifact: 'full' = model.joblib, 'slim' = slim/ (sklearn 없이 로드), 'auto' = slim/ 이 있으면 slim
+    """
+    metadata = read_metadata(family, version)
+    if expected_columns is not None:
+        check_schema(metadata, expected_columns)
+    slim_path = slim_dir(family, metadata['version'])
+    if artifact == 'slim' or (artifact == 'auto' and os.path.isdir(slim_path)):
+        from compact_forest import CompactPipeline
+
+        if not os.path.isdir(slim_path):
+            raise ModelNotFoundError(f"No slim artifact for '{family}' {metadata['version']}; run export_slim.py")
+        return CompactPipeline.load(slim_path), {**metadata, 'artifact': 'slim'}
+
+    import joblib
+
+    model = joblib.load(os.path.join(version_dir(family, metadata['version']), 'model.joblib'))
+    return model, {**metadata, 'artifact': 'full'}
+
+
+class LazyModel:
+    """첫 사용 시점에 한 번만 로드되는 모델 핸들 (스레드 안전)."""
+
+    def __init__(self, family, expected_columns=None, version=None, artifact='auto'):
+        self.family = family
+        self.expected_columns = expected_columns
+        self.version = version
+        self.artifact = artifact
+        self.metadata = None
+        self.load_seconds = None
+        self._model = None
+        self._lock = threading.Lock()
+
+    @property
+    def loaded(self):
+        return self._model is not None
+
+    def get(self):
+        if self._model is None:
+            with self._lock:
+                if self._model is None:
+                    started = time.perf_counter()
+                    model, metadata = load_model(self.family, self.version, self.expected_columns, self.artifact)
+                    self.load_seconds = time.perf_counter() - started
+                    self.metadata = metadata
+                    self._model = model
+        return self._model
+
+    def reload(self):
+        """LATEST가 바뀌었을 때 새 버전으로 교체합니다."""
+        with self._lock:
+            self._model = None
+        return self.get()
@@ -0,0 +1,268 @@
+"""
+예산 제약 크리에이터 포트폴리오 최적화
+
+"캠페인 예산이 $50k 일 때 creators 테이블에서 어떤 크리에이터들을 섭외해야 예상 매출(ROI x 비용)이 최대가 되는가?"
+predict.py 의 get_recommendations 는 플랫폼 x 등급 16개 조합만 비교하므로 이 질문에 답할 수 없습니다.
+
+1. 후보 점수: 'roi' 모델로 모든 후보 크리에이터를 한 번에 예측합니다 (평균 + 트리 간 표준편차, confidence.py).
+   ROI 는 크리에이터 피처에만 의존하므로 모델 버전별로 한 번만 계산해 메모리에 캐싱합니다.
+   score_creators.py 로 사전 계산된 점수(creator_roi_scores)가 있으면 그 값을 쓰고, 없는 크리에이터만 예측합니다.
+2. 비용: 섭외 비용 = max(MIN_FEE, 팔로워 수 x COST_PER_FOLLOWER) (실제 단가표가 생기면 교체)
+3. 최적화: 0/1 knapsack 을 "가성비(위험 조정 ROI) 내림차순 greedy + 제약 검사"로 풉니다.
+   - 플랫폼별 예산 비중 상한, niche 별 최대 인원(다양성), 전체 인원 상한, 최소 ROI
+   - 제약을 뺀 분할 가능(LP) knapsack 상한을 함께 계산하여 최적해와의 최대 격차(gap)를 보고합니다.
+
+사용 예시 (프로젝트 루트에서 실행):
+    python 2_recommendation_model/portfolio.py --budget 50000
+    python 2_recommendation_model/portfolio.py --budget 50000 --platform-cap TikTok=0.3 --max-per-niche 20 --risk-aversion 1
+"""
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import text
+
+from confidence import ForestConfidence
+
+COST_PER_FOLLOWER = 0.03
+MIN_FEE = 50.0
+ROI_FEATURES = ['follower_count', 'niche', 'platform']
+
+CANDIDATES_QUERY = "SELECT creator_id, follower_count, niche, platform FROM creators"
+
+
+def creator_costs(follower_count, cost_per_follower=COST_PER_FOLLOWER, min_fee=MIN_FEE):
+    return np.maximum(np.asarray(follower_count, dtype=np.float64) * cost_per_follower, min_fee)
+
+
+def score_candidates(model, candidates, store=None):
+    """후보 전체를 한 번에 예측: roi_mean / roi_std 컬럼을 붙여 반환합니다 (store: 피처 스토어 피처를 입력에 추가)."""
+    if store is None:
+        result = ForestConfidence(model).predict(candidates[ROI_FEATURES])
+    else:
+        result = ForestConfidence(model).predict(store.attach(candidates)[ROI_FEATURES + list(store.features)])
+    scored = candidates.copy()
+    scored['roi_mean'] = result['mean']
+    scored['roi_std'] = result['std'] if result['std'] is not None else 0.0
+    return scored
+
+
+def apply_precomputed(candidates, scores):
+    """
+    CreatorScores 에 있는 후보는 저장된 점수를 붙이고, (점수가 붙은 DataFrame, 아직 점수가 없는 후보) 를 반환합니다.
+    점수를 계산한 뒤 피처가 바뀐 크리에이터는 '점수 없음'으로 돌려 다시 예측합니다.
+    """
+    found, pos = scores.lookup(candidates['creator_id'].to_numpy(),
+                               features={c: candidates[c].to_numpy() for c in ROI_FEATURES})
+    known = candidates[found].copy()
+    known['roi_mean'] = scores.scores['roi_mean'][pos[found]]
+    known['roi_std'] = np.nan_to_num(scores.scores['roi_std'][pos[found]])
+    return known, candidates[~found]
+
+
+class CandidatePool:
+    """creators 테이블 + ROI 점수를 메모리에 캐싱합니다 (ttl_seconds 가 지나면 다시 읽음)."""
+
+    def __init__(self, model, engine, ttl_seconds=600, scores=None, feature_store=None):
+        self.model = model
+        self.engine = engine
+        self.ttl_seconds = ttl_seconds
+        self.scores = scores  # score_creators.CreatorScores (선택)
+        self.feature_store = feature_store  # feature_store.CreatorFeatureStore (모델이 스토어 피처로 학습된 경우)
+        self.precomputed = 0
+        self._frame = None
+        self._loaded_at = 0.0
+        self.score_seconds = None
+
+    def frame(self):
+        if self._frame is None or time.time() - self._loaded_at > self.ttl_seconds:
+            candidates = pd.read_sql(text(CANDIDATES_QUERY), self.engine).dropna(subset=ROI_FEATURES)
+            started = time.perf_counter()
+            parts = []
+            if self.scores is not None and len(self.scores):
+                known, candidates = apply_precomputed(candidates, self.scores)
+                parts.append(known)
+            self.precomputed = len(parts[0]) if parts else 0
+            if len(candidates):
+                parts.append(score_candidates(self.model, candidates, self.feature_store))
+            elif not parts:
+                # 후보가 하나도 없으면 (빈 creators 테이블) 모델을 호출하지 않고 빈 점수 컬럼만 붙입니다.
+                parts.append(candidates.assign(roi_mean=np.empty(0), roi_std=np.empty(0)))
+            self._frame = pd.concat(parts).sort_values('creator_id', kind='stable') if len(parts) > 1 else parts[0]
+            self.score_seconds = time.perf_counter() - started
+            self._loaded_at = time.time()
+        return self._frame
+
+
+def filter_candidates(pool, platforms=None, niches=None, min_followers=None, max_followers=None):
+    mask = np.ones(len(pool), dtype=bool)
+    if platforms:
+        mask &= pool['platform'].isin(platforms).to_numpy()
+    if niches:
+        mask &= pool['niche'].isin(niches).to_numpy()
+    if min_followers is not None:
+        mask &= pool['follower_count'].to_numpy() >= min_followers
+    if max_followers is not None:
+        mask &= pool['follower_count'].to_numpy() <= max_followers
+    return pool[mask]
+
+
+def fractional_upper_bound(costs, values, budget):
+    """분할 가능 knapsack(LP 완화) 최적값: 0/1 해와 모든 제약 조합의 상한입니다. costs/values 는 가성비 내림차순."""
+    cum_cost = np.cumsum(costs)
+    full = int(np.searchsorted(cum_cost, budget, side='right'))
+    bound = values[:full].sum()
+    if full < len(costs):
+        used = cum_cost[full - 1] if full else 0.0
+        bound += values[full] * (budget - used) / costs[full]
+    return float(bound)
+
+
+def optimize_portfolio(candidates, budget, platform_caps=None, max_per_niche=None, max_creators=None,
+                       risk_aversion=0.0, min_roi=1.0, cost_per_follower=COST_PER_FOLLOWER, min_fee=MIN_FEE):
+    """
+    candidates: creator_id / follower_count / niche / platform / roi_mean / roi_std 컬럼 (score_candidates 결과)
+    platform_caps: {'TikTok': 0.3} 처럼 플랫폼별 예산 비중 상한
+    risk_aversion: 위험 조정 ROI = roi_mean - risk_aversion x roi_std (1.0 이면 1 표준편차만큼 보수적으로)
+    반환: (선택된 크리에이터 DataFrame, 요약 dict)
+    """
+    started = time.perf_counter()
+    costs = creator_costs(candidates['follower_count'], cost_per_follower, min_fee)
+    adjusted_roi = candidates['roi_mean'].to_numpy() - risk_aversion * candidates['roi_std'].to_numpy()
+
+    # 예산을 넘거나 기대 ROI 가 기준 미달인 후보는 미리 제외 (벡터 연산)
+    eligible = np.flatnonzero((costs <= budget) & (adjusted_roi >= min_roi))
+    order = eligible[np.argsort(-adjusted_roi[eligible], kind='stable')]
+    costs_sorted = costs[order]
+    values_sorted = adjusted_roi[order] * costs_sorted
+    upper_bound = fractional_upper_bound(costs_sorted, values_sorted, budget)
+
+    # 남은 예산보다 비싼 후보만 남으면 조기 종료하기 위한 뒤쪽 최소 비용
+    suffix_min_cost = np.minimum.accumulate(costs_sorted[::-1])[::-1] if len(order) else costs_sorted
+
+    platform_codes, platform_names = pd.factorize(candidates['platform'])
+    niche_codes, _ = pd.factorize(candidates['niche'])
+    platform_limit = np.full(len(platform_names), np.inf)
+    for name, share in (platform_caps or {}).items():
+        if name in platform_names:
+            platform_limit[platform_names.get_loc(name)] = share * budget
+    platform_spent = np.zeros(len(platform_names))
+    niche_count = np.zeros(niche_codes.max() + 1 if len(niche_codes) else 0, dtype=np.int64)
+    niche_limit = max_per_niche if max_per_niche is not None else np.iinfo(np.int64).max
+    count_limit = max_creators if max_creators is not None else len(order)
+
+    selected = []
+    remaining = float(budget)
+    plat_of, niche_of = platform_codes[order].tolist(), niche_codes[order].tolist()
+    open_niches = len(np.unique(niche_codes[order])) if max_per_niche is not None else -1
+    for i, cost in enumerate(costs_sorted.tolist()):
+        if remaining < suffix_min_cost[i] or len(selected) >= count_limit or open_niches == 0:
+            break
+        if cost > remaining:
+            continue
+        p, n = plat_of[i], niche_of[i]
+        if platform_spent[p] + cost > platform_limit[p] or niche_count[n] >= niche_limit:
+            continue
+        selected.append(i)
+        remaining -= cost
+        platform_spent[p] += cost
+        niche_count[n] += 1
+        if niche_count[n] == niche_limit:
+            open_niches -= 1
+
+    picked = candidates.iloc[order[selected]].copy()
+    picked['cost'] = costs_sorted[selected]
+    picked['adjusted_roi'] = adjusted_roi[order[selected]]
+    picked['expected_revenue'] = picked['roi_mean'] * picked['cost']
+
+    objective = float((picked['adjusted_roi'] * picked['cost']).sum())
+    spent = float(picked['cost'].sum())
+    summary = {
+        'budget': float(budget),
+        'spent': spent,
+        'creators': len(picked),
+        'expected_revenue': float(picked['expected_revenue'].sum()),
+        'portfolio_roi': float(picked['expected_revenue'].sum() / spent) if spent else 0.0,
+        'objective': objective,
+        # 플랫폼 / niche / 인원 제약을 뺀 LP 상한 대비 격차 (제약이 걸리면 실제 최적해와의 격차보다 크게 나옵니다)
+        'upper_bound': upper_bound,
+        'optimality_gap': (upper_bound - objective) / upper_bound if upper_bound else 0.0,
+        'spend_by_platform': picked.groupby('platform')['cost'].sum().round(2).to_dict(),
+        'creators_by_niche': picked['niche'].value_counts().to_dict(),
+        'candidates': len(candidates),
+        'eligible': len(order),
+        'solve_ms': (time.perf_counter() - started) * 1000,
+    }
+    return picked, summary
+
+
+def parse_caps(values):
+    caps = {}
+    for item in values or []:
+        name, _, share = item.partition('=')
+        caps[name] = float(share)
+    return caps
+
+
+def main():
+    from feature_store import CreatorFeatureStore, store_input_columns
+    from db import get_engine
+    from model_registry import load_model
+
+    parser = argparse.ArgumentParser(description="예산 제약 크리에이터 포트폴리오 최적화")
+    parser.add_argument('--budget', type=float, required=True)
+    parser.add_argument('--platform', action='append', help="후보 플랫폼 (여러 번 지정 가능)")
+    parser.add_argument('--niche', action='append', help="후보 niche (여러 번 지정 가능)")
+    parser.add_argument('--min-followers', type=int)
+    parser.add_argument('--max-followers', type=int)
+    parser.add_argument('--platform-cap', action='append', help="플랫폼 예산 비중 상한 (예: TikTok=0.3)")
+    parser.add_argument('--max-per-niche', type=int)
+    parser.add_argument('--max-creators', type=int)
+    parser.add_argument('--risk-aversion', type=float, default=0.0)
+    parser.add_argument('--min-roi', type=float, default=1.0)
+    parser.add_argument('--candidate-limit', type=int, help="후보를 N명으로 제한 (벤치마크용)")
+    parser.add_argument('--top', type=int, default=10, help="출력할 선택 크리에이터 수")
+    parser.add_argument('--live', action='store_true', help="사전 계산 점수(creator_roi_scores)를 쓰지 않고 전부 예측")
+    args = parser.parse_args()
+
+    print(">>> [1/3] Loading model and candidates...")
+    model, metadata = load_model('roi')
+    engine = get_engine()
+    scores = None
+    if not args.live:
+        from score_creators import CreatorScores
+        scores = CreatorScores.load(engine, metadata['version'])
+    feature_store = None
+    if store_input_columns(ROI_FEATURES, metadata) != ROI_FEATURES:
+        feature_store = CreatorFeatureStore.load()
+    pool = CandidatePool(model, engine, scores=scores, feature_store=feature_store)
+    started = time.perf_counter()
+    frame = pool.frame()
+    print(f"   {len(frame):,} creators scored with roi/{metadata['version']} in {pool.score_seconds:.1f}s "
+          f"({pool.precomputed:,} precomputed, total {time.perf_counter() - started:.1f}s)")
+
+    print(">>> [2/3] Filtering candidates...")
+    candidates = filter_candidates(frame, args.platform, args.niche, args.min_followers, args.max_followers)
+    if args.candidate_limit:
+        candidates = candidates.iloc[:args.candidate_limit]
+    print(f"   {len(candidates):,} candidates")
+
+    print(">>> [3/3] Optimizing portfolio...")
+    picked, summary = optimize_portfolio(candidates, args.budget, parse_caps(args.platform_cap), args.max_per_niche,
+                                         args.max_creators, args.risk_aversion, args.min_roi)
+    print(f"   Solved in {summary['solve_ms']:.1f} ms: {summary['creators']} creators, "
+          f"spent ${summary['spent']:,.0f} / ${summary['budget']:,.0f}")
+    print(f"   Expected revenue ${summary['expected_revenue']:,.0f} (ROI x{summary['portfolio_roi']:.2f}), "
+          f"gap to unconstrained LP bound {summary['optimality_gap']:.2%}")
+    print(f"   Spend by platform: {summary['spend_by_platform']}")
+    print(f"   Creators by niche: {summary['creators_by_niche']}")
+    print(picked.head(args.top)[['creator_id', 'platform', 'niche', 'follower_count', 'cost', 'roi_mean', 'roi_std']]
+          .to_string(index=False))
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except Exception as e:
+        print(f"Portfolio Error: {e}")
@@ -1,16 +1,17 @@
 import pandas as pd
-import joblib
-import os
 
-# 저장된 모델 경로
-MODEL_PATH = '2_recommendation_model/saved_models/roi_predictor.joblib'
+from model_registry import LazyModel, ModelNotFoundError
 
-# 모델 로드 (전역 변수로 한 번만 로드하여 속도 향상)
-if os.path.exists(MODEL_PATH):
-    model = joblib.load(MODEL_PATH)
-else:
+# 이 모듈은 매출 예측 모델('sales' 패밀리, train_budget.py)만 사용합니다.
+FEATURE_COLUMNS = ['platform', 'influencer_category', 'budget']
+sales_model = LazyModel('sales', expected_columns=FEATURE_COLUMNS)
+
+# 모델 로드 (전역 변수로 한 번만 로드하여 속도 향상, 스키마가 다르면 여기서 바로 실패)
+try:
+    model = sales_model.get()
+except ModelNotFoundError:
     model = None
-    print("⚠️ 경고: 모델 파일이 없습니다. train.py를 먼저 실행하세요.")
+    print("⚠️ 경고: 모델 파일이 없습니다. train_budget.py를 먼저 실행하세요.")
 
 def get_recommendations(target_budget, top_k=3):
     """
@@ -36,7 +37,7 @@ def get_recommendations(target_budget, top_k=3):
             })
     
     # 데이터프레임으로 변환
-    candidates_df = pd.DataFrame(candidates)
+    candidates_df = pd.DataFrame(candidates, columns=FEATURE_COLUMNS)
 
     # 3. AI 모델로 매출 예측
     predicted_sales = model.predict(candidates_df)
@@ -0,0 +1,284 @@
+"""
+저장된 모델 크기 / 지연시간 프로파일러 + 경량화 변형 생성
+
+저장된 모델(레지스트리 버전 또는 joblib 파일)을 불러와 아래 항목을 측정합니다.
+- 저장 파일 크기 (raw / joblib 압축), 로드 시간
+- 트리 개수, 트리별 노드 수 / 깊이
+- 배치 크기별 추론 지연시간
+
+그리고 경량화 변형(트리 수 축소, 깊이 제한, float32 압축 포맷, joblib 압축)을 만들어
+같은 검증 데이터에서 정확도 변화(R2 / MSE 차이)와 함께 비교합니다.
+원하는 변형은 --register 로 레지스트리에 새 버전으로 등록할 수 있습니다.
+
+변형 표기법 (쉼표로 조합): trees=N, depth=D, float32
+    예) --variant trees=50 --variant depth=16 --variant trees=50,depth=16,float32
+
+사용 예시 (프로젝트 루트에서 실행):
+    python 2_recommendation_model/profile_model.py --family roi
+    python 2_recommendation_model/profile_model.py --family roi --register trees=50,depth=16,float32
+    python 2_recommendation_model/profile_model.py --family sales --path old_model.joblib
+"""
+import argparse
+import copy
+import json
+import os
+import tempfile
+import time
+
+import joblib
+import numpy as np
+from sklearn.ensemble import RandomForestRegressor
+from sklearn.metrics import mean_squared_error, r2_score
+from sklearn.model_selection import train_test_split
+from sklearn.pipeline import Pipeline
+
+from compact_forest import CompactForest, CompactPipeline
+from model_families import FAMILIES, feature_columns, load_training_frame
+from model_registry import load_model, register_model
+
+BATCH_SIZES = [1, 10, 100, 1000, 10000]
+DEFAULT_VARIANTS = ['trees=50', 'trees=25', 'depth=20', 'depth=12', 'float32', 'trees=50,depth=16,float32']
+COMPRESS_LEVEL = 3
+
+
+# ==========================================
+# 1. 측정
+# ==========================================
+def artifact_stats(model):
+    """raw / 압축 joblib 파일 크기(bytes)와 각각의 로드 시간(s)."""
+    stats = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for label, compress in (('raw', 0), ('compressed', COMPRESS_LEVEL)):
+            path = os.path.join(tmp, f'{label}.joblib')
+            joblib.dump(model, path, compress=compress)
+            started = time.perf_counter()
+            joblib.load(path)
+            stats[f'{label}_bytes'] = os.path.getsize(path)
+            stats[f'{label}_load_seconds'] = time.perf_counter() - started
+    return stats
+
+
+def tree_stats(model):
+    """트리 개수와 트리별 노드 수 / 깊이 요약."""
+    regressor = model.named_steps['regressor']
+    if isinstance(regressor, CompactForest):
+        nodes = np.diff(np.append(regressor.roots, regressor.node_count))
+        depths = np.array([regressor.max_depth])
+    elif isinstance(regressor, RandomForestRegressor):
+        nodes = np.array([e.tree_.node_count for e in regressor.estimators_])
+        depths = np.array([e.tree_.max_depth for e in regressor.estimators_])
+    elif hasattr(regressor, '_predictors'):  # HistGradientBoostingRegressor
+        nodes = np.array([len(p[0].nodes) for p in regressor._predictors])
+        depths = np.array([p[0].nodes['depth'].max() for p in regressor._predictors])
+    else:
+        return {'model_class': type(regressor).__name__}
+    return {
+        'model_class': type(regressor).__name__,
+        'n_trees': len(nodes),
+        'total_nodes': int(nodes.sum()),
+        'nodes_per_tree': {'min': int(nodes.min()), 'mean': float(nodes.mean()), 'max': int(nodes.max())},
+        'depth': {'min': int(depths.min()), 'mean': float(depths.mean()), 'max': int(depths.max())},
+    }
+
+
+def latency_by_batch(model, X, batch_sizes=BATCH_SIZES, repeat=5):
+    """배치 크기별 predict 지연시간 중앙값(ms)."""
+    model.predict(X.iloc[:1])  # warm-up
+    result = {}
+    for size in batch_sizes:
+        if size > len(X):
+            break
+        batch = X.iloc[:size]
+        times = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            model.predict(batch)
+            times.append((time.perf_counter() - started) * 1000)
+        result[str(size)] = float(np.median(times))
+    return result
+
+
+# ==========================================
+# 2. 경량화 변형
+# ==========================================
+def _replace_regressor(model, regressor):
+    # 전처리기는 원본과 공유합니다 (복사하지 않음).
+    return Pipeline([('preprocessor', model.named_steps['preprocessor']), ('regressor', regressor)])
+
+
+def limit_trees(model, n_trees):
+    """앞쪽 n_trees 개 트리만 남깁니다 (각 트리는 독립적으로 학습되므로 재학습 불필요)."""
+    regressor = copy.copy(model.named_steps['regressor'])
+    regressor.estimators_ = regressor.estimators_[:n_trees]
+    regressor.n_estimators = len(regressor.estimators_)
+    return _replace_regressor(model, regressor)
+
+
+def _cap_tree_depth(tree, max_depth):
+    """sklearn Tree 상태를 max_depth 이하 노드만 남기도록 다시 만듭니다 (잘린 노드는 리프가 되어 평균값을 반환)."""
+    cls, args, state = tree.__reduce__()
+    nodes, values = state['nodes'], state['values']
+    left, right = nodes['left_child'], nodes['right_child']
+
+    depth = np.full(len(nodes), -1)
+    frontier = np.array([0])
+    level = 0
+    while len(frontier) and level <= max_depth:
+        depth[frontier] = level
+        internal = frontier[left[frontier] != -1]
+        frontier = np.concatenate([left[internal], right[internal]])
+        level += 1
+
+    keep = depth >= 0
+    new_index = np.cumsum(keep) - 1
+    new_nodes = nodes[keep].copy()
+    cut = (depth[keep] == max_depth) & (new_nodes['left_child'] != -1)
+    internal = (new_nodes['left_child'] != -1) & ~cut
+    new_nodes['left_child'][internal] = new_index[new_nodes['left_child'][internal]]
+    new_nodes['right_child'][internal] = new_index[new_nodes['right_child'][internal]]
+    new_nodes['left_child'][cut] = -1
+    new_nodes['right_child'][cut] = -1
+    new_nodes['feature'][cut] = -2
+    new_nodes['threshold'][cut] = -2.0
+
+    state = dict(state, nodes=new_nodes, values=values[keep].copy(), node_count=int(keep.sum()),
+                 max_depth=int(min(state['max_depth'], max_depth)))
+    new_tree = cls(*args)
+    new_tree.__setstate__(state)
+    return new_tree
+
+
+def cap_depth(model, max_depth):
+    """모든 트리를 max_depth 에서 잘라냅니다 (재학습 없이)."""
+    regressor = copy.copy(model.named_steps['regressor'])
+    estimators = []
+    for estimator in regressor.estimators_:
+        estimator = copy.copy(estimator)
+        estimator.tree_ = _cap_tree_depth(estimator.tree_, max_depth)
+        estimator.max_depth = max_depth
+        estimators.append(estimator)
+    regressor.estimators_ = estimators
+    regressor.max_depth = max_depth
+    return _replace_regressor(model, regressor)
+
+
+def build_variant(model, spec):
+    """'trees=50,depth=16,float32' 형식의 변형 명세를 순서대로 적용합니다."""
+    if not isinstance(model.named_steps['regressor'], RandomForestRegressor):
+        raise ValueError("Pruned variants are only supported for RandomForest models")
+    variant = model
+    for part in spec.split(','):
+        key, _, value = part.strip().partition('=')
+        if key == 'trees':
+            variant = limit_trees(variant, int(value))
+        elif key == 'depth':
+            variant = cap_depth(variant, int(value))
+        elif key == 'float32':
+            variant = CompactPipeline.from_pipeline(variant, dtype=np.float32)
+        else:
+            raise ValueError(f"Unknown variant option '{part}' (use trees=N, depth=D, float32)")
+    return variant
+
+
+# ==========================================
+# 3. 실행
+# ==========================================
+def load_eval_data(family, eval_rows, random_state=42):
+    """학습 스크립트와 같은 분할(test_size=0.2, random_state=42)의 테스트 세트에서 평가 데이터를 뽑습니다."""
+    df = load_training_frame(family)
+    X = df[feature_columns(family)]
+    y = df[FAMILIES[family]['target']]
+    _, X_test, _, y_test = train_test_split(X, y, test_size=0.2, random_state=random_state)
+    if eval_rows and len(X_test) > eval_rows:
+        X_test, y_test = X_test.iloc[:eval_rows], y_test.iloc[:eval_rows]
+    return X_test, y_test
+
+
+def profile(model, X, y, baseline_pred=None):
+    y_pred = model.predict(X)
+    result = {
+        **tree_stats(model),
+        **artifact_stats(model),
+        'latency_ms': latency_by_batch(model, X),
+        'r2': r2_score(y, y_pred),
+        'mse': mean_squared_error(y, y_pred),
+    }
+    if baseline_pred is not None:
+        result['max_abs_pred_diff'] = float(np.abs(y_pred - baseline_pred).max())
+    return result, y_pred
+
+
+def print_report(results):
+    base = results[0]
+    print(f"\n{'variant':<28} {'trees':>5} {'nodes':>10} {'raw':>9} {'comp':>9} {'load':>7} "
+          f"{'1 row':>8} {'1k rows':>8} {'R2':>7} {'dR2':>8} {'dMSE%':>7}")
+    for r in results:
+        latency = r['latency_ms']
+        print(f"{r['variant']:<28} {r.get('n_trees', '-'):>5} {r.get('total_nodes', 0):>10,} "
+              f"{r['raw_bytes'] / 1e6:>6.1f} MB {r['compressed_bytes'] / 1e6:>6.1f} MB {r['raw_load_seconds']:>6.2f}s "
+              f"{latency.get('1', float('nan')):>5.2f} ms {latency.get('1000', float('nan')):>5.1f} ms "
+              f"{r['r2']:>7.4f} {r['r2'] - base['r2']:>+8.4f} {(r['mse'] / base['mse'] - 1) * 100:>+6.1f}%")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="모델 크기 / 지연시간 프로파일링 및 경량화 변형 비교")
+    parser.add_argument('--family', choices=list(FAMILIES), default='roi')
+    parser.add_argument('--version', help="레지스트리 버전 (기본: LATEST)")
+    parser.add_argument('--path', help="레지스트리 대신 joblib 파일 경로에서 모델 로드")
+    parser.add_argument('--variant', action='append', help="경량화 변형 명세 (여러 번 지정 가능)")
+    parser.add_argument('--no-variants', action='store_true', help="원본 모델만 프로파일링")
+    parser.add_argument('--eval-rows', type=int, default=20000, help="정확도 / 지연시간 측정에 쓸 테스트 행 수")
+    parser.add_argument('--register', metavar='VARIANT', help="지정한 변형을 레지스트리에 새 버전으로 등록")
+    parser.add_argument('--output', help="결과 JSON 저장 경로")
+    args = parser.parse_args()
+
+    print(">>> [1/3] Loading model...")
+    started = time.perf_counter()
+    if args.path:
+        model, metadata = joblib.load(args.path), None
+    else:
+        model, metadata = load_model(args.family, args.version, artifact='full')
+    print(f"   Loaded {args.path or args.family + '/' + metadata['version']} in {time.perf_counter() - started:.2f}s")
+
+    print(">>> [2/3] Fetching evaluation data from Database...")
+    X, y = load_eval_data(args.family, args.eval_rows)
+    print(f"   Evaluation rows: {len(X)}")
+
+    specs = [] if args.no_variants else (args.variant or DEFAULT_VARIANTS)
+    if args.register and args.register not in specs:
+        specs.append(args.register)
+
+    print(f">>> [3/3] Profiling baseline + {len(specs)} variants...")
+    baseline, baseline_pred = profile(model, X, y)
+    results = [{'variant': 'baseline', **baseline}]
+    variants = {}
+    for spec in specs:
+        variants[spec] = build_variant(model, spec)
+        result, _ = profile(variants[spec], X, y, baseline_pred)
+        results.append({'variant': spec, **result})
+    print_report(results)
+
+    if args.register:
+        source = metadata or {'training_rows': None, 'fit_seconds': 0, 'version': None}
+        base = {'base_version': source['version']} if metadata else {'base_path': os.path.abspath(args.path)}
+        registered = register_model(
+            args.family, variants[args.register], X, source['fit_seconds'],
+            metrics={k: v for k, v in results[-1].items() if k in ('r2', 'mse')},
+            extra={'source': 'profile_model', 'variant': args.register, **base},
+            training_rows=source['training_rows'],
+        )
+        print(f">>> Registered variant '{args.register}': {args.family}/{registered['version']} "
+              f"({registered['artifact_bytes'] / 1e6:.1f} MB)")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump({'family': args.family, 'version': metadata and metadata['version'], 'results': results},
+                      f, indent=2, default=float)
+        print(f">>> Saved: {args.output}")
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except Exception as e:
+        print(f"Profiling Error: {e}")
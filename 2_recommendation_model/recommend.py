@@ -1,5 +1,30 @@
-import pandas as pd
+"""
+캠페인 성과 기반 인플루언서 추천 (recommend_influencers)
+
+기존 점수(0.4 x engagements + 0.3 x estimated_reach + 0.3 x product_sales)는 원본 값을 그대로 더했기 때문에
+값의 크기가 가장 큰 estimated_reach 가 사실상 순위를 결정했고, 호출할 때마다 전체 DataFrame 을 복사해 다시 계산했습니다.
+
+RankingEngine 은 데이터 스냅샷마다 한 번만
+- 목표(objective) 컬럼들을 정규화(rank: 백분위 순위 0~1 / zscore: 표준화)한 (행 수 x 목표 수) float32 행렬과
+- 필터 컬럼(campaign_type / influencer_category / platform)의 정수 코드 배열을 만들어 두고,
+호출마다 마케터가 넘긴 가중치 벡터로 행렬-벡터 곱 한 번 + argpartition 부분 top-k 선택만 수행합니다.
+가중치가 기본값이든 마케터별 맞춤값이든 비용이 같습니다.
+
+목표 컬럼: engagements, estimated_reach, product_sales (기본 가중치 0.4 / 0.3 / 0.3)
+         + sales_efficiency (product_sales / budget), engagement_rate (engagements / estimated_reach) (기본 가중치 0)
+
+사용 예시 (프로젝트 루트에서 실행):
+    python 2_recommendation_model/recommend.py
+    python 2_recommendation_model/recommend.py --campaign-type Giveaway --weights product_sales=0.7,sales_efficiency=0.3
+    python 2_recommendation_model/recommend.py --normalization zscore --benchmark
+"""
+import argparse
 import os
+import time
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
 from sqlalchemy import create_engine
 from dotenv import load_dotenv
 from cryptography.fernet import Fernet
@@ -27,14 +52,134 @@ def get_decrypted_db_url():
 # .env 파일에서 환경변수 로드
 load_dotenv()
 
-# DB 및 데이터 로드
-try:
-    DB_URL = get_decrypted_db_url()
-    engine = create_engine(DB_URL)
-except ValueError as e:
-    print(f"Error: {e}")
-    exit(1)
-df = pd.read_sql('SELECT * FROM campaign_performance', engine)
+# ==========================================
+# 1. 랭킹 엔진 (스냅샷마다 정규화 행렬을 한 번만 계산)
+# ==========================================
+OBJECTIVES = ['engagements', 'estimated_reach', 'product_sales', 'sales_efficiency', 'engagement_rate']
+DEFAULT_WEIGHTS = {'engagements': 0.4, 'estimated_reach': 0.3, 'product_sales': 0.3}
+FILTER_COLUMNS = ['campaign_type', 'influencer_category', 'platform']
+NORMALIZATIONS = ['rank', 'zscore']
+
+SNAPSHOT_QUERY = 'SELECT * FROM campaign_performance'
+
+
+def objective_values(frame):
+    """목표 컬럼 원본 값 (결측 / 0으로 나누기는 0). 파생 목표는 여기서 계산합니다."""
+    engagements = frame['engagements'].fillna(0).to_numpy(dtype=np.float64)
+    reach = frame['estimated_reach'].fillna(0).to_numpy(dtype=np.float64)
+    sales = frame['product_sales'].fillna(0).to_numpy(dtype=np.float64)
+    budget = frame['budget'].fillna(0).to_numpy(dtype=np.float64)
+    return {
+        'engagements': engagements,
+        'estimated_reach': reach,
+        'product_sales': sales,
+        'sales_efficiency': np.divide(sales, budget, out=np.zeros_like(sales), where=budget > 0),
+        'engagement_rate': np.divide(engagements, reach, out=np.zeros_like(engagements), where=reach > 0),
+    }
+
+
+def normalize(values, method='rank'):
+    """rank: 백분위 순위(동점은 평균 순위, 0~1) / zscore: (x - 평균) / 표준편차 (표준편차 0이면 0)."""
+    if method == 'rank':
+        return (pd.Series(values).rank(method='average').to_numpy() - 1.0) / max(len(values) - 1, 1)
+    if method == 'zscore':
+        std = values.std()
+        return (values - values.mean()) / std if std > 0 else np.zeros_like(values)
+    raise ValueError(f"Unknown normalization '{method}'. Choose one of {NORMALIZATIONS}")
+
+
+class RankingEngine:
+    """
+    campaign_performance 스냅샷 하나에 대한 추천 랭킹 엔진.
+    matrix: (행 수, len(OBJECTIVES)) 정규화 float32 행렬, codes: 필터 컬럼별 정수 코드 (결측은 -1).
+    """
+
+    def __init__(self, frame, normalization='rank'):
+        self.frame = frame.reset_index(drop=True)
+        self.normalization = normalization
+        values = objective_values(self.frame)
+        self.matrix = np.column_stack([normalize(values[c], normalization) for c in OBJECTIVES]).astype(np.float32)
+        self.sales = values['product_sales']
+        self.engagements = values['engagements']
+        self.codes, self.categories = {}, {}
+        for column in FILTER_COLUMNS:
+            categorical = pd.Categorical(self.frame[column])
+            self.codes[column] = categorical.codes
+            self.categories[column] = {value: i for i, value in enumerate(categorical.categories)}
+        self.snapshot_at = datetime.now().isoformat(timespec='seconds')
+
+    @classmethod
+    def from_db(cls, engine, normalization='rank'):
+        return cls(pd.read_sql(SNAPSHOT_QUERY, engine), normalization)
+
+    def __len__(self):
+        return len(self.frame)
+
+    def weight_vector(self, weights=None):
+        """{목표: 가중치} (없는 목표는 0) 또는 OBJECTIVES 순서의 시퀀스 -> float32 벡터."""
+        if weights is None:
+            weights = DEFAULT_WEIGHTS
+        if isinstance(weights, dict):
+            unknown = set(weights) - set(OBJECTIVES)
+            if unknown:
+                raise ValueError(f"Unknown objectives {sorted(unknown)}. Choose from {OBJECTIVES}")
+            return np.array([weights.get(c, 0.0) for c in OBJECTIVES], dtype=np.float32)
+        vector = np.asarray(weights, dtype=np.float32)
+        if vector.shape != (len(OBJECTIVES),):
+            raise ValueError(f"Weight vector must have {len(OBJECTIVES)} values in the order {OBJECTIVES}")
+        return vector
+
+    def candidates(self, campaign_type=None, influencer_category=None, platform=None, min_product_sales=0,
+                   min_engagements=0):
+        """조건을 만족하는 행 번호 배열 (조건이 없으면 None = 전체)."""
+        mask = None
+        for column, value in zip(FILTER_COLUMNS, [campaign_type, influencer_category, platform]):
+            if value:
+                # 스냅샷에 없는 값이면 코드가 -2 가 되어 어떤 행과도 일치하지 않습니다.
+                condition = self.codes[column] == self.categories[column].get(value, -2)
+                mask = condition if mask is None else mask & condition
+        if min_product_sales:
+            mask = (self.sales >= min_product_sales) if mask is None else mask & (self.sales >= min_product_sales)
+        if min_engagements:
+            mask = (self.engagements >= min_engagements) if mask is None else mask & (self.engagements >= min_engagements)
+        return None if mask is None else np.flatnonzero(mask)
+
+    def top_k(self, weights=None, top_n=10, rows=None):
+        """(행 번호, 점수) 를 점수 내림차순으로 top_n 개. rows 가 있으면 그 행들 중에서만 고릅니다."""
+        w = self.weight_vector(weights)
+        scores = self.matrix @ w if rows is None else self.matrix[rows] @ w
+        k = min(top_n, len(scores))
+        if k <= 0:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+        top = np.argpartition(-scores, k - 1)[:k] if k < len(scores) else np.arange(len(scores))
+        top = top[np.lexsort((top, -scores[top]))]  # 점수 내림차순, 동점은 행 순서
+        return (top if rows is None else rows[top]), scores[top]
+
+    def rank(self, weights=None, top_n=10, **filters):
+        """필터 + 가중치로 상위 top_n 행을 score 컬럼과 함께 DataFrame 으로 반환합니다."""
+        rows, scores = self.top_k(weights, top_n, self.candidates(**filters))
+        return self.frame.iloc[rows].assign(score=scores)
+
+
+# ==========================================
+# 2. 추천 함수 (스냅샷은 첫 호출 시 한 번만 로드)
+# ==========================================
+ranking_engine = None
+
+
+def get_ranking_engine():
+    global ranking_engine
+    if ranking_engine is None:
+        ranking_engine = RankingEngine.from_db(create_engine(get_decrypted_db_url()))
+    return ranking_engine
+
+
+def refresh_ranking_engine(normalization='rank'):
+    """새 데이터가 적재되었을 때 스냅샷(정규화 행렬)을 다시 만듭니다."""
+    global ranking_engine
+    ranking_engine = RankingEngine.from_db(create_engine(get_decrypted_db_url()), normalization)
+    return ranking_engine
+
 
 def recommend_influencers(
     campaign_type=None,
@@ -42,9 +187,22 @@ def recommend_influencers(
     platform=None,
     top_n=10,
     min_product_sales=0,
-    min_engagements=0
+    min_engagements=0,
+    weights=None
 ):
-    # 1. 캠페인 조건 기반 필터링
+    """
+    캠페인 조건으로 필터링한 뒤 정규화된 목표의 가중합(score)으로 상위 top_n 을 반환합니다.
+    weights: {목표: 가중치} (기본 DEFAULT_WEIGHTS, 목표 목록은 OBJECTIVES)
+    """
+    return get_ranking_engine().rank(
+        weights, top_n, campaign_type=campaign_type, influencer_category=influencer_category, platform=platform,
+        min_product_sales=min_product_sales, min_engagements=min_engagements
+    )
+
+
+def legacy_recommend(df, campaign_type=None, influencer_category=None, platform=None, top_n=10,
+                     min_product_sales=0, min_engagements=0):
+    """기존 방식(원본 값 가중합, 매 호출 복사 + 전체 정렬) - 벤치마크 비교용."""
     filtered = df.copy()
     if campaign_type:
         filtered = filtered[filtered['campaign_type'] == campaign_type]
@@ -56,21 +214,80 @@ def recommend_influencers(
         (filtered['product_sales'] >= min_product_sales) &
         (filtered['engagements'] >= min_engagements)
     ]
-    # 2. 점수 산식
     filtered['score'] = (
         0.4 * filtered['engagements'].fillna(0)
         + 0.3 * filtered['estimated_reach'].fillna(0)
         + 0.3 * filtered['product_sales'].fillna(0)
     )
-    # 3. TOP N 인플루언서 반환
     return filtered.sort_values(by='score', ascending=False).head(top_n)
 
-# 테스트 실행 예시
-result = recommend_influencers(
-    campaign_type='Brand Awareness',
-    influencer_category='Food',
-    platform='YouTube',
-    top_n=5,
-    min_product_sales=100
-)
-print(result[['campaign_id','platform','influencer_category','score']])
+
+def parse_weights(text):
+    """'product_sales=0.7,sales_efficiency=0.3' -> dict."""
+    weights = {}
+    for item in text.split(','):
+        name, _, value = item.partition('=')
+        weights[name.strip()] = float(value)
+    return weights
+
+
+def run_benchmark(ranking, repeat=20, seed=42):
+    """기존 방식 vs 랭킹 엔진 (기본 가중치 / 호출마다 다른 마케터 가중치) 호출당 시간 (ms)."""
+    rng = np.random.default_rng(seed)
+    filters = {'campaign_type': 'Brand Awareness', 'influencer_category': 'Food', 'platform': 'YouTube',
+               'min_product_sales': 100}
+    timings = {}
+    started = time.perf_counter()
+    for _ in range(repeat):
+        legacy_recommend(ranking.frame, top_n=10, **filters)
+    timings['legacy_ms'] = (time.perf_counter() - started) / repeat * 1e3
+    for label in ['default', 'custom']:
+        for suffix, kwargs in [('', filters), ('_unfiltered', {})]:
+            started = time.perf_counter()
+            for _ in range(repeat):
+                ranking.rank(rng.random(len(OBJECTIVES)) if label == 'custom' else None, 10, **kwargs)
+            timings[f'{label}{suffix}_ms'] = (time.perf_counter() - started) / repeat * 1e3
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description="캠페인 성과 기반 인플루언서 추천 (정규화 목표 가중합 랭킹)")
+    parser.add_argument('--campaign-type', default='Brand Awareness')
+    parser.add_argument('--influencer-category', default='Food')
+    parser.add_argument('--platform', default='YouTube')
+    parser.add_argument('--top', type=int, default=5)
+    parser.add_argument('--min-product-sales', type=float, default=100)
+    parser.add_argument('--weights', help=f"목표별 가중치 (예: product_sales=0.7,sales_efficiency=0.3), 목표: {', '.join(OBJECTIVES)}")
+    parser.add_argument('--normalization', choices=NORMALIZATIONS, default='rank')
+    parser.add_argument('--benchmark', action='store_true', help="기존 방식과 호출당 시간 비교")
+    args = parser.parse_args()
+
+    print(">>> [1/2] Building ranking snapshot...")
+    started = time.perf_counter()
+    ranking = refresh_ranking_engine(args.normalization)
+    print(f"   {len(ranking):,} campaigns, {args.normalization} normalization ({time.perf_counter() - started:.1f}s)")
+
+    print(">>> [2/2] Ranking...")
+    weights = parse_weights(args.weights) if args.weights else None
+    result = recommend_influencers(
+        campaign_type=args.campaign_type,
+        influencer_category=args.influencer_category,
+        platform=args.platform,
+        top_n=args.top,
+        min_product_sales=args.min_product_sales,
+        weights=weights
+    )
+    print(result[['campaign_id', 'platform', 'influencer_category', 'score']])
+
+    if args.benchmark:
+        timings = run_benchmark(ranking)
+        print(f"   legacy {timings['legacy_ms']:.1f} ms/call | engine default {timings['default_ms']:.1f} ms, "
+              f"custom weights {timings['custom_ms']:.1f} ms (unfiltered: {timings['default_unfiltered_ms']:.1f} / "
+              f"{timings['custom_unfiltered_ms']:.1f} ms)")
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except Exception as e:
+        print(f"Recommendation Error: {e}")
@@ -0,0 +1,274 @@
+"""
+크리에이터 ROI 사전 계산 배치 (야간 작업)
+
+API 요청 대부분은 이미 creators 테이블에 있는 크리에이터에 대한 질문인데, main.py 는 매 요청마다 포레스트를 다시 탐색합니다.
+이 배치는 모든 크리에이터를 creator_id 범위 청크로 나누어 여러 워커 프로세스에서 병렬로 예측하고
+(평균 + 트리 간 표준편차 + 90% 구간, confidence.py), 결과를 COPY FROM STDIN 으로 creator_roi_scores 테이블에 적재합니다.
+모든 행에는 모델 버전과 점수를 계산할 때의 피처(follower_count / niche / platform)가 붙으므로, 서빙 쪽은 현재 로드한 모델 버전의
+점수 중 요청 피처가 같은 행만 사용하고 나머지는 실시간 예측으로 처리합니다.
+
+- 워커마다 모델 / DB 연결을 한 번만 만들고(initializer), 청크 단위로 읽기 -> 예측 -> COPY 를 반복합니다.
+- 워커는 실행마다 만든 스테이징 테이블에 적재하고, 모두 끝나면 한 트랜잭션에서 해당 버전 점수를 교체합니다
+  (재실행 안전, 중간에 실패해도 서빙 중인 점수는 그대로입니다).
+- 최근 keep_versions 개 버전만 남기고 이전 버전 점수는 정리합니다.
+
+테이블은 5_database/migrations/004_creator_roi_scores.sql, 007_creator_roi_scores_features.sql 로 생성합니다 (python 5_database/migrate.py).
+
+사용 예시 (프로젝트 루트에서 실행):
+    python 2_recommendation_model/score_creators.py                      # 최신 roi 모델로 전체 크리에이터 점수 계산
+    python 2_recommendation_model/score_creators.py --workers 4 --chunk-size 50000
+    python 2_recommendation_model/score_creators.py --version v20261019-164129 --keep-versions 3
+"""
+import argparse
+import io
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import text
+
+SCORES_TABLE = 'creator_roi_scores'
+SCORE_COLUMNS = ['roi_mean', 'roi_std', 'roi_lower', 'roi_upper']
+ROI_FEATURES = ['follower_count', 'niche', 'platform']
+
+DEFAULT_CHUNK_SIZE = 100_000
+DEFAULT_KEEP_VERSIONS = 2
+
+CHUNK_QUERY = """
+    SELECT creator_id, follower_count, niche, platform FROM creators
+    WHERE creator_id >= :lo AND creator_id < :hi
+"""
+
+# 워커 프로세스 전역 상태 (_init_worker 에서 한 번만 생성)
+_worker = {}
+
+
+def creator_id_ranges(engine, chunk_size=DEFAULT_CHUNK_SIZE):
+    """creator_id 최소~최대 구간을 chunk_size 폭의 [lo, hi) 범위 목록으로 나눕니다."""
+    with engine.connect() as conn:
+        lo, hi = conn.execute(text("SELECT min(creator_id), max(creator_id) FROM creators")).one()
+    if lo is None:
+        return []
+    return [(start, min(start + chunk_size, hi + 1)) for start in range(lo, hi + 1, chunk_size)]
+
+
+def _init_worker(version, scored_at, table):
+    from confidence import ForestConfidence
+    from feature_store import CreatorFeatureStore, store_input_columns
+    from db import get_engine
+    from model_registry import load_model, read_metadata
+
+    # train.py --features 로 학습한 모델이면 피처 스토어를 워커마다 한 번만 읽어 입력에 붙입니다.
+    columns = store_input_columns(ROI_FEATURES, read_metadata('roi', version))
+    model, _ = load_model('roi', version=version, expected_columns=columns)
+    _worker['confidence'] = ForestConfidence(model)
+    _worker['store'] = CreatorFeatureStore.load() if columns != ROI_FEATURES else None
+    _worker['engine'] = get_engine()
+    _worker['version'] = version
+    _worker['scored_at'] = scored_at
+    _worker['table'] = table
+
+
+def score_frame(confidence, creators, store=None):
+    """creator_id + ROI 피처 DataFrame -> creator_id + 점수 컬럼 DataFrame (store: 피처 스토어 피처를 입력에 추가)."""
+    if store is None:
+        result = confidence.predict(creators[ROI_FEATURES])
+    else:
+        result = confidence.predict(store.attach(creators)[ROI_FEATURES + list(store.features)])
+    scores = pd.DataFrame({'creator_id': creators['creator_id'].to_numpy(), 'roi_mean': result['mean']})
+    for column, key in zip(SCORE_COLUMNS[1:], ['std', 'lower', 'upper']):
+        scores[column] = result[key] if result[key] is not None else np.nan
+    return scores
+
+
+def score_range(bounds):
+    """워커: creator_id [lo, hi) 범위를 읽어 예측하고 스테이징 테이블에 COPY 로 적재합니다. (행 수, 소요 시간) 반환."""
+    started = time.perf_counter()
+    engine = _worker['engine']
+    creators = pd.read_sql(text(CHUNK_QUERY), engine, params={'lo': bounds[0], 'hi': bounds[1]})
+    creators = creators.dropna(subset=ROI_FEATURES)
+    if creators.empty:
+        return 0, time.perf_counter() - started
+
+    scores = score_frame(_worker['confidence'], creators, _worker['store'])
+    scores[SCORE_COLUMNS] = scores[SCORE_COLUMNS].astype(np.float32)
+    # 서빙 쪽이 요청 피처와 비교할 수 있도록 점수를 계산한 피처를 함께 저장합니다.
+    scores['follower_count'] = creators['follower_count'].to_numpy(dtype=np.int64)
+    scores['niche'] = creators['niche'].to_numpy()
+    scores['platform'] = creators['platform'].to_numpy()
+    scores['model_version'] = _worker['version']
+    scores['scored_at'] = _worker['scored_at']
+
+    buffer = io.StringIO()
+    scores.to_csv(buffer, index=False, header=False)
+    buffer.seek(0)
+    conn = engine.raw_connection()
+    try:
+        with conn.cursor() as cur:
+            cur.copy_expert(f"COPY {_worker['table']} ({', '.join(scores.columns)}) FROM STDIN WITH (FORMAT csv)", buffer)
+        conn.commit()
+    finally:
+        conn.close()
+    return len(scores), time.perf_counter() - started
+
+
+def prune_versions(engine, keep=DEFAULT_KEEP_VERSIONS):
+    """최근 scored_at 기준 keep 개 버전만 남기고 삭제합니다. 삭제한 행 수를 반환합니다."""
+    with engine.begin() as conn:
+        result = conn.execute(text(f"""
+            DELETE FROM {SCORES_TABLE} WHERE model_version NOT IN (
+                SELECT model_version FROM {SCORES_TABLE}
+                GROUP BY model_version ORDER BY max(scored_at) DESC LIMIT :keep
+            )
+        """), {'keep': keep})
+        return result.rowcount
+
+
+def score_all_creators(engine, version=None, workers=None, chunk_size=DEFAULT_CHUNK_SIZE,
+                       keep_versions=DEFAULT_KEEP_VERSIONS):
+    """모든 크리에이터를 병렬로 점수화하여 적재하고 요약 dict 를 반환합니다."""
+    from model_registry import read_metadata
+
+    version = read_metadata('roi', version)['version']
+    workers = workers or os.cpu_count() or 1
+    scored_at = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    ranges = creator_id_ranges(engine, chunk_size)
+
+    # 실행마다 별도의 스테이징 테이블에 적재하므로 동시에 도는 다른 실행 / 서빙 중인 점수와 섞이지 않습니다.
+    staging = f"{SCORES_TABLE}_load_{os.getpid()}"
+    with engine.begin() as conn:
+        if conn.execute(text("SELECT to_regclass(:t)"), {'t': SCORES_TABLE}).scalar() is None:
+            raise RuntimeError(f"Table {SCORES_TABLE} does not exist. Run: python 5_database/migrate.py")
+        if not conn.execute(text("""
+            SELECT 1 FROM information_schema.columns WHERE table_name = :t AND column_name = 'platform'
+        """), {'t': SCORES_TABLE}).scalar():
+            raise RuntimeError(f"Table {SCORES_TABLE} has no feature columns. Run: python 5_database/migrate.py")
+        conn.execute(text(f"DROP TABLE IF EXISTS {staging}"))
+        conn.execute(text(f"CREATE UNLOGGED TABLE {staging} (LIKE {SCORES_TABLE} INCLUDING DEFAULTS)"))
+
+    started = time.perf_counter()
+    rows = 0
+    try:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(version, scored_at, staging)) as pool:
+            for i, (n, seconds) in enumerate(pool.map(score_range, ranges), 1):
+                rows += n
+                print(f"   chunk {i}/{len(ranges)}: {n:,} rows ({seconds:.1f}s)")
+
+        # 모든 청크가 적재된 뒤에만 한 트랜잭션으로 교체합니다 (서빙 쪽은 이전 점수 또는 새 점수 전체만 봅니다).
+        columns = ', '.join(['creator_id', 'model_version', *SCORE_COLUMNS, 'scored_at', *ROI_FEATURES])
+        with engine.begin() as conn:
+            conn.execute(text(f"DELETE FROM {SCORES_TABLE} WHERE model_version = :v"), {'v': version})
+            conn.execute(text(f"INSERT INTO {SCORES_TABLE} ({columns}) SELECT {columns} FROM {staging}"))
+    finally:
+        with engine.begin() as conn:
+            conn.execute(text(f"DROP TABLE IF EXISTS {staging}"))
+    elapsed = time.perf_counter() - started
+
+    pruned = prune_versions(engine, keep_versions)
+    with engine.begin() as conn:
+        conn.execute(text(f"ANALYZE {SCORES_TABLE};"))
+    return {'version': version, 'rows': rows, 'chunks': len(ranges), 'workers': workers,
+            'seconds': elapsed, 'rows_per_second': rows / elapsed if elapsed else 0.0, 'pruned_rows': pruned}
+
+
+class CreatorScores:
+    """
+    한 모델 버전의 creator_roi_scores 를 메모리에 올려둔 조회용 사본입니다.
+    creator_id 정렬 배열 + searchsorted 로 조회하므로 100만 명 기준 약 30MB, 조회는 요청 수에 비례합니다.
+    점수를 계산할 때의 피처도 함께 보관하여(niche / platform 은 범주 코드), 요청 피처가 다르면 '없음'으로 봅니다.
+    """
+
+    def __init__(self, version, creator_ids, scores, features=None, scored_at=None):
+        self.version = version
+        self.creator_ids = creator_ids
+        self.scores = scores  # {'roi_mean': ndarray, 'roi_std': ..., 'roi_lower': ..., 'roi_upper': ...}
+        # {'follower_count': int64 ndarray, 'niche': pd.Categorical, 'platform': pd.Categorical}
+        self.features = features if features is not None else {
+            'follower_count': np.empty(0, dtype=np.int64),
+            'niche': pd.Categorical([]), 'platform': pd.Categorical([])}
+        self.scored_at = scored_at  # 적재 시각 (같은 버전을 다시 점수화했는지 확인하는 용도)
+
+    @classmethod
+    def empty(cls, version):
+        """점수가 하나도 없는 사본 (모든 조회가 '없음')."""
+        return cls(version, np.empty(0, dtype=np.int64), {column: np.empty(0) for column in SCORE_COLUMNS})
+
+    @classmethod
+    def load(cls, engine, version):
+        # 007 마이그레이션 이전에 적재한 행(피처 없음)은 비교할 수 없으므로 제외합니다 (실시간 예측으로 처리).
+        frame = pd.read_sql(text(f"""
+            SELECT creator_id, {', '.join(SCORE_COLUMNS)}, {', '.join(ROI_FEATURES)}, scored_at FROM {SCORES_TABLE}
+            WHERE model_version = :v AND follower_count IS NOT NULL AND niche IS NOT NULL AND platform IS NOT NULL
+            ORDER BY creator_id
+        """), engine, params={'v': version})
+        features = {'follower_count': frame['follower_count'].to_numpy(dtype=np.int64),
+                    'niche': pd.Categorical(frame['niche']), 'platform': pd.Categorical(frame['platform'])}
+        return cls(version, frame['creator_id'].to_numpy(dtype=np.int64),
+                   {column: frame[column].to_numpy(dtype=np.float64) for column in SCORE_COLUMNS},
+                   features, frame['scored_at'].max() if len(frame) else None)
+
+    @staticmethod
+    def latest_scored_at(engine, version):
+        """DB 에 있는 해당 버전 점수의 적재 시각 (한 실행의 행은 모두 같은 값, 없으면 None). PK 인덱스로 한 행만 읽습니다."""
+        with engine.connect() as conn:
+            return conn.execute(text(f"SELECT scored_at FROM {SCORES_TABLE} WHERE model_version = :v LIMIT 1"),
+                                {'v': version}).scalar()
+
+    def __len__(self):
+        return len(self.creator_ids)
+
+    def lookup(self, creator_ids, features=None):
+        """
+        creator_id 배열 -> (찾은 여부 bool 배열, 점수 배열 내 위치). 없는 id 의 위치 값은 의미 없습니다.
+        features({'follower_count': 값 목록, 'niche': ..., 'platform': ...})를 주면 점수를 계산할 때의 피처와
+        모두 같은 행만 찾은 것으로 봅니다 (요청 피처가 바뀌었으면 사전 계산 점수는 맞지 않음).
+        """
+        ids = np.asarray(creator_ids, dtype=np.int64)
+        if not len(self.creator_ids):
+            return np.zeros(len(ids), dtype=bool), np.zeros(len(ids), dtype=np.int64)
+        pos = np.minimum(np.searchsorted(self.creator_ids, ids), len(self.creator_ids) - 1)
+        found = self.creator_ids[pos] == ids
+        if features is not None:
+            found &= self.features['follower_count'][pos] == np.asarray(features['follower_count'], dtype=np.int64)
+            for column in ['niche', 'platform']:
+                stored = self.features[column]
+                codes = stored.categories.get_indexer(pd.Index(features[column], dtype=object))
+                found &= (codes >= 0) & (stored.codes[pos] == codes)
+        return found, pos
+
+    def row_features(self, position):
+        """점수 배열 내 위치 -> 점수를 계산할 때의 {'follower_count', 'niche', 'platform'}."""
+        return {'follower_count': int(self.features['follower_count'][position]),
+                'niche': self.features['niche'][position], 'platform': self.features['platform'][position]}
+
+
+def main():
+    from db import get_engine
+
+    parser = argparse.ArgumentParser(description="모든 크리에이터의 ROI 점수를 병렬 계산하여 creator_roi_scores 에 적재")
+    parser.add_argument('--version', help="roi 모델 버전 (기본: LATEST)")
+    parser.add_argument('--workers', type=int, help="워커 프로세스 수 (기본: CPU 코어 수)")
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE, help="워커 하나가 처리하는 creator_id 범위 폭")
+    parser.add_argument('--keep-versions', type=int, default=DEFAULT_KEEP_VERSIONS, help="보관할 모델 버전 수")
+    args = parser.parse_args()
+
+    print(">>> [1/2] Scoring creators...")
+    engine = get_engine()
+    summary = score_all_creators(engine, args.version, args.workers, args.chunk_size, args.keep_versions)
+
+    print(">>> [2/2] Done.")
+    print(f"   roi/{summary['version']}: {summary['rows']:,} creators in {summary['seconds']:.1f}s "
+          f"({summary['rows_per_second']:,.0f} rows/s, {summary['workers']} workers, {summary['chunks']} chunks)")
+    if summary['pruned_rows']:
+        print(f"   Pruned {summary['pruned_rows']:,} rows of older model versions")
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except Exception as e:
+        print(f"Scoring Error: {e}")
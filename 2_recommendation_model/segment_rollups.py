@@ -0,0 +1,371 @@
+"""
+campaign_performance 세그먼트 사전 집계 (대시보드 / 추천용 세그먼트 분석)
+
+"플랫폼 x 인플루언서 카테고리 x 캠페인 유형별 평균 ROI", "예산 구간별 매출 분포" 같은 질문을 매번 전체 테이블을
+pandas 로 읽어 계산하지 않도록, 세그먼트(platform x influencer_category x campaign_type x budget_band)마다
+건수 / 합계 / 제곱합 / 최소·최대 / 분위수 스케치(log10 고정 구간 히스토그램)를 campaign_segment_rollups 테이블에 유지합니다.
+
+- 모든 값이 더하기(또는 min / max)로 병합되므로, 새 캠페인을 적재할 때 그 배치만 집계해서 기존 값에 더합니다 (update_rollups,
+  적재와 같은 트랜잭션).
+- 조회는 세그먼트 행(최대 수천 개)만 다시 묶으므로 원본 행 수와 무관합니다 (평균 / 표준편차는 정확, 분위수는 근사).
+- 분위수 오차: 구간 폭 10^0.05 (약 12%) 안에서 선형 보간하므로 보통 수 % 이내입니다.
+
+테이블은 5_database/migrations/005_campaign_segment_rollups.sql 로 생성합니다 (python 5_database/migrate.py).
+
+사용 예시 (프로젝트 루트에서 실행):
+    python 2_recommendation_model/segment_rollups.py --rebuild                    # 전체 재계산 (청크 스트리밍)
+    python 2_recommendation_model/segment_rollups.py --group-by platform,influencer_category
+    python 2_recommendation_model/segment_rollups.py --group-by budget_band --platform Instagram --benchmark
+"""
+import argparse
+import time
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import text
+
+ROLLUP_TABLE = 'campaign_segment_rollups'
+SEGMENT_COLUMNS = ['platform', 'influencer_category', 'campaign_type', 'budget_band']
+SOURCE_COLUMNS = ['platform', 'influencer_category', 'campaign_type', 'budget', 'product_sales',
+                  'engagements', 'estimated_reach']
+
+# 예산 구간 하한($): 구간 i = [BUDGET_BANDS[i], BUDGET_BANDS[i + 1])
+BUDGET_BANDS = [0, 500, 1_000, 2_500, 5_000, 10_000, 25_000, 50_000, 100_000]
+
+SUM_COLUMNS = ['campaigns', 'budget_sum', 'sales_sum', 'sales_sumsq', 'roi_sum', 'roi_sumsq',
+               'engagements_sum', 'reach_sum']
+MIN_COLUMNS = ['roi_min', 'sales_min']
+MAX_COLUMNS = ['roi_max', 'sales_max']
+
+# 분위수 스케치: log10 값의 고정 폭 히스토그램 (첫 / 마지막 칸은 범위 밖 값). 구간 경계가 같으므로 더하기로 병합됩니다.
+# roi: log10(매출 / 예산) = log10(1 + ROI% / 100), sales: log10(매출)
+SKETCHES = {'roi': (-3.0, 3.0), 'sales': (0.0, 7.0)}
+SKETCH_STEP = 0.05
+
+DEFAULT_CHUNK_SIZE = 250_000
+
+
+# ==========================================
+# 1. 구간 / 스케치 헬퍼
+# ==========================================
+def _money(value):
+    if value >= 1000:
+        return f"{value / 1000:g}k"
+    return f"{value:g}"
+
+
+def budget_band_labels():
+    edges = BUDGET_BANDS + [None]
+    return [f"{_money(lo)}-{_money(hi)}" if hi else f"{_money(lo)}+" for lo, hi in zip(edges, edges[1:])]
+
+
+def budget_band_of(budget):
+    return np.clip(np.searchsorted(BUDGET_BANDS, budget, side='right') - 1, 0, len(BUDGET_BANDS) - 1)
+
+
+def sketch_bins(name):
+    lo, hi = SKETCHES[name]
+    return int(round((hi - lo) / SKETCH_STEP)) + 2
+
+
+def sketch_index(name, log_values):
+    """log10 값 -> 히스토그램 칸 번호 (0: 범위 아래 / 0 이하 값, 마지막: 범위 위)."""
+    lo, hi = SKETCHES[name]
+    values = np.nan_to_num(log_values, nan=lo - 1, neginf=lo - 1, posinf=hi + 1)
+    return np.clip(np.floor((values - lo) / SKETCH_STEP).astype(np.int64) + 1, 0, sketch_bins(name) - 1)
+
+
+def sketch_quantiles(name, hist, q, lower, upper):
+    """세그먼트별 히스토그램(행) -> q 분위수 log10 값. 범위 밖 칸에 걸리면 해당 세그먼트의 최소 / 최대 값을 씁니다."""
+    lo, _ = SKETCHES[name]
+    cum = np.cumsum(hist, axis=1)
+    target = q * cum[:, -1]
+    idx = np.minimum((cum < target[:, None]).sum(axis=1), hist.shape[1] - 1)
+    rows = np.arange(len(hist))
+    count = hist[rows, idx]
+    before = cum[rows, idx] - count
+    within = np.divide(target - before, count, out=np.zeros(len(hist)), where=count > 0)
+    values = lo + (idx - 1 + within) * SKETCH_STEP
+    values = np.where(idx == 0, lower, np.where(idx == hist.shape[1] - 1, upper, values))
+    return np.clip(values, lower, upper)
+
+
+def _reduce(frame, keys, hists=None, bins=None):
+    """keys 기준으로 합계 / 최소 / 최대와 히스토그램을 묶습니다. hists: 행별 히스토그램, bins: 행별 칸 번호."""
+    grouped = frame.groupby(keys, sort=True, observed=True)
+    codes, n = grouped.ngroup().to_numpy(), grouped.ngroups
+    agg = {**{c: 'sum' for c in SUM_COLUMNS}, **{c: 'min' for c in MIN_COLUMNS}, **{c: 'max' for c in MAX_COLUMNS}}
+    out = grouped.agg(agg).reset_index()
+    merged = {}
+    for name in SKETCHES:
+        width = sketch_bins(name)
+        if bins is not None:
+            merged[name] = np.bincount(codes * width + bins[name], minlength=n * width).reshape(n, width)
+        else:
+            merged[name] = np.zeros((n, width), dtype=np.int64)
+            np.add.at(merged[name], codes, hists[name])
+    return out, merged
+
+
+# ==========================================
+# 2. 세그먼트 집계
+# ==========================================
+class SegmentRollups:
+    """세그먼트 행(frame: SEGMENT_COLUMNS + 합계 컬럼)과 세그먼트별 히스토그램(hists)을 함께 들고 있는 집계 사본입니다."""
+
+    def __init__(self, frame, hists):
+        self.frame = frame.reset_index(drop=True)
+        self.hists = hists  # {'roi': (세그먼트 수, 칸 수) int 배열, 'sales': ...}
+
+    @classmethod
+    def empty(cls):
+        frame = pd.DataFrame({c: pd.Series(dtype=object if c != 'budget_band' else np.int64) for c in SEGMENT_COLUMNS}
+                             | {c: pd.Series(dtype=float) for c in SUM_COLUMNS + MIN_COLUMNS + MAX_COLUMNS})
+        return cls(frame, {name: np.zeros((0, sketch_bins(name)), dtype=np.int64) for name in SKETCHES})
+
+    @classmethod
+    def from_frame(cls, df):
+        """campaign_performance 행(SOURCE_COLUMNS) -> 세그먼트 집계. 결측 범주는 'Unknown', ROI 는 eda.py 와 같은 % 정의."""
+        budget = df['budget'].fillna(0).to_numpy(dtype=float)
+        sales = df['product_sales'].fillna(0).to_numpy(dtype=float)
+        roi = np.divide((sales - budget) * 100, budget, out=np.zeros(len(df)), where=budget > 0)
+        rows = pd.DataFrame({c: df[c].fillna('Unknown').astype(str).to_numpy() for c in SEGMENT_COLUMNS[:3]})
+        rows['budget_band'] = budget_band_of(budget)
+        rows['campaigns'] = 1
+        rows['budget_sum'], rows['sales_sum'], rows['sales_sumsq'] = budget, sales, sales ** 2
+        rows['roi_sum'], rows['roi_sumsq'] = roi, roi ** 2
+        rows['engagements_sum'] = df['engagements'].fillna(0).to_numpy(dtype=float)
+        rows['reach_sum'] = df['estimated_reach'].fillna(0).to_numpy(dtype=float)
+        rows['roi_min'] = rows['roi_max'] = roi
+        rows['sales_min'] = rows['sales_max'] = sales
+        with np.errstate(divide='ignore', invalid='ignore'):
+            bins = {'roi': sketch_index('roi', np.log10(1 + roi / 100)), 'sales': sketch_index('sales', np.log10(sales))}
+        return cls(*_reduce(rows, SEGMENT_COLUMNS, bins=bins))
+
+    def merge(self, other):
+        frame = pd.concat([self.frame, other.frame], ignore_index=True)
+        hists = {name: np.vstack([self.hists[name], other.hists[name]]) for name in SKETCHES}
+        return SegmentRollups(*_reduce(frame, SEGMENT_COLUMNS, hists=hists))
+
+    def __len__(self):
+        return len(self.frame)
+
+    @property
+    def campaigns(self):
+        return int(self.frame['campaigns'].sum())
+
+    # ------------------------------------------
+    # DB 읽기 / 쓰기
+    # ------------------------------------------
+    @classmethod
+    def read(cls, conn):
+        columns = SEGMENT_COLUMNS + SUM_COLUMNS + MIN_COLUMNS + MAX_COLUMNS
+        result = conn.execute(text(
+            f"SELECT {', '.join(columns)}, roi_hist, sales_hist FROM {ROLLUP_TABLE} ORDER BY {', '.join(SEGMENT_COLUMNS)}"))
+        records = result.all()
+        if not records:
+            return cls.empty()
+        frame = pd.DataFrame([r[:len(columns)] for r in records], columns=columns)
+        hists = {name: np.array([r[len(columns) + i] for r in records], dtype=np.int64)
+                 for i, name in enumerate(SKETCHES)}
+        return cls(frame, hists)
+
+    @classmethod
+    def load(cls, engine):
+        with engine.connect() as conn:
+            return cls.read(conn)
+
+    def write(self, conn):
+        """테이블 내용을 이 집계로 교체합니다 (호출한 트랜잭션 안에서 실행)."""
+        updated_at = datetime.now()
+        columns = SEGMENT_COLUMNS + SUM_COLUMNS + MIN_COLUMNS + MAX_COLUMNS
+        records = self.frame[columns].to_dict(orient='records')
+        for i, record in enumerate(records):
+            record['budget_band'] = int(record['budget_band'])
+            record['campaigns'] = int(record['campaigns'])
+            record['roi_hist'] = self.hists['roi'][i].tolist()
+            record['sales_hist'] = self.hists['sales'][i].tolist()
+            record['updated_at'] = updated_at
+        conn.execute(text(f"DELETE FROM {ROLLUP_TABLE}"))
+        if records:
+            names = columns + ['roi_hist', 'sales_hist', 'updated_at']
+            conn.execute(text(f"INSERT INTO {ROLLUP_TABLE} ({', '.join(names)}) "
+                              f"VALUES ({', '.join(':' + n for n in names)})"), records)
+
+    # ------------------------------------------
+    # 조회
+    # ------------------------------------------
+    def query(self, group_by=('platform',), filters=None, quantiles=(0.5, 0.9)):
+        """
+        세그먼트 행만 다시 묶어 그룹별 통계 DataFrame 을 반환합니다 (원본 행을 읽지 않음).
+        filters: {컬럼: 허용 값 목록}, budget_band 는 budget_band_labels() 의 라벨로 지정합니다.
+        """
+        group_by, labels = list(group_by), budget_band_labels()
+        mask = np.ones(len(self.frame), dtype=bool)
+        for column, values in (filters or {}).items():
+            if values:
+                if column == 'budget_band':
+                    values = [labels.index(v) for v in values]
+                mask &= self.frame[column].isin(values).to_numpy()
+        frame = self.frame[mask].assign(_all='all')
+        hists = {name: self.hists[name][mask] for name in SKETCHES}
+        if not len(frame):
+            return pd.DataFrame(columns=group_by + ['campaigns'])
+        grouped, merged = _reduce(frame, group_by or ['_all'], hists=hists)
+
+        n = grouped['campaigns'].to_numpy(dtype=float)
+        out = grouped[group_by].copy()
+        if 'budget_band' in group_by:
+            out['budget_band'] = [labels[i] for i in out['budget_band']]
+        out['campaigns'] = grouped['campaigns'].astype(np.int64)
+        out['avg_budget'] = grouped['budget_sum'] / n
+        out['avg_sales'] = grouped['sales_sum'] / n
+        out['avg_roi'] = grouped['roi_sum'] / n
+        for name in ['sales', 'roi']:
+            total, sumsq = grouped[f'{name}_sum'].to_numpy(), grouped[f'{name}_sumsq'].to_numpy()
+            variance = np.divide(sumsq - total ** 2 / n, n - 1, out=np.zeros(len(n)), where=n > 1)
+            out[f'{name}_std'] = np.sqrt(np.maximum(variance, 0.0))
+        out['roi_min'], out['roi_max'] = grouped['roi_min'], grouped['roi_max']
+        out['engagement_rate'] = grouped['engagements_sum'] / grouped['reach_sum'].where(grouped['reach_sum'] > 0)
+        for q in quantiles:
+            suffix = f"p{q * 100:g}"
+            with np.errstate(divide='ignore', invalid='ignore'):
+                roi_log = sketch_quantiles('roi', merged['roi'], q, np.log10(1 + grouped['roi_min'] / 100),
+                                           np.log10(1 + grouped['roi_max'] / 100))
+                sales_log = sketch_quantiles('sales', merged['sales'], q, np.log10(grouped['sales_min']),
+                                             np.log10(grouped['sales_max']))
+            out[f'roi_{suffix}'] = (10 ** roi_log - 1) * 100
+            out[f'sales_{suffix}'] = 10 ** sales_log
+        return out
+
+
+# ==========================================
+# 3. 갱신 (증분 / 전체)
+# ==========================================
+def rollups_table_exists(conn):
+    return conn.execute(text("SELECT to_regclass(:t)"), {'t': ROLLUP_TABLE}).scalar() is not None
+
+
+def aggregate_source(conn, chunksize=DEFAULT_CHUNK_SIZE):
+    """campaign_performance 전체를 (conn 의 트랜잭션 안에서) 청크 단위로 스트리밍하며 집계합니다."""
+    rollups = SegmentRollups.empty()
+    query = text(f"SELECT {', '.join(SOURCE_COLUMNS)} FROM campaign_performance").execution_options(
+        stream_results=True)
+    for rows in conn.execute(query).partitions(chunksize):
+        chunk = pd.DataFrame.from_records(rows, columns=SOURCE_COLUMNS, coerce_float=True)
+        rollups = rollups.merge(SegmentRollups.from_frame(chunk))
+    return rollups
+
+
+def update_rollups(conn, df, replace=False):
+    """
+    새로 적재한 campaign_performance 행(df)만 집계해서 기존 세그먼트 값에 더합니다.
+    conn 은 df 를 적재한 그 트랜잭션의 연결이어야 합니다 (적재와 집계가 함께 커밋 / 롤백됩니다).
+    replace=True 이면 (원본 테이블을 df 로 교체한 경우) 기존 값을 버리고 df 의 집계로 바꿉니다.
+    집계 테이블이 비어 있는데 원본에 df 말고도 행이 있으면 (005 마이그레이션 직후) 원본 전체를 다시 집계합니다.
+    테이블이 없으면(마이그레이션 전) 아무것도 하지 않고 None 을 반환합니다.
+    """
+    if not rollups_table_exists(conn):
+        print(f"   Skip rollups: {ROLLUP_TABLE} does not exist (run 5_database/migrate.py)")
+        return None
+    # 동시에 적재하는 다른 프로세스와 읽기 -> 병합 -> 쓰기가 섞이지 않도록 잠급니다 (테이블은 수천 행 이하).
+    conn.execute(text(f"LOCK TABLE {ROLLUP_TABLE} IN SHARE ROW EXCLUSIVE MODE"))
+    delta = SegmentRollups.from_frame(df)
+    if replace:
+        merged = delta
+    else:
+        existing = SegmentRollups.read(conn)
+        if len(existing) == 0 and conn.execute(text("SELECT count(*) FROM campaign_performance")).scalar() > len(df):
+            print(f"   {ROLLUP_TABLE} is empty; rebuilding from campaign_performance")
+            merged = aggregate_source(conn)
+        else:
+            merged = existing.merge(delta)
+    merged.write(conn)
+    return merged
+
+
+def rebuild_rollups(engine, chunksize=DEFAULT_CHUNK_SIZE):
+    """campaign_performance 전체를 청크 단위로 스트리밍하며 다시 집계하고 테이블을 교체합니다."""
+    with engine.begin() as conn:
+        if not rollups_table_exists(conn):
+            raise RuntimeError(f"Table {ROLLUP_TABLE} does not exist. Run: python 5_database/migrate.py")
+        # 집계하는 동안 들어오는 적재(update_rollups)는 잠금에서 기다렸다가 새 값 위에 더해집니다.
+        conn.execute(text(f"LOCK TABLE {ROLLUP_TABLE} IN SHARE ROW EXCLUSIVE MODE"))
+        rollups = aggregate_source(conn, chunksize)
+        rollups.write(conn)
+    return rollups
+
+
+def scan_query(engine, group_by, filters=None):
+    """비교용: 원본 테이블을 전부 읽어 pandas 로 같은 평균을 계산합니다 (eda.py 방식)."""
+    df = pd.read_sql(f"SELECT {', '.join(SOURCE_COLUMNS)} FROM campaign_performance", engine)
+    df['budget_band'] = budget_band_of(df['budget'].fillna(0).to_numpy())
+    for column, values in (filters or {}).items():
+        if values:
+            if column == 'budget_band':
+                values = [budget_band_labels().index(v) for v in values]
+            df = df[df[column].isin(values)]
+    budget = df['budget'].fillna(0)
+    df['roi'] = np.where(budget > 0, (df['product_sales'].fillna(0) - budget) * 100 / budget.where(budget > 0), 0.0)
+    out = df.groupby(group_by).agg(campaigns=('roi', 'size'), avg_roi=('roi', 'mean'), roi_p50=('roi', 'median'),
+                                   avg_sales=('product_sales', 'mean')).reset_index()
+    if 'budget_band' in group_by:
+        out['budget_band'] = [budget_band_labels()[i] for i in out['budget_band']]
+    return out
+
+
+def main():
+    from db import get_engine
+
+    parser = argparse.ArgumentParser(description="campaign_performance 세그먼트 사전 집계 (재계산 / 조회)")
+    parser.add_argument('--rebuild', action='store_true', help="원본 테이블 전체를 다시 집계")
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument('--group-by', default='platform', help=f"묶을 컬럼 (쉼표 구분) {SEGMENT_COLUMNS}")
+    parser.add_argument('--platform', help="필터 (쉼표 구분)")
+    parser.add_argument('--influencer-category', help="필터 (쉼표 구분)")
+    parser.add_argument('--campaign-type', help="필터 (쉼표 구분)")
+    parser.add_argument('--quantiles', default='0.5,0.9')
+    parser.add_argument('--benchmark', action='store_true', help="원본 전체 스캔(pandas)과 시간 / 값 비교")
+    args = parser.parse_args()
+
+    engine = get_engine()
+    if args.rebuild:
+        print(">>> [0/2] Rebuilding segment rollups from campaign_performance...")
+        started = time.perf_counter()
+        rollups = rebuild_rollups(engine, args.chunk_size)
+        print(f"   {rollups.campaigns:,} campaigns -> {len(rollups):,} segments ({time.perf_counter() - started:.1f}s)")
+
+    group_by = [c for c in args.group_by.split(',') if c]
+    filters = {column: value.split(',') for column, value in [
+        ('platform', args.platform), ('influencer_category', args.influencer_category),
+        ('campaign_type', args.campaign_type)] if value}
+    quantiles = [float(q) for q in args.quantiles.split(',')]
+
+    print(">>> [1/2] Querying rollups...")
+    started = time.perf_counter()
+    rollups = SegmentRollups.load(engine)
+    loaded = time.perf_counter()
+    result = rollups.query(group_by, filters, quantiles)
+    done = time.perf_counter()
+    print(f"   {len(rollups):,} segments loaded in {(loaded - started) * 1000:.1f} ms, "
+          f"queried in {(done - loaded) * 1000:.1f} ms")
+    with pd.option_context('display.width', 200, 'display.max_columns', 20):
+        print(result.round(2).to_string(index=False))
+
+    if args.benchmark:
+        print(">>> [2/2] Full table scan for comparison...")
+        started = time.perf_counter()
+        scan = scan_query(engine, group_by, filters)
+        print(f"   Scan + pandas groupby: {time.perf_counter() - started:.2f}s")
+        compare = result.merge(scan, on=group_by, suffixes=('', '_scan'))
+        print(f"   max |avg_roi diff| = {np.max(np.abs(compare['avg_roi'] - compare['avg_roi_scan'])):.2e}, "
+              f"max |roi_p50 diff| = {np.max(np.abs(compare['roi_p50'] - compare['roi_p50_scan'])):.2f} "
+              f"(ROI % points), campaigns equal: {bool((compare['campaigns'] == compare['campaigns_scan']).all())}")
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except Exception as e:
+        print(f"Rollup Error: {e}")
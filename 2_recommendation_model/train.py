@@ -1,16 +1,21 @@
+import argparse
 import os
+import sys
+import time
 import pandas as pd
-import joblib
 from sqlalchemy import create_engine
-from sklearn.ensemble import RandomForestRegressor
 from sklearn.model_selection import train_test_split
-from sklearn.preprocessing import OneHotEncoder
-from sklearn.compose import ColumnTransformer
-from sklearn.pipeline import Pipeline
 from sklearn.metrics import mean_squared_error, r2_score
 from dotenv import load_dotenv
 from cryptography.fernet import Fernet
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import profiling
+from model_families import ENGINES, FAMILIES, build_model, prepare_for_serving, training_query
+from evaluate import evaluate_candidate
+from feature_store import FEATURE_COLUMNS, CreatorFeatureStore
+from model_registry import register_model
+
 def get_decrypted_db_url():
     """환경변수에서 암호화된 DB URL을 복호화하여 반환합니다."""
     key = os.getenv("ENCRYPTION_KEY")
@@ -34,8 +39,9 @@ def get_decrypted_db_url():
 # .env 파일에서 환경변수 로드
 load_dotenv()
 
-def train_model():
+def train_model(model_engine='rf', cv_folds=0, use_features=False):
     print(">>> [1/4] Fetching data from Database...")
+    profiling.step('fetch_data')
     
     try:
         DB_URL = get_decrypted_db_url()
@@ -46,23 +52,28 @@ def train_model():
 
     # DB에서 학습 데이터 가져오기 (Matches + Creators 조인)
     # "누가(Creator) 어떤 성과(ROI)를 냈는가?"
-    query = """
-    SELECT 
-        c.follower_count,
-        c.niche,
-        c.platform,
-        m.actual_roi
-    FROM matches m
-    JOIN creators c ON m.creator_id = c.creator_id
-    """
+    # 5_database/migrate.py로 만든 Materialized View가 있고 원본과 같은 상태이면 조인 대신 뷰를 읽습니다.
+    query = training_query('roi', engine)
+    if query == FAMILIES['roi']['view_query']:
+        print("   Source: training_features_roi (materialized view)")
     df = pd.read_sql(query, engine)
     
     print(f"   Data loaded: {len(df)} records")
-    print("   Features: follower_count, niche, platform")
+
+    # (선택) 피처 스토어(feature_store.py build)의 크리에이터 인게이지먼트 피처를 creator_id 로 붙입니다.
+    features = ['follower_count', 'niche', 'platform']
+    extra_numeric = []
+    if use_features:
+        store = CreatorFeatureStore.load()
+        df = store.attach(df)
+        extra_numeric = FEATURE_COLUMNS
+        features = features + extra_numeric
+        print(f"   Feature store: {len(store):,} creators (built {store.metadata['built_at']})")
+    print(f"   Features: {', '.join(features)}")
     print("   Target: actual_roi")
 
     # 2. 데이터 분리 (Features vs Target)
-    X = df[['follower_count', 'niche', 'platform']]
+    X = df[features]
     y = df['actual_roi']
 
     # 학습셋/테스트셋 분리
@@ -70,24 +81,19 @@ def train_model():
 
     # 3. 파이프라인 구축 (전처리 + 모델)
     print(">>> [2/4] Building ML Pipeline...")
+    profiling.step('build_pipeline')
     
-    # 범주형 데이터(niche, platform)는 One-Hot Encoding, 수치형은 그대로
-    preprocessor = ColumnTransformer(
-        transformers=[
-            ('cat', OneHotEncoder(handle_unknown='ignore'), ['niche', 'platform']),
-            ('num', 'passthrough', ['follower_count'])
-        ]
-    )
-
-    # 모델: Random Forest (강력하고 범용적인 회귀 모델)
-    model = Pipeline([
-        ('preprocessor', preprocessor),
-        ('regressor', RandomForestRegressor(n_estimators=100, random_state=42))
-    ])
+    # rf : Random Forest (강력하고 범용적인 회귀 모델, 범주형은 One-Hot Encoding)
+    # hgb: Histogram Gradient Boosting (범주형 네이티브 지원, 모델이 작고 추론이 빠름)
+    print(f"   Engine: {model_engine}")
+    model = build_model('roi', model_engine, extra_numeric=extra_numeric)
 
     # 4. 모델 학습
     print(">>> [3/4] Training the Model (Learning patterns)...")
+    profiling.step('train')
+    started = time.perf_counter()
     model.fit(X_train, y_train)
+    fit_seconds = time.perf_counter() - started
 
     # 5. 평가
     y_pred = model.predict(X_test)
@@ -95,14 +101,35 @@ def train_model():
     r2 = r2_score(y_test, y_pred)
     print(f"   Model Performance -> MSE: {mse:.2f}, R2: {r2:.2f}")
 
-    # 6. 모델 저장 (직렬화)
+    # 학습은 모든 코어로, 서빙(단건 예측)은 스레드 풀 없이 동작하도록 되돌립니다.
+    prepare_for_serving(model)
+
+    # 6. 모델 저장 (레지스트리의 'roi' 패밀리에 새 버전으로 등록)
     print(">>> [4/4] Saving the Model...")
-    save_path = '2_recommendation_model/saved_models/roi_predictor.joblib'
-    joblib.dump(model, save_path)
-    print(f"   Success! Model saved to: {save_path}")
+    profiling.step('save')
+    metadata = register_model('roi', model, X_train, fit_seconds, metrics={'mse': mse, 'r2': r2},
+                              extra={'engine': model_engine,
+                                     'feature_store': store.metadata['built_at'] if use_features else None})
+    print(f"   Success! Model registered: roi/{metadata['version']} ({metadata['artifact_bytes'] / 1e6:.1f} MB)")
+
+    # 7. (선택) 교차 검증 리포트: 같은 설정으로 K-fold / 시간 분할 평가를 fold 병렬로 실행
+    if cv_folds:
+        print(f">>> [+] Cross-validating ({cv_folds} folds)...")
+        profiling.step('evaluate')
+        evaluate_candidate('roi', build_model('roi', model_engine, extra_numeric=extra_numeric), df,
+                           metadata['version'], folds=cv_folds, source=f"engine:{model_engine}", columns=features)
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="ROI 예측 모델 학습")
+    parser.add_argument('--engine', choices=ENGINES, default='rf', help="rf: RandomForest, hgb: HistGradientBoosting")
+    parser.add_argument('--cv', type=int, default=0, metavar='K',
+                        help="등록 후 K-fold / 시간 분할 교차 검증 리포트(evaluation.json) 작성")
+    parser.add_argument('--features', action='store_true',
+                        help="피처 스토어(feature_store.py build)의 인게이지먼트 피처를 입력에 추가")
+    profiling.add_profile_argument(parser)
+    args = parser.parse_args()
     try:
-        train_model()
+        with profiling.run('train', args.profile):
+            train_model(args.engine, args.cv, args.features)
     except Exception as e:
         print(f"Training Error: {e}")
\ No newline at end of file
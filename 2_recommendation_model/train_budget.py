@@ -1,15 +1,19 @@
+import argparse
 import pandas as pd
-import joblib
 import os
+import sys
+import time
 from sqlalchemy import create_engine
 from sklearn.model_selection import train_test_split
-from sklearn.ensemble import RandomForestRegressor
-from sklearn.preprocessing import OneHotEncoder
-from sklearn.compose import ColumnTransformer
-from sklearn.pipeline import Pipeline
 from dotenv import load_dotenv
 from cryptography.fernet import Fernet
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import profiling
+from model_families import ENGINES, build_model, prepare_for_serving
+from evaluate import evaluate_candidate
+from model_registry import register_model
+
 def get_decrypted_db_url():
     """환경변수에서 암호화된 DB URL을 복호화하여 반환합니다."""
     key = os.getenv("ENCRYPTION_KEY")
@@ -33,8 +37,9 @@ def get_decrypted_db_url():
 # .env 파일에서 환경변수 로드
 load_dotenv()
 
-def train_model():
+def train_model(model_engine='rf', cv_folds=0):
     print("🚀 모델 학습 데이터 로딩 중...")
+    profiling.step('fetch_data')
     try:
         DB_URL = get_decrypted_db_url()
         engine = create_engine(DB_URL)
@@ -48,7 +53,8 @@ def train_model():
         platform, 
         influencer_category, 
         budget, 
-        product_sales 
+        product_sales,
+        start_date
     FROM campaign_performance
     """
     try:
@@ -65,35 +71,47 @@ def train_model():
     X = df[['platform', 'influencer_category', 'budget']]
     y = df['product_sales']
 
-    # 2. 전처리 파이프라인
-    # 범주형 데이터(문자열) -> 수치형 변환
-    preprocessor = ColumnTransformer(
-        transformers=[
-            ('cat', OneHotEncoder(handle_unknown='ignore'), ['platform', 'influencer_category'])
-        ],
-        remainder='passthrough'
-    )
-
-    # 3. 모델 정의 (Random Forest)
-    model_pipeline = Pipeline(steps=[
-        ('preprocessor', preprocessor),
-        ('regressor', RandomForestRegressor(n_estimators=100, random_state=42))
-    ])
+    # 2. 모델 정의 (전처리 + 회귀 모델)
+    # rf : Random Forest (범주형 데이터(문자열)는 One-Hot Encoding)
+    # hgb: Histogram Gradient Boosting (범주형 네이티브 지원, 모델이 작고 추론이 빠름)
+    print(f"🌲 모델 엔진: {model_engine}")
+    profiling.step('build_pipeline')
+    model_pipeline = build_model('sales', model_engine)
 
-    # 4. 학습 진행
+    # 3. 학습 진행
     print("🧠 AI 학습 시작...")
+    profiling.step('train')
     X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
+    started = time.perf_counter()
     model_pipeline.fit(X_train, y_train)
+    fit_seconds = time.perf_counter() - started
 
     # 성능 평가
     score = model_pipeline.score(X_test, y_test)
     print(f"✅ 학습 완료! 예측 정확도(R2 Score): {score:.2f}")
 
-    # 5. 모델 저장
-    os.makedirs('2_recommendation_model/saved_models', exist_ok=True)
-    save_path = '2_recommendation_model/saved_models/roi_predictor.joblib'
-    joblib.dump(model_pipeline, save_path)
-    print(f"💾 모델 파일 저장됨: {save_path}")
+    # 학습은 모든 코어로, 서빙(단건 예측)은 스레드 풀 없이 동작하도록 되돌립니다.
+    prepare_for_serving(model_pipeline)
+
+    # 4. 모델 저장 (레지스트리의 'sales' 패밀리에 새 버전으로 등록 - roi 모델을 덮어쓰지 않음)
+    profiling.step('save')
+    metadata = register_model('sales', model_pipeline, X_train, fit_seconds, metrics={'r2': score},
+                              extra={'engine': model_engine})
+    print(f"💾 모델 등록됨: sales/{metadata['version']} ({metadata['artifact_bytes'] / 1e6:.1f} MB)")
+
+    # 5. (선택) 교차 검증 리포트: 같은 설정으로 K-fold / 시간 분할 평가를 fold 병렬로 실행
+    if cv_folds:
+        print(f"📏 교차 검증 ({cv_folds} folds)...")
+        profiling.step('evaluate')
+        evaluate_candidate('sales', build_model('sales', model_engine), df, metadata['version'], folds=cv_folds,
+                           source=f"engine:{model_engine}")
 
 if __name__ == "__main__":
-    train_model()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="예산 기반 매출 예측 모델 학습")
+    parser.add_argument('--engine', choices=ENGINES, default='rf', help="rf: RandomForest, hgb: HistGradientBoosting")
+    parser.add_argument('--cv', type=int, default=0, metavar='K',
+                        help="등록 후 K-fold / 시간 분할 교차 검증 리포트(evaluation.json) 작성")
+    profiling.add_profile_argument(parser)
+    args = parser.parse_args()
+    with profiling.run('train_budget', args.profile):
+        train_model(args.engine, args.cv)
\ No newline at end of file
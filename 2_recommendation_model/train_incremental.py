@@ -0,0 +1,231 @@
+"""
+증분 학습 모드 (train.py 전체 재학습 대체용)
+
+matches 테이블은 매일 늘어나므로 매번 전체 재학습을 하면 학습 시간이 계속 늘어납니다.
+- 모델 레지스트리 메타데이터에 마지막으로 학습한 match_id / created_at (high-water mark)을 저장하고,
+- 다음 실행에서는 그 이후의 새 행만 가져와 warm_start로 트리를 추가 학습합니다.
+- 새 데이터가 충분히 쌓이거나, 새 범주가 나타나거나, 일정 기간이 지나면 전체 재학습합니다.
+- 전체 재학습은 최신 버전과 같은 엔진(rf / hgb)과 입력 스키마(train.py --features 면 피처 스토어 컬럼 포함)로 만듭니다.
+  증분(warm_start 트리 추가)은 기본 입력의 rf 모델만 가능하므로, 그 외 모델은 매번 전체 재학습합니다.
+
+사용 예시 (프로젝트 루트에서 실행, cron 등으로 주기 실행):
+    python 2_recommendation_model/train_incremental.py              # 자동 (증분 또는 전체)
+    python 2_recommendation_model/train_incremental.py --mode full  # 강제 전체 재학습
+"""
+import argparse
+import time
+from datetime import datetime, timedelta
+
+import pandas as pd
+from sqlalchemy import text
+
+from feature_store import FEATURE_COLUMNS as STORE_FEATURES, CreatorFeatureStore, store_input_columns
+from model_families import FAMILIES, build_model, feature_columns, get_engine, load_training_frame, prepare_for_serving
+from model_registry import ModelNotFoundError, SchemaMismatchError, load_model, read_metadata, register_model
+
+FAMILY = 'roi'
+
+# 전체 재학습 정책 기본값
+DEFAULT_TREES_PER_UPDATE = 20
+DEFAULT_MAX_TREES = 300          # 트리가 이 개수를 넘으면 전체 재학습 (모델 크기/지연시간 제한)
+DEFAULT_REFIT_RATIO = 0.5        # 마지막 전체 학습 이후 새 행이 그때 행 수의 50%를 넘으면 전체 재학습
+DEFAULT_REFIT_DAYS = 7           # 마지막 전체 학습 후 7일이 지나면 전체 재학습
+
+NEW_ROWS_QUERY = """
+    SELECT m.match_id, m.created_at, c.follower_count, c.niche, c.platform, m.actual_roi
+    FROM matches m
+    JOIN creators c ON m.creator_id = c.creator_id
+    WHERE m.match_id > :high_water_match_id
+    ORDER BY m.match_id
+"""
+
+
+def load_latest():
+    """레지스트리 최신 'roi' 모델과 증분 학습 상태를 반환합니다 (상태가 없으면 (None, None))."""
+    try:
+        model, metadata = load_model(FAMILY, expected_columns=feature_columns(FAMILY), artifact='full')
+    except ModelNotFoundError:
+        return None, None
+    except SchemaMismatchError as e:
+        # train.py --features 등 입력 스키마가 다른 모델은 증분으로 이어갈 수 없으므로 (같은 스키마로) 전체 재학습합니다.
+        print(f"   Latest model has a different input schema ({e}) -> full refit")
+        return None, None
+    if metadata.get('extra', {}).get('engine', 'rf') != 'rf':
+        print(f"   Latest model engine is '{metadata['extra']['engine']}' (no warm-start trees) -> full refit")
+        return None, None
+    state = metadata.get('extra', {}).get('incremental')
+    return (model, state) if state else (None, None)
+
+
+def latest_model_spec():
+    """최신 버전의 (모델 엔진, 피처 스토어 사용 여부). 등록된 모델이 없으면 ('rf', False)."""
+    try:
+        metadata = read_metadata(FAMILY)
+    except ModelNotFoundError:
+        return 'rf', False
+    base = feature_columns(FAMILY)
+    return metadata.get('extra', {}).get('engine', 'rf'), store_input_columns(base, metadata) != base
+
+
+def save_model_and_state(model, state, X_fit, fit_seconds, model_engine='rf', store=None):
+    """새 버전으로 등록하고, 증분 학습 상태는 메타데이터(extra.incremental)에 함께 기록합니다 (extra 는 train.py 와 같은 형식)."""
+    extra = {'source': 'train_incremental', 'engine': model_engine,
+             'feature_store': store.metadata['built_at'] if store is not None else None, 'incremental': state}
+    return register_model(FAMILY, model, X_fit, fit_seconds, extra=extra,
+                          training_rows=state['rows_at_full_refit'] + state['rows_since_full_refit'])
+
+
+def high_water_mark(df):
+    return {
+        'high_water_match_id': int(df['match_id'].max()),
+        'high_water_created_at': str(df['created_at'].max()),
+    }
+
+
+def full_refit(engine, n_estimators=100):
+    # 최신 버전과 같은 엔진 / 입력 스키마로 다시 만듭니다 (hgb 나 --features 모델을 기본 rf 로 바꾸지 않도록).
+    model_engine, use_features = latest_model_spec()
+    print(f">>> [1/3] Fetching all training data (full refit, engine={model_engine}"
+          f"{', feature store' if use_features else ''})...")
+    df = load_training_frame(FAMILY, engine)
+    if df.empty:
+        print("❌ 데이터가 없습니다. etl_nurihaus.py를 먼저 실행하세요.")
+        return None
+    columns, extra_numeric, store = feature_columns(FAMILY), [], None
+    if use_features:
+        store = CreatorFeatureStore.load()
+        df = store.attach(df)
+        columns, extra_numeric = columns + STORE_FEATURES, STORE_FEATURES
+    X = df[columns]
+    y = df[FAMILIES[FAMILY]['target']]
+
+    print(f">>> [2/3] Training from scratch on {len(df)} records...")
+    started = time.perf_counter()
+    params = {'n_estimators': n_estimators} if model_engine == 'rf' else {}
+    model = build_model(FAMILY, model_engine, extra_numeric=extra_numeric, **params)
+    model.fit(X, y)
+    prepare_for_serving(model)
+    fit_seconds = time.perf_counter() - started
+
+    state = {
+        **high_water_mark(df),
+        'rows_at_full_refit': len(df),
+        'rows_since_full_refit': 0,
+        'last_full_refit_at': datetime.now().isoformat(timespec='seconds'),
+        'n_estimators': n_estimators if model_engine == 'rf' else None,
+        'updates': [{'mode': 'full', 'rows': len(df), 'fit_seconds': round(fit_seconds, 2),
+                     'at': datetime.now().isoformat(timespec='seconds')}],
+    }
+    print(">>> [3/3] Saving the Model...")
+    metadata = save_model_and_state(model, state, X, fit_seconds, model_engine, store)
+    print(f"   Success! Full refit in {fit_seconds:.1f}s, model registered: {FAMILY}/{metadata['version']}")
+    return state
+
+
+def has_unseen_categories(model, df_new):
+    """학습 당시 전처리기가 모르는 범주가 새 데이터에 있으면 True (증분으로는 반영 불가)."""
+    encoder = model.named_steps['preprocessor'].named_transformers_['cat']
+    for column, known in zip(FAMILIES[FAMILY]['categorical'], encoder.categories_):
+        if not set(df_new[column].dropna().unique()) <= set(known):
+            return True
+    return False
+
+
+def incremental_update(engine, model, state, trees_per_update):
+    print(f">>> [1/3] Fetching new matches after match_id={state['high_water_match_id']}...")
+    df_new = pd.read_sql(text(NEW_ROWS_QUERY), engine,
+                         params={'high_water_match_id': state['high_water_match_id']})
+    df_new = df_new.dropna(subset=[FAMILIES[FAMILY]['target']])
+    if df_new.empty:
+        print("   No new matches. Model is up to date.")
+        return state
+
+    print(f">>> [2/3] Adding {trees_per_update} warm-start trees on {len(df_new)} new records...")
+    started = time.perf_counter()
+    preprocessor = model.named_steps['preprocessor']
+    regressor = model.named_steps['regressor']
+    # 전처리기는 그대로 두고(입력 스키마 고정), 새 트리만 최근 데이터로 학습합니다.
+    Xt_new = preprocessor.transform(df_new[feature_columns(FAMILY)])
+    regressor.set_params(warm_start=True, n_jobs=-1, n_estimators=len(regressor.estimators_) + trees_per_update)
+    regressor.fit(Xt_new, df_new[FAMILIES[FAMILY]['target']])
+    regressor.set_params(warm_start=False, n_jobs=None)
+    fit_seconds = time.perf_counter() - started
+
+    state.update(high_water_mark(df_new))
+    state['rows_since_full_refit'] += len(df_new)
+    state['n_estimators'] = len(regressor.estimators_)
+    state['updates'].append({'mode': 'incremental', 'rows': len(df_new), 'trees_added': trees_per_update,
+                             'fit_seconds': round(fit_seconds, 2), 'at': datetime.now().isoformat(timespec='seconds')})
+
+    print(">>> [3/3] Saving the Model...")
+    metadata = save_model_and_state(model, state, df_new[feature_columns(FAMILY)], fit_seconds, 'rf')
+    print(f"   Success! {state['n_estimators']} trees total, update took {fit_seconds:.1f}s "
+          f"-> {FAMILY}/{metadata['version']}")
+    return state
+
+
+def needs_full_refit(state, model, df_probe_rows, max_trees, refit_ratio, refit_days, trees_per_update):
+    """주기적 전체 재학습 정책: 이유를 문자열로 반환 (필요 없으면 None)."""
+    if state is None:
+        return "no saved model/state"
+    if len(model.named_steps['regressor'].estimators_) + trees_per_update > max_trees:
+        return f"tree count would exceed {max_trees}"
+    if state['rows_since_full_refit'] + df_probe_rows > refit_ratio * state['rows_at_full_refit']:
+        return f"new rows exceed {refit_ratio:.0%} of the last full refit"
+    last_full = datetime.fromisoformat(state['last_full_refit_at'])
+    if datetime.now() - last_full > timedelta(days=refit_days):
+        return f"last full refit is older than {refit_days} days"
+    return None
+
+
+def train_incremental(mode='auto', trees_per_update=DEFAULT_TREES_PER_UPDATE, max_trees=DEFAULT_MAX_TREES,
+                      refit_ratio=DEFAULT_REFIT_RATIO, refit_days=DEFAULT_REFIT_DAYS):
+    try:
+        engine = get_engine()
+    except ValueError as e:
+        print(f"Error initializing database connection: {e}")
+        return None
+
+    model, state = load_latest()
+    if mode == 'full' or state is None:
+        return full_refit(engine)
+
+    with engine.connect() as conn:
+        new_rows = conn.execute(text("SELECT count(*) FROM matches WHERE match_id > :hwm"),
+                                {'hwm': state['high_water_match_id']}).scalar()
+
+    if mode == 'auto':
+        reason = needs_full_refit(state, model, new_rows, max_trees, refit_ratio, refit_days, trees_per_update)
+        if reason:
+            print(f"   Full refit policy triggered: {reason}")
+            return full_refit(engine)
+
+    if new_rows:
+        df_probe = pd.read_sql(text("""
+            SELECT DISTINCT c.niche, c.platform FROM matches m JOIN creators c ON m.creator_id = c.creator_id
+            WHERE m.match_id > :hwm
+        """), engine, params={'hwm': state['high_water_match_id']})
+        if has_unseen_categories(model, df_probe):
+            print("   New niche/platform values found -> full refit")
+            return full_refit(engine)
+
+    return incremental_update(engine, model, state, trees_per_update)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="ROI 모델 증분(warm-start) 학습")
+    parser.add_argument('--mode', choices=['auto', 'incremental', 'full'], default='auto')
+    parser.add_argument('--trees-per-update', type=int, default=DEFAULT_TREES_PER_UPDATE)
+    parser.add_argument('--max-trees', type=int, default=DEFAULT_MAX_TREES)
+    parser.add_argument('--refit-ratio', type=float, default=DEFAULT_REFIT_RATIO)
+    parser.add_argument('--refit-days', type=int, default=DEFAULT_REFIT_DAYS)
+    args = parser.parse_args()
+
+    train_incremental(args.mode, args.trees_per_update, args.max_trees, args.refit_ratio, args.refit_days)
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except Exception as e:
+        print(f"Training Error: {e}")
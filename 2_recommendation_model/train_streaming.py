@@ -0,0 +1,291 @@
+"""
+Out-of-core 학습 모드 (train_budget.py 의 전체 테이블 로딩 대체용)
+
+campaign_performance 전체를 DataFrame 하나로 읽지 않고 청크 단위로 스트리밍하면서 학습합니다.
+- 범주형(platform, influencer_category)은 DB에서 미리 조회한 고정 어휘(vocabulary)로 One-Hot 인코딩
+- 1차 패스: 수치형 / 타깃의 평균·분산만 누적 (StandardScaler.partial_fit)
+- 2차 패스 이후: SGDRegressor 또는 MLPRegressor 를 청크마다 partial_fit
+- 검증용 행(5행 중 1행)은 학습에서 빼고 R2 / MSE 를 누적 계산
+최대 메모리는 청크 크기에만 비례하며 테이블 크기와 무관합니다.
+
+사용 예시 (프로젝트 루트에서 실행):
+    python 2_recommendation_model/train_streaming.py --chunksize 100000 --epochs 3
+    python 2_recommendation_model/train_streaming.py --learner mlp --parquet 1_data_simulation/synthetic_data/campaign_performance.parquet
+"""
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import text
+from sklearn.compose import ColumnTransformer
+from sklearn.linear_model import SGDRegressor
+from sklearn.neural_network import MLPRegressor
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import FunctionTransformer, OneHotEncoder, StandardScaler
+
+from model_families import FAMILIES, feature_columns, get_engine
+from model_registry import register_model
+
+FAMILY = 'sales'
+SPEC = FAMILIES[FAMILY]
+DEFAULT_CHUNKSIZE = 100_000
+VALIDATION_EVERY = 5  # 5행 중 1행은 검증용
+
+
+# ==========================================
+# 1. 청크 소스 (DB / Parquet)
+# ==========================================
+def db_chunk_source(engine, chunksize):
+    """서버 사이드 커서(stream_results)로 campaign_performance를 청크 단위로 읽는 함수를 반환합니다."""
+    columns = feature_columns(FAMILY) + [SPEC['target']]
+    query = f"SELECT {', '.join(columns)} FROM campaign_performance"
+
+    def iter_chunks():
+        with engine.connect().execution_options(stream_results=True) as conn:
+            yield from pd.read_sql(text(query), conn, chunksize=chunksize)
+    return iter_chunks
+
+
+def parquet_chunk_source(path, chunksize):
+    """generate_synthetic.py 가 만든 Parquet 파일을 청크 단위로 읽는 함수를 반환합니다."""
+    import pyarrow.parquet as pq
+
+    columns = feature_columns(FAMILY) + [SPEC['target']]
+
+    def iter_chunks():
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunksize, columns=columns):
+            yield batch.to_pandas()
+    return iter_chunks
+
+
+def db_vocabulary(engine):
+    """범주형 컬럼별 고정 어휘를 DB에서 조회합니다 (SELECT DISTINCT, 인덱스로 빠르게 처리)."""
+    vocab = {}
+    with engine.connect() as conn:
+        for column in SPEC['categorical']:
+            rows = conn.execute(text(
+                f"SELECT DISTINCT {column} FROM campaign_performance WHERE {column} IS NOT NULL ORDER BY 1"))
+            vocab[column] = [r[0] for r in rows]
+    return vocab
+
+
+def parquet_vocabulary(path):
+    import pyarrow.parquet as pq
+    import pyarrow.compute as pc
+
+    vocab = {}
+    parquet = pq.ParquetFile(path)
+    for column in SPEC['categorical']:
+        values = set()
+        # 컬럼 하나씩 row group 단위로 읽으므로 전체 테이블을 메모리에 올리지 않습니다.
+        for i in range(parquet.num_row_groups):
+            values.update(pc.unique(parquet.read_row_group(i, columns=[column]).column(0)).to_pylist())
+        vocab[column] = sorted(v for v in values if v is not None)
+    return vocab
+
+
+# ==========================================
+# 2. 전처리 / 모델
+# ==========================================
+def build_streaming_preprocessor(vocab):
+    """고정 어휘 One-Hot + 예산(원값, log1p) 표준화. 어휘가 고정이라 청크마다 같은 컬럼이 나옵니다."""
+    return ColumnTransformer(
+        transformers=[
+            ('cat', OneHotEncoder(categories=[vocab[c] for c in SPEC['categorical']], handle_unknown='ignore'),
+             SPEC['categorical']),
+            ('num', StandardScaler(), SPEC['numeric']),
+            ('num_log', Pipeline([('log', FunctionTransformer(np.log1p)), ('scale', StandardScaler())]),
+             SPEC['numeric']),
+        ]
+    )
+
+
+def build_learner(learner, random_state=42):
+    if learner == 'mlp':
+        return MLPRegressor(hidden_layer_sizes=(32, 16), learning_rate_init=1e-3, random_state=random_state)
+    # average=True (ASGD): 꼬리가 두꺼운 매출 분포에서도 청크 간 계수가 크게 흔들리지 않도록 평균 계수를 사용
+    return SGDRegressor(penalty='l2', alpha=1e-5, eta0=0.001, average=True, random_state=random_state)
+
+
+def split_validation(chunk, offset):
+    """전역 행 번호 기준으로 VALIDATION_EVERY 행마다 1행을 검증용으로 떼어냅니다."""
+    is_valid = (np.arange(offset, offset + len(chunk)) % VALIDATION_EVERY) == 0
+    return chunk[~is_valid], chunk[is_valid]
+
+
+def fold_target_scaling(learner, y_mean, y_std):
+    """표준화된 타깃으로 학습한 선형 출력층에 타깃 스케일을 되돌려 넣어, 원래 단위로 예측하게 만듭니다."""
+    if isinstance(learner, MLPRegressor):
+        learner.coefs_[-1] = learner.coefs_[-1] * y_std
+        learner.intercepts_[-1] = learner.intercepts_[-1] * y_std + y_mean
+    else:
+        learner.coef_ = learner.coef_ * y_std
+        learner.intercept_ = learner.intercept_ * y_std + y_mean
+
+
+class StreamingMetrics:
+    """R2 / MSE 를 청크마다 누적 계산합니다 (전체 예측값을 저장하지 않음)."""
+
+    def __init__(self):
+        self.n = 0
+        self.sum_y = 0.0
+        self.sum_y2 = 0.0
+        self.sse = 0.0
+
+    def update(self, y_true, y_pred):
+        y_true = np.asarray(y_true, dtype=np.float64)
+        self.n += len(y_true)
+        self.sum_y += y_true.sum()
+        self.sum_y2 += np.square(y_true).sum()
+        self.sse += np.square(y_true - y_pred).sum()
+
+    def result(self):
+        if self.n == 0:
+            return {'r2': float('nan'), 'mse': float('nan'), 'rows': 0}
+        sst = self.sum_y2 - self.sum_y ** 2 / self.n
+        return {'r2': 1.0 - self.sse / sst if sst > 0 else float('nan'), 'mse': self.sse / self.n, 'rows': self.n}
+
+
+# ==========================================
+# 3. 학습
+# ==========================================
+def train_streaming(iter_chunks, vocab, learner='sgd', epochs=3, random_state=42, verbose=True):
+    """청크 이터레이터 팩토리(iter_chunks)로 여러 번 스트리밍하며 학습하고 (model, metrics, schema_sample)을 반환합니다."""
+    features = feature_columns(FAMILY)
+    target = SPEC['target']
+    x_scaler = StandardScaler()
+    x_log_scaler = StandardScaler()
+    y_scaler = StandardScaler()
+    schema_sample = None
+    train_rows = 0
+
+    # 1차 패스: 수치형 / 타깃 통계만 누적
+    if verbose:
+        print(">>> [1/3] Pass 0: accumulating scaling statistics...")
+    offset = 0
+    for chunk in iter_chunks():
+        chunk = chunk.dropna(subset=[target])
+        train, _ = split_validation(chunk, offset)
+        offset += len(chunk)
+        if schema_sample is None:
+            schema_sample = chunk[features].head(0)
+        if not len(train):
+            continue
+        numeric_values = train[SPEC['numeric']].to_numpy(dtype=np.float64)
+        x_scaler.partial_fit(numeric_values)
+        x_log_scaler.partial_fit(np.log1p(numeric_values))
+        y_scaler.partial_fit(train[[target]].to_numpy(dtype=np.float64))
+        train_rows += len(train)
+    if not train_rows:
+        raise ValueError("No rows to train on.")
+
+    # 고정 어휘 인코더는 최소 DataFrame으로 fit 하고, 스케일러에는 전체 데이터의 누적 통계를 넣어둡니다.
+    preprocessor = build_streaming_preprocessor(vocab)
+    preprocessor.fit(_dummy_frame(vocab))
+    fitted_scalers = [(preprocessor.named_transformers_['num'], x_scaler),
+                      (preprocessor.named_transformers_['num_log'].named_steps['scale'], x_log_scaler)]
+    for target_scaler, source in fitted_scalers:
+        for attr in ('mean_', 'var_', 'scale_', 'n_samples_seen_'):
+            setattr(target_scaler, attr, getattr(source, attr))
+
+    y_mean, y_std = float(y_scaler.mean_[0]), float(y_scaler.scale_[0])
+    model = build_learner(learner, random_state)
+
+    # 2차 패스 이후: 청크마다 partial_fit
+    rng = np.random.default_rng(random_state)
+    metrics = None
+    for epoch in range(1, epochs + 1):
+        started = time.perf_counter()
+        metrics = StreamingMetrics()
+        offset = 0
+        for chunk in iter_chunks():
+            chunk = chunk.dropna(subset=[target])
+            train, valid = split_validation(chunk, offset)
+            offset += len(chunk)
+            if len(valid) and epoch > 1:
+                # 검증은 이전 에폭까지 학습한 모델로 평가 (원래 단위로 비교)
+                pred = model.predict(preprocessor.transform(valid[features])) * y_std + y_mean
+                metrics.update(valid[target], pred)
+            if len(train):
+                order = rng.permutation(len(train))
+                Xt = preprocessor.transform(train[features].iloc[order])
+                yt = (train[target].to_numpy(dtype=np.float64)[order] - y_mean) / y_std
+                model.partial_fit(Xt, yt)
+        if verbose:
+            msg = f"   Epoch {epoch}/{epochs} done in {time.perf_counter() - started:.1f}s"
+            if epoch > 1:
+                msg += f" (validation R2 of epoch {epoch - 1}: {metrics.result()['r2']:.3f})"
+            print(msg)
+
+    # 마지막 에폭 모델로 검증 패스 한 번 더 (예측만 수행)
+    if verbose:
+        print(">>> [2/3] Final validation pass...")
+    final_metrics = StreamingMetrics()
+    offset = 0
+    for chunk in iter_chunks():
+        chunk = chunk.dropna(subset=[target])
+        _, valid = split_validation(chunk, offset)
+        offset += len(chunk)
+        if len(valid):
+            pred = model.predict(preprocessor.transform(valid[features])) * y_std + y_mean
+            final_metrics.update(valid[target], pred)
+
+    fold_target_scaling(model, y_mean, y_std)
+    pipeline = Pipeline([('preprocessor', preprocessor), ('regressor', model)])
+    result = final_metrics.result()
+    result['train_rows'] = train_rows
+    return pipeline, result, schema_sample
+
+
+def _dummy_frame(vocab):
+    """전처리기 fit 용 최소 DataFrame (어휘의 첫 값 + 숫자 0)."""
+    row = {c: vocab[c][0] if vocab[c] else '' for c in SPEC['categorical']}
+    row.update({c: 0.0 for c in SPEC['numeric']})
+    return pd.DataFrame([row], columns=feature_columns(FAMILY))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="campaign_performance 청크 스트리밍 학습 (sales 모델)")
+    parser.add_argument('--learner', choices=['sgd', 'mlp'], default='sgd')
+    parser.add_argument('--chunksize', type=int, default=DEFAULT_CHUNKSIZE)
+    parser.add_argument('--epochs', type=int, default=3)
+    parser.add_argument('--parquet', help="DB 대신 Parquet 파일에서 읽기 (generate_synthetic.py 결과)")
+    parser.add_argument('--no-register', action='store_true', help="레지스트리에 등록하지 않고 평가만")
+    args = parser.parse_args()
+
+    print(f"🚀 스트리밍 학습 시작 (learner={args.learner}, chunksize={args.chunksize:,})")
+    if args.parquet:
+        iter_chunks = parquet_chunk_source(args.parquet, args.chunksize)
+        vocab = parquet_vocabulary(args.parquet)
+    else:
+        try:
+            engine = get_engine()
+        except ValueError as e:
+            print(f"Error: {e}")
+            exit(1)
+        iter_chunks = db_chunk_source(engine, args.chunksize)
+        vocab = db_vocabulary(engine)
+    print(f"   Vocabulary: {vocab}")
+
+    started = time.perf_counter()
+    model, metrics, schema_sample = train_streaming(iter_chunks, vocab, learner=args.learner, epochs=args.epochs)
+    fit_seconds = time.perf_counter() - started
+    print(f"✅ 학습 완료! ({fit_seconds:.1f}s) 검증 R2: {metrics['r2']:.3f}, MSE: {metrics['mse']:.1f}, "
+          f"학습 행 수: {metrics['train_rows']:,}")
+
+    if not args.no_register:
+        print(">>> [3/3] Registering the Model...")
+        metadata = register_model(FAMILY, model, schema_sample, fit_seconds,
+                                  metrics={'r2': metrics['r2'], 'mse': metrics['mse']},
+                                  extra={'source': 'train_streaming', 'learner': args.learner,
+                                         'chunksize': args.chunksize, 'epochs': args.epochs},
+                                  training_rows=metrics['train_rows'])
+        print(f"💾 모델 등록됨: {FAMILY}/{metadata['version']}")
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except Exception as e:
+        print(f"Training Error: {e}")
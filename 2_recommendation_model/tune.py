@@ -0,0 +1,246 @@
+"""
+하이퍼파라미터 탐색 모드 (train.py / train_budget.py 의 고정 파라미터 모델 대체용)
+
+- 전처리(ColumnTransformer) 결과를 joblib.Memory로 디스크에 캐싱하여 후보 간 / 재실행 간 재사용
+- 엔진별 후보 그리드를 모든 코어에서 병렬 학습
+  rf : n_estimators x max_depth x min_samples_leaf
+  hgb: learning_rate x max_leaf_nodes x min_samples_leaf (max_iter 는 early stopping 으로 결정)
+- Successive Halving: 적은 데이터로 먼저 평가하여 성능이 나쁜 후보를 조기 탈락
+- 정확도(R2)와 실측 추론 지연시간을 함께 반영한 점수로 최종 모델 선택
+
+사용 예시 (프로젝트 루트에서 실행):
+    python 2_recommendation_model/tune.py --family roi
+    python 2_recommendation_model/tune.py --family sales --engine hgb
+    python 2_recommendation_model/tune.py --family sales --latency-weight 0.1 --max-latency-ms 20
+"""
+import argparse
+import itertools
+import json
+import os
+import time
+
+import numpy as np
+from joblib import Memory, Parallel, delayed
+from sklearn.model_selection import train_test_split
+from sklearn.pipeline import Pipeline
+from sklearn.metrics import mean_squared_error, r2_score
+from threadpoolctl import threadpool_limits
+
+from model_families import (ENGINES, FAMILIES, SAVED_MODELS_DIR, build_model, feature_columns, load_training_frame,
+                            prepare_for_serving)
+from model_registry import register_model, version_dir
+
+CACHE_DIR = os.path.join(SAVED_MODELS_DIR, '.preprocess_cache')
+
+PARAM_GRIDS = {
+    'rf': {
+        'n_estimators': [50, 100, 200],
+        'max_depth': [None, 8, 16, 32],
+        'min_samples_leaf': [1, 5, 20],
+    },
+    'hgb': {
+        'learning_rate': [0.05, 0.1, 0.2],
+        'max_leaf_nodes': [15, 31, 63],
+        'min_samples_leaf': [20, 100],
+    },
+}
+PARAM_GRID = PARAM_GRIDS['rf']
+
+
+# ==========================================
+# 1. 전처리 캐싱
+# ==========================================
+def _fit_transform(family, X_train, X_valid, engine='rf'):
+    """엔진의 전처리기를 학습 데이터로 fit 하고 학습/검증 행렬을 변환합니다 (joblib.Memory 캐싱 대상)."""
+    preprocessor = build_model(family, engine).named_steps['preprocessor']
+    Xt_train = preprocessor.fit_transform(X_train)
+    Xt_valid = preprocessor.transform(X_valid)
+    # 트리 모델은 밀집 float32 행렬에서 가장 빠르게 동작합니다.
+    if hasattr(Xt_train, 'toarray'):
+        Xt_train, Xt_valid = Xt_train.toarray(), Xt_valid.toarray()
+    return preprocessor, Xt_train.astype(np.float32), Xt_valid.astype(np.float32)
+
+
+def cached_preprocess(family, X_train, X_valid, engine='rf', cache_dir=CACHE_DIR):
+    """입력 데이터 / 엔진이 같으면 캐시된 전처리 결과를 그대로 돌려줍니다."""
+    memory = Memory(cache_dir, verbose=0)
+    return memory.cache(_fit_transform)(family, X_train, X_valid, engine)
+
+
+# ==========================================
+# 2. 후보 학습 / 평가
+# ==========================================
+def param_candidates(grid=PARAM_GRID):
+    keys = list(grid)
+    return [dict(zip(keys, values)) for values in itertools.product(*(grid[k] for k in keys))]
+
+
+def build_regressor(family, engine, params, random_state=42, n_jobs=1):
+    """model_families.build_model 과 같은 설정의 회귀 모델 (전처리 단계 제외)."""
+    if engine == 'rf':
+        params = {**params, 'n_jobs': n_jobs}
+    return build_model(family, engine, random_state, **params).named_steps['regressor']
+
+
+def _fit_candidate(family, engine, params, Xt, y, random_state):
+    # 후보 단위로 병렬화하므로 개별 모델은 단일 코어로 학습합니다 (RF: n_jobs=1, HGB: OpenMP 스레드 1개).
+    model = build_regressor(family, engine, params, random_state)
+    started = time.perf_counter()
+    with threadpool_limits(limits=1):
+        model.fit(Xt, y)
+    return model, time.perf_counter() - started
+
+
+def measure_latency(regressor, Xt_valid, batch_size=1000, repeat=20):
+    """단건 / 배치 추론 지연시간(ms)의 중앙값을 측정합니다."""
+    single = Xt_valid[:1]
+    batch = Xt_valid[:batch_size]
+    regressor.predict(single)  # warm-up
+
+    single_times = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        regressor.predict(single)
+        single_times.append((time.perf_counter() - started) * 1000)
+
+    batch_times = []
+    for _ in range(max(repeat // 4, 3)):
+        started = time.perf_counter()
+        regressor.predict(batch)
+        batch_times.append((time.perf_counter() - started) * 1000)
+
+    return float(np.median(single_times)), float(np.median(batch_times))
+
+
+def combined_score(r2, latency_ms, latency_weight, latency_budget_ms):
+    """정확도(R2)에서 지연시간 페널티를 뺀 점수 (지연시간이 예산과 같으면 latency_weight 만큼 감점)."""
+    return r2 - latency_weight * (latency_ms / latency_budget_ms)
+
+
+def successive_halving(candidates, Xt_train, y_train, Xt_valid, y_valid, eta=3, min_fraction=1 / 9,
+                       n_jobs=-1, random_state=42, latency_weight=0.05, latency_budget_ms=10.0,
+                       max_latency_ms=None, family='roi', engine='rf'):
+    """
+    라운드마다 학습 데이터 비율을 eta배씩 늘리면서 상위 1/eta 후보만 남깁니다.
+    마지막 라운드는 전체 학습 데이터를 사용합니다.
+    """
+    rng = np.random.default_rng(random_state)
+    order = rng.permutation(len(y_train))
+    fraction = min_fraction
+    history = []
+    survivors = candidates
+    rung = 0
+
+    while True:
+        rung += 1
+        fraction = min(fraction, 1.0)
+        n_rows = max(int(len(order) * fraction), 50)
+        idx = order[:n_rows]
+        print(f"   Rung {rung}: {len(survivors)} candidates x {n_rows:,} rows")
+
+        fitted = Parallel(n_jobs=n_jobs)(
+            delayed(_fit_candidate)(family, engine, params, Xt_train[idx], y_train[idx], random_state)
+            for params in survivors
+        )
+
+        results = []
+        for params, (model, fit_seconds) in zip(survivors, fitted):
+            y_pred = model.predict(Xt_valid)
+            r2 = r2_score(y_valid, y_pred)
+            single_ms, batch_ms = measure_latency(model, Xt_valid)
+            score = combined_score(r2, batch_ms, latency_weight, latency_budget_ms)
+            if max_latency_ms is not None and batch_ms > max_latency_ms:
+                score = -np.inf
+            results.append({
+                'rung': rung, 'rows': n_rows, 'params': params,
+                'r2': r2, 'mse': mean_squared_error(y_valid, y_pred),
+                'fit_seconds': fit_seconds, 'single_latency_ms': single_ms, 'batch_latency_ms': batch_ms,
+                'score': score,
+            })
+            del model
+        history.extend(results)
+
+        results.sort(key=lambda r: r['score'], reverse=True)
+        if fraction >= 1.0 or len(results) == 1:
+            return results[0], history
+
+        keep = max(len(results) // eta, 1)
+        for dropped in results[keep:]:
+            dropped['early_stopped'] = True
+        survivors = [r['params'] for r in results[:keep]]
+        fraction *= eta
+
+
+# ==========================================
+# 3. 실행
+# ==========================================
+def tune(family, n_jobs=-1, latency_weight=0.05, latency_budget_ms=10.0, max_latency_ms=None, random_state=42,
+         engine='rf'):
+    spec = FAMILIES[family]
+    print(f">>> [1/4] Fetching '{family}' training data from Database...")
+    df = load_training_frame(family)
+    if df.empty:
+        print("❌ 데이터가 없습니다.")
+        return None
+    X = df[feature_columns(family)]
+    y = df[spec['target']].to_numpy()
+    X_train, X_valid, y_train, y_valid = train_test_split(X, y, test_size=0.2, random_state=random_state)
+    print(f"   Data loaded: {len(df)} records")
+
+    print(">>> [2/4] Preprocessing (cached)...")
+    started = time.perf_counter()
+    preprocessor, Xt_train, Xt_valid = cached_preprocess(family, X_train, X_valid, engine)
+    print(f"   Preprocessed in {time.perf_counter() - started:.2f}s -> {Xt_train.shape[1]} features")
+
+    candidates = param_candidates(PARAM_GRIDS[engine])
+    print(f">>> [3/4] Searching {len(candidates)} {engine} candidates (successive halving, n_jobs={n_jobs})...")
+    best, history = successive_halving(
+        candidates, Xt_train, y_train, Xt_valid, y_valid, n_jobs=n_jobs, random_state=random_state,
+        latency_weight=latency_weight, latency_budget_ms=latency_budget_ms, max_latency_ms=max_latency_ms,
+        family=family, engine=engine,
+    )
+    if not np.isfinite(best['score']):
+        print("❌ 지연시간 조건을 만족하는 후보가 없습니다. --max-latency-ms 를 늘려보세요.")
+        return None
+    print(f"   Best: {best['params']} -> R2: {best['r2']:.3f}, "
+          f"batch latency: {best['batch_latency_ms']:.2f} ms, single: {best['single_latency_ms']:.2f} ms")
+
+    print(">>> [4/4] Refitting best candidate on all cores and saving...")
+    regressor = build_regressor(family, engine, best['params'], random_state, n_jobs=n_jobs)
+    started = time.perf_counter()
+    regressor.fit(Xt_train, y_train)
+    fit_seconds = time.perf_counter() - started
+    # 서빙은 단건 요청 위주이므로 추론 시에는 스레드 풀을 쓰지 않도록 되돌립니다 (RF만 해당).
+    model = prepare_for_serving(Pipeline([('preprocessor', preprocessor), ('regressor', regressor)]))
+
+    metrics = {key: best[key] for key in ('r2', 'mse', 'single_latency_ms', 'batch_latency_ms')}
+    metadata = register_model(family, model, X_train, fit_seconds, metrics=metrics,
+                              extra={'source': 'tune', 'engine': engine, 'params': best['params']})
+    report_path = os.path.join(version_dir(family, metadata['version']), 'tuning_results.json')
+    with open(report_path, 'w', encoding='utf-8') as f:
+        json.dump({'family': family, 'engine': engine, 'best': best, 'history': history}, f, indent=2, default=str)
+    print(f"   Success! Model registered: {family}/{metadata['version']}")
+    print(f"   Search report: {report_path}")
+    return model
+
+
+def main():
+    parser = argparse.ArgumentParser(description="하이퍼파라미터 탐색 (정확도 + 지연시간)")
+    parser.add_argument('--family', choices=list(FAMILIES), default='roi')
+    parser.add_argument('--engine', choices=ENGINES, default='rf', help="rf: RandomForest, hgb: HistGradientBoosting")
+    parser.add_argument('--n-jobs', type=int, default=-1, help="병렬 작업 수 (-1: 모든 코어)")
+    parser.add_argument('--latency-weight', type=float, default=0.05,
+                        help="지연시간 페널티 가중치 (배치 지연시간이 예산과 같을 때 R2 감점 폭)")
+    parser.add_argument('--latency-budget-ms', type=float, default=10.0, help="1,000건 배치 추론 지연시간 예산")
+    parser.add_argument('--max-latency-ms', type=float, help="이 값을 넘는 후보는 제외")
+    args = parser.parse_args()
+
+    tune(args.family, n_jobs=args.n_jobs, latency_weight=args.latency_weight,
+         latency_budget_ms=args.latency_budget_ms, max_latency_ms=args.max_latency_ms, engine=args.engine)
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except Exception as e:
+        print(f"Tuning Error: {e}")
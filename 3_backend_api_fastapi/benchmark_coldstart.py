@@ -0,0 +1,88 @@
+"""
+API 콜드 스타트 측정: 서버 프로세스 시작 -> 첫 헬스 체크 응답 / 첫 예측 응답까지 걸린 시간
+
+uvicorn 으로 main.py 를 새 프로세스로 띄우고, 짧은 간격으로 GET / 와 POST /predict 를 반복 호출하여
+처음 200 응답을 받은 시각을 기록합니다. Render 재시작 직후 상황과 같도록 매 실행마다 새 프로세스를 사용합니다.
+MODEL_ARTIFACT (auto / slim / full) 별로 비교할 수 있습니다.
+
+사용 예시 (프로젝트 루트에서 실행):
+    python 3_backend_api_fastapi/benchmark_coldstart.py
+    python 3_backend_api_fastapi/benchmark_coldstart.py --artifacts slim,full --runs 5 --output coldstart.json
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(script_dir)
+
+PREDICT_BODY = json.dumps({"follower_count": 50000, "niche": "Beauty", "platform": "Instagram",
+                           "budget": 5000}).encode('utf-8')
+
+
+def request_ok(url, body=None, timeout=2.0):
+    req = urllib.request.Request(url, data=body, headers={'Content-Type': 'application/json'} if body else {})
+    try:
+        with urllib.request.urlopen(req, timeout=timeout) as response:
+            return response.status == 200
+    except (urllib.error.URLError, ConnectionError, TimeoutError):
+        return False
+
+
+def measure_once(artifact, port, timeout=120.0, poll_seconds=0.01):
+    """서버를 띄우고 (첫 헬스 응답, 첫 예측 응답) 까지의 초를 반환합니다."""
+    env = {**os.environ, 'MODEL_ARTIFACT': artifact}
+    cmd = [sys.executable, '-m', 'uvicorn', '3_backend_api_fastapi.main:app', '--port', str(port), '--log-level', 'warning']
+    started = time.perf_counter()
+    proc = subprocess.Popen(cmd, cwd=project_root, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    base = f"http://127.0.0.1:{port}"
+    healthy = predicted = None
+    try:
+        while time.perf_counter() - started < timeout and proc.poll() is None:
+            if healthy is None and request_ok(f"{base}/"):
+                healthy = time.perf_counter() - started
+            if healthy is not None and request_ok(f"{base}/predict", PREDICT_BODY):
+                predicted = time.perf_counter() - started
+                break
+            time.sleep(poll_seconds)
+    finally:
+        proc.terminate()
+        proc.wait()
+    return healthy, predicted
+
+
+def main():
+    parser = argparse.ArgumentParser(description="API 콜드 스타트 (첫 헬스 응답 / 첫 예측) 측정")
+    parser.add_argument('--artifacts', default='slim,full', help="비교할 MODEL_ARTIFACT 값 (쉼표 구분)")
+    parser.add_argument('--runs', type=int, default=3)
+    parser.add_argument('--port', type=int, default=8790)
+    parser.add_argument('--output', help="결과 JSON 저장 경로")
+    args = parser.parse_args()
+
+    results = []
+    for artifact in args.artifacts.split(','):
+        samples = [measure_once(artifact, args.port) for _ in range(args.runs)]
+        healthy = [h for h, _ in samples if h is not None]
+        predicted = [p for _, p in samples if p is not None]
+        result = {'artifact': artifact, 'runs': args.runs,
+                  'first_healthy_s': statistics.median(healthy) if healthy else None,
+                  'first_prediction_s': statistics.median(predicted) if predicted else None, 'samples': samples}
+        results.append(result)
+        fmt = lambda v: f"{v:.2f}s" if v is not None else "failed"
+        print(f"   {artifact:<5} first healthy {fmt(result['first_healthy_s'])}, "
+              f"first prediction {fmt(result['first_prediction_s'])} (median of {args.runs})")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+        print(f">>> Saved: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
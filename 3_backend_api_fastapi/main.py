@@ -1,35 +1,77 @@
-import joblib
-import pandas as pd
-from fastapi import FastAPI, HTTPException
-from pydantic import BaseModel
+import numpy as np
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, HTTPException, Query
+from pydantic import BaseModel, Field
+from typing import Dict, List, Optional
 import os
+import sys
+import threading
+import time
 
-# 1. FastAPI 앱 초기화
-app = FastAPI(title="Nurihaus PoC AI API", description="Creator Matching & ROI Prediction")
-
-# 2. 학습된 모델 로드 (서버 시작 시 한 번만 로드)
-# 스크립트의 현재 위치를 기준으로 모델 파일의 절대 경로를 계산합니다.
+# 1. 학습된 모델 로드 (서버 시작 직후 백그라운드 스레드에서 한 번만 로드)
+# 무료 인스턴스는 자주 재시작되므로, 헬스 체크(/)는 모델 로드를 기다리지 않고 바로 응답하고
+# 준비 상태는 /ready 로 확인합니다. pandas / sklearn 은 필요한 경로에서만 import 합니다.
+# 스크립트의 현재 위치를 기준으로 모델 레지스트리 경로를 계산합니다.
 # 이렇게 하면 어떤 위치에서 서버를 실행하더라도 항상 정확한 경로를 찾을 수 있습니다.
-try:
-    # 현재 파일(main.py)의 절대 경로
-    current_file_path = os.path.abspath(__file__)
-    # 현재 파일이 속한 디렉토리 (3_backend_api_fastapi)
-    current_dir = os.path.dirname(current_file_path)
-    # 프로젝트 루트 디렉토리 (current_dir의 상위 폴더)
-    project_root = os.path.dirname(current_dir)
-    # 프로젝트 루트에서부터 모델 파일까지의 전체 경로 조합
-    MODEL_PATH = os.path.join(project_root, "2_recommendation_model", "saved_models", "roi_predictor.joblib")
-    
-    # 경로가 실제로 존재하는지 확인
-    if not os.path.exists(MODEL_PATH):
-        raise FileNotFoundError(f"Model file not found at the calculated path: {MODEL_PATH}")
-
-    model = joblib.load(MODEL_PATH)
-    print(f">>> Model loaded successfully from {MODEL_PATH}")
-
-except Exception as e:
-    print(f">>> FATAL: Failed to load model. Error: {e}")
-    model = None
+# 현재 파일(main.py)의 절대 경로
+current_file_path = os.path.abspath(__file__)
+# 현재 파일이 속한 디렉토리 (3_backend_api_fastapi)
+current_dir = os.path.dirname(current_file_path)
+# 프로젝트 루트 디렉토리 (current_dir의 상위 폴더)
+project_root = os.path.dirname(current_dir)
+# 모델 레지스트리 모듈 위치 (2_recommendation_model)
+sys.path.insert(0, os.path.join(project_root, "2_recommendation_model"))
+# 공용 프로파일러 (NURIHAUS_PROFILE=1 이면 요청별 단계 시간을 모아 서버 종료 시 profiles/ 에 보고서 기록)
+sys.path.insert(0, project_root)
+
+import profiling
+from model_registry import LazyModel, read_metadata
+from confidence import ForestConfidence, confidence_labels
+from feature_store import FEATURE_COLUMNS as STORE_FEATURES, load_store_or_empty, store_input_columns
+
+# 이 서버는 ROI 예측 모델('roi' 패밀리, train.py)만 사용합니다. 다른 패밀리는 로드하지 않습니다.
+# MODEL_ARTIFACT: auto(기본, export_slim.py 로 만든 slim/ 이 있으면 sklearn 없이 로드) / slim / full
+ROI_FEATURES = ['follower_count', 'niche', 'platform']
+roi_model = LazyModel('roi', expected_columns=ROI_FEATURES, artifact=os.getenv('MODEL_ARTIFACT', 'auto'))
+# train.py --features 로 학습한 모델이면 ROI_FEATURES + 피처 스토어 컬럼 (load_roi_model 에서 결정)
+model_features = ROI_FEATURES
+model = None
+forest_confidence = None
+model_error = None
+
+def load_roi_model():
+    global model, forest_confidence, model_error, model_features
+    try:
+        # 입력 스키마가 다르면 SchemaMismatchError가 발생하며, /ready 와 예측 요청에 오류로 보고됩니다.
+        with profiling.stage('model_load'):
+            roi_model.expected_columns = store_input_columns(ROI_FEATURES, read_metadata('roi', roi_model.version))
+            loaded = roi_model.get()
+            # 트리별 리프 값 테이블을 한 번만 만들어 두고, 매 예측마다 평균과 신뢰구간을 함께 계산합니다.
+            forest_confidence = ForestConfidence(loaded)
+        model_features = roi_model.expected_columns
+        model = loaded
+        print(f">>> Model loaded successfully: roi/{roi_model.metadata['version']} "
+              f"[{roi_model.metadata['artifact']}] ({roi_model.load_seconds:.2f}s)")
+    except Exception as e:
+        model_error = str(e)
+        print(f">>> FATAL: Failed to load model. Error: {e}")
+
+def require_model():
+    if model is None:
+        if model_error:
+            raise HTTPException(status_code=500, detail=f"Model is not loaded. {model_error}")
+        raise HTTPException(status_code=503, detail="Model is loading. Please retry shortly.",
+                            headers={"Retry-After": "1"})
+
+@asynccontextmanager
+async def lifespan(app):
+    profiling.start('api')
+    threading.Thread(target=load_roi_model, name="model-loader", daemon=True).start()
+    yield
+    profiling.finish()
+
+# 2. FastAPI 앱 초기화
+app = FastAPI(title="Nurihaus PoC AI API", description="Creator Matching & ROI Prediction", lifespan=lifespan)
 
 # 3. 요청 데이터 구조 정의 (Pydantic)
 class CampaignRequest(BaseModel):
@@ -37,45 +79,355 @@ class CampaignRequest(BaseModel):
     niche: str
     platform: str
     budget: int  # 예산은 ROI 계산 후 매출 추정에 사용
+    creator_id: Optional[int] = None  # 이미 등록된 크리에이터면 사전 계산 점수(creator_roi_scores)를 사용
+
+MAX_CONTENT_TOP_K = 1000  # /match/content 한 번에 돌려줄 최대 크리에이터 수
+
+class ContentMatchRequest(BaseModel):
+    content_requirements: str  # 캠페인 요구사항 텍스트
+    top_k: int = Field(10, gt=0, le=MAX_CONTENT_TOP_K)
+
+class PortfolioRequest(BaseModel):
+    budget: float                                  # 캠페인 총 예산
+    platforms: Optional[List[str]] = None          # 후보 플랫폼 (없으면 전체)
+    niches: Optional[List[str]] = None             # 후보 niche (없으면 전체)
+    min_followers: Optional[int] = None
+    max_followers: Optional[int] = None
+    platform_caps: Optional[Dict[str, float]] = None  # 플랫폼별 예산 비중 상한 (예: {"TikTok": 0.3})
+    max_per_niche: Optional[int] = None            # niche 별 최대 인원 (다양성)
+    max_creators: Optional[int] = None
+    risk_aversion: float = 0.0                     # ROI 평균 - risk_aversion x 표준편차 로 보수적 선택
+    top_n: int = 50                                # 응답에 포함할 선택 크리에이터 수
+
+# 사전 계산된 크리에이터 ROI 점수 (score_creators.py 야간 배치, 현재 모델 버전만)
+# CREATOR_SCORES_CHECK_SECONDS 마다 DB 의 적재 시각(scored_at)을 확인하여 배치가 다시 돌았으면 새로 읽습니다.
+# 로드에 실패하면 (이전 점수가 없을 때) 빈 점수로 실시간 예측만 하고, 같은 주기로 다시 로드를 시도합니다.
+CREATOR_SCORES_CHECK_SECONDS = 60
+creator_scores = None
+creator_scores_checked_at = 0.0
+
+def get_creator_scores():
+    global creator_scores, creator_scores_checked_at, candidate_pool
+    if creator_scores is not None and time.monotonic() - creator_scores_checked_at <= CREATOR_SCORES_CHECK_SECONDS:
+        return creator_scores
+    from score_creators import CreatorScores
+    version = roi_model.metadata['version']
+    try:
+        from db import get_engine
+        engine = get_engine()
+        # 실패 후의 빈 점수는 scored_at 이 None 이므로, DB 에 점수가 생기면 다시 읽습니다.
+        if creator_scores is None or CreatorScores.latest_scored_at(engine, version) != creator_scores.scored_at:
+            creator_scores = CreatorScores.load(engine, version)
+            # 이전 점수로 만든 후보 풀은 다음 요청에서 새 점수로 다시 만듭니다.
+            candidate_pool = None
+            print(f">>> Creator scores loaded: {len(creator_scores):,} creators for roi/{version}")
+    except Exception as e:
+        # 테이블이 없거나 DB에 연결할 수 없으면 (이미 읽은 점수가 없을 때) 모든 요청을 실시간 예측으로 처리합니다.
+        print(f">>> Warning: creator scores unavailable, using live inference only. Error: {e}")
+        if creator_scores is None:
+            creator_scores = CreatorScores.empty(version)
+    creator_scores_checked_at = time.monotonic()
+    return creator_scores
 
-# 4. 헬스 체크 엔드포인트 (서버 상태 확인용)
+# 포트폴리오 후보 풀 (creators 테이블 + ROI 점수, 첫 요청 시 한 번 계산 후 캐싱)
+candidate_pool = None
+
+def get_candidate_pool():
+    global candidate_pool
+    if candidate_pool is None:
+        from db import get_engine
+        from portfolio import CandidatePool
+        candidate_pool = CandidatePool(model, get_engine(), scores=get_creator_scores(),
+                                       feature_store=get_feature_store() if model_features != ROI_FEATURES else None)
+    return candidate_pool
+
+# 크리에이터 인게이지먼트 피처 스토어 (feature_store.py build 로 생성, 첫 요청 시 한 번만 로드, 없으면 모두 기본값)
+feature_store = None
+
+def get_feature_store():
+    global feature_store
+    if feature_store is None:
+        feature_store = load_store_or_empty()
+        print(f">>> Feature store loaded: {len(feature_store):,} creators")
+    return feature_store
+
+# 콘텐츠 매칭 인덱스 (content_index.py build / update 로 생성, 첫 요청 시 로드)
+# 요청마다 meta.json 의 수정 시각을 확인하여(stat 한 번) update 가 인덱스를 교체했으면 다시 읽습니다.
+content_index = None
+content_index_mtime = None
+
+def get_content_index():
+    global content_index, content_index_mtime
+    from content_index import INDEX_DIR, ContentIndex
+    try:
+        mtime = os.stat(os.path.join(INDEX_DIR, 'meta.json')).st_mtime_ns
+    except FileNotFoundError:
+        mtime = None  # 아직 없거나 save 가 폴더를 교체하는 중
+    if content_index is not None and (mtime is None or mtime == content_index_mtime):
+        return content_index
+    try:
+        loaded = ContentIndex.load()
+    except OSError:
+        if content_index is None:
+            raise
+        # 교체 중에 읽지 못했으면 이전 인덱스로 응답하고 다음 요청에서 다시 시도합니다.
+        return content_index
+    content_index, content_index_mtime = loaded, mtime
+    print(f">>> Content index loaded: {loaded.n_docs:,} creators (updated_at {loaded.updated_at})")
+    return content_index
+
+# 세그먼트 사전 집계 (segment_rollups.py, 새 캠페인 적재 시 갱신되므로 일정 시간마다 다시 읽음, 수천 행 이하)
+SEGMENT_ROLLUPS_TTL_SECONDS = 60
+segment_rollups = None
+segment_rollups_loaded_at = 0.0
+
+def get_segment_rollups():
+    global segment_rollups, segment_rollups_loaded_at
+    if segment_rollups is None or time.monotonic() - segment_rollups_loaded_at > SEGMENT_ROLLUPS_TTL_SECONDS:
+        from db import get_engine
+        from segment_rollups import SegmentRollups
+        segment_rollups = SegmentRollups.load(get_engine())
+        segment_rollups_loaded_at = time.monotonic()
+    return segment_rollups
+
+# 4. 헬스 체크 엔드포인트 (서버 상태 확인용, 모델 로드를 기다리지 않음) / 준비 상태 엔드포인트
 @app.get("/")
 def read_root():
     return {"status": "active", "service": "Nurihaus AI PoC"}
 
+@app.get("/ready")
+def read_ready():
+    require_model()
+    return {"status": "ready", "model_version": roi_model.metadata['version'],
+            "artifact": roi_model.metadata['artifact'], "load_seconds": round(roi_model.load_seconds, 3)}
+
+def model_input(rows):
+    """슬림 모델은 {컬럼: 값 목록} 을 그대로 받고, sklearn 파이프라인(full)은 DataFrame 이 필요합니다."""
+    columns = {c: [row[c] for row in rows] for c in model_features}
+    if roi_model.metadata['artifact'] == 'slim':
+        return columns
+    import pandas as pd
+    return pd.DataFrame(columns, columns=model_features)
+
+def predict_requests(requests):
+    """
+    요청 목록의 ROI 평균 + 신뢰구간을 계산합니다.
+    creator_id 가 사전 계산 점수에 있고 요청 피처가 점수를 계산할 때와 같으면 그 값을 쓰고, 나머지(신규 입력 / 피처가 바뀐
+    크리에이터)만 하나의 DataFrame으로 묶어 실시간 예측합니다.
+    creator_id 가 피처 스토어에 있으면 인게이지먼트 피처를 응답에 포함하고, 스토어 피처로 학습한 모델이면 입력에도 붙입니다.
+    """
+    n = len(requests)
+    result = {key: np.full(n, np.nan) for key in ['mean', 'std', 'lower', 'upper']}
+    precomputed = np.zeros(n, dtype=bool)
+
+    with_id = [i for i, r in enumerate(requests) if r.creator_id is not None]
+    store_values, in_store = None, np.zeros(n, dtype=bool)
+    if with_id or model_features != ROI_FEATURES:
+        with profiling.stage('feature_lookup'):
+            store_values, in_store = get_feature_store().get([r.creator_id for r in requests])
+    if with_id:
+        with profiling.stage('precomputed_lookup'):
+            scores = get_creator_scores()
+            found, pos = scores.lookup([requests[i].creator_id for i in with_id],
+                                       features={c: [getattr(requests[i], c) for i in with_id] for c in ROI_FEATURES})
+            if found.any():
+                rows, pos = np.asarray(with_id)[found], pos[found]
+                precomputed[rows] = True
+                for key in result:
+                    result[key][rows] = scores.scores[f'roi_{key}'][pos]
+
+    live = np.flatnonzero(~precomputed)
+    if len(live):
+        with profiling.stage('build_input'):
+            input_data = model_input([{
+                'follower_count': requests[i].follower_count,
+                'niche': requests[i].niche,
+                'platform': requests[i].platform,
+                **({c: float(store_values[c][i]) for c in STORE_FEATURES} if model_features != ROI_FEATURES else {})
+            } for i in live])
+        with profiling.stage('live_inference'):
+            live_result = forest_confidence.predict(input_data)
+        for key in result:
+            if live_result[key] is not None:
+                result[key][live] = live_result[key]
+    labels = confidence_labels(result['mean'], result['lower'], result['upper'])
+
+    responses = []
+    with profiling.stage('format_response'):
+        for i, r in enumerate(requests):
+            predicted_roi = float(result['mean'][i])
+            # 비즈니스 로직: 예상 매출 계산 (ROI * 예산)
+            # ROI가 5.0이면 예산의 5배 효율이라는 뜻
+            estimated_revenue = r.budget * predicted_roi
+            analysis = {
+                "predicted_roi": round(predicted_roi, 2),
+                "estimated_revenue": round(estimated_revenue, 0),
+                "confidence_score": labels[i],
+                "source": "precomputed" if precomputed[i] else "live",
+            }
+            if not np.isnan(result['std'][i]):
+                lower, upper = float(result['lower'][i]), float(result['upper'][i])
+                analysis["roi_std"] = round(float(result['std'][i]), 3)
+                analysis["roi_interval_90"] = [round(lower, 2), round(upper, 2)]
+                analysis["revenue_interval_90"] = [round(r.budget * lower, 0), round(r.budget * upper, 0)]
+            input_info = {
+                "niche": r.niche,
+                "platform": r.platform
+            }
+            if r.creator_id is not None:
+                input_info["creator_id"] = r.creator_id
+            if in_store[i]:
+                input_info["creator_features"] = {c: round(float(store_values[c][i]), 4) for c in STORE_FEATURES}
+            responses.append({
+                "input_info": input_info,
+                "ai_analysis": analysis
+            })
+    return responses
+
 # 5. 추천 및 예측 엔드포인트 (핵심)
 @app.post("/predict")
+@profiling.profile_request
 def predict_roi(request: CampaignRequest):
-    if not model:
-        raise HTTPException(status_code=500, detail="Model is not loaded.")
+    require_model()
+
+    try:
+        # AI 예측 실행 (예상 ROI + 트리 간 분산 기반 신뢰구간)
+        return predict_requests([request])[0]
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Prediction Error: {str(e)}")
 
-    # 입력 데이터를 모델이 이해할 수 있는 DataFrame 형태로 변환
-    input_data = pd.DataFrame([{
-        'follower_count': request.follower_count,
-        'niche': request.niche,
-        'platform': request.platform
-    }])
+# 6. 배치 예측 엔드포인트 (여러 요청을 한 번의 트리 탐색으로 처리)
+@app.post("/predict/batch")
+@profiling.profile_request
+def predict_roi_batch(requests: List[CampaignRequest]):
+    require_model()
+    if not requests:
+        return []
 
     try:
-        # AI 예측 실행 (예상 ROI)
-        predicted_roi = model.predict(input_data)[0]
-        
-        # 비즈니스 로직: 예상 매출 계산 (ROI * 예산)
-        # ROI가 5.0이면 예산의 5배 효율이라는 뜻
-        estimated_revenue = request.budget * predicted_roi
-
-        return {
-            "input_info": {
-                "niche": request.niche,
-                "platform": request.platform
-            },
-            "ai_analysis": {
-                "predicted_roi": round(predicted_roi, 2),
-                "estimated_revenue": round(estimated_revenue, 0),
-                "confidence_score": "Low (Synthetic Data)" # 데모용 문구
-            }
-        }
+        return predict_requests(requests)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Prediction Error: {str(e)}")
 
+# 7. 등록된 크리에이터 ROI 조회 (사전 계산 점수, 없으면 creators 테이블의 피처로 실시간 예측)
+@app.get("/creators/{creator_id}/roi")
+@profiling.profile_request
+def creator_roi(creator_id: int, budget: int = 0):
+    require_model()
+
+    scores = get_creator_scores()
+    found, pos = scores.lookup([creator_id])
+    if found[0]:
+        # 점수를 계산할 때의 피처로 요청을 만들므로 DB 를 조회하지 않고 사전 계산 점수가 그대로 쓰입니다.
+        request = CampaignRequest(**scores.row_features(pos[0]), budget=budget, creator_id=creator_id)
+    else:
+        from sqlalchemy import text
+        from db import get_engine
+        try:
+            with get_engine().connect() as conn:
+                row = conn.execute(text("SELECT follower_count, niche, platform FROM creators WHERE creator_id = :id"),
+                                   {'id': creator_id}).one_or_none()
+        except Exception as e:
+            raise HTTPException(status_code=503, detail=f"Creator lookup unavailable. {e}")
+        if row is None:
+            raise HTTPException(status_code=404, detail=f"Creator {creator_id} not found.")
+        # creator_id 를 넘겨 피처 스토어 피처로 학습한 모델이면 스토어 피처도 입력에 붙입니다.
+        request = CampaignRequest(follower_count=row.follower_count, niche=row.niche, platform=row.platform,
+                                  budget=budget, creator_id=creator_id)
+
+    try:
+        response = predict_requests([request])[0]
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Prediction Error: {str(e)}")
+    creator_features = response["input_info"].get("creator_features")
+    response["input_info"] = {"creator_id": creator_id, "model_version": scores.version}
+    if creator_features is not None:
+        response["input_info"]["creator_features"] = creator_features
+    return response
+
+# 8. 콘텐츠 매칭 엔드포인트 (캠페인 요구사항과 bio가 비슷한 크리에이터 top-k)
+@app.post("/match/content")
+@profiling.profile_request
+def match_content(request: ContentMatchRequest):
+    try:
+        index = get_content_index()
+    except FileNotFoundError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+
+    creator_ids, scores = index.query([request.content_requirements], k=request.top_k)[0]
+    return {
+        "content_requirements": request.content_requirements,
+        "matches": [{"creator_id": int(c), "score": round(float(s), 4)} for c, s in zip(creator_ids, scores)]
+    }
+
+# 9. 예산 제약 포트폴리오 엔드포인트 (예산 안에서 예상 매출이 최대가 되는 크리에이터 조합)
+@app.post("/portfolio")
+@profiling.profile_request
+def build_portfolio(request: PortfolioRequest):
+    require_model()
+
+    from portfolio import filter_candidates, optimize_portfolio
+    try:
+        with profiling.stage('candidate_pool'):
+            pool = get_candidate_pool().frame()
+            candidates = filter_candidates(pool, request.platforms, request.niches,
+                                           request.min_followers, request.max_followers)
+        with profiling.stage('optimize'):
+            picked, summary = optimize_portfolio(
+                candidates, request.budget, platform_caps=request.platform_caps, max_per_niche=request.max_per_niche,
+                max_creators=request.max_creators, risk_aversion=request.risk_aversion,
+            )
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Portfolio Error: {str(e)}")
+
+    columns = ['creator_id', 'platform', 'niche', 'follower_count', 'cost', 'roi_mean', 'roi_std', 'expected_revenue']
+    return {
+        "summary": summary,
+        "creators": picked[columns].head(request.top_n).round(3).to_dict(orient='records')
+    }
+
+# 10. 세그먼트 분석 엔드포인트 (platform x influencer_category x campaign_type x budget_band 사전 집계만 조회)
+# 예: /segments?group_by=platform,influencer_category&campaign_type=Giveaway&quantiles=0.5,0.9
+@app.get("/segments")
+@profiling.profile_request
+def segment_analytics(
+    group_by: List[str] = Query(default=['platform']),
+    platform: Optional[List[str]] = Query(default=None),
+    influencer_category: Optional[List[str]] = Query(default=None),
+    campaign_type: Optional[List[str]] = Query(default=None),
+    budget_band: Optional[List[str]] = Query(default=None),
+    quantiles: List[str] = Query(default=['0.5', '0.9']),
+):
+    from segment_rollups import SEGMENT_COLUMNS, budget_band_labels
+
+    # 반복 파라미터(group_by=a&group_by=b)와 쉼표 구분(group_by=a,b)을 모두 받습니다.
+    split = lambda values: [v for value in values or [] for v in value.split(',') if v]
+    group_by = split(group_by)
+    unknown = [c for c in group_by if c not in SEGMENT_COLUMNS]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown group_by column(s) {unknown}. Choose from {SEGMENT_COLUMNS}")
+    bands = split(budget_band)
+    if any(b not in budget_band_labels() for b in bands):
+        raise HTTPException(status_code=400, detail=f"budget_band must be one of {budget_band_labels()}")
+    try:
+        qs = [float(q) for q in split(quantiles)]
+    except ValueError:
+        qs = [-1.0]
+    if any(not 0 < q < 1 for q in qs):
+        raise HTTPException(status_code=400, detail="quantiles must be numbers between 0 and 1")
+
+    try:
+        rollups = get_segment_rollups()
+    except Exception as e:
+        raise HTTPException(status_code=503, detail=f"Segment rollups unavailable. {e}")
+    filters = {'platform': split(platform), 'influencer_category': split(influencer_category),
+               'campaign_type': split(campaign_type), 'budget_band': bands}
+    result = rollups.query(group_by, filters, qs).round(3)
+    return {
+        "group_by": group_by,
+        "filters": {k: v for k, v in filters.items() if v},
+        "total_campaigns": int(result['campaigns'].sum()) if len(result) else 0,
+        "segments": result.astype(object).where(result.notna(), None).to_dict(orient='records'),
+    }
+
 # 실행 방법 (터미널): uvicorn 3_backend_api_fastapi.main:app --reload
\ No newline at end of file
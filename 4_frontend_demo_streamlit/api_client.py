@@ -0,0 +1,82 @@
+"""
+대시보드용 백엔드(FastAPI) 클라이언트
+
+- 연결 재사용: requests.Session 을 st.cache_resource 로 앱 프로세스당 하나만 만들고 커넥션 풀을 공유합니다.
+- 타임아웃 / 재시도: 연결 3초, 응답 10초. 연결 실패와 502/503/504 는 지수 백오프로 최대 3번 재시도합니다.
+- 응답 캐싱: st.cache_data 로 같은 폼 입력의 결과를 TTL 동안 재사용합니다 (Streamlit rerun 마다 왕복하지 않음).
+  오류 응답은 예외로 올려 캐싱되지 않게 합니다.
+- What-if 그리드: niche x platform x 팔로워 구간 전체를 /predict/batch 한 번으로 보냅니다.
+  예산은 매출(ROI x 예산)만 바꾸므로 그리드는 예산 없이 캐싱하고, 매출은 화면에서 계산합니다.
+"""
+import time
+
+import pandas as pd
+import requests
+import streamlit as st
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+TIMEOUT = (3.05, 10)  # (연결, 응답) 초
+CACHE_TTL_SECONDS = 300
+RETRY = Retry(total=3, backoff_factor=0.3, status_forcelist=[502, 503, 504],
+              allowed_methods=['GET', 'POST'])  # /predict 는 같은 입력에 같은 결과를 주므로 재시도해도 안전
+
+
+class APIError(Exception):
+    """백엔드가 200 이외의 응답을 돌려줬을 때 발생합니다."""
+
+
+@st.cache_resource
+def get_session():
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=10, max_retries=RETRY)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+
+def _post(api_url, path, payload):
+    started = time.perf_counter()
+    response = get_session().post(f"{api_url}{path}", json=payload, timeout=TIMEOUT)
+    latency_ms = (time.perf_counter() - started) * 1000
+    if response.status_code != 200:
+        raise APIError(f"{response.status_code}: {response.text}")
+    return {'data': response.json(), 'latency_ms': latency_ms, 'fetched_at': time.time()}
+
+
+@st.cache_data(ttl=CACHE_TTL_SECONDS, show_spinner=False)
+def _cached_predict(api_url, niche, platform, follower_count, budget):
+    payload = {"niche": niche, "platform": platform, "follower_count": follower_count, "budget": budget}
+    return _post(api_url, "/predict", payload)
+
+
+def predict(api_url, niche, platform, follower_count, budget):
+    """
+    /predict 결과를 반환합니다 (폼 입력 기준 캐싱).
+    반환: {'data': 응답 JSON, 'latency_ms': 실제 API 왕복 시간, 'cached': 이번 호출이 캐시에서 나왔는지}
+    """
+    called_at = time.time()
+    result = _cached_predict(api_url, niche, platform, int(follower_count), int(budget))
+    return {**result, 'cached': result['fetched_at'] < called_at}
+
+
+@st.cache_data(ttl=CACHE_TTL_SECONDS, show_spinner=False)
+def _cached_grid(api_url, niches, platforms, follower_levels):
+    cells = [(n, p, f) for n in niches for p in platforms for f in follower_levels]
+    # budget=1: 응답의 매출 값은 쓰지 않습니다 (예산과 무관한 ROI 만 캐싱)
+    payload = [{"niche": n, "platform": p, "follower_count": f, "budget": 1} for n, p, f in cells]
+    result = _post(api_url, "/predict/batch", payload)
+    grid = pd.DataFrame(cells, columns=['niche', 'platform', 'follower_count'])
+    grid['roi'] = [item['ai_analysis']['predicted_roi'] for item in result['data']]
+    grid['roi_std'] = [item['ai_analysis'].get('roi_std') for item in result['data']]
+    return {**result, 'data': grid}
+
+
+def predict_grid(api_url, niches, platforms, follower_levels):
+    """
+    niche x platform x 팔로워 구간 전체의 예상 ROI 를 한 번의 배치 요청으로 가져옵니다 (그리드 정의 기준 캐싱).
+    반환: {'data': niche / platform / follower_count / roi / roi_std DataFrame, 'latency_ms', 'cached'}
+    """
+    called_at = time.time()
+    result = _cached_grid(api_url, tuple(niches), tuple(platforms), tuple(int(f) for f in follower_levels))
+    return {**result, 'cached': result['fetched_at'] < called_at}
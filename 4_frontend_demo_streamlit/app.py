@@ -1,7 +1,8 @@
+import numpy as np
+import plotly.graph_objects as go
 import streamlit as st
-import requests
-import pandas as pd
-import time
+
+from api_client import APIError, predict, predict_grid
 
 # 1. 페이지 설정
 st.set_page_config(
@@ -15,6 +16,11 @@ if "API_URL" in st.secrets:
 else:
     API_URL = "http://127.0.0.1:8000"
 
+NICHES = ["Beauty", "Fashion", "Lifestyle", "Vlog"]
+PLATFORMS = ["Instagram", "YouTube", "TikTok"]
+# What-if 그리드의 팔로워 구간 (1천 ~ 100만, 로그 간격 20단계)
+FOLLOWER_LEVELS = [int(round(f, -2)) for f in np.geomspace(1000, 1000000, 20)]
+
 # 3. 헤더 섹션
 st.title("Spray Contextual Matcher (Prototype)")
 st.markdown("""
@@ -27,69 +33,96 @@ st.sidebar.header("1. 캠페인 조건 설정")
 
 # 입력 폼
 with st.sidebar.form("campaign_form"):
-    target_niche = st.selectbox("타겟 니치 (Niche)", ["Beauty", "Fashion", "Lifestyle", "Vlog"])
-    target_platform = st.selectbox("플랫폼 (Platform)", ["Instagram", "YouTube", "TikTok"])
+    target_niche = st.selectbox("타겟 니치 (Niche)", NICHES)
+    target_platform = st.selectbox("플랫폼 (Platform)", PLATFORMS)
     target_followers = st.slider("목표 크리에이터 팔로워 수", 1000, 1000000, 50000)
     budget = st.number_input("캠페인 예산 ($)", min_value=500, value=5000, step=500)
     
     submitted = st.form_submit_button("🚀 AI 분석 실행")
 
 # 5. 메인 화면: 결과 표시
+response = None
 if submitted:
-    # API 요청 준비
-    payload = {
-        "niche": target_niche,
-        "platform": target_platform,
-        "follower_count": target_followers,
-        "budget": budget
-    }
-    
     # 로딩 애니메이션 (UX)
     with st.spinner("AI가 2.5만 건의 매칭 데이터를 분석 중입니다..."):
         try:
-            # 백엔드 API 호출
-            response = requests.post(f"{API_URL}/predict", json=payload)
-            time.sleep(1) # (데모용) 분석하는 척 1초 대기
-            
-            if response.status_code == 200:
-                result = response.json()
-                ai_data = result['ai_analysis']
-                
-                # --- 결과 시각화 섹션 ---
-                st.success("분석 완료! AI 예측 결과입니다.")
-                
-                # KPI 지표 (Metrics)
-                col1, col2, col3 = st.columns(3)
-                
-                with col1:
-                    st.metric(label="예상 ROI (투자 대비 수익)", value=f"{ai_data['predicted_roi']}x", delta="AI 예측")
-                
-                with col2:
-                    st.metric(label="예상 매출액 (Revenue)", value=f"${ai_data['estimated_revenue']:,}")
-                
-                with col3:
-                    st.metric(label="데이터 신뢰도", value=ai_data['confidence_score'])
-                
-                # 추가 설명
-                st.info(f"""
-                💡 **인사이트:**
-                선택하신 **{target_platform}** 플랫폼의 **{target_niche}** 카테고리 크리에이터({target_followers:,}명 팔로워)와 매칭 시,
-                **${budget:,}** 예산으로 약 **${ai_data['estimated_revenue']:,}**의 매출 효과가 기대됩니다.
-                """)
-                
-                # (선택) 비교 그래프 예시
-                st.subheader("📊 예상 성과 비교")
-                chart_data = pd.DataFrame({
-                    "구분": ["기존 평균 ROI", "AI 매칭 예상 ROI"],
-                    "ROI": [4.5, ai_data['predicted_roi']] # 4.5는 가상의 기준값
-                })
-                st.bar_chart(chart_data.set_index("구분"))
-                
-            else:
-                st.error(f"API 호출 실패: {response.text}")
-                
+            # 백엔드 API 호출 (세션 재사용 + 같은 입력은 캐시 응답)
+            response = predict(API_URL, target_niche, target_platform, target_followers, budget)
+        except APIError as e:
+            st.error(f"API 호출 실패: {e}")
         except Exception as e:
             st.error(f"서버 연결 오류. 백엔드(FastAPI)가 켜져 있나요? \n 에러 메시지: {e}")
 
+    if response is not None:
+        ai_data = response['data']['ai_analysis']
+
+        # --- 결과 시각화 섹션 ---
+        st.success("분석 완료! AI 예측 결과입니다.")
+        source = "캐시된 결과" if response['cached'] else "실시간 호출"
+        st.caption(f"⏱️ API 응답 시간: {response['latency_ms']:.0f} ms ({source})")
+
+        # KPI 지표 (Metrics)
+        col1, col2, col3 = st.columns(3)
+
+        with col1:
+            st.metric(label="예상 ROI (투자 대비 수익)", value=f"{ai_data['predicted_roi']}x", delta="AI 예측")
+
+        with col2:
+            st.metric(label="예상 매출액 (Revenue)", value=f"${ai_data['estimated_revenue']:,}")
+
+        with col3:
+            st.metric(label="데이터 신뢰도", value=ai_data['confidence_score'])
+
+        # 추가 설명
+        st.info(f"""
+        💡 **인사이트:**
+        선택하신 **{target_platform}** 플랫폼의 **{target_niche}** 카테고리 크리에이터({target_followers:,}명 팔로워)와 매칭 시,
+        **${budget:,}** 예산으로 약 **${ai_data['estimated_revenue']:,}**의 매출 효과가 기대됩니다.
+        """)
+
 else:
     st.info("👈 왼쪽 사이드바에서 캠페인 조건을 설정하고 'AI 분석 실행' 버튼을 눌러주세요.")
+
+# 6. What-if 분석: niche x platform x 팔로워 구간 전체를 한 번의 배치 요청으로 예측하여 히트맵으로 표시
+st.subheader("📊 What-if 분석: 니치 x 플랫폼 x 팔로워 구간별 예상 성과")
+try:
+    # 그리드는 예산과 무관하게 캐싱되므로, 예산만 바꾸면 API를 다시 호출하지 않습니다.
+    grid_response = predict_grid(API_URL, NICHES, PLATFORMS, FOLLOWER_LEVELS)
+except APIError as e:
+    st.error(f"API 호출 실패: {e}")
+    grid_response = None
+except Exception as e:
+    st.error(f"서버 연결 오류. 백엔드(FastAPI)가 켜져 있나요? \n 에러 메시지: {e}")
+    grid_response = None
+
+if grid_response is not None:
+    grid = grid_response['data']
+    grid['revenue'] = grid['roi'] * budget
+
+    metric = st.radio("표시 지표", ["예상 ROI", "예상 매출액"], horizontal=True)
+    value_column, value_format = ("roi", ".2f") if metric == "예상 ROI" else ("revenue", "$,.0f")
+    grid['segment'] = grid['platform'] + " · " + grid['niche']
+    table = grid.pivot(index='segment', columns='follower_count', values=value_column)
+
+    fig = go.Figure(go.Heatmap(
+        z=table.values,
+        x=[f"{f:,}" for f in table.columns],
+        y=table.index,
+        colorscale="Viridis",
+        colorbar=dict(title=metric),
+        hovertemplate=f"%{{y}}<br>팔로워 %{{x}}<br>{metric}: %{{z:{value_format}}}<extra></extra>",
+    ))
+    fig.update_layout(xaxis_title="팔로워 수", yaxis_title="플랫폼 · 니치", height=520,
+                      margin=dict(l=10, r=10, t=30, b=10))
+    st.plotly_chart(fig, use_container_width=True)
+
+    source = "캐시된 결과" if grid_response['cached'] else "실시간 호출"
+    st.caption(f"⏱️ {len(grid)}개 조합을 배치 요청 1회로 예측: {grid_response['latency_ms']:.0f} ms ({source}) · "
+               f"매출은 예산 ${budget:,} 기준")
+
+    # 선택한 조건과 같은 팔로워 구간의 전체 조합 평균 대비 비교 (기존의 가상 기준값 4.5 대체)
+    if response is not None:
+        nearest = min(FOLLOWER_LEVELS, key=lambda f: abs(np.log(f) - np.log(target_followers)))
+        baseline = grid.loc[grid['follower_count'] == nearest, 'roi'].mean()
+        st.metric(label=f"선택 조건 ROI vs 같은 팔로워 구간({nearest:,}) 전체 평균",
+                  value=f"{ai_data['predicted_roi']}x", delta=f"{ai_data['predicted_roi'] - baseline:+.2f}x")
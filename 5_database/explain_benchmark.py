@@ -0,0 +1,155 @@
+"""
+주요 쿼리의 EXPLAIN ANALYZE 실행 시간 측정 (마이그레이션 전/후 비교용)
+
+사용 예시 (프로젝트 루트에서 실행):
+    python 5_database/explain_benchmark.py --label before
+    python 5_database/migrate.py
+    python 5_database/explain_benchmark.py --label after
+    python 5_database/explain_benchmark.py --compare before after
+"""
+import argparse
+import json
+import os
+import statistics
+
+from sqlalchemy import create_engine, text
+from dotenv import load_dotenv
+from cryptography.fernet import Fernet
+
+def get_decrypted_db_url():
+    """환경변수에서 암호화된 DB URL을 복호화하여 반환합니다."""
+    key = os.getenv("ENCRYPTION_KEY")
+    encrypted_url = os.getenv("ENCRYPTED_DATABASE_URL")
+
+    if not key or not encrypted_url:
+        # fallback to the old plain text DATABASE_URL for backward compatibility
+        plain_db_url = os.getenv("DATABASE_URL")
+        if plain_db_url:
+            print("Warning: Using plain text DATABASE_URL. For better security, please use ENCRYPTION_KEY and ENCRYPTED_DATABASE_URL.")
+            return plain_db_url
+        raise ValueError("ENCRYPTION_KEY and ENCRYPTED_DATABASE_URL must be set, or a plain DATABASE_URL must be provided.")
+
+    try:
+        f = Fernet(key.encode('utf-8'))
+        decrypted_url = f.decrypt(encrypted_url.encode('utf-8')).decode('utf-8')
+        return decrypted_url
+    except Exception as e:
+        raise ValueError(f"Failed to decrypt DATABASE_URL. Check your key and encrypted URL. Error: {e}")
+
+# .env 파일에서 환경변수 로드
+load_dotenv()
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+RESULTS_DIR = os.path.join(script_dir, 'benchmarks')
+
+# 측정 대상 쿼리: (이름, 필요한 테이블/뷰, SQL)
+QUERIES = [
+    ('train_roi_join', 'matches', """
+        SELECT c.follower_count, c.niche, c.platform, m.actual_roi
+        FROM matches m JOIN creators c ON m.creator_id = c.creator_id
+    """),
+    ('train_roi_view', 'training_features_roi', """
+        SELECT follower_count, niche, platform, actual_roi FROM training_features_roi
+    """),
+    ('train_roi_recent_join', 'matches', """
+        SELECT c.follower_count, c.niche, c.platform, m.actual_roi
+        FROM matches m JOIN creators c ON m.creator_id = c.creator_id
+        WHERE m.created_at > (SELECT max(created_at) - INTERVAL '7 days' FROM matches)
+    """),
+    ('creator_match_history', 'matches', """
+        SELECT m.match_id, m.actual_roi FROM matches m WHERE m.creator_id = 4242
+    """),
+    ('cp_segment_filter', 'campaign_performance', """
+        SELECT * FROM campaign_performance
+        WHERE campaign_type = 'Brand Awareness' AND influencer_category = 'Food' AND platform = 'YouTube'
+          AND product_sales >= 100
+    """),
+    ('cp_platform_rollup', 'campaign_performance', """
+        SELECT influencer_category, count(*), avg(product_sales), avg(budget)
+        FROM campaign_performance WHERE platform = 'YouTube'
+        GROUP BY influencer_category
+    """),
+    ('cp_recent_campaigns', 'campaign_performance', """
+        SELECT platform, sum(product_sales) FROM campaign_performance
+        WHERE start_date >= (SELECT max(start_date) - INTERVAL '30 days' FROM campaign_performance)
+        GROUP BY platform
+    """),
+]
+
+
+def explain(conn, sql):
+    plan = conn.execute(text(f"EXPLAIN (ANALYZE, FORMAT JSON) {sql}")).scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    top = plan[0]
+    return top['Execution Time'], top['Plan']['Node Type']
+
+
+def run_benchmark(engine, repeat=5):
+    results = {}
+    with engine.connect() as conn:
+        counts = {}
+        for table in ['matches', 'creators', 'campaign_performance']:
+            if conn.execute(text("SELECT to_regclass(:t)"), {'t': table}).scalar() is not None:
+                counts[table] = conn.execute(text(f"SELECT count(*) FROM {table}")).scalar()
+        print(f">>> Row counts: {counts}")
+
+        for name, relation, sql in QUERIES:
+            if conn.execute(text("SELECT to_regclass(:r)"), {'r': relation}).scalar() is None:
+                print(f"   {name:<24} skipped ({relation} does not exist)")
+                continue
+            # 첫 실행은 캐시 워밍업으로 보고 버립니다.
+            explain(conn, sql)
+            timings = []
+            for _ in range(repeat):
+                ms, node = explain(conn, sql)
+                timings.append(ms)
+            results[name] = {'median_ms': statistics.median(timings), 'min_ms': min(timings), 'plan_root': node}
+            print(f"   {name:<24} {results[name]['median_ms']:>10.2f} ms  ({node})")
+    return {'row_counts': counts, 'queries': results}
+
+
+def compare(before_label, after_label):
+    with open(os.path.join(RESULTS_DIR, f"{before_label}.json"), encoding='utf-8') as f:
+        before = json.load(f)['queries']
+    with open(os.path.join(RESULTS_DIR, f"{after_label}.json"), encoding='utf-8') as f:
+        after = json.load(f)['queries']
+
+    print(f"{'query':<24} {before_label:>12} {after_label:>12} {'speedup':>9}")
+    for name, _, _ in QUERIES:
+        b = before.get(name, {}).get('median_ms')
+        a = after.get(name, {}).get('median_ms')
+        b_txt = f"{b:.2f} ms" if b is not None else '-'
+        a_txt = f"{a:.2f} ms" if a is not None else '-'
+        speedup = f"{b / a:.1f}x" if a and b else '-'
+        print(f"{name:<24} {b_txt:>12} {a_txt:>12} {speedup:>9}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="EXPLAIN ANALYZE 기반 쿼리 성능 측정")
+    parser.add_argument('--label', default='latest', help="결과 파일 이름 (benchmarks/<label>.json)")
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--compare', nargs=2, metavar=('BEFORE', 'AFTER'), help="두 결과 비교")
+    args = parser.parse_args()
+
+    if args.compare:
+        compare(*args.compare)
+        return
+
+    try:
+        DB_URL = get_decrypted_db_url()
+        engine = create_engine(DB_URL)
+    except ValueError as e:
+        print(f"Error: {e}")
+        exit(1)
+
+    results = run_benchmark(engine, repeat=args.repeat)
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    path = os.path.join(RESULTS_DIR, f"{args.label}.json")
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2)
+    print(f">>> Saved: {path}")
+
+
+if __name__ == "__main__":
+    main()
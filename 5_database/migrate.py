@@ -0,0 +1,172 @@
+"""
+DB 스키마 마이그레이션 실행기
+
+5_database/migrations/*.sql 파일을 번호 순서대로 한 번씩만 적용하고,
+적용 이력은 schema_migrations 테이블에 기록합니다.
+
+사용 예시 (프로젝트 루트에서 실행):
+    python 5_database/migrate.py                     # 미적용 마이그레이션 적용 (인덱스 + 학습용 뷰)
+    python 5_database/migrate.py --include-optional  # campaign_performance 플랫폼 파티셔닝까지 적용
+    python 5_database/migrate.py --refresh           # 학습용 Materialized View 갱신
+    python 5_database/migrate.py --status            # 적용 현황 확인
+"""
+import argparse
+import os
+import time
+
+from sqlalchemy import create_engine, text
+from dotenv import load_dotenv
+from cryptography.fernet import Fernet
+
+def get_decrypted_db_url():
+    """환경변수에서 암호화된 DB URL을 복호화하여 반환합니다."""
+    key = os.getenv("ENCRYPTION_KEY")
+    encrypted_url = os.getenv("ENCRYPTED_DATABASE_URL")
+
+    if not key or not encrypted_url:
+        # fallback to the old plain text DATABASE_URL for backward compatibility
+        plain_db_url = os.getenv("DATABASE_URL")
+        if plain_db_url:
+            print("Warning: Using plain text DATABASE_URL. For better security, please use ENCRYPTION_KEY and ENCRYPTED_DATABASE_URL.")
+            return plain_db_url
+        raise ValueError("ENCRYPTION_KEY and ENCRYPTED_DATABASE_URL must be set, or a plain DATABASE_URL must be provided.")
+
+    try:
+        f = Fernet(key.encode('utf-8'))
+        decrypted_url = f.decrypt(encrypted_url.encode('utf-8')).decode('utf-8')
+        return decrypted_url
+    except Exception as e:
+        raise ValueError(f"Failed to decrypt DATABASE_URL. Check your key and encrypted URL. Error: {e}")
+
+# .env 파일에서 환경변수 로드
+load_dotenv()
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+MIGRATIONS_DIR = os.path.join(script_dir, 'migrations')
+
+# 기본 실행에서는 건너뛰는 마이그레이션 (--include-optional 로 적용)
+OPTIONAL_MIGRATIONS = {'003_partition_campaign_performance.sql'}
+
+# 학습용 Materialized View 목록 (--refresh 대상): {뷰 이름: 원본 상태를 기록할 키 컬럼}
+MATERIALIZED_VIEWS = {'training_features_roi': 'match_id'}
+# 뷰 갱신 시점의 원본 상태 (008 마이그레이션, model_families.view_is_fresh 가 비교)
+VIEW_REFRESHES_TABLE = 'materialized_view_refreshes'
+
+
+def list_migrations():
+    return sorted(f for f in os.listdir(MIGRATIONS_DIR) if f.endswith('.sql'))
+
+
+def ensure_history_table(conn):
+    conn.execute(text("""
+        CREATE TABLE IF NOT EXISTS schema_migrations (
+            name VARCHAR(255) PRIMARY KEY,
+            applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            duration_seconds FLOAT
+        );
+    """))
+
+
+def applied_migrations(conn):
+    return {row[0] for row in conn.execute(text("SELECT name FROM schema_migrations"))}
+
+
+def apply_migrations(engine, include_optional=False):
+    """미적용 마이그레이션을 파일 하나당 트랜잭션 하나로 적용합니다."""
+    with engine.begin() as conn:
+        ensure_history_table(conn)
+        done = applied_migrations(conn)
+
+    pending = [m for m in list_migrations()
+               if m not in done and (include_optional or m not in OPTIONAL_MIGRATIONS)]
+    if not pending:
+        print(">>> No pending migrations.")
+        return []
+
+    for i, name in enumerate(pending, 1):
+        print(f">>> [{i}/{len(pending)}] Applying {name}...")
+        with open(os.path.join(MIGRATIONS_DIR, name), encoding='utf-8') as f:
+            sql = f.read()
+        started = time.perf_counter()
+        with engine.begin() as conn:
+            conn.exec_driver_sql(sql)
+            # 뷰를 새로 만든 마이그레이션(002 재적용 등)이면 그 시점의 원본 상태도 함께 기록합니다.
+            for view in MATERIALIZED_VIEWS:
+                if f"CREATE MATERIALIZED VIEW {view}" in sql:
+                    record_view_refresh(conn, view)
+            elapsed = time.perf_counter() - started
+            conn.execute(text("INSERT INTO schema_migrations (name, duration_seconds) VALUES (:name, :d)"),
+                         {'name': name, 'd': elapsed})
+        print(f"   Success: {name} ({elapsed:.1f}s)")
+    return pending
+
+
+def record_view_refresh(conn, view):
+    """뷰가 지금 담고 있는 (행 수, 최대 키) 를 기록합니다. = 갱신 시점의 원본 상태 (008 적용 전이면 건너뜀)."""
+    if conn.execute(text("SELECT to_regclass(:t)"), {'t': VIEW_REFRESHES_TABLE}).scalar() is None:
+        return
+    conn.execute(text(f"""
+        INSERT INTO {VIEW_REFRESHES_TABLE} (view_name, source_rows, source_max_id, refreshed_at)
+        SELECT :view, count(*), max({MATERIALIZED_VIEWS[view]}), CURRENT_TIMESTAMP FROM {view}
+        ON CONFLICT (view_name) DO UPDATE
+            SET source_rows = EXCLUDED.source_rows, source_max_id = EXCLUDED.source_max_id,
+                refreshed_at = EXCLUDED.refreshed_at
+    """), {'view': view})
+
+
+def refresh_views(engine):
+    """학습용 Materialized View를 CONCURRENTLY 갱신합니다 (갱신 중에도 조회 가능)."""
+    # REFRESH ... CONCURRENTLY는 트랜잭션 블록 밖에서도 실행 가능하지만, 여기서는 뷰마다 커밋합니다.
+    for view in MATERIALIZED_VIEWS:
+        started = time.perf_counter()
+        with engine.begin() as conn:
+            exists = conn.execute(text("SELECT to_regclass(:v)"), {'v': view}).scalar()
+            if exists is None:
+                print(f"   Skip: {view} does not exist (run migrate.py first)")
+                continue
+            conn.execute(text(f"REFRESH MATERIALIZED VIEW CONCURRENTLY {view};"))
+            record_view_refresh(conn, view)
+            conn.execute(text(f"ANALYZE {view};"))
+        print(f"   Refreshed {view} ({time.perf_counter() - started:.1f}s)")
+
+
+def print_status(engine):
+    with engine.begin() as conn:
+        ensure_history_table(conn)
+        rows = {r[0]: r for r in conn.execute(text(
+            "SELECT name, applied_at, duration_seconds FROM schema_migrations"))}
+    for name in list_migrations():
+        optional = ' (optional)' if name in OPTIONAL_MIGRATIONS else ''
+        if name in rows:
+            print(f"   [x] {name}{optional} - applied {rows[name][1]} ({rows[name][2]:.1f}s)")
+        else:
+            print(f"   [ ] {name}{optional}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="DB 스키마 마이그레이션")
+    parser.add_argument('--include-optional', action='store_true', help="선택 마이그레이션(파티셔닝)까지 적용")
+    parser.add_argument('--refresh', action='store_true', help="학습용 Materialized View 갱신")
+    parser.add_argument('--status', action='store_true', help="적용 현황 출력")
+    args = parser.parse_args()
+
+    try:
+        DB_URL = get_decrypted_db_url()
+        engine = create_engine(DB_URL)
+    except ValueError as e:
+        print(f"Error: {e}")
+        exit(1)
+
+    if args.status:
+        print_status(engine)
+    elif args.refresh:
+        refresh_views(engine)
+    else:
+        apply_migrations(engine, include_optional=args.include_optional)
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except Exception as e:
+        print(f"Migration Error: {e}")
@@ -0,0 +1,18 @@
+-- 001: 조인/필터/증분 조회에 필요한 인덱스
+-- train.py: matches JOIN creators ON creator_id
+CREATE INDEX IF NOT EXISTS idx_matches_creator_id ON matches (creator_id);
+-- 증분 학습 / 시간 기반 검증: created_at 기준 범위 조회
+CREATE INDEX IF NOT EXISTS idx_matches_created_at ON matches (created_at);
+-- 니치 / 플랫폼 기준 크리에이터 필터링
+CREATE INDEX IF NOT EXISTS idx_creators_platform_niche ON creators (platform, niche);
+
+-- campaign_performance: recommend.py / eda.py의 세그먼트 필터와 기간 조회
+CREATE INDEX IF NOT EXISTS idx_cp_platform_category_type
+    ON campaign_performance (platform, influencer_category, campaign_type);
+CREATE INDEX IF NOT EXISTS idx_cp_start_date ON campaign_performance (start_date);
+-- to_sql(add_budget.py)로 만든 테이블에는 PK가 없으므로 campaign_id 조회용 인덱스를 추가합니다.
+CREATE INDEX IF NOT EXISTS idx_cp_campaign_id ON campaign_performance (campaign_id);
+
+ANALYZE matches;
+ANALYZE creators;
+ANALYZE campaign_performance;
@@ -0,0 +1,21 @@
+-- 002: train.py 학습 데이터(Matches + Creators 조인)를 미리 계산해둔 Materialized View
+-- 갱신: REFRESH MATERIALIZED VIEW CONCURRENTLY training_features_roi;  (python 5_database/migrate.py --refresh)
+DROP MATERIALIZED VIEW IF EXISTS training_features_roi;
+
+CREATE MATERIALIZED VIEW training_features_roi AS
+SELECT
+    m.match_id,
+    m.created_at,
+    c.creator_id,
+    c.follower_count,
+    c.niche,
+    c.platform,
+    m.actual_roi
+FROM matches m
+JOIN creators c ON m.creator_id = c.creator_id;
+
+-- CONCURRENTLY 갱신(조회를 막지 않음)에는 UNIQUE 인덱스가 필요합니다.
+CREATE UNIQUE INDEX IF NOT EXISTS idx_training_features_roi_match_id ON training_features_roi (match_id);
+CREATE INDEX IF NOT EXISTS idx_training_features_roi_created_at ON training_features_roi (created_at);
+
+ANALYZE training_features_roi;
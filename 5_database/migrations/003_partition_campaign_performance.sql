@@ -0,0 +1,42 @@
+-- 003 (선택): campaign_performance를 platform 기준 LIST 파티션 테이블로 전환
+-- 실행: python 5_database/migrate.py --include-optional
+-- 플랫폼 조건이 있는 조회는 해당 파티션만 스캔합니다 (partition pruning).
+CREATE TABLE campaign_performance_partitioned (
+    campaign_id         VARCHAR(50),
+    platform            VARCHAR(50) NOT NULL DEFAULT 'Unknown',
+    influencer_category VARCHAR(50),
+    campaign_type       VARCHAR(50),
+    start_date          TIMESTAMP,
+    engagements         BIGINT,
+    estimated_reach     BIGINT,
+    product_sales       FLOAT,
+    budget              FLOAT,
+    campaign_duration_days INT,
+    end_date            TIMESTAMP
+) PARTITION BY LIST (platform);
+
+CREATE TABLE campaign_performance_instagram PARTITION OF campaign_performance_partitioned FOR VALUES IN ('Instagram');
+CREATE TABLE campaign_performance_youtube   PARTITION OF campaign_performance_partitioned FOR VALUES IN ('YouTube');
+CREATE TABLE campaign_performance_tiktok    PARTITION OF campaign_performance_partitioned FOR VALUES IN ('TikTok');
+CREATE TABLE campaign_performance_facebook  PARTITION OF campaign_performance_partitioned FOR VALUES IN ('Facebook');
+CREATE TABLE campaign_performance_other     PARTITION OF campaign_performance_partitioned DEFAULT;
+
+INSERT INTO campaign_performance_partitioned (
+    campaign_id, platform, influencer_category, campaign_type, start_date, engagements,
+    estimated_reach, product_sales, budget, campaign_duration_days, end_date
+)
+SELECT
+    campaign_id, COALESCE(platform, 'Unknown'), influencer_category, campaign_type, start_date, engagements,
+    estimated_reach, product_sales, budget, campaign_duration_days, end_date
+FROM campaign_performance;
+
+-- 파티션 테이블에 만든 인덱스는 모든 파티션에 자동으로 생성됩니다.
+CREATE INDEX idx_cpp_category_type ON campaign_performance_partitioned (influencer_category, campaign_type);
+CREATE INDEX idx_cpp_start_date ON campaign_performance_partitioned (start_date);
+CREATE INDEX idx_cpp_campaign_id ON campaign_performance_partitioned (campaign_id);
+
+-- 기존 테이블은 campaign_performance_unpartitioned 로 남겨두고 이름을 교체합니다.
+ALTER TABLE campaign_performance RENAME TO campaign_performance_unpartitioned;
+ALTER TABLE campaign_performance_partitioned RENAME TO campaign_performance;
+
+ANALYZE campaign_performance;
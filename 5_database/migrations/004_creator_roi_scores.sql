@@ -0,0 +1,12 @@
+-- 004: 크리에이터별 사전 계산 ROI 점수 (2_recommendation_model/score_creators.py 야간 배치가 COPY 로 적재)
+-- main.py 는 현재 서빙 중인 모델 버전의 점수만 조회하므로, 모델이 바뀌어도 이전 버전 점수가 섞이지 않습니다.
+CREATE TABLE IF NOT EXISTS creator_roi_scores (
+    creator_id INTEGER NOT NULL,
+    model_version VARCHAR(32) NOT NULL,
+    roi_mean REAL NOT NULL,
+    roi_std REAL,
+    roi_lower REAL,
+    roi_upper REAL,
+    scored_at TIMESTAMP NOT NULL,
+    PRIMARY KEY (model_version, creator_id)
+);
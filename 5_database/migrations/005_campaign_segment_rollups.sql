@@ -0,0 +1,26 @@
+-- 005: campaign_performance 세그먼트별 사전 집계 (2_recommendation_model/segment_rollups.py 가 갱신)
+-- 세그먼트 = platform x influencer_category x campaign_type x budget_band (예산 구간 번호, segment_rollups.BUDGET_BANDS)
+-- 합계 / 제곱합 / 최소·최대 / 고정 구간 로그 히스토그램(분위수 추정용)만 저장하므로 새 캠페인 적재분을 더하기만 하면 됩니다.
+-- 전체 재계산: python 2_recommendation_model/segment_rollups.py --rebuild
+CREATE TABLE IF NOT EXISTS campaign_segment_rollups (
+    platform            VARCHAR(50) NOT NULL,
+    influencer_category VARCHAR(50) NOT NULL,
+    campaign_type       VARCHAR(50) NOT NULL,
+    budget_band         SMALLINT NOT NULL,
+    campaigns           BIGINT NOT NULL,
+    budget_sum          DOUBLE PRECISION NOT NULL,
+    sales_sum           DOUBLE PRECISION NOT NULL,
+    sales_sumsq         DOUBLE PRECISION NOT NULL,
+    roi_sum             DOUBLE PRECISION NOT NULL,
+    roi_sumsq           DOUBLE PRECISION NOT NULL,
+    engagements_sum     DOUBLE PRECISION NOT NULL,
+    reach_sum           DOUBLE PRECISION NOT NULL,
+    roi_min             DOUBLE PRECISION,
+    roi_max             DOUBLE PRECISION,
+    sales_min           DOUBLE PRECISION,
+    sales_max           DOUBLE PRECISION,
+    roi_hist            INTEGER[] NOT NULL,
+    sales_hist          INTEGER[] NOT NULL,
+    updated_at          TIMESTAMP NOT NULL,
+    PRIMARY KEY (platform, influencer_category, campaign_type, budget_band)
+);
@@ -0,0 +1,17 @@
+-- 006: creators 수정 시각 (2_recommendation_model/content_index.py update 가 bio 수정분을 다시 색인하는 기준)
+-- 기존 행은 마이그레이션 시각으로 채워지며, 이후 UPDATE 마다 트리거가 updated_at 을 갱신합니다.
+ALTER TABLE creators ADD COLUMN IF NOT EXISTS updated_at TIMESTAMP NOT NULL DEFAULT now();
+
+CREATE OR REPLACE FUNCTION set_updated_at() RETURNS trigger AS $$
+BEGIN
+    NEW.updated_at := now();
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_creators_updated_at ON creators;
+CREATE TRIGGER trg_creators_updated_at
+    BEFORE UPDATE ON creators
+    FOR EACH ROW EXECUTE FUNCTION set_updated_at();
+
+CREATE INDEX IF NOT EXISTS idx_creators_updated_at ON creators (updated_at);
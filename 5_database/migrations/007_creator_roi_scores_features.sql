@@ -0,0 +1,5 @@
+-- 007: 점수를 계산할 때 사용한 크리에이터 피처 (main.py 는 요청 피처가 이 값과 같을 때만 사전 계산 점수를 사용)
+-- 기존 행은 NULL 로 남으며, 다음 score_creators.py 실행 전까지는 실시간 예측으로 처리됩니다.
+ALTER TABLE creator_roi_scores ADD COLUMN IF NOT EXISTS follower_count INTEGER;
+ALTER TABLE creator_roi_scores ADD COLUMN IF NOT EXISTS niche VARCHAR(100);
+ALTER TABLE creator_roi_scores ADD COLUMN IF NOT EXISTS platform VARCHAR(50);
@@ -0,0 +1,15 @@
+-- 008: Materialized View 갱신 시점의 원본 상태 (행 수, 최대 키)
+-- migrate.py --refresh (또는 뷰를 만드는 마이그레이션)가 기록하고, 학습 스크립트(model_families.view_is_fresh)는
+-- 뷰 전체를 세지 않고 이 값과 원본 테이블만 비교하여 뷰가 최신인지 판단합니다.
+CREATE TABLE IF NOT EXISTS materialized_view_refreshes (
+    view_name VARCHAR(255) PRIMARY KEY,
+    source_rows BIGINT NOT NULL,
+    source_max_id BIGINT,
+    refreshed_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+
+-- 이미 있는 뷰는 지금 담고 있는 상태를 기록합니다 (마지막 REFRESH 시점의 원본과 같음).
+INSERT INTO materialized_view_refreshes (view_name, source_rows, source_max_id)
+SELECT 'training_features_roi', count(*), max(match_id) FROM training_features_roi
+ON CONFLICT (view_name) DO UPDATE
+    SET source_rows = EXCLUDED.source_rows, source_max_id = EXCLUDED.source_max_id, refreshed_at = EXCLUDED.refreshed_at;
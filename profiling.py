@@ -0,0 +1,349 @@
+"""
+공용 프로파일링 유틸리티 (학습 / ETL / EDA 스크립트와 API 서버)
+
+켜는 방법:
+- 스크립트: --profile 플래그, 또는 환경변수 NURIHAUS_PROFILE=1
+- API 서버: NURIHAUS_PROFILE=1 uvicorn 3_backend_api_fastapi.main:app  (서버 종료 시 보고서 기록)
+
+기록 항목:
+- 단계(stage) 시간: 스크립트의 [1/4]...[4/4] 같은 단계별 경과 시간 / CPU 시간 / tracemalloc 피크 메모리
+- 요청(request) 시간: 엔드포인트별 건수와 p50 / p95 / 최대 지연시간, 요청 안의 단계(phase)별 평균 시간
+- NURIHAUS_PROFILE_SLOWEST=N 이면 가장 느린 N개 요청의 cProfile 결과(누적 시간 상위 함수)
+- NURIHAUS_PROFILE_MEMORY=0 이면 tracemalloc 을 끕니다 (메모리 추적은 할당이 많은 코드를 느리게 만듭니다)
+
+보고서는 profiles/<이름>-<시각>.json 으로 저장되며 (NURIHAUS_PROFILE_DIR 로 변경), 두 보고서를 비교할 수 있습니다.
+꺼져 있을 때는 모든 호출이 아무 일도 하지 않으므로 코드에 그대로 남겨 둡니다.
+
+사용 예시 (프로젝트 루트에서 실행):
+    python 2_recommendation_model/train.py --profile
+    NURIHAUS_PROFILE=1 NURIHAUS_PROFILE_SLOWEST=5 uvicorn 3_backend_api_fastapi.main:app
+    python profiling.py diff profiles/train-20261019-170000.json profiles/train-20261019-173000.json
+"""
+import argparse
+import contextvars
+import cProfile
+import functools
+import heapq
+import io
+import itertools
+import json
+import os
+import platform
+import pstats
+import resource
+import sys
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime
+
+PROFILE_ENV = 'NURIHAUS_PROFILE'
+project_root = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_REPORT_DIR = os.path.join(project_root, 'profiles')
+PROFILE_TOP_FUNCTIONS = 25
+
+MB = 1024 ** 2
+
+# 현재 요청의 기록 (스레드 풀에서 실행되는 엔드포인트에도 컨텍스트가 복사되어 전달됩니다)
+_current_request = contextvars.ContextVar('profiling_request', default=None)
+
+
+def env_enabled():
+    return os.getenv(PROFILE_ENV, '').lower() not in ('', '0', 'false', 'no')
+
+
+def _percentile(sorted_values, q):
+    return sorted_values[min(len(sorted_values) - 1, int(q * len(sorted_values)))]
+
+
+class Profiler:
+    def __init__(self, name, enabled=None, report_dir=None, trace_memory=None, slowest=None):
+        self.name = name
+        self.enabled = env_enabled() if enabled is None else bool(enabled)
+        self.report_dir = report_dir or os.getenv('NURIHAUS_PROFILE_DIR') or DEFAULT_REPORT_DIR
+        self.trace_memory = (os.getenv('NURIHAUS_PROFILE_MEMORY', '1') != '0') if trace_memory is None else trace_memory
+        self.slowest = int(os.getenv('NURIHAUS_PROFILE_SLOWEST', '0')) if slowest is None else slowest
+        self.stages = []
+        self.requests = {}   # 엔드포인트 -> [(ms, {phase: ms})]
+        self.slow_heap = []  # (ms, 순번, 엔드포인트, phases, cProfile)
+        self.error = None
+        self._open = []      # 열려 있는 단계 (중첩 가능)
+        self._step = None    # step() 으로 시작한 단계의 컨텍스트
+        self._lock = threading.Lock()
+        self._counter = itertools.count()
+        self._started = None
+        self._peak = 0       # reset_peak() 로 지워지는 전역 피크를 단계마다 모아 둡니다.
+
+    # ------------------------------------------
+    # 시작 / 종료
+    # ------------------------------------------
+    def start(self):
+        if self.enabled:
+            if self.trace_memory and not tracemalloc.is_tracing():
+                tracemalloc.start()
+            self._started = (time.perf_counter(), time.process_time(), datetime.now())
+        return self
+
+    def finish(self, error=None):
+        """마지막 단계를 닫고 보고서를 기록합니다. 기록한 파일 경로를 반환합니다 (꺼져 있으면 None)."""
+        if not self.enabled or self._started is None:
+            return None
+        self._end_step()
+        if error is not None:
+            self.error = f"{type(error).__name__}: {error}"
+        path = self.write()
+        print(f">>> Profile report: {path}")
+        return path
+
+    # ------------------------------------------
+    # 단계 (stage)
+    # ------------------------------------------
+    def _fold_peak(self):
+        peak = tracemalloc.get_traced_memory()[1] if tracemalloc.is_tracing() else 0
+        self._peak = max(self._peak, peak)
+        for record in self._open:
+            record['_peak'] = max(record['_peak'], peak)
+        return peak
+
+    @contextmanager
+    def stage(self, name):
+        """스크립트 단계 (요청 처리 중이면 요청의 phase 로 기록)."""
+        if not self.enabled:
+            yield
+            return
+        request = _current_request.get()
+        if request is not None:
+            started = time.perf_counter()
+            try:
+                yield
+            finally:
+                phases = request['phases']
+                phases[name] = phases.get(name, 0.0) + (time.perf_counter() - started) * 1000
+            return
+
+        tracing = tracemalloc.is_tracing()
+        with self._lock:
+            self._fold_peak()
+            record = {'name': '/'.join([r['name'] for r in self._open] + [name]), '_peak': 0,
+                      '_mem': tracemalloc.get_traced_memory()[0] if tracing else 0}
+            self._open.append(record)
+            if tracing:
+                tracemalloc.reset_peak()
+        started, cpu_started = time.perf_counter(), time.process_time()
+        try:
+            yield
+        finally:
+            seconds, cpu = time.perf_counter() - started, time.process_time() - cpu_started
+            with self._lock:
+                self._fold_peak()
+                self._open.remove(record)
+                current = tracemalloc.get_traced_memory()[0] if tracing else 0
+                self.stages.append({
+                    'name': record['name'],
+                    'seconds': round(seconds, 4),
+                    'cpu_seconds': round(cpu, 4),
+                    'peak_traced_mb': round(record['_peak'] / MB, 2) if tracing else None,
+                    'retained_mb': round((current - record['_mem']) / MB, 2) if tracing else None,
+                })
+
+    def step(self, name):
+        """이전 step 을 닫고 새 단계를 엽니다 (스크립트의 '>>> [2/4] ...' 출력 바로 아래에 한 줄로 사용)."""
+        if not self.enabled:
+            return
+        self._end_step()
+        self._step = self.stage(name)
+        self._step.__enter__()
+
+    def _end_step(self):
+        if self._step is not None:
+            step, self._step = self._step, None
+            step.__exit__(None, None, None)
+
+    # ------------------------------------------
+    # 요청 (request)
+    # ------------------------------------------
+    @contextmanager
+    def request(self, endpoint):
+        if not self.enabled:
+            yield
+            return
+        record = {'phases': {}}
+        token = _current_request.set(record)
+        profile = cProfile.Profile() if self.slowest else None
+        started = time.perf_counter()
+        if profile is not None:
+            try:
+                profile.enable()
+            except ValueError:
+                profile = None  # 다른 요청이 이미 프로파일링 중 (Python 3.12+ 는 동시에 하나만 허용)
+        try:
+            yield
+        finally:
+            if profile is not None:
+                profile.disable()
+            ms = (time.perf_counter() - started) * 1000
+            _current_request.reset(token)
+            with self._lock:
+                self.requests.setdefault(endpoint, []).append((ms, record['phases']))
+                if profile is not None:
+                    entry = (ms, next(self._counter), endpoint, record['phases'], profile)
+                    if len(self.slow_heap) < self.slowest:
+                        heapq.heappush(self.slow_heap, entry)
+                    elif ms > self.slow_heap[0][0]:
+                        heapq.heapreplace(self.slow_heap, entry)
+
+    # ------------------------------------------
+    # 보고서
+    # ------------------------------------------
+    def _request_summary(self):
+        by_endpoint = {}
+        for endpoint, samples in sorted(self.requests.items()):
+            times = sorted(ms for ms, _ in samples)
+            phase_totals = {}
+            for _, phases in samples:
+                for phase, ms in phases.items():
+                    phase_totals[phase] = phase_totals.get(phase, 0.0) + ms
+            by_endpoint[endpoint] = {
+                'count': len(times),
+                'mean_ms': round(sum(times) / len(times), 3),
+                'p50_ms': round(_percentile(times, 0.5), 3),
+                'p95_ms': round(_percentile(times, 0.95), 3),
+                'max_ms': round(times[-1], 3),
+                'phases_mean_ms': {p: round(t / len(times), 3) for p, t in sorted(phase_totals.items())},
+            }
+        slowest = []
+        for ms, _, endpoint, phases, profile in sorted(self.slow_heap, reverse=True):
+            out = io.StringIO()
+            pstats.Stats(profile, stream=out).sort_stats('cumulative').print_stats(PROFILE_TOP_FUNCTIONS)
+            slowest.append({'endpoint': endpoint, 'ms': round(ms, 3),
+                            'phases_ms': {p: round(t, 3) for p, t in phases.items()}, 'profile': out.getvalue()})
+        return {'count': sum(len(s) for s in self.requests.values()), 'by_endpoint': by_endpoint, 'slowest': slowest}
+
+    def report(self):
+        wall_started, cpu_started, started_at = self._started
+        return {
+            'name': self.name,
+            'started_at': started_at.isoformat(timespec='seconds'),
+            'argv': sys.argv,
+            'pid': os.getpid(),
+            'python': platform.python_version(),
+            'total_seconds': round(time.perf_counter() - wall_started, 4),
+            'cpu_seconds': round(time.process_time() - cpu_started, 4),
+            'peak_traced_mb': round(max(self._peak, self._fold_peak()) / MB, 2) if tracemalloc.is_tracing() else None,
+            # Linux: ru_maxrss 단위는 KB (프로세스 전체 최대 RSS, tracemalloc 밖의 numpy 버퍼 포함)
+            'max_rss_mb': round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+            'stages': self.stages,
+            'requests': self._request_summary(),
+            'error': self.error,
+        }
+
+    def write(self, path=None):
+        if path is None:
+            os.makedirs(self.report_dir, exist_ok=True)
+            stamp = self._started[2].strftime('%Y%m%d-%H%M%S')
+            path = os.path.join(self.report_dir, f"{self.name}-{stamp}-{os.getpid()}.json")
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.report(), f, indent=2, ensure_ascii=False)
+        return path
+
+
+# ==========================================
+# 프로세스 전역 프로파일러 (스크립트에서는 start / step / finish 만 호출)
+# ==========================================
+_profiler = Profiler('disabled', enabled=False)
+
+
+def start(name, enabled=None, **kwargs):
+    """전역 프로파일러를 만들고 시작합니다. enabled=None 이면 NURIHAUS_PROFILE 환경변수를 따릅니다."""
+    global _profiler
+    _profiler = Profiler(name, enabled=(enabled or None), **kwargs).start()
+    return _profiler
+
+
+def get():
+    return _profiler
+
+
+def step(name):
+    _profiler.step(name)
+
+
+def stage(name):
+    return _profiler.stage(name)
+
+
+def finish(error=None):
+    return _profiler.finish(error)
+
+
+def profile_request(func):
+    """엔드포인트 데코레이터: 함수 이름으로 요청 시간을 기록합니다 (FastAPI 가 보는 시그니처는 그대로).
+    전역 프로파일러를 호출 시점에 확인하므로 서버 시작 후 start() 로 켜도 적용됩니다."""
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        if not _profiler.enabled:
+            return func(*args, **kwargs)
+        with _profiler.request(func.__name__):
+            return func(*args, **kwargs)
+    return wrapper
+
+
+@contextmanager
+def run(name, enabled=None, **kwargs):
+    """스크립트 전체를 감싸 종료(예외 포함) 시 보고서를 기록합니다."""
+    profiler = start(name, enabled, **kwargs)
+    try:
+        yield profiler
+    except BaseException as e:
+        profiler.finish(error=e)
+        raise
+    else:
+        profiler.finish()
+
+
+def add_profile_argument(parser):
+    parser.add_argument('--profile', action='store_true',
+                        help=f"단계별 시간 / 메모리 프로파일 보고서 기록 (또는 {PROFILE_ENV}=1)")
+    return parser
+
+
+# ==========================================
+# 보고서 비교
+# ==========================================
+def diff_reports(before, after):
+    """두 보고서의 단계별 시간 / 피크 메모리와 엔드포인트별 p95 차이를 행 목록으로 반환합니다."""
+    rows = [('total', before['total_seconds'], after['total_seconds'], before['peak_traced_mb'], after['peak_traced_mb'])]
+    stages_before = {s['name']: s for s in before['stages']}
+    for s in after['stages']:
+        b = stages_before.pop(s['name'], {})
+        rows.append((s['name'], b.get('seconds'), s['seconds'], b.get('peak_traced_mb'), s['peak_traced_mb']))
+    rows += [(name, b['seconds'], None, b['peak_traced_mb'], None) for name, b in stages_before.items()]
+    endpoints_before = before['requests']['by_endpoint']
+    for name, e in after['requests']['by_endpoint'].items():
+        rows.append((f"{name} p95 (ms)", endpoints_before.get(name, {}).get('p95_ms'), e['p95_ms'], None, None))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="프로파일 보고서 도구")
+    sub = parser.add_subparsers(dest='command', required=True)
+    diff = sub.add_parser('diff', help="두 보고서 비교")
+    diff.add_argument('before')
+    diff.add_argument('after')
+    args = parser.parse_args()
+
+    with open(args.before, encoding='utf-8') as f:
+        before = json.load(f)
+    with open(args.after, encoding='utf-8') as f:
+        after = json.load(f)
+
+    fmt = lambda v, spec: format(v, spec) if v is not None else '-'
+    print(f"{'stage':<40} {'before s':>10} {'after s':>10} {'change':>8} {'before MB':>10} {'after MB':>10}")
+    for name, b, a, mb_b, mb_a in diff_reports(before, after):
+        change = f"{(a - b) / b:+.0%}" if a is not None and b else '-'
+        print(f"{name:<40} {fmt(b, '.3f'):>10} {fmt(a, '.3f'):>10} {change:>8} {fmt(mb_b, '.1f'):>10} {fmt(mb_a, '.1f'):>10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,13 @@
+"""
+테스트 공용 설정: 스크립트들이 프로젝트 루트에서 실행될 때와 같은 import 경로를 만들어 줍니다.
+
+실행 (프로젝트 루트에서):
+    python -m pytest -q tests
+"""
+import os
+import sys
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+for path in ['', '0_data_collection', '1_data_simulation', os.path.join('1_data_simulation', 'read_csv'),
+             '2_recommendation_model', '3_backend_api_fastapi']:
+    sys.path.insert(0, os.path.join(project_root, path))
@@ -0,0 +1,49 @@
+import numpy as np
+
+from ann_index import IVFIndex, exact_search
+
+
+def unit_vectors(n, dim=16, seed=0):
+    vectors = np.random.default_rng(seed).normal(size=(n, dim)).astype(np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def test_full_probe_matches_exact_search():
+    vectors, queries = unit_vectors(2000), unit_vectors(20, seed=1)
+    ids = np.arange(100, 2100)
+    index = IVFIndex.build(vectors, ids, n_lists=20)
+
+    found, scores = index.search(queries, k=10, n_probe=index.n_lists)
+    exact_pos, exact_scores = exact_search(vectors, queries, k=10)
+    np.testing.assert_array_equal(found, ids[exact_pos])
+    np.testing.assert_allclose(scores, exact_scores, rtol=1e-5)
+
+
+def test_delta_and_merge_keep_results(tmp_path):
+    vectors, queries = unit_vectors(3000), unit_vectors(10, seed=1)
+    ids = np.arange(3000)
+    index = IVFIndex.build(vectors[:2800], ids[:2800], n_lists=16)
+    index.add(vectors[2800:], ids[2800:])
+    assert len(index.delta_ids) == 200 and len(index) == 3000
+
+    before = index.search(queries, k=5, n_probe=index.n_lists)
+    exact_pos, _ = exact_search(vectors, queries, k=5)
+    np.testing.assert_array_equal(before[0], ids[exact_pos])
+
+    index.merge()
+    assert len(index.delta_ids) == 0 and len(index.ids) == 3000
+    assert np.all(np.diff(index.offsets) >= 0) and index.offsets[-1] == 3000
+    np.testing.assert_array_equal(index.search(queries, k=5, n_probe=index.n_lists)[0], before[0])
+
+    index.save(str(tmp_path / 'ann'))
+    loaded, meta = IVFIndex.load(str(tmp_path / 'ann'))
+    assert meta['size'] == 3000
+    np.testing.assert_array_equal(loaded.search(queries, k=5, n_probe=loaded.n_lists)[0], before[0])
+
+
+def test_fewer_candidates_than_k_are_padded():
+    vectors = unit_vectors(5)
+    index = IVFIndex.build(vectors, np.arange(5), n_lists=2)
+    found, scores = index.search(vectors[:1], k=8, n_probe=2)
+    assert sorted(found[0][:5]) == [0, 1, 2, 3, 4]
+    assert (found[0][5:] == -1).all() and np.isneginf(scores[0][5:]).all()
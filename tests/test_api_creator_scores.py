@@ -0,0 +1,86 @@
+import time
+
+import numpy as np
+import pytest
+from test_creator_scores import make_scores
+
+import db
+import main
+from feature_store import CreatorFeatureStore
+from score_creators import CreatorScores
+
+
+class FakeConfidence:
+    """입력 follower_count / 1000 을 ROI 로 돌려주는 ForestConfidence 대역 (호출 기록)."""
+
+    def __init__(self):
+        self.calls = []
+
+    def predict(self, columns):
+        self.calls.append(columns)
+        mean = np.asarray(columns['follower_count'], dtype=np.float64) / 1000
+        return {'mean': mean, 'std': np.full(len(mean), 0.1), 'lower': mean - 0.2, 'upper': mean + 0.2}
+
+
+@pytest.fixture
+def api(monkeypatch):
+    monkeypatch.setattr(main.roi_model, 'metadata', {'version': 'v1', 'artifact': 'slim'})
+    monkeypatch.setattr(main, 'model_features', main.ROI_FEATURES)
+    monkeypatch.setattr(main, 'forest_confidence', FakeConfidence())
+    monkeypatch.setattr(main, 'feature_store', CreatorFeatureStore.empty())
+    monkeypatch.setattr(main, 'creator_scores', make_scores())
+    monkeypatch.setattr(main, 'creator_scores_checked_at', time.monotonic())
+    monkeypatch.setattr(main, 'candidate_pool', None)
+    return main
+
+
+def test_precomputed_and_live_rows_are_merged(api):
+    requests = [
+        main.CampaignRequest(follower_count=5_000, niche='Food', platform='TikTok', budget=100, creator_id=7),
+        main.CampaignRequest(follower_count=42_000, niche='Food', platform='TikTok', budget=100),
+        # 점수를 계산한 뒤 팔로워 수가 바뀐 크리에이터 -> 실시간 예측
+        main.CampaignRequest(follower_count=8_000, niche='Beauty', platform='Instagram', budget=100, creator_id=3),
+        main.CampaignRequest(follower_count=90_000, niche='Tech', platform='YouTube', budget=100, creator_id=10),
+    ]
+    responses = api.predict_requests(requests)
+
+    assert [r['ai_analysis']['source'] for r in responses] == ['precomputed', 'live', 'live', 'precomputed']
+    assert [r['ai_analysis']['predicted_roi'] for r in responses] == [2.0, 42.0, 8.0, 3.0]
+    assert responses[0]['ai_analysis']['roi_interval_90'] == [4.0, 5.0]
+    assert responses[1]['ai_analysis']['roi_interval_90'] == [41.8, 42.2]
+    # 실시간 예측은 한 번의 호출로 묶입니다.
+    assert len(api.forest_confidence.calls) == 1
+    assert api.forest_confidence.calls[0]['follower_count'] == [42_000, 8_000]
+
+
+def test_failed_scores_load_is_retried(api, monkeypatch):
+    attempts = []
+
+    def flaky_load(engine, version):
+        attempts.append(version)
+        if len(attempts) == 1:
+            raise ConnectionError('database is down')
+        return make_scores(version)
+
+    monkeypatch.setattr(db, 'get_engine', lambda: None)
+    monkeypatch.setattr(CreatorScores, 'load', staticmethod(flaky_load))
+    monkeypatch.setattr(CreatorScores, 'latest_scored_at', staticmethod(lambda engine, version: make_scores().scored_at))
+    monkeypatch.setattr(main, 'creator_scores', None)
+
+    scores = api.get_creator_scores()
+    assert len(scores) == 0 and scores.version == 'v1'
+    # 재시도 주기 전에는 빈 점수를 그대로 씁니다.
+    assert api.get_creator_scores() is scores and len(attempts) == 1
+
+    monkeypatch.setattr(main, 'creator_scores_checked_at', time.monotonic() - main.CREATOR_SCORES_CHECK_SECONDS - 1)
+    api.candidate_pool = object()
+    scores = api.get_creator_scores()
+    assert len(scores) == 3 and len(attempts) == 2
+    assert api.candidate_pool is None
+
+    # 같은 적재 시각이면 다시 읽지 않고, 배치가 다시 돌아 시각이 바뀌면 새로 읽습니다.
+    monkeypatch.setattr(main, 'creator_scores_checked_at', 0.0)
+    assert api.get_creator_scores() is scores and len(attempts) == 2
+    monkeypatch.setattr(CreatorScores, 'latest_scored_at', staticmethod(lambda engine, version: 'newer'))
+    monkeypatch.setattr(main, 'creator_scores_checked_at', 0.0)
+    assert api.get_creator_scores() is not scores and len(attempts) == 3
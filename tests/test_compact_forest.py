@@ -0,0 +1,45 @@
+import numpy as np
+import pandas as pd
+from sklearn.compose import ColumnTransformer
+from sklearn.ensemble import RandomForestRegressor
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import OneHotEncoder
+
+from compact_forest import CompactForest, CompactPipeline
+
+
+def test_threshold_rounding_keeps_split_direction():
+    # 인접한 float32 두 값의 중간(float64 threshold)이 float32 캐스팅에서 큰 쪽으로 반올림되는 경우.
+    low = np.nextafter(np.float32(1e6), np.float32(2e6))
+    high = np.nextafter(low, np.float32(2e6))
+    X = np.array([[low], [high]] * 4, dtype=np.float32)
+    y = np.array([0.0, 1.0] * 4)
+    forest = RandomForestRegressor(n_estimators=3, bootstrap=False, random_state=0).fit(X, y)
+    assert np.float32(forest.estimators_[0].tree_.threshold[0]) == high
+
+    compact = CompactForest.from_sklearn(forest)
+    np.testing.assert_array_equal(compact.predict(X), forest.predict(X))
+
+
+def test_pipeline_parity_on_training_rows():
+    rng = np.random.default_rng(0)
+    n = 2000
+    frame = pd.DataFrame({
+        'niche': rng.choice(['Beauty', 'Food', 'Tech'], n),
+        'platform': rng.choice(['Instagram', 'YouTube'], n),
+        'follower_count': rng.integers(1_000, 5_000_000, n),
+    })
+    y = np.log(frame['follower_count']) + (frame['niche'] == 'Food') + rng.normal(0, 0.1, n)
+    model = Pipeline([
+        ('preprocessor', ColumnTransformer([
+            ('cat', OneHotEncoder(handle_unknown='ignore'), ['niche', 'platform']),
+            ('num', 'passthrough', ['follower_count']),
+        ])),
+        ('regressor', RandomForestRegressor(n_estimators=10, random_state=0)),
+    ]).fit(frame, y)
+
+    slim = CompactPipeline.slim(model)
+    np.testing.assert_allclose(slim.predict(frame), model.predict(frame), rtol=0, atol=1e-4)
+
+    unseen = frame.head(5).assign(niche='Travel')
+    np.testing.assert_allclose(slim.predict(unseen), model.predict(unseen), rtol=0, atol=1e-4)
@@ -0,0 +1,24 @@
+from content_index import ContentIndex
+
+
+def build_index(docs):
+    return ContentIndex.build([(list(docs), list(docs.values()))])
+
+
+def test_edited_creator_is_reindexed():
+    index = build_index({1: 'vegan skincare routine', 2: 'street food tour', 3: 'gaming setup review'})
+    index.add([2], ['vegan skincare haul'])
+    ids, _ = index.query(['street food'], k=3)[0]
+    assert 2 not in ids
+    ids, _ = index.query(['vegan skincare'], k=3)[0]
+    assert sorted(ids) == [1, 2]
+
+
+def test_removed_creator_is_not_returned(tmp_path):
+    index = build_index({1: 'vegan skincare routine', 2: 'vegan skincare haul'})
+    assert index.remove([2, 99]) == 1
+    index.save(str(tmp_path / 'index'))
+    loaded = ContentIndex.load(str(tmp_path / 'index'))
+    ids, _ = loaded.query(['vegan skincare'], k=5)[0]
+    assert ids.tolist() == [1]
+    assert loaded.live_ids.tolist() == [1]
@@ -0,0 +1,34 @@
+import numpy as np
+import pandas as pd
+
+from score_creators import SCORE_COLUMNS, CreatorScores
+
+
+def make_scores(version='v1'):
+    ids = np.array([3, 7, 10], dtype=np.int64)
+    scores = {column: np.array([1.0, 2.0, 3.0]) + i for i, column in enumerate(SCORE_COLUMNS)}
+    features = {'follower_count': np.array([1_000, 5_000, 90_000], dtype=np.int64),
+                'niche': pd.Categorical(['Beauty', 'Food', 'Tech']),
+                'platform': pd.Categorical(['Instagram', 'TikTok', 'YouTube'])}
+    return CreatorScores(version, ids, scores, features, scored_at=pd.Timestamp('2026-10-19 03:00'))
+
+
+def test_lookup_by_id():
+    scores = make_scores()
+    found, pos = scores.lookup([7, 4, 10, 11, 0])
+    np.testing.assert_array_equal(found, [True, False, True, False, False])
+    np.testing.assert_array_equal(pos[found], [1, 2])
+    assert scores.row_features(pos[0]) == {'follower_count': 5_000, 'niche': 'Food', 'platform': 'TikTok'}
+
+    found, _ = CreatorScores.empty('v1').lookup([3, 7])
+    assert not found.any()
+
+
+def test_lookup_requires_matching_features():
+    scores = make_scores()
+    found, _ = scores.lookup([3, 3, 3, 3, 7], features={
+        'follower_count': [1_000, 2_000, 1_000, 1_000, 5_000],
+        'niche': ['Beauty', 'Beauty', 'Food', 'Beauty', 'Food'],
+        'platform': ['Instagram', 'Instagram', 'Instagram', 'Threads', 'TikTok'],
+    })
+    np.testing.assert_array_equal(found, [True, False, False, False, True])
@@ -0,0 +1,74 @@
+import json
+from collections import namedtuple
+from datetime import datetime, timedelta
+
+import play_review_harvester
+from play_review_harvester import TOKEN_FIELDS, harvest_reviews
+
+FakeToken = namedtuple('FakeToken', TOKEN_FIELDS)
+
+
+class FakeStore:
+    """google_play_scraper.reviews 흉내: NEWEST 순서로 page_size 개씩, token 은 다음 페이지 시작 위치."""
+
+    def __init__(self, n, start=datetime(2026, 1, 1)):
+        self.reviews = []
+        self.start = start
+        self.add(n)
+
+    def add(self, n):
+        newest = len(self.reviews)
+        new = [{'reviewId': f"r{newest + i}", 'at': self.start + timedelta(hours=newest + i), 'content': 'ok'}
+               for i in range(n)]
+        self.reviews = new[::-1] + self.reviews
+
+    def fetch(self, app_id, lang=None, country=None, sort=None, count=None, continuation_token=None):
+        if continuation_token is None:
+            continuation_token = FakeToken(0, lang, country, sort, count, None, None)
+        offset, count = continuation_token.token, continuation_token.count
+        page = self.reviews[offset:offset + count]
+        next_offset = offset + count if offset + count < len(self.reviews) else None
+        return page, continuation_token._replace(token=next_offset)
+
+
+def read_ids(path):
+    with open(path, encoding='utf-8') as f:
+        return [json.loads(line)['reviewId'] for line in f]
+
+
+def harvest(store, path, **kwargs):
+    return harvest_reviews('app', str(path), page_size=3, fetch=store.fetch, make_token=FakeToken, **kwargs)
+
+
+def test_interrupted_run_resumes_without_duplicates(tmp_path):
+    store, path = FakeStore(10), tmp_path / 'reviews.jsonl'
+    summary = harvest(store, path, max_pages=2)
+    assert not summary['complete'] and summary['reviews'] == 6
+
+    summary = harvest(store, path)
+    assert summary['complete']
+    assert read_ids(path) == [r['reviewId'] for r in store.reviews]
+
+
+def test_incremental_run_fetches_only_newer_reviews(tmp_path):
+    store, path = FakeStore(5), tmp_path / 'reviews.jsonl'
+    harvest(store, path)
+    store.add(4)
+
+    summary = harvest(store, path)
+    assert summary['reviews'] == 4
+    assert summary['last_review_at'] == store.reviews[0]['at'].isoformat()
+    assert read_ids(path) == ['r4', 'r3', 'r2', 'r1', 'r0', 'r8', 'r7', 'r6', 'r5']
+    assert harvest(store, path)['reviews'] == 0
+
+
+def test_restarts_run_when_token_cannot_be_rebuilt(tmp_path, monkeypatch):
+    store, path = FakeStore(5), tmp_path / 'reviews.jsonl'
+    harvest(store, path)
+    store.add(7)
+    harvest(store, path, max_pages=1)
+
+    monkeypatch.setattr(play_review_harvester, 'continuation_token_class', lambda: None)
+    summary = harvest_reviews('app', str(path), page_size=3, fetch=store.fetch)
+    assert summary['complete'] and summary['reviews'] == 7
+    assert read_ids(path) == [f"r{i}" for i in (4, 3, 2, 1, 0, 11, 10, 9, 8, 7, 6, 5)]
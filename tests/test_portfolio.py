@@ -0,0 +1,83 @@
+import itertools
+
+import numpy as np
+import pandas as pd
+import pytest
+from sqlalchemy import create_engine, text
+
+from portfolio import CandidatePool, creator_costs, filter_candidates, fractional_upper_bound, optimize_portfolio
+
+
+def make_candidates(n=12, seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'creator_id': np.arange(1, n + 1),
+        'follower_count': rng.integers(1_000, 200_000, n),
+        'niche': rng.choice(['Beauty', 'Food', 'Tech'], n),
+        'platform': rng.choice(['Instagram', 'TikTok', 'YouTube'], n),
+        'roi_mean': rng.uniform(0.5, 6.0, n),
+        'roi_std': rng.uniform(0.0, 1.5, n),
+    })
+
+
+def brute_force(candidates, budget, min_roi=1.0):
+    """제약 없는 0/1 knapsack 최적값 (모든 부분집합)."""
+    costs = creator_costs(candidates['follower_count'])
+    values = candidates['roi_mean'].to_numpy() * costs
+    eligible = [i for i in range(len(candidates)) if candidates['roi_mean'].iloc[i] >= min_roi]
+    best = 0.0
+    for r in range(len(eligible) + 1):
+        for subset in itertools.combinations(eligible, r):
+            subset = list(subset)
+            if costs[subset].sum() <= budget:
+                best = max(best, values[subset].sum())
+    return best
+
+
+@pytest.mark.parametrize('seed', [0, 1, 2])
+def test_objective_never_exceeds_optimum_or_upper_bound(seed):
+    candidates = make_candidates(seed=seed)
+    budget = 0.4 * creator_costs(candidates['follower_count']).sum()
+    picked, summary = optimize_portfolio(candidates, budget)
+
+    optimum = brute_force(candidates, budget)
+    assert summary['spent'] <= budget
+    assert summary['objective'] <= optimum + 1e-6
+    assert optimum <= summary['upper_bound'] + 1e-6
+    assert 0 <= summary['optimality_gap'] < 1
+    assert (picked['roi_mean'] >= 1.0).all()
+
+
+def test_constraints_are_respected():
+    candidates = make_candidates(n=200, seed=3)
+    budget = 0.5 * creator_costs(candidates['follower_count']).sum()
+    picked, summary = optimize_portfolio(candidates, budget, platform_caps={'TikTok': 0.2}, max_per_niche=5,
+                                         max_creators=12, risk_aversion=1.0)
+    assert summary['spent'] <= budget
+    assert summary['spend_by_platform'].get('TikTok', 0) <= 0.2 * budget
+    assert max(summary['creators_by_niche'].values()) <= 5
+    assert len(picked) <= 12
+    assert (picked['roi_mean'] - picked['roi_std'] >= 1.0 - 1e-9).all()
+
+
+def test_fractional_upper_bound():
+    costs = np.array([10.0, 20.0, 30.0])
+    values = np.array([60.0, 100.0, 120.0])
+    assert fractional_upper_bound(costs, values, 50) == pytest.approx(60 + 100 + 120 * 20 / 30)
+    assert fractional_upper_bound(costs, values, 100) == pytest.approx(280)
+
+
+def test_empty_candidate_pool_returns_empty_portfolio():
+    engine = create_engine('sqlite://')
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE creators (creator_id INTEGER, follower_count INTEGER, niche TEXT, platform TEXT)"))
+
+    # 후보가 없으면 모델을 호출하지 않아야 합니다 (sklearn 은 0행 입력에서 예외를 냅니다).
+    pool = CandidatePool(model=None, engine=engine).frame()
+    assert len(pool) == 0 and {'roi_mean', 'roi_std'} <= set(pool.columns)
+
+    for candidates in [pool, filter_candidates(make_candidates(), platforms=['Threads'])]:
+        picked, summary = optimize_portfolio(candidates, 10_000, platform_caps={'TikTok': 0.3}, max_per_niche=2)
+        assert len(picked) == 0
+        assert summary['creators'] == summary['eligible'] == summary['candidates'] == 0
+        assert summary['spent'] == summary['objective'] == summary['upper_bound'] == 0.0
@@ -0,0 +1,66 @@
+import json
+import threading
+from http.server import ThreadingHTTPServer
+
+import pytest
+
+from profile_collector import PROFILE_COLUMNS, collect_profiles
+from stub_instagram_server import StubHandler, fake_profile
+
+
+@pytest.fixture
+def stub_server():
+    StubHandler.latency = 0.0
+    StubHandler.rate_limit = None
+    StubHandler.stats.clear()
+    StubHandler.window[:] = [0.0, 0]
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StubHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def collect(base_url, tmp_path, usernames, **kwargs):
+    return collect_profiles(usernames, str(tmp_path / 'out'), base_url, workers=4, rate=1000, burst=50,
+                            cache_dir=str(tmp_path / 'cache'), checkpoint_path=str(tmp_path / 'checkpoint.jsonl'),
+                            progress_every=0, **kwargs)
+
+
+def test_output_and_counts(stub_server, tmp_path):
+    counts = collect(stub_server, tmp_path, ['alice', '@alice', 'bob', ' ', 'missing_user', 'bob'])
+    assert {k: counts[k] for k in ('ok', 'not_found', 'error', 'skipped', 'duplicates')} == \
+        {'ok': 2, 'not_found': 1, 'error': 0, 'skipped': 0, 'duplicates': 3}
+
+    with open(tmp_path / 'out' / 'alice', encoding='utf-8') as f:
+        fields = f.readline().rstrip('\n').split('\t')
+    user = fake_profile('alice')['data']['user']
+    assert len(fields) == len(PROFILE_COLUMNS)
+    assert fields[0] == 'alice'
+    assert int(fields[1]) == user['edge_followed_by']['count']
+    assert fields[7] == ' '.join(user['biography'].split())
+    assert not (tmp_path / 'out' / 'missing_user').exists()
+
+
+def test_resume_skips_finished_users(stub_server, tmp_path):
+    collect(stub_server, tmp_path, ['alice', 'missing_user'])
+    requests_before = sum(StubHandler.stats.values())
+
+    counts = collect(stub_server, tmp_path, ['alice', 'missing_user', 'carol'])
+    assert counts['skipped'] == 2
+    assert counts['ok'] == 1
+    assert sum(StubHandler.stats.values()) == requests_before + 1
+    with open(tmp_path / 'checkpoint.jsonl', encoding='utf-8') as f:
+        statuses = [json.loads(line)['status'] for line in f]
+    assert statuses.count('ok') == 2 and statuses.count('not_found') == 1
+
+
+def test_rate_limited_requests_are_retried(stub_server, tmp_path):
+    StubHandler.rate_limit = 3
+    usernames = [f"user{i}" for i in range(8)]
+    counts = collect(stub_server, tmp_path, usernames)
+    assert counts['ok'] == len(usernames)
+    assert counts['error'] == 0
+    assert StubHandler.stats[429] > 0
+    assert all((tmp_path / 'out' / u).exists() for u in usernames)
@@ -0,0 +1,66 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from segment_rollups import SEGMENT_COLUMNS, SKETCHES, SegmentRollups
+
+
+def make_campaigns(n=5000, seed=0):
+    rng = np.random.default_rng(seed)
+    budget = rng.uniform(100, 60_000, n).round(2)
+    return pd.DataFrame({
+        'platform': rng.choice(['Instagram', 'TikTok', 'YouTube', None], n),
+        'influencer_category': rng.choice(['Beauty', 'Food', 'Tech'], n),
+        'campaign_type': rng.choice(['Awareness', 'Conversion'], n),
+        'budget': budget,
+        'product_sales': (budget * rng.lognormal(0.3, 0.6, n)).round(2),
+        'engagements': rng.integers(0, 50_000, n),
+        'estimated_reach': rng.integers(1_000, 500_000, n),
+    })
+
+
+def test_incremental_merge_equals_full_rebuild():
+    df = make_campaigns()
+    full = SegmentRollups.from_frame(df)
+    incremental = SegmentRollups.empty()
+    for start in range(0, len(df), 700):
+        chunk = df.iloc[start:start + 700]
+        incremental = incremental.merge(SegmentRollups.from_frame(chunk))
+
+    assert len(incremental) == len(full)
+    assert incremental.campaigns == full.campaigns == len(df)
+    pd.testing.assert_frame_equal(incremental.frame[SEGMENT_COLUMNS], full.frame[SEGMENT_COLUMNS],
+                                  check_dtype=False)
+    numeric = [c for c in full.frame.columns if c not in SEGMENT_COLUMNS]
+    np.testing.assert_allclose(incremental.frame[numeric].to_numpy(float), full.frame[numeric].to_numpy(float),
+                               rtol=1e-9)
+    for name in SKETCHES:
+        np.testing.assert_array_equal(incremental.hists[name], full.hists[name])
+
+
+def test_query_matches_direct_aggregation():
+    df = make_campaigns(seed=1)
+    stats = SegmentRollups.from_frame(df).query(group_by=['platform'], quantiles=(0.5,)).set_index('platform')
+
+    platform = df['platform'].fillna('Unknown')
+    roi = (df['product_sales'] - df['budget']) * 100 / df['budget']
+    expected = pd.DataFrame({'campaigns': platform.value_counts(), 'avg_roi': roi.groupby(platform).mean(),
+                             'roi_std': roi.groupby(platform).std(), 'median_roi': roi.groupby(platform).median()})
+    assert stats['campaigns'].to_dict() == expected['campaigns'].to_dict()
+    np.testing.assert_allclose(stats['avg_roi'], expected.loc[stats.index, 'avg_roi'], rtol=1e-9)
+    np.testing.assert_allclose(stats['roi_std'], expected.loc[stats.index, 'roi_std'], rtol=1e-6)
+    # 분위수는 log10 폭 0.05 스케치로 추정하므로 근사값입니다 (ROI% 기준 약 12% 이내).
+    growth = 1 + stats['roi_p50'] / 100
+    expected_growth = 1 + expected.loc[stats.index, 'median_roi'] / 100
+    np.testing.assert_allclose(growth, expected_growth, rtol=0.13)
+
+
+def test_filters_use_budget_band_labels():
+    df = make_campaigns(seed=2)
+    rollups = SegmentRollups.from_frame(df)
+    stats = rollups.query(group_by=[], filters={'budget_band': ['10k-25k'], 'influencer_category': ['Food']})
+    expected = ((df['budget'] >= 10_000) & (df['budget'] < 25_000) & (df['influencer_category'] == 'Food')).sum()
+    assert int(stats['campaigns'].iloc[0]) == expected
+    assert stats['avg_budget'].iloc[0] == pytest.approx(
+        df.loc[(df['budget'] >= 10_000) & (df['budget'] < 25_000) & (df['influencer_category'] == 'Food'),
+               'budget'].mean())
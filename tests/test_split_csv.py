@@ -0,0 +1,43 @@
+import os
+
+import pandas as pd
+import pyarrow.parquet as pq
+
+from split_csv import NULL_PARTITION, split_csv
+
+
+def write_csv(tmp_path, frame):
+    path = tmp_path / 'input.csv'
+    frame.to_csv(path, index=False)
+    return str(path)
+
+
+def test_null_partition_rows_are_kept(tmp_path):
+    frame = pd.DataFrame({'influencer_category': ['Beauty', None, 'Food', None], 'sales': [1, 2, 3, 4]})
+    written = split_csv(write_csv(tmp_path, frame), str(tmp_path / 'out'), partition_by='influencer_category',
+                        chunksize=2, prefix='p')
+    assert sum(written.values()) == len(frame)
+    null_path = os.path.join(tmp_path, 'out', f'p_{NULL_PARTITION}.csv')
+    assert written[null_path] == 2
+    assert pd.read_csv(null_path)['sales'].tolist() == [2, 4]
+
+
+def test_colliding_filenames_are_not_overwritten(tmp_path):
+    frame = pd.DataFrame({'platform': ['A/B', 'A B', 'A/B'], 'sales': [1, 2, 3]})
+    written = split_csv(write_csv(tmp_path, frame), str(tmp_path / 'out'), partition_by='platform', prefix='p')
+    assert len(written) == 2
+    assert sorted(written.values()) == [1, 2]
+    assert sum(len(pd.read_csv(path)) for path in written) == len(frame)
+
+
+def test_parquet_schema_survives_missing_ints_in_later_chunk(tmp_path):
+    # 첫 청크는 정수로, 두 번째 청크는 결측 때문에 float 로 추론되는 컬럼
+    path = tmp_path / 'input.csv'
+    path.write_text("platform,engagements,note\nYouTube,1,\nYouTube,2,\nYouTube,,x\nYouTube,4,y\n")
+    written = split_csv(str(path), str(tmp_path / 'out'), fmt='parquet', chunksize=2, prefix='p')
+    (path, rows), = written.items()
+    assert rows == 4
+    table = pq.read_table(path)
+    assert str(table.schema.field('engagements').type) == 'int64'
+    assert table.column('engagements').to_pylist() == [1, 2, None, 4]
+    assert table.column('note').to_pylist() == [None, None, 'x', 'y']